@@ -8,12 +8,18 @@ from rest_framework.permissions import AllowAny
 import logging
 import requests
 import json # Keep json import
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 
 from ..models import AlertGroup, AlertInstance, AlertComment
 from ..services.alerts_processor import acknowledge_alert
 from ..services.alert_logger import save_alert_to_file
 # Import the task for .delay()
 from ..tasks import process_alert_payload_task 
+from ..services.direct_ingest import direct_ingest_pool, IngestPoolFull
+from ..services.shard_router import alert_shard_router
+from ..services.alert_spool import alert_spool
+from ..services.label_index import filter_by_labels
+from core.services import read_cache
 from .serializers import (
     AlertGroupSerializer,
     AlertInstanceSerializer,
@@ -38,8 +44,20 @@ class AlertWebhookView(APIView):
             # Explicitly serialize the payload to JSON before sending
             try:
                 payload_json = json.dumps(request.data)
-                logger.info("Webhook serializer valid. Calling Celery task with JSON payload...")
-                process_alert_payload_task.delay(payload_json)
+                if direct_ingest_pool.enabled:
+                    return self._ingest_directly(payload_json)
+                if alert_spool.enabled:
+                    try:
+                        alert_spool.append(payload_json)
+                        return Response({'status': 'success (spooled)'}, status=status.HTTP_200_OK)
+                    except OSError as e:
+                        logger.error(f"Could not append payload to the alert spool, calling Celery directly: {e}", exc_info=True)
+                if alert_shard_router.enabled:
+                    logger.info("Webhook serializer valid. Dispatching JSON payload to fingerprint shard queues...")
+                    alert_shard_router.dispatch(payload_json)
+                else:
+                    logger.info("Webhook serializer valid. Calling Celery task with JSON payload...")
+                    process_alert_payload_task.delay(payload_json)
                 return Response({'status': 'success (task queued)'}, status=status.HTTP_200_OK)
             except TypeError as e:
                  logger.error(f"Could not serialize payload to JSON: {e}", exc_info=True)
@@ -59,6 +77,29 @@ class AlertWebhookView(APIView):
         logger.warning(f"Webhook serializer invalid: {serializer.errors}")
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    def _ingest_directly(self, payload_json):
+        """
+        Applies the payload in the local direct-ingest pool and waits for it to commit,
+        so a 5xx tells Alertmanager to retry.
+        """
+        logger.info("Webhook serializer valid. Applying payload in the direct-ingest pool...")
+        try:
+            # Never park a request thread on a full pool; Alertmanager retries the 503
+            future = direct_ingest_pool.submit(payload_json, block=False)
+        except IngestPoolFull as e:
+            logger.warning(f"Direct-ingest pool is full, rejecting webhook: {e}")
+            return Response({'status': 'busy, retry later'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        try:
+            future.result(timeout=direct_ingest_pool.result_timeout)
+        except FuturesTimeoutError:
+            logger.warning("Direct ingest did not finish in time; payload is still being processed.")
+            return Response({'status': 'accepted (processing)'}, status=status.HTTP_202_ACCEPTED)
+        except Exception as e:
+            logger.error(f"Direct ingest failed: {e}", exc_info=True)
+            return Response({'status': 'error processing payload'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return Response({'status': 'success (processed)'}, status=status.HTTP_200_OK)
+
 
 class AlertGroupViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -89,28 +130,25 @@ class AlertGroupViewSet(viewsets.ReadOnlyModelViewSet):
         if instance:
             queryset = queryset.filter(instance__icontains=instance)
 
-        # Filter by service (within labels JSONField)
-        service = self.request.query_params.get('service', None)
-        if service:
-            queryset = queryset.filter(labels__service__icontains=service)
-
-        # Filter by job (within labels JSONField)
-        job = self.request.query_params.get('job', None)
-        if job:
-            queryset = queryset.filter(labels__job__icontains=job)
-
-        # Filter by cluster (within labels JSONField)
-        cluster = self.request.query_params.get('cluster', None)
-        if cluster:
-            queryset = queryset.filter(labels__cluster__icontains=cluster)
-
-        # Filter by namespace (within labels JSONField)
-        namespace = self.request.query_params.get('namespace', None)
-        if namespace:
-            queryset = queryset.filter(labels__namespace__icontains=namespace)
+        # Filter by service/job/cluster/namespace labels through the indexed label store
+        label_filters = {
+            key: self.request.query_params.get(key)
+            for key in ('service', 'job', 'cluster', 'namespace')
+            if self.request.query_params.get(key)
+        }
+        if label_filters:
+            queryset = filter_by_labels(queryset, label_filters, lookup='icontains')
 
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        # Responses depend only on the query string (and host, for pagination links)
+        data = read_cache.cached(
+            read_cache.ALERT_READS, f"api:alert_groups:{request.build_absolute_uri()}",
+            lambda: super(AlertGroupViewSet, self).list(request, *args, **kwargs).data
+        )
+        return Response(data)
+
     @action(detail=True, methods=['put'])
     def acknowledge(self, request, fingerprint=None): # Changed pk to fingerprint
         alert_group = self.get_object() # get_object() will now use fingerprint
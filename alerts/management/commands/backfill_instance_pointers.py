@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from alerts.models import AlertGroup
+from alerts.services.alert_state_manager import refresh_instance_pointers
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfills the denormalized AlertGroup instance fields (active_instance, latest_instance and the "
+        "first_instance_start, current_problem_start and latest_instance_start sort columns) from the instance history. "
+        "Safe to re-run; groups are processed in primary-key order, one transaction per batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Groups per UPDATE.')
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        last_pk = 0
+        total = 0
+        while True:
+            ids = list(
+                AlertGroup.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                total += refresh_instance_pointers([AlertGroup(pk=pk) for pk in ids])
+            last_pk = ids[-1]
+            if options['verbosity'] > 1:
+                self.stdout.write(f"Backfilled up to AlertGroup {last_pk} ({total} so far)")
+        self.stdout.write(self.style.SUCCESS(f"Backfilled instance pointers for {total} AlertGroup(s)."))
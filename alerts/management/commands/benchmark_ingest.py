@@ -0,0 +1,113 @@
+import json
+import time
+import uuid
+import statistics
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from alerts.models import AlertGroup
+from alerts.tasks import process_alert_payload_task
+from alerts.services.direct_ingest import direct_ingest_pool
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares receive-to-commit latency of the Celery ingest path (process_alert_payload_task.delay) "
+        "with the direct-ingest pool. Writes real AlertGroups labelled sentryhub_benchmark=true and "
+        "fires alert_processed for them, so run it against a staging instance. "
+        "All payloads are submitted as one burst, so latencies include queueing. "
+        "The celery path needs a running broker and worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=200, help='Number of payloads per path.')
+        parser.add_argument('--alerts-per-payload', type=int, default=1, help='Alerts in each payload.')
+        parser.add_argument('--path', choices=['celery', 'direct', 'both'], default='both', help='Ingest path(s) to measure.')
+        parser.add_argument('--timeout', type=float, default=120.0, help='Seconds to wait for all payloads of a path to commit.')
+        parser.add_argument('--keep', action='store_true', help='Keep the benchmark AlertGroups instead of deleting them.')
+
+    def handle(self, *args, **options):
+        run_id = uuid.uuid4().hex[:8]
+        paths = ['celery', 'direct'] if options['path'] == 'both' else [options['path']]
+        try:
+            for path in paths:
+                payloads = self._build_payloads(f"bench-{run_id}-{path}", options['count'], options['alerts_per_payload'])
+                if path == 'direct':
+                    latencies, elapsed = self._run_direct(payloads, options['timeout'])
+                else:
+                    latencies, elapsed = self._run_celery(payloads, options['timeout'])
+                self._report(path, latencies, elapsed, len(payloads))
+        finally:
+            direct_ingest_pool.shutdown(wait=True)
+            if not options['keep']:
+                deleted, _ = AlertGroup.objects.filter(fingerprint__startswith=f"bench-{run_id}-").delete()
+                self.stdout.write(f"Deleted {deleted} benchmark row(s).")
+
+    def _build_payloads(self, prefix, count, alerts_per_payload):
+        starts_at = timezone.now().isoformat()
+        payloads = []
+        for i in range(count):
+            alerts = []
+            for j in range(alerts_per_payload):
+                alerts.append({
+                    'status': 'firing',
+                    'labels': {'alertname': 'SentryHubIngestBenchmark', 'sentryhub_benchmark': 'true', 'instance': f"{prefix}-{i}-{j}"},
+                    'annotations': {'summary': 'Ingest benchmark alert'},
+                    'startsAt': starts_at,
+                    'endsAt': '0001-01-01T00:00:00Z',
+                    'generatorURL': '',
+                    'fingerprint': f"{prefix}-{i}-{j}",
+                })
+            # The first fingerprint of each payload marks it as committed
+            payloads.append((alerts[0]['fingerprint'], json.dumps({'receiver': 'benchmark', 'status': 'firing', 'alerts': alerts})))
+        return payloads
+
+    def _run_direct(self, payloads, timeout):
+        if not direct_ingest_pool.enabled:
+            self.stdout.write(self.style.WARNING("ALERT_INGEST['MODE'] is not 'direct'; measuring the pool anyway."))
+        latencies = []
+        started = time.perf_counter()
+        pending = []
+        for _, payload_json in payloads:
+            sent_at = time.perf_counter()
+            future = direct_ingest_pool.submit(payload_json)
+            future.add_done_callback(lambda f, sent_at=sent_at: latencies.append(time.perf_counter() - sent_at))
+            pending.append(future)
+        for future in pending:
+            future.result(timeout=timeout)
+        return latencies, time.perf_counter() - started
+
+    def _run_celery(self, payloads, timeout):
+        sent_at = {}
+        started = time.perf_counter()
+        for fingerprint, payload_json in payloads:
+            sent_at[fingerprint] = time.perf_counter()
+            process_alert_payload_task.delay(payload_json)
+
+        # Commit time is observed by polling, so latencies include up to one poll interval
+        latencies = []
+        deadline = started + timeout
+        while sent_at:
+            if time.perf_counter() > deadline:
+                raise CommandError(f"{len(sent_at)} payload(s) were not committed within {timeout}s. Is a Celery worker running?")
+            committed = AlertGroup.objects.filter(fingerprint__in=list(sent_at)).values_list('fingerprint', flat=True)
+            now = time.perf_counter()
+            for fingerprint in committed:
+                latencies.append(now - sent_at.pop(fingerprint))
+            time.sleep(0.005)
+        return latencies, time.perf_counter() - started
+
+    def _report(self, path, latencies, elapsed, count):
+        values = sorted(latencies)
+        self.stdout.write(self.style.SUCCESS(
+            f"[{path}] {count} payloads in {elapsed:.2f}s ({count / elapsed if elapsed else 0:.1f} payloads/s) | "
+            f"receive-to-commit ms: p50={_percentile(values, 50) * 1000:.1f} "
+            f"p95={_percentile(values, 95) * 1000:.1f} p99={_percentile(values, 99) * 1000:.1f} "
+            f"max={(values[-1] if values else 0) * 1000:.1f} mean={(statistics.mean(values) if values else 0) * 1000:.1f}"
+        ))
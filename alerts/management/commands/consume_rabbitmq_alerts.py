@@ -2,15 +2,48 @@ import logging
 import pika
 import json
 import time
+from functools import partial
 from django.core.management.base import BaseCommand
 from django.conf import settings
-from alerts.tasks import process_alert_payload_task # Ensure this is the correct path to your Celery task
+from alerts.tasks import process_alert_payload_task, process_alert_payload_batch_task
+from alerts.services.direct_ingest import direct_ingest_pool, IngestPoolFull
+from alerts.services.shard_router import alert_shard_router
 
 logger = logging.getLogger(__name__)
 
+
+def _alert_name(payload):
+    """Best-effort alert name of an already parsed payload, for logging only."""
+    if isinstance(payload, dict):
+        return payload.get('commonLabels', {}).get('alertname', 'N/A')
+    return 'N/A'
+
+
 class Command(BaseCommand):
     help = 'Starts a robust RabbitMQ consumer to process external alerts from a queue with retry logic.'
 
+    # Set in handle(); direct mode applies payloads in the local pool instead of queueing Celery tasks
+    direct_ingest = False
+    connection = None
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help="Max messages per Celery task. Values > 1 enable batch mode (default: RABBITMQ_CONFIG['BATCH_SIZE'])."
+        )
+        parser.add_argument(
+            '--prefetch', type=int, default=None,
+            help="Channel prefetch count (default: RABBITMQ_CONFIG['PREFETCH_COUNT'])."
+        )
+        parser.add_argument(
+            '--linger', type=float, default=None,
+            help="Max seconds to wait for a batch to fill up (default: RABBITMQ_CONFIG['BATCH_LINGER_SECONDS'])."
+        )
+        parser.add_argument(
+            '--ingest-mode', choices=['celery', 'direct'], default=None,
+            help="'celery' queues a task per message/batch, 'direct' applies them in a local worker pool (default: ALERT_INGEST['MODE'])."
+        )
+
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS('Initializing RabbitMQ consumer...'))
         logger.info("Initializing RabbitMQ consumer for external alerts.")
@@ -18,6 +51,24 @@ class Command(BaseCommand):
         rabbitmq_config = settings.RABBITMQ_CONFIG
         retry_delay = rabbitmq_config.get('RETRY_DELAY', 30)
 
+        batch_size = options.get('batch_size') or rabbitmq_config.get('BATCH_SIZE', 1)
+        prefetch_count = options.get('prefetch') or rabbitmq_config.get('PREFETCH_COUNT', 1)
+        linger = options.get('linger')
+        if linger is None:
+            linger = rabbitmq_config.get('BATCH_LINGER_SECONDS', 0.2)
+        batch_size = max(1, batch_size)
+        if prefetch_count < batch_size:
+            logger.warning(f"Prefetch count {prefetch_count} is lower than batch size {batch_size}; raising it to {batch_size}.")
+            prefetch_count = batch_size
+        ingest_mode = options.get('ingest_mode') or getattr(settings, 'ALERT_INGEST', {}).get('MODE', 'celery')
+        self.direct_ingest = ingest_mode == 'direct'
+        logger.info(f"Ingest mode: {ingest_mode}.")
+        if self.direct_ingest and prefetch_count > direct_ingest_pool.max_pending:
+            # Each unacknowledged delivery holds at most one pool slot, so the pool can never be full
+            logger.warning(f"Prefetch count {prefetch_count} exceeds the direct-ingest pool's {direct_ingest_pool.max_pending} pending slots; lowering it.")
+            prefetch_count = direct_ingest_pool.max_pending
+            batch_size = min(batch_size, prefetch_count)
+
         while True: # Outer loop for connection retries
             connection = None
             try:
@@ -34,6 +85,7 @@ class Command(BaseCommand):
                     blocked_connection_timeout=rabbitmq_config.get('BLOCKED_CONNECTION_TIMEOUT', 300)
                 )
                 connection = pika.BlockingConnection(parameters)
+                self.connection = connection
                 channel = connection.channel()
                 self.stdout.write(self.style.SUCCESS('Successfully connected to RabbitMQ.'))
                 logger.info("Successfully connected to RabbitMQ.")
@@ -42,55 +94,69 @@ class Command(BaseCommand):
                 channel.queue_declare(queue=queue_name, durable=True)
                 logger.info(f"Declared queue: {queue_name}")
 
-                channel.basic_qos(prefetch_count=1)
-                logger.info("QoS prefetch_count set to 1.")
+                channel.basic_qos(prefetch_count=prefetch_count)
+                logger.info(f"QoS prefetch_count set to {prefetch_count}.")
 
-                def on_message_callback(ch, method, properties, body):
-                    message_tag = method.delivery_tag
-                    payload_str = "" # Initialize to avoid UnboundLocalError in except block
-                    try:
-                        logger.debug(f"Received raw message (tag: {message_tag}).")
-                        payload_str = body.decode('utf-8')
-
-                        # Minimal validation that it *could* be JSON, actual parsing is in the task
-                        try:
-                            # Attempt to parse to ensure it's valid JSON format before sending to task
-                            # but we will send the string, not the parsed dict.
-                            json.loads(payload_str)
-                            logger.info(f"[<] Received valid JSON message (tag: {message_tag}): {payload_str[:250]}...")
-                        except json.JSONDecodeError as e_json:
-                            logger.error(f"[!] Failed to decode JSON (tag: {message_tag}): {payload_str[:250]}... Error: {e_json}")
-                            ch.basic_nack(delivery_tag=message_tag, requeue=False)
-                            logger.warning(f"[-] NACKed message (tag: {message_tag}) due to JSON decode error (no requeue).")
-                            return
-
-                        # Send the original JSON STRING to Celery task
-                        process_alert_payload_task.delay(payload_str)
-                        # For logging, we can parse it here if needed (but don't send the parsed version)
+                if batch_size > 1:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"Batch consumer started (batch size {batch_size}, linger {linger}s). "
+                        f"Waiting for messages on queue '{queue_name}'. Press Ctrl+C to exit."
+                    ))
+                    logger.info(f"Batch consumer started on queue '{queue_name}' (batch size {batch_size}, linger {linger}s).")
+                    self.consume_batches(channel, queue_name, batch_size, linger)
+                else:
+                    def on_message_callback(ch, method, properties, body):
+                        message_tag = method.delivery_tag
+                        payload_str = "" # Initialize to avoid UnboundLocalError in except block
                         try:
-                            parsed_for_log = json.loads(payload_str)
-                            alert_name = parsed_for_log.get('commonLabels', {}).get('alertname', 'N/A')
-                        except:
-                            alert_name = 'N/A (error parsing for log)'
+                            logger.debug(f"Received raw message (tag: {message_tag}).")
+                            payload_str = body.decode('utf-8')
 
-                        logger.info(f"[>] Dispatched message (tag: {message_tag}, alert: {alert_name}) to Celery.")
+                            # Validate once; the original JSON STRING is what gets sent to the task
+                            try:
+                                parsed = json.loads(payload_str)
+                                logger.info(f"[<] Received valid JSON message (tag: {message_tag}): {payload_str[:250]}...")
+                            except json.JSONDecodeError as e_json:
+                                logger.error(f"[!] Failed to decode JSON (tag: {message_tag}): {payload_str[:250]}... Error: {e_json}")
+                                ch.basic_nack(delivery_tag=message_tag, requeue=False)
+                                logger.warning(f"[-] NACKed message (tag: {message_tag}) due to JSON decode error (no requeue).")
+                                return
 
-                        ch.basic_ack(delivery_tag=message_tag)
-                        logger.info(f"[v] ACKed message (tag: {message_tag}, alert: {alert_name}).")
+                            alert_name = _alert_name(parsed)
+                            if self.direct_ingest:
+                                try:
+                                    future = direct_ingest_pool.submit(payload_str, block=False)
+                                except IngestPoolFull as e_full:
+                                    ch.basic_nack(delivery_tag=message_tag, requeue=True)
+                                    logger.warning(f"[-] NACKed message (tag: {message_tag}) for redelivery: {e_full}")
+                                    return
+                                future.add_done_callback(partial(self._on_direct_ingest_done, ch, [message_tag]))
+                                logger.info(f"[>] Submitted message (tag: {message_tag}, alert: {alert_name}) to the direct-ingest pool.")
+                                return
 
-                    except Exception as e_process:
-                        logger.error(f"[!] Error processing message (tag: {message_tag}): {e_process}", exc_info=True)
-                        try:
-                            ch.basic_nack(delivery_tag=message_tag, requeue=False)
-                            logger.warning(f"[-] NACKed message (tag: {message_tag}) due to processing error (no requeue).")
-                        except Exception as e_nack:
-                            logger.error(f"[!!] Failed to NACK message (tag: {message_tag}) after processing error: {e_nack}", exc_info=True)
+                            if alert_shard_router.enabled:
+                                alert_shard_router.dispatch(payload_str)
+                            else:
+                                process_alert_payload_task.delay(payload_str)
+
+                            logger.info(f"[>] Dispatched message (tag: {message_tag}, alert: {alert_name}) to Celery.")
+
+                            ch.basic_ack(delivery_tag=message_tag)
+                            logger.info(f"[v] ACKed message (tag: {message_tag}, alert: {alert_name}).")
+
+                        except Exception as e_process:
+                            logger.error(f"[!] Error processing message (tag: {message_tag}): {e_process}", exc_info=True)
+                            try:
+                                ch.basic_nack(delivery_tag=message_tag, requeue=False)
+                                logger.warning(f"[-] NACKed message (tag: {message_tag}) due to processing error (no requeue).")
+                            except Exception as e_nack:
+                                logger.error(f"[!!] Failed to NACK message (tag: {message_tag}) after processing error: {e_nack}", exc_info=True)
 
-                channel.basic_consume(queue=queue_name, on_message_callback=on_message_callback)
+                    channel.basic_consume(queue=queue_name, on_message_callback=on_message_callback)
 
-                self.stdout.write(self.style.SUCCESS(f"Consumer started. Waiting for messages on queue '{queue_name}'. Press Ctrl+C to exit."))
-                logger.info(f"Consumer started. Waiting for messages on queue '{queue_name}'.")
-                channel.start_consuming()
+                    self.stdout.write(self.style.SUCCESS(f"Consumer started. Waiting for messages on queue '{queue_name}'. Press Ctrl+C to exit."))
+                    logger.info(f"Consumer started. Waiting for messages on queue '{queue_name}'.")
+                    channel.start_consuming()
 
             except (pika.exceptions.AMQPConnectionError,
                     pika.exceptions.ChannelClosedByBroker,
@@ -117,5 +183,109 @@ class Command(BaseCommand):
             logger.info(f"Consumer loop iteration ended. Retrying in {retry_delay} seconds...")
             time.sleep(retry_delay)
 
+        if self.direct_ingest:
+            # Unacknowledged in-flight messages are redelivered by the broker after the connection closed
+            direct_ingest_pool.shutdown(wait=True)
         self.stdout.write(self.style.SUCCESS('RabbitMQ consumer shut down completely.'))
-        logger.info("RabbitMQ consumer shut down completely.")
\ No newline at end of file
+        logger.info("RabbitMQ consumer shut down completely.")
+
+    def consume_batches(self, channel, queue_name, batch_size, linger):
+        """
+        Collects up to `batch_size` messages, or whatever arrived within `linger`
+        seconds of the first one, and hands them to flush_batch().
+        Unacknowledged messages are redelivered by the broker if the connection drops.
+        """
+        batch = []
+        batch_started = None
+        for method, properties, body in channel.consume(queue_name, inactivity_timeout=max(linger, 0.01)):
+            if method is not None:
+                if not batch:
+                    batch_started = time.monotonic()
+                batch.append((method.delivery_tag, body))
+
+            if batch and (
+                len(batch) >= batch_size
+                or method is None
+                or time.monotonic() - batch_started >= linger
+            ):
+                self.flush_batch(channel, batch)
+                batch = []
+
+        if batch:
+            self.flush_batch(channel, batch)
+
+    def flush_batch(self, channel, batch):
+        """
+        Validates each message once, NACKs invalid ones, dispatches the valid
+        payloads as a single Celery task and confirms them with one multi-ACK.
+        """
+        valid = []
+        for message_tag, body in batch:
+            try:
+                payload_str = body.decode('utf-8')
+                json.loads(payload_str)
+            except (UnicodeDecodeError, json.JSONDecodeError) as e_json:
+                logger.error(f"[!] Failed to decode JSON (tag: {message_tag}): {body[:250]!r}... Error: {e_json}")
+                channel.basic_nack(delivery_tag=message_tag, requeue=False)
+                logger.warning(f"[-] NACKed message (tag: {message_tag}) due to JSON decode error (no requeue).")
+                continue
+            valid.append((message_tag, payload_str))
+
+        if not valid:
+            return
+
+        if self.direct_ingest:
+            # Batches may finish out of order in the pool, so each one settles only its own tags
+            tags = [message_tag for message_tag, _ in valid]
+            try:
+                future = direct_ingest_pool.submit_batch([payload_str for _, payload_str in valid], block=False)
+            except IngestPoolFull as e_full:
+                for message_tag in tags:
+                    channel.basic_nack(delivery_tag=message_tag, requeue=True)
+                logger.warning(f"[-] NACKed batch of {len(tags)} message(s) for redelivery: {e_full}")
+                return
+            except Exception as e_submit:
+                logger.error(f"[!] Failed to submit batch of {len(valid)} message(s) to the direct-ingest pool: {e_submit}", exc_info=True)
+                for message_tag in tags:
+                    channel.basic_nack(delivery_tag=message_tag, requeue=True)
+                raise
+            future.add_done_callback(partial(self._on_direct_ingest_done, channel, tags))
+            logger.info(f"[>] Submitted batch of {len(valid)} message(s) to the direct-ingest pool.")
+            return
+
+        # Invalid messages are already settled, so a multi-ACK up to the last valid tag covers the rest
+        last_tag = valid[-1][0]
+        try:
+            payloads = [payload_str for _, payload_str in valid]
+            if alert_shard_router.enabled:
+                alert_shard_router.dispatch_batch(payloads)
+            else:
+                process_alert_payload_batch_task.delay(payloads)
+        except Exception as e_dispatch:
+            logger.error(f"[!] Failed to dispatch batch of {len(valid)} message(s) (last tag: {last_tag}): {e_dispatch}", exc_info=True)
+            channel.basic_nack(delivery_tag=last_tag, multiple=True, requeue=True)
+            logger.warning(f"[-] NACKed batch up to tag {last_tag} (requeued).")
+            raise
+
+        logger.info(f"[>] Dispatched batch of {len(valid)} message(s) (last tag: {last_tag}) to Celery.")
+        channel.basic_ack(delivery_tag=last_tag, multiple=True)
+        logger.info(f"[v] ACKed batch up to tag {last_tag}.")
+
+    def _on_direct_ingest_done(self, channel, tags, future):
+        """Runs in a pool thread; pika channels are not thread-safe, so settling is handed back to the connection thread."""
+        try:
+            self.connection.add_callback_threadsafe(partial(self._settle_direct_ingest, channel, tags, future.exception()))
+        except Exception as e_conn:
+            # Connection already gone; the broker redelivers these messages after reconnecting
+            logger.warning(f"[!] Could not settle {len(tags)} directly ingested message(s) (last tag: {tags[-1]}): {e_conn}")
+
+    def _settle_direct_ingest(self, channel, tags, error):
+        if error is None:
+            for message_tag in tags:
+                channel.basic_ack(delivery_tag=message_tag)
+            logger.info(f"[v] ACKed {len(tags)} directly ingested message(s) (last tag: {tags[-1]}).")
+            return
+        logger.error(f"[!] Direct ingest failed for {len(tags)} message(s) (last tag: {tags[-1]}): {error}")
+        for message_tag in tags:
+            channel.basic_nack(delivery_tag=message_tag, requeue=False)
+        logger.warning(f"[-] NACKed {len(tags)} message(s) due to processing error (no requeue).")
@@ -0,0 +1,88 @@
+import heapq
+import itertools
+import logging
+import time
+from django.core.management.base import BaseCommand
+from alerts.tasks import process_alert_payload_batch_task
+from alerts.services.alert_spool import alert_spool
+from alerts.services.shard_router import alert_shard_router
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Ships webhook payloads from the local alert spool to Celery in bulk and removes drained segments.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help='Max payloads per Celery task (default: 200).')
+        parser.add_argument('--interval', type=float, default=0.2, help='Seconds to sleep when the spool is empty (default: 0.2).')
+        parser.add_argument('--retry-delay', type=float, default=5.0, help='Seconds to wait after a failed dispatch (default: 5).')
+        parser.add_argument('--once', action='store_true', help='Drain what is currently spooled and exit.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS(f"Draining alert spool at {alert_spool.directory}..."))
+        logger.info(f"Alert spool drainer started for {alert_spool.directory}.")
+        try:
+            while True:
+                try:
+                    shipped = self.drain_once(options['batch_size'])
+                except Exception as e:
+                    logger.error(f"Alert spool drainer: dispatch failed, retrying in {options['retry_delay']}s: {e}", exc_info=True)
+                    if options['once']:
+                        raise
+                    time.sleep(options['retry_delay'])
+                    continue
+                if options['once']:
+                    self.stdout.write(self.style.SUCCESS(f"Shipped {shipped} spooled payload(s)."))
+                    break
+                if not shipped:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('\nAlert spool drainer stopping due to KeyboardInterrupt.'))
+            logger.info("Alert spool drainer stopping due to KeyboardInterrupt.")
+
+    def drain_once(self, batch_size):
+        """Ship every complete record currently spooled. Returns the number of payloads shipped."""
+        shipped = 0
+        offsets = {segment: alert_spool.read_offset(segment) for segment in alert_spool.segments()}
+        while True:
+            batch = self.next_batch(offsets, batch_size)
+            if not batch:
+                break
+            records = [payload for _, _, payload, _ in batch]
+            # Offsets only move forward after the broker accepted the batch (at-least-once)
+            if alert_shard_router.enabled:
+                alert_shard_router.dispatch_batch(records)
+            else:
+                process_alert_payload_batch_task.delay(records)
+            shipped_to = {segment: end for _, segment, _, end in batch}
+            for segment, end in shipped_to.items():
+                alert_spool.write_offset(segment, end)
+                offsets[segment] = end
+            logger.info(f"Alert spool drainer: Shipped {len(records)} payload(s) from {len(shipped_to)} segment(s).")
+            shipped += len(records)
+        for segment, offset in offsets.items():
+            if alert_spool.is_finished(segment, offset):
+                alert_spool.remove_segment(segment)
+                logger.info(f"Alert spool drainer: Removed drained segment {segment}.")
+        return shipped
+
+    def next_batch(self, offsets, batch_size):
+        """
+        The next `batch_size` unshipped records of all segments, merged by receive time.
+
+        A record is only safe to ship once every segment has been read past its
+        receive time: segments cut off by the read limit, and records newer than
+        MERGE_DELAY_SECONDS (a concurrent writer may still append older ones),
+        bound the merge. Each segment's records stay in file order.
+        """
+        merge_delay = float(alert_spool.config.get('MERGE_DELAY_SECONDS', 0.1))
+        watermark = time.time_ns() - int(merge_delay * 1e9)
+        streams = []
+        for segment, offset in offsets.items():
+            entries = alert_spool.read_entries(segment, offset, batch_size)
+            if len(entries) == batch_size:
+                watermark = min(watermark, entries[-1][0])
+            streams.append([(received, segment, payload, end) for received, payload, end in entries])
+        merged = heapq.merge(*streams, key=lambda entry: entry[0])
+        return list(itertools.islice(itertools.takewhile(lambda entry: entry[0] <= watermark, merged), batch_size))
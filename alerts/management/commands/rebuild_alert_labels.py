@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from alerts.models import AlertGroup
+from alerts.services.label_index import sync_alert_labels
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the AlertLabel index from AlertGroup.labels. Run once after migrating to fill it for "
+        "existing groups; safe to re-run. Groups are processed in primary-key order, one transaction per batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Groups per batch.')
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        last_pk = 0
+        groups_done = 0
+        labels_written = 0
+        while True:
+            groups = list(
+                AlertGroup.objects.filter(pk__gt=last_pk).order_by('pk').only('pk', 'labels')[:batch_size]
+            )
+            if not groups:
+                break
+            labels_written += sync_alert_labels(groups)
+            groups_done += len(groups)
+            last_pk = groups[-1].pk
+            if options['verbosity'] > 1:
+                self.stdout.write(f"Indexed up to AlertGroup {last_pk} ({labels_written} label(s) so far)")
+        self.stdout.write(self.style.SUCCESS(f"Indexed {labels_written} label(s) for {groups_done} AlertGroup(s)."))
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0011_alter_alertinstance_started_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alertgroup',
+            name='active_instance',
+            field=models.ForeignKey(blank=True, help_text='The currently open firing instance, if any.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='alerts.alertinstance'),
+        ),
+        migrations.AddField(
+            model_name='alertgroup',
+            name='latest_instance',
+            field=models.ForeignKey(blank=True, help_text='The instance with the most recent start time.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='alerts.alertinstance'),
+        ),
+        migrations.AddIndex(
+            model_name='alertinstance',
+            index=models.Index(fields=['alert_group', '-started_at'], name='alerts_inst_group_started_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alertinstance',
+            index=models.Index(condition=models.Q(('ended_at__isnull', True), ('status', 'firing')), fields=['alert_group', '-started_at'], name='alerts_inst_open_firing_idx'),
+        ),
+    ]
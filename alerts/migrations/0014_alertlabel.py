@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0013_alertgroup_instance_start_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertLabel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255)),
+                ('value', models.CharField(max_length=1024)),
+                ('alert_group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='label_set', to='alerts.alertgroup')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['key', 'value'], name='alerts_label_key_value_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='alertlabel',
+            constraint=models.UniqueConstraint(fields=('alert_group', 'key'), name='alerts_label_group_key_uniq'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0014_alertlabel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(help_text='UTC day the rolled-up instances started on.')),
+                ('instance_count', models.PositiveIntegerField(default=0)),
+                ('firing_seconds', models.FloatField(default=0, help_text='Summed duration of the instances that have an end time.')),
+                ('max_firing_seconds', models.FloatField(default=0)),
+                ('alert_group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='alerts.alertgroup')),
+            ],
+            options={
+                'ordering': ['-day'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='alertdailyrollup',
+            constraint=models.UniqueConstraint(fields=('alert_group', 'day'), name='alerts_rollup_group_day_uniq'),
+        ),
+    ]
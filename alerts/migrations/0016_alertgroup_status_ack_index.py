@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0015_alertdailyrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alertgroup',
+            index=models.Index(fields=['current_status', 'acknowledged', 'is_silenced'], name='alerts_group_status_ack_idx'),
+        ),
+    ]
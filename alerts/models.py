@@ -66,6 +66,29 @@ class AlertGroup(models.Model):
         verbose_name="Jira Issue Key",
         help_text="The key of the Jira issue associated with this alert group (e.g., PROJECT-123)."
     )
+    # Denormalized pointers maintained by the alert state manager and manual resolve,
+    # so hot paths don't have to search the instance history.
+    active_instance = models.ForeignKey(
+        'AlertInstance',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text="The currently open firing instance, if any."
+    )
+    latest_instance = models.ForeignKey(
+        'AlertInstance',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text="The instance with the most recent start time."
+    )
+    # Start times maintained alongside the pointers so list views can sort and
+    # show durations without subqueries over the instance history.
+    first_instance_start = models.DateTimeField(null=True, blank=True)
+    current_problem_start = models.DateTimeField(null=True, blank=True)
+    latest_instance_start = models.DateTimeField(null=True, blank=True)
 
     def __str__(self):
         base_str = f"{self.name} ({self.instance or self.fingerprint})"
@@ -75,6 +98,40 @@ class AlertGroup(models.Model):
     
     class Meta:
         ordering = ['-last_occurrence']
+        indexes = [
+            models.Index(fields=['-latest_instance_start', '-id'], name='alerts_group_latest_start_idx'),
+            # Dashboard "unacknowledged" card
+            models.Index(fields=['current_status', 'acknowledged', 'is_silenced'], name='alerts_group_status_ack_idx'),
+        ]
+
+
+class AlertLabel(models.Model):
+    """
+    Normalized copy of AlertGroup.labels, one row per label, so label filters
+    can use the (key, value) index instead of scanning the labels JSON.
+    Kept in sync by alerts.services.label_index.
+    """
+    KEY_MAX_LENGTH = 255
+    VALUE_MAX_LENGTH = 1024
+
+    alert_group = models.ForeignKey(
+        'AlertGroup',
+        on_delete=models.CASCADE,
+        related_name='label_set'
+    )
+    key = models.CharField(max_length=KEY_MAX_LENGTH)
+    value = models.CharField(max_length=VALUE_MAX_LENGTH)
+
+    def __str__(self):
+        return f"{self.key}={self.value}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['alert_group', 'key'], name='alerts_label_group_key_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['key', 'value'], name='alerts_label_key_value_idx'),
+        ]
 
 
 class AlertInstance(models.Model):
@@ -111,6 +168,42 @@ class AlertInstance(models.Model):
     
     class Meta:
         ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['alert_group', '-started_at'], name='alerts_inst_group_started_idx'),
+            # Partial index on PostgreSQL (and SQLite); backends without partial
+            # index support skip it.
+            models.Index(
+                fields=['alert_group', '-started_at'],
+                condition=models.Q(status='firing', ended_at__isnull=True),
+                name='alerts_inst_open_firing_idx',
+            ),
+        ]
+
+
+class AlertDailyRollup(models.Model):
+    """
+    Per-group, per-day summary of AlertInstances removed by the retention purge
+    (core.services.retention). Together with the remaining raw instances it
+    keeps the full firing history countable after old rows are gone.
+    """
+    alert_group = models.ForeignKey(
+        'AlertGroup',
+        on_delete=models.CASCADE,
+        related_name='daily_rollups'
+    )
+    day = models.DateField(help_text="UTC day the rolled-up instances started on.")
+    instance_count = models.PositiveIntegerField(default=0)
+    firing_seconds = models.FloatField(default=0, help_text="Summed duration of the instances that have an end time.")
+    max_firing_seconds = models.FloatField(default=0)
+
+    def __str__(self):
+        return f"{self.alert_group.name} on {self.day}: {self.instance_count} instance(s)"
+
+    class Meta:
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['alert_group', 'day'], name='alerts_rollup_group_day_uniq'),
+        ]
 
 
 class AlertComment(models.Model):
@@ -0,0 +1,244 @@
+# alerts/services/alert_deduplicator.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Tuple, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _signature(alert: dict) -> str:
+    """Build the dedup signature of a parsed alert from (status, startsAt, endsAt)."""
+    starts_at = alert.get('starts_at')
+    ends_at = alert.get('ends_at')
+    return "|".join([
+        str(alert.get('status')),
+        starts_at.isoformat() if starts_at else '',
+        ends_at.isoformat() if ends_at else '',
+    ])
+
+
+class AlertDeduplicator:
+    """
+    Skips Alertmanager repeat notifications before they reach the state manager.
+
+    For each fingerprint the signature (status, startsAt, endsAt) of the last
+    event that was committed is remembered. An incoming alert whose signature
+    equals the remembered one is a resend that cannot change any state.
+
+    Two tiers are used:
+    - a bounded, thread-safe in-process LRU with a TTL
+    - an optional Redis tier (ALERT_DEDUP['REDIS_URL']) shared by all workers
+    Redis errors are logged and never block ingestion; the alert is then
+    simply processed normally.
+
+    A match is confirmed against the group's current_status with one query
+    per payload, so groups resolved manually or deleted by another process
+    are processed again whatever the tiers remember.
+    """
+
+    def __init__(self):
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_url = None
+
+    # --- configuration ---
+
+    @property
+    def config(self) -> dict:
+        return getattr(settings, 'ALERT_DEDUP', {})
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.config.get('ENABLED', False))
+
+    @property
+    def ttl(self) -> int:
+        return int(self.config.get('TTL_SECONDS', 3600))
+
+    @property
+    def max_size(self) -> int:
+        return int(self.config.get('LRU_SIZE', 50000))
+
+    def _get_redis(self):
+        url = self.config.get('REDIS_URL')
+        if not url:
+            return None
+        if self._redis is None or self._redis_url != url:
+            import redis
+            self._redis = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+            self._redis_url = url
+        return self._redis
+
+    def _redis_key(self, fingerprint: str) -> str:
+        prefix = self.config.get('REDIS_KEY_PREFIX', 'sentryhub:alert_dedup:')
+        return f"{prefix}{fingerprint}"
+
+    # --- public API ---
+
+    def partition(self, parsed_alerts: List[dict]) -> Tuple[List[dict], List[dict]]:
+        """
+        Split parsed alerts into (fresh, resends).
+
+        Only the first occurrence of a fingerprint within the payload can be a
+        resend; later events for the same fingerprint always go through the
+        state manager so intra-payload ordering is preserved.
+        """
+        if not self.enabled or not parsed_alerts:
+            return list(parsed_alerts), []
+
+        fingerprints = []
+        for alert in parsed_alerts:
+            fp = alert.get('fingerprint')
+            if fp and fp not in fingerprints:
+                fingerprints.append(fp)
+
+        known = self._lookup(fingerprints)
+
+        candidates = {}
+        seen = set()
+        for alert in parsed_alerts:
+            fp = alert.get('fingerprint')
+            if fp and fp not in seen and known.get(fp) == _signature(alert):
+                candidates[fp] = alert.get('status')
+            seen.add(fp)
+        confirmed = self._confirm_unchanged(candidates)
+
+        fresh, resends = [], []
+        seen = set()
+        for alert in parsed_alerts:
+            fp = alert.get('fingerprint')
+            if fp and fp not in seen and fp in confirmed:
+                resends.append(alert)
+            else:
+                fresh.append(alert)
+            seen.add(fp)
+        return fresh, resends
+
+    def remember(self, parsed_alerts: List[dict]) -> None:
+        """Record the signatures of alerts whose state changes were committed."""
+        if not self.enabled or not parsed_alerts:
+            return
+
+        latest = {}
+        for alert in parsed_alerts:
+            fp = alert.get('fingerprint')
+            if fp:
+                latest[fp] = _signature(alert)
+
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for fp, sig in latest.items():
+                self._lru[fp] = (sig, expires_at)
+                self._lru.move_to_end(fp)
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+
+        client = self._get_redis_safe()
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                for fp, sig in latest.items():
+                    pipe.set(self._redis_key(fp), sig, ex=self.ttl)
+                pipe.execute()
+            except Exception as e:
+                logger.warning(f"AlertDeduplicator: Failed to write {len(latest)} signature(s) to Redis: {e}")
+
+    def forget(self, fingerprints: List[str]) -> None:
+        """Drop remembered signatures, e.g. after a manual resolve or a group deletion."""
+        fingerprints = [fp for fp in fingerprints if fp]
+        if not fingerprints:
+            return
+        with self._lock:
+            for fp in fingerprints:
+                self._lru.pop(fp, None)
+
+        client = self._get_redis_safe()
+        if client is not None:
+            try:
+                client.delete(*[self._redis_key(fp) for fp in fingerprints])
+            except Exception as e:
+                logger.warning(f"AlertDeduplicator: Failed to delete {len(fingerprints)} signature(s) from Redis: {e}")
+
+    def clear(self) -> None:
+        """Clear the in-process tier (the Redis tier expires on its own)."""
+        with self._lock:
+            self._lru.clear()
+
+    # --- internals ---
+
+    def _get_redis_safe(self) -> Optional[object]:
+        try:
+            return self._get_redis()
+        except Exception as e:
+            logger.warning(f"AlertDeduplicator: Redis tier unavailable: {e}")
+            return None
+
+    def _confirm_unchanged(self, candidates: dict) -> set:
+        """
+        Keep the resend candidates ({fingerprint: status}) whose group still
+        exists with that status. forget() only reaches the tiers of the calling
+        process, so a group resolved manually or deleted from the web process
+        would otherwise stay deduplicated by the workers' LRUs until the TTL.
+        """
+        if not candidates:
+            return set()
+        from alerts.models import AlertGroup
+
+        current = dict(
+            AlertGroup.objects.filter(fingerprint__in=list(candidates)).values_list('fingerprint', 'current_status')
+        )
+        confirmed = {fp for fp, status in candidates.items() if current.get(fp) == status}
+        stale = [fp for fp in candidates if fp not in confirmed]
+        if stale:
+            logger.info(f"AlertDeduplicator: {len(stale)} group(s) changed outside ingestion; processing their alerts.")
+            with self._lock:
+                for fp in stale:
+                    self._lru.pop(fp, None)
+        return confirmed
+
+    def _lookup(self, fingerprints: List[str]) -> dict:
+        known = {}
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            for fp in fingerprints:
+                entry = self._lru.get(fp)
+                if entry is None:
+                    missing.append(fp)
+                    continue
+                sig, expires_at = entry
+                if expires_at <= now:
+                    del self._lru[fp]
+                    missing.append(fp)
+                    continue
+                self._lru.move_to_end(fp)
+                known[fp] = sig
+
+        client = self._get_redis_safe() if missing else None
+        if client is not None:
+            try:
+                values = client.mget([self._redis_key(fp) for fp in missing])
+            except Exception as e:
+                logger.warning(f"AlertDeduplicator: Redis lookup failed for {len(missing)} fingerprint(s): {e}")
+                values = []
+            expires_at = now + self.ttl
+            with self._lock:
+                for fp, value in zip(missing, values):
+                    if value is None:
+                        continue
+                    sig = value.decode('utf-8') if isinstance(value, bytes) else value
+                    known[fp] = sig
+                    self._lru[fp] = (sig, expires_at)
+                    self._lru.move_to_end(fp)
+                while len(self._lru) > self.max_size:
+                    self._lru.popitem(last=False)
+        return known
+
+
+# Global instance (one per worker process)
+alert_deduplicator = AlertDeduplicator()
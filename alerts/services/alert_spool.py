@@ -0,0 +1,254 @@
+# alerts/services/alert_spool.py
+import logging
+import os
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+OPEN_SUFFIX = '.open'
+SEALED_SUFFIX = '.seg'
+OFFSET_SUFFIX = '.offset'
+
+
+class AlertSpool:
+    """
+    Append-only local write-ahead spool for webhook payloads.
+
+    The webhook appends each raw JSON payload as one line to the current
+    segment of its process and returns; a drainer (`drain_alert_spool`)
+    ships spooled payloads to Celery in bulk. This keeps webhook latency
+    independent of the broker, and payloads survive a broker outage.
+
+    Segments are named '<time_ns>-<pid>.open' while a process writes to
+    them and renamed to '.seg' once sealed (size or age limit, or shutdown).
+    Writes are flushed to the OS immediately and fsync'ed in batches every
+    FSYNC_INTERVAL_SECONDS, so a process crash loses nothing and a host
+    crash loses at most that interval.
+
+    Each record is '<time_ns> <payload>', stamped under the writer's lock.
+    Every process writes its own segment, so the drainer merges the segments
+    by that receive time and ships records in the order the webhook got them
+    across all processes (the same fingerprint can arrive at any gunicorn
+    worker). With the shard router this order is kept per fingerprint all
+    the way to the AlertGroup.
+
+    The drainer keeps the byte offset it has shipped for each segment in a
+    '<time_ns>-<pid>.offset' sidecar, so delivery is at-least-once.
+
+    Settings (ALERT_SPOOL):
+    - ENABLED: webhook writes to the spool instead of calling Celery
+    - DIR: spool directory
+    - SEGMENT_MAX_BYTES / SEGMENT_MAX_AGE_SECONDS: rotation limits
+    - FSYNC_INTERVAL_SECONDS: fsync batching interval
+    - MERGE_DELAY_SECONDS: the drainer only ships records at least this old, so
+      a record stamped just before a concurrent one in another process is
+      never overtaken by it
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._file = None
+        self._path = None
+        self._opened_at = 0.0
+        self._dirty = False
+        self._fsync_thread = None
+        self._pid = None
+
+    # --- configuration ---
+
+    @property
+    def config(self) -> dict:
+        return getattr(settings, 'ALERT_SPOOL', {})
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.config.get('ENABLED', False))
+
+    @property
+    def directory(self) -> str:
+        return str(self.config.get('DIR') or os.path.join(settings.BASE_DIR, 'spool', 'alerts'))
+
+    # --- writer ---
+
+    def append(self, payload_json: str) -> None:
+        """Append one raw JSON payload (json.dumps output never contains a raw newline)."""
+        payload = payload_json.replace('\n', ' ').encode('utf-8')
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked worker: never share the parent's segment
+                self._file = None
+                self._fsync_thread = None
+                self._pid = os.getpid()
+            if self._file is not None and self._should_rotate():
+                self._seal_current()
+            if self._file is None:
+                self._open_segment()
+            self._file.write(b'%d %s\n' % (time.time_ns(), payload))
+            self._file.flush()
+            self._dirty = True
+        self._ensure_fsync_thread()
+
+    def close(self) -> None:
+        """Seal the current segment, e.g. on shutdown."""
+        with self._lock:
+            if self._file is not None:
+                self._seal_current()
+
+    def _should_rotate(self) -> bool:
+        max_bytes = int(self.config.get('SEGMENT_MAX_BYTES', 16 * 1024 * 1024))
+        max_age = float(self.config.get('SEGMENT_MAX_AGE_SECONDS', 60))
+        return self._file.tell() >= max_bytes or time.monotonic() - self._opened_at >= max_age
+
+    def _open_segment(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self._path = os.path.join(self.directory, f"{time.time_ns():020d}-{os.getpid()}{OPEN_SUFFIX}")
+        self._file = open(self._path, 'ab')
+        self._opened_at = time.monotonic()
+
+    def _seal_current(self) -> None:
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.rename(self._path, self._path[:-len(OPEN_SUFFIX)] + SEALED_SUFFIX)
+        except OSError as e:
+            logger.error(f"AlertSpool: Failed to seal segment {self._path}: {e}", exc_info=True)
+        finally:
+            self._file = None
+            self._path = None
+            self._dirty = False
+
+    def _ensure_fsync_thread(self) -> None:
+        if self._fsync_thread is not None and self._fsync_thread.is_alive():
+            return
+        with self._lock:
+            if self._fsync_thread is None or not self._fsync_thread.is_alive():
+                self._fsync_thread = threading.Thread(target=self._fsync_loop, name='alert-spool-fsync', daemon=True)
+                self._fsync_thread.start()
+
+    def _fsync_loop(self) -> None:
+        interval = float(self.config.get('FSYNC_INTERVAL_SECONDS', 0.05))
+        ticker = threading.Event()
+        while not ticker.wait(interval):
+            with self._lock:
+                if self._file is None:
+                    # Segment sealed; the next append starts a new thread
+                    self._fsync_thread = None
+                    return
+                if not self._dirty:
+                    continue
+                try:
+                    os.fsync(self._file.fileno())
+                    self._dirty = False
+                except OSError as e:
+                    logger.error(f"AlertSpool: fsync failed for {self._path}: {e}")
+
+    # --- reader (used by the drainer) ---
+
+    def segments(self) -> List[str]:
+        """All segment paths, oldest first."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return [
+            os.path.join(self.directory, name)
+            for name in sorted(names)
+            if name.endswith(OPEN_SUFFIX) or name.endswith(SEALED_SUFFIX)
+        ]
+
+    def _offset_path(self, segment: str) -> str:
+        # Keyed by the segment's base name so the offset survives the '.open' -> '.seg' rename
+        return os.path.splitext(segment)[0] + OFFSET_SUFFIX
+
+    def read_offset(self, segment: str) -> int:
+        try:
+            with open(self._offset_path(segment)) as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def write_offset(self, segment: str, offset: int) -> None:
+        offset_path = self._offset_path(segment)
+        tmp_path = f"{offset_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(str(offset))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, offset_path)
+
+    def read_records(self, segment: str, offset: int, limit: int) -> Tuple[List[str], int]:
+        """
+        Read up to `limit` complete records starting at byte `offset`.
+        Returns (records, new_offset); a trailing partial line is left for later.
+        """
+        entries = self.read_entries(segment, offset, limit)
+        return [payload for _, payload, _ in entries], (entries[-1][2] if entries else offset)
+
+    def read_entries(self, segment: str, offset: int, limit: int) -> List[Tuple[int, str, int]]:
+        """
+        Read up to `limit` complete records starting at byte `offset` as
+        (received_ns, payload, offset after the record) tuples.
+        """
+        entries = []
+        try:
+            f = open(segment, 'rb')
+        except FileNotFoundError:
+            if not segment.endswith(OPEN_SUFFIX):
+                return entries
+            try:
+                # Sealed (renamed) meanwhile; same content under its '.seg' name
+                f = open(segment[:-len(OPEN_SUFFIX)] + SEALED_SUFFIX, 'rb')
+            except FileNotFoundError:
+                return entries
+        # Records written before receive stamps existed take the segment's creation time
+        created = os.path.basename(segment).split('-', 1)[0]
+        segment_ns = int(created) if created.isdigit() else 0
+        with f:
+            f.seek(offset)
+            while len(entries) < limit:
+                line = f.readline()
+                if not line or not line.endswith(b'\n'):
+                    break
+                offset += len(line)
+                line = line.decode('utf-8').rstrip('\n')
+                if not line.strip():
+                    continue
+                stamp, _, payload = line.partition(' ')
+                if stamp.isdigit():
+                    entries.append((int(stamp), payload, offset))
+                else:
+                    entries.append((segment_ns, line, offset))
+        return entries
+
+    def remove_segment(self, segment: str) -> None:
+        for path in (segment, self._offset_path(segment)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def is_finished(self, segment: str, offset: int, stale_after: Optional[float] = None) -> bool:
+        """
+        A segment can be removed once fully shipped and sealed, or fully shipped
+        and left '.open' by a writer that has been idle longer than `stale_after`.
+        """
+        try:
+            stat = os.stat(segment)
+        except FileNotFoundError:
+            return False
+        if offset < stat.st_size:
+            return False
+        if segment.endswith(SEALED_SUFFIX):
+            return True
+        if stale_after is None:
+            stale_after = float(self.config.get('SEGMENT_MAX_AGE_SECONDS', 60)) * 5
+        return time.time() - stat.st_mtime > stale_after
+
+
+# Global instance (one per web process)
+alert_spool = AlertSpool()
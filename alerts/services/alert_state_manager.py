@@ -1,13 +1,16 @@
 # alerts/services/alert_state_manager.py
 from django.utils import timezone
-from django.db import transaction
-from typing import Tuple, Optional
+from django.db import transaction, IntegrityError
+from typing import List, Tuple, Optional
+from collections import defaultdict
 import logging
-from django.db.models import F
+from django.db.models import F, OuterRef, Q, Subquery
 import json # Keep import if used elsewhere, e.g. logging
 import pytz # Keep import if used elsewhere
 
 from ..models import AlertGroup, AlertInstance
+from .label_index import sync_alert_labels
+from dashboard.services.rollups import record_new_groups, record_status_changes
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +77,7 @@ def update_alert_state(parsed_alert_data: dict) -> Tuple[Optional[AlertGroup], O
                      fields_to_update.append('total_firing_count') # Add total_firing_count to update fields
 
                 alert_group.save(update_fields=fields_to_update)
+                record_status_changes([(alert_group, original_status, status)])
             else:
                 # total_firing_count defaults to 1, which is correct.
                 pass
@@ -136,6 +140,9 @@ def update_alert_state(parsed_alert_data: dict) -> Tuple[Optional[AlertGroup], O
                      logger.warning(f"Duplicate resolved event detected for AlertGroup {alert_group.id} starting at {starts_at}. Skipping.")
 
 
+            if alert_instance is not None or status == 'firing':
+                refresh_instance_pointers([alert_group])
+
             return alert_group, alert_instance
 
     except Exception as e:
@@ -230,4 +237,314 @@ def _create_resolved_instance(alert_group, starts_at, ends_at, annotations, gene
         annotations=annotations,
         generator_url=generator_url,
         resolution_type=resolution_type
-    )
\ No newline at end of file
+    )
+
+def refresh_instance_pointers(alert_groups: List[AlertGroup]) -> int:
+    """
+    Recompute the denormalized instance fields of the given groups with one
+    UPDATE (indexed subqueries per group), then mirror the result on the
+    in-memory objects so signal receivers see current values:
+    active_instance/latest_instance and first_instance_start,
+    current_problem_start (earliest firing instance) and latest_instance_start.
+
+    Returns:
+        Number of AlertGroup rows updated
+    """
+    groups_by_id = {group.id: group for group in alert_groups}
+    if not groups_by_id:
+        return 0
+
+    instances = AlertInstance.objects.filter(alert_group=OuterRef('pk'))
+    newest = instances.order_by('-started_at', '-id')
+    oldest = instances.order_by('started_at', 'id')
+    updated = AlertGroup.objects.filter(pk__in=groups_by_id.keys()).update(
+        active_instance=Subquery(newest.filter(status='firing', ended_at__isnull=True).values('pk')[:1]),
+        latest_instance=Subquery(newest.values('pk')[:1]),
+        latest_instance_start=Subquery(newest.values('started_at')[:1]),
+        first_instance_start=Subquery(oldest.values('started_at')[:1]),
+        current_problem_start=Subquery(oldest.filter(status='firing').values('started_at')[:1]),
+    )
+    fields = [
+        'active_instance_id', 'latest_instance_id',
+        'first_instance_start', 'current_problem_start', 'latest_instance_start',
+    ]
+    for row in AlertGroup.objects.filter(pk__in=groups_by_id.keys()).values('pk', *fields):
+        alert_group = groups_by_id[row['pk']]
+        for field in fields:
+            setattr(alert_group, field, row[field])
+    return updated
+
+
+def touch_alert_groups(parsed_alerts: List[dict]) -> int:
+    """
+    Cheap path for repeat notifications that cannot change any state:
+    bump last_occurrence for their groups in a single UPDATE.
+
+    Returns:
+        Number of AlertGroup rows updated
+    """
+    fingerprints = {alert['fingerprint'] for alert in parsed_alerts if alert.get('fingerprint')}
+    if not fingerprints:
+        return 0
+    updated = AlertGroup.objects.filter(fingerprint__in=fingerprints).update(last_occurrence=timezone.now())
+    logger.info(f"Touched last_occurrence for {updated} AlertGroup(s) from {len(parsed_alerts)} repeat notification(s).")
+    return updated
+
+
+# --- Batch Processing ---
+
+def update_alert_states(parsed_alerts: List[dict]) -> List[Tuple[Optional[AlertGroup], Optional[AlertInstance]]]:
+    """
+    Batch variant of update_alert_state for multi-alert payloads.
+
+    Loads all AlertGroups for the payload's fingerprints in one query and all
+    relevant AlertInstances (open firing instances plus any instance sharing a
+    start time with the payload) in a second query. Each alert is then applied
+    in payload order against that in-memory state, using exactly the same
+    rules as update_alert_state, and the changes are written back with
+    bulk_create/bulk_update.
+
+    Args:
+        parsed_alerts: List of standardized alert dicts from payload_parser
+
+    Returns:
+        List of (AlertGroup, AlertInstance) tuples aligned with parsed_alerts.
+        The instance is None when the alert was a duplicate and nothing changed.
+    """
+    if not parsed_alerts:
+        return []
+
+    try:
+        with transaction.atomic():
+            now = timezone.now()
+            fingerprints = {alert['fingerprint'] for alert in parsed_alerts}
+            start_times = {alert['starts_at'] for alert in parsed_alerts}
+
+            groups_by_fp = {
+                group.fingerprint: group
+                for group in AlertGroup.objects.filter(fingerprint__in=fingerprints)
+            }
+            new_groups = _create_missing_groups(parsed_alerts, groups_by_fp, now)
+
+            instances_by_group = defaultdict(list)
+            existing_groups = {g.id: g for fp, g in groups_by_fp.items() if fp not in new_groups}
+            if existing_groups:
+                relevant_instances = AlertInstance.objects.filter(
+                    alert_group_id__in=existing_groups.keys()
+                ).filter(
+                    Q(status='firing', ended_at__isnull=True) | Q(started_at__in=start_times)
+                )
+                for instance in relevant_instances:
+                    instance.alert_group = existing_groups[instance.alert_group_id]
+                    instances_by_group[instance.alert_group_id].append(instance)
+
+            firing_increments = defaultdict(int)
+            status_changes = []
+            touched_group_ids = set()
+            instances_to_create = []
+            instances_to_update = {}
+            results = []
+
+            for alert in parsed_alerts:
+                fingerprint = alert['fingerprint']
+                status = alert['status']
+                starts_at = alert['starts_at']
+                ends_at = alert['ends_at']
+                alert_group = groups_by_fp[fingerprint]
+                group_instances = instances_by_group[alert_group.id]
+
+                if fingerprint in new_groups and alert_group.id not in touched_group_ids:
+                    # First event for a freshly created group: get_or_create semantics,
+                    # the group was already created with this alert's status.
+                    touched_group_ids.add(alert_group.id)
+                else:
+                    if status == 'firing' and alert_group.current_status != 'firing':
+                        firing_increments[alert_group.id] += 1
+                    status_changes.append((alert_group, alert_group.current_status, status))
+                    alert_group.current_status = status
+                    alert_group.last_occurrence = now
+                    alert_group.source = alert.get('source')
+                    touched_group_ids.add(alert_group.id)
+
+                alert_instance = None
+                if status == 'firing':
+                    previous_firing = [
+                        inst for inst in group_instances
+                        if inst.status == 'firing' and inst.ended_at is None and inst.started_at != starts_at
+                    ]
+                    for inst in previous_firing:
+                        inst.status = 'resolved'
+                        inst.resolution_type = 'inferred'
+                        if inst.pk:
+                            instances_to_update[inst.pk] = inst
+                    if previous_firing:
+                        logger.info(f"Marked {len(previous_firing)} previous firing instance(s) as 'resolved' (inferred, ended_at=NULL) for AlertGroup {alert_group.id} (FP: {fingerprint}) due to new firing event starting at {starts_at}.")
+
+                    is_duplicate = any(
+                        inst.status == 'firing' and inst.started_at == starts_at
+                        for inst in group_instances
+                    )
+                    if not is_duplicate:
+                        logger.info(f"Creating new 'firing' instance for AlertGroup {alert_group.id} (FP: {fingerprint}) starting at {starts_at}")
+                        alert_instance = AlertInstance(
+                            alert_group=alert_group,
+                            status='firing',
+                            started_at=starts_at,
+                            annotations=alert['annotations'],
+                            generator_url=alert['generator_url'],
+                            ended_at=None,
+                            resolution_type=None,
+                        )
+                        group_instances.append(alert_instance)
+                        instances_to_create.append(alert_instance)
+                    else:
+                        logger.warning(f"Duplicate firing event detected for AlertGroup {alert_group.id} (FP: {fingerprint}) starting at {starts_at}. Skipping instance creation.")
+
+                else:  # resolved
+                    is_duplicate = any(
+                        inst.status == 'resolved' and inst.started_at == starts_at and inst.ended_at == ends_at
+                        for inst in group_instances
+                    )
+                    if not is_duplicate:
+                        open_firing = [
+                            inst for inst in group_instances
+                            if inst.status == 'firing' and inst.ended_at is None
+                        ]
+                        matching_firing = next(
+                            (inst for inst in open_firing if inst.started_at == starts_at), None
+                        )
+                        if matching_firing:
+                            alert_instance = _resolve_in_memory(matching_firing, ends_at, 'normal', instances_to_update)
+                        elif open_firing:
+                            latest_open = max(open_firing, key=lambda inst: inst.started_at)
+                            logger.warning(f"Received resolved event for AlertGroup {alert_group.id} (FP: {fingerprint}) starting at {starts_at}, but no exact firing match found. Marking latest open instance ({latest_open.id}) as 'resolved' (inferred, ended_at=NULL).")
+                            alert_instance = _resolve_in_memory(latest_open, None, 'inferred', instances_to_update)
+                        else:
+                            logger.warning(f"Received resolved event for AlertGroup {alert_group.id} (FP: {fingerprint}) starting at {starts_at}, but no matching or open firing instance found. Creating resolved instance directly.")
+                            alert_instance = AlertInstance(
+                                alert_group=alert_group,
+                                status='resolved',
+                                started_at=starts_at,
+                                ended_at=ends_at or starts_at,
+                                annotations=alert['annotations'],
+                                generator_url=alert['generator_url'],
+                                resolution_type='normal',
+                            )
+                            group_instances.append(alert_instance)
+                            instances_to_create.append(alert_instance)
+                    else:
+                        logger.warning(f"Duplicate resolved event detected for AlertGroup {alert_group.id} starting at {starts_at}. Skipping.")
+
+                results.append((alert_group, alert_instance))
+
+            _write_group_changes(groups_by_fp, touched_group_ids, firing_increments)
+            if instances_to_create:
+                AlertInstance.objects.bulk_create(instances_to_create)
+            if instances_to_update:
+                AlertInstance.objects.bulk_update(
+                    instances_to_update.values(), ['status', 'ended_at', 'resolution_type']
+                )
+            refresh_instance_pointers([g for g in groups_by_fp.values() if g.id in touched_group_ids])
+            record_status_changes(status_changes)
+
+            logger.info(
+                f"Batch state update applied {len(parsed_alerts)} alert(s) across {len(touched_group_ids)} group(s): "
+                f"{len(new_groups)} new group(s), {len(instances_to_create)} instance(s) created, "
+                f"{len(instances_to_update)} instance(s) updated."
+            )
+            return results
+
+    except Exception as e:
+        logger.error(f"Error processing batch alert update for {len(parsed_alerts)} alert(s): {e}", exc_info=True)
+        raise e
+
+
+def _create_missing_groups(parsed_alerts, groups_by_fp, now):
+    """
+    Bulk-create AlertGroups for fingerprints not yet in the database.
+    Defaults are taken from the first alert seen for each fingerprint, as
+    get_or_create would. Falls back to get_or_create if another worker
+    created one of the groups concurrently.
+    Returns the set of fingerprints whose groups were created here.
+    """
+    pending = {}
+    for alert in parsed_alerts:
+        fingerprint = alert['fingerprint']
+        if fingerprint in groups_by_fp or fingerprint in pending:
+            continue
+        labels = alert['labels']
+        pending[fingerprint] = AlertGroup(
+            fingerprint=fingerprint,
+            name=labels.get('alertname', 'Unknown Alert'),
+            labels=labels,
+            severity=labels.get('severity', 'warning'),
+            current_status=alert['status'],
+            instance=labels.get('instance'),
+            source=alert.get('source'),
+            first_occurrence=now,
+            last_occurrence=now,
+        )
+
+    if not pending:
+        return set()
+
+    try:
+        with transaction.atomic():
+            AlertGroup.objects.bulk_create(pending.values())
+        # bulk_create skips post_save, which indexes the labels and counts single creates
+        sync_alert_labels(pending.values(), replace=False)
+        record_new_groups(pending.values())
+        groups_by_fp.update(pending)
+        return set(pending)
+    except IntegrityError:
+        logger.warning(f"Concurrent AlertGroup creation detected for a batch of {len(pending)} fingerprint(s). Falling back to get_or_create.")
+
+    created_fingerprints = set()
+    for fingerprint, group in pending.items():
+        defaults = {field: getattr(group, field) for field in (
+            'name', 'labels', 'severity', 'current_status', 'instance',
+            'source', 'first_occurrence', 'last_occurrence',
+        )}
+        alert_group, created = AlertGroup.objects.get_or_create(fingerprint=fingerprint, defaults=defaults)
+        groups_by_fp[fingerprint] = alert_group
+        if created:
+            created_fingerprints.add(fingerprint)
+    return created_fingerprints
+
+
+def _resolve_in_memory(instance, end_time, resolution_type, instances_to_update):
+    """In-memory counterpart of _update_to_resolved; the write happens in bulk later."""
+    instance.status = 'resolved'
+    if end_time is not None:
+        instance.ended_at = end_time
+    instance.resolution_type = resolution_type
+    if instance.pk:
+        instances_to_update[instance.pk] = instance
+    end_time_str = f"at {end_time}" if end_time else "(ended_at=NULL)"
+    logger.info(f"Updated instance {instance.id} to 'resolved' (Type: {resolution_type}) {end_time_str} for AlertGroup {instance.alert_group_id} (FP: {instance.alert_group.fingerprint})")
+    return instance
+
+
+def _write_group_changes(groups_by_fp, touched_group_ids, firing_increments):
+    """
+    Write status/occurrence/source changes for all touched groups in one bulk_update.
+    total_firing_count is incremented with F() so concurrent workers don't clobber each other.
+    """
+    groups_to_update = [g for g in groups_by_fp.values() if g.id in touched_group_ids]
+    if not groups_to_update:
+        return
+
+    update_fields = ['current_status', 'last_occurrence', 'source']
+    loaded_counts = {}
+    if firing_increments:
+        update_fields.append('total_firing_count')
+        for alert_group in groups_to_update:
+            loaded_counts[alert_group.id] = alert_group.total_firing_count
+            alert_group.total_firing_count = F('total_firing_count') + firing_increments.get(alert_group.id, 0)
+
+    AlertGroup.objects.bulk_update(groups_to_update, update_fields)
+
+    # Keep the in-memory objects usable by signal receivers without re-fetching them
+    for alert_group in groups_to_update:
+        if alert_group.id in loaded_counts:
+            alert_group.total_firing_count = loaded_counts[alert_group.id] + firing_increments.get(alert_group.id, 0)
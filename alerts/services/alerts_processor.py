@@ -3,6 +3,9 @@ from django.db import transaction
 import logging
 
 from ..models import AlertGroup, AlertInstance, AlertAcknowledgementHistory, AlertComment
+from .alert_deduplicator import alert_deduplicator
+from dashboard.services.rollups import record_status_changes
+from core.services import read_cache
 
 logger = logging.getLogger(__name__)
 
@@ -54,12 +57,22 @@ def manually_resolve_alert(alert_group, user, resolved_at, note=None):
             instance.resolution_type = 'manual'
             instance.save(update_fields=['status', 'ended_at', 'resolution_type'])
 
+        previous_status = alert_group.current_status
         AlertGroup.objects.filter(pk=alert_group.pk).update(
             current_status='resolved',
             last_occurrence=resolved_at,
+            active_instance=None,
+            current_problem_start=None,
         )
         alert_group.current_status = 'resolved'
         alert_group.last_occurrence = resolved_at
+        alert_group.active_instance = None
+        alert_group.current_problem_start = None
+        record_status_changes([(alert_group, previous_status, 'resolved')])
+
+        # A resend of the firing event must be processed again after a manual resolve
+        transaction.on_commit(lambda: alert_deduplicator.forget([alert_group.fingerprint]))
+        read_cache.invalidate()
 
         if note:
             AlertComment.objects.create(
@@ -79,9 +92,29 @@ def manually_resolve_alert(alert_group, user, resolved_at, note=None):
         return primary_instance
 
 def get_active_firing_instance(alert_group):
-    """Get the active firing instance for an alert group."""
+    """
+    Get the active firing instance for an alert group.
+    Uses the denormalized active_instance pointer and falls back to the
+    (partially indexed) query when the pointer is empty or stale.
+    """
+    if alert_group.active_instance_id:
+        instance = alert_group.active_instance
+        if instance is not None and instance.status == 'firing' and instance.ended_at is None:
+            return instance
     return AlertInstance.objects.filter(
         alert_group=alert_group,
         status='firing',
         ended_at__isnull=True
-    ).first()
+    ).order_by('-started_at').first()
+
+
+def get_latest_instance(alert_group):
+    """
+    Get the instance with the most recent start time for an alert group.
+    Uses the denormalized latest_instance pointer when it is set.
+    """
+    if alert_group.latest_instance_id:
+        instance = alert_group.latest_instance
+        if instance is not None:
+            return instance
+    return alert_group.instances.order_by('-started_at').first()
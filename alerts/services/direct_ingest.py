@@ -0,0 +1,146 @@
+# alerts/services/direct_ingest.py
+import logging
+import os
+import threading
+import multiprocessing
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import List
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class IngestPoolFull(Exception):
+    """Raised when the direct-ingest pool has no free slot within the wait time."""
+    pass
+
+
+def _init_process_worker():
+    """Initializer for spawned worker processes: set up Django before any ORM use."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sentryHub.settings')
+    import django
+    django.setup()
+
+
+def _ingest_payload(payload_json: str):
+    """Runs parse -> state update -> alert_processed for one payload in the calling worker."""
+    from alerts.tasks import process_alert_payload_task
+    close_old_connections()
+    try:
+        return process_alert_payload_task(payload_json)
+    finally:
+        close_old_connections()
+
+
+def _ingest_payload_batch(payload_jsons: List[str]):
+    """Same as _ingest_payload for a batch of payloads applied in one transaction."""
+    from alerts.tasks import process_alert_payload_batch_task
+    close_old_connections()
+    try:
+        return process_alert_payload_batch_task(payload_jsons)
+    finally:
+        close_old_connections()
+
+
+class DirectIngestPool:
+    """
+    Bounded local worker pool that applies alert payloads without the Celery hop.
+
+    Payloads are processed in-process by calling the task functions directly,
+    so parsing, state updates and the 'alert_processed' signal run here while
+    notification fan-out (Jira, Slack, SMS) is still queued to Celery by the
+    signal handlers on commit.
+
+    Settings (ALERT_INGEST):
+    - MODE: 'celery' (default) or 'direct'
+    - WORKER_TYPE: 'thread' or 'process'
+    - WORKERS: pool size
+    - MAX_PENDING: max payloads queued or running; submit() waits for a slot
+    - SUBMIT_TIMEOUT_SECONDS: how long a blocking submit() waits before raising IngestPoolFull
+    - RESULT_TIMEOUT_SECONDS: how long the webhook waits for a payload to commit
+
+    Callers that must not stall (the webhook request threads and the RabbitMQ
+    connection thread) submit with block=False and push back instead.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    @property
+    def config(self) -> dict:
+        return getattr(settings, 'ALERT_INGEST', {})
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.get('MODE', 'celery') == 'direct'
+
+    @property
+    def result_timeout(self) -> float:
+        return float(self.config.get('RESULT_TIMEOUT_SECONDS', 30))
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                workers = int(self.config.get('WORKERS', 4))
+                max_pending = self.max_pending
+                if self.config.get('WORKER_TYPE', 'thread') == 'process':
+                    # 'spawn' so children never share the parent's DB connections
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=workers,
+                        mp_context=multiprocessing.get_context('spawn'),
+                        initializer=_init_process_worker,
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='alert-ingest')
+                self._slots = threading.BoundedSemaphore(max_pending)
+                logger.info(f"DirectIngestPool: Started {workers} {self.config.get('WORKER_TYPE', 'thread')} worker(s), max pending {max_pending}.")
+            return self._executor
+
+    @property
+    def max_pending(self) -> int:
+        workers = int(self.config.get('WORKERS', 4))
+        return max(int(self.config.get('MAX_PENDING', workers * 4)), workers)
+
+    def submit(self, payload_json: str, block: bool = True) -> Future:
+        """
+        Queue one raw JSON payload. Blocks up to SUBMIT_TIMEOUT_SECONDS while
+        the pool is full, or raises IngestPoolFull at once when block is False.
+        """
+        return self._submit(_ingest_payload, payload_json, block)
+
+    def submit_batch(self, payload_jsons: List[str], block: bool = True) -> Future:
+        """Queue a batch of raw JSON payloads as a single unit of work; see submit()."""
+        return self._submit(_ingest_payload_batch, payload_jsons, block)
+
+    def _submit(self, fn, arg, block: bool) -> Future:
+        executor = self._get_executor()
+        if block:
+            timeout = float(self.config.get('SUBMIT_TIMEOUT_SECONDS', 10))
+            acquired = self._slots.acquire(timeout=timeout)
+        else:
+            timeout = 0
+            acquired = self._slots.acquire(blocking=False)
+        if not acquired:
+            raise IngestPoolFull(f"No free direct-ingest slot after {timeout}s")
+        try:
+            future = executor.submit(fn, arg)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+                self._slots = None
+
+
+# Global instance (one per web or consumer process)
+direct_ingest_pool = DirectIngestPool()
@@ -0,0 +1,85 @@
+# alerts/services/enrichment.py
+"""
+Ingest pipeline stages that run after the state transaction commits.
+
+Ingestion is split in two:
+1. state commit: parse the payload and apply state changes (alerts.tasks),
+   the only work done while group rows are locked;
+2. enrichment: once committed, evaluate silences for all changed groups
+   against the silence index and then dispatch 'alert_processed'
+   for each event, so documentation linking and the Jira/Slack/SMS
+   handlers run outside the ingest transaction.
+
+Each stage's duration is exported as sentryhub_ingest_stage_seconds_total
+and sentryhub_ingest_stage_runs_total, labelled by stage.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from functools import partial
+from typing import List, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+from core.services.metrics import metrics_manager
+from ..models import AlertGroup, AlertInstance
+from ..signals import alert_processed
+from .silence_matcher import check_alert_silence
+
+logger = logging.getLogger(__name__)
+
+# (alert_group, alert_instance, status of this particular event)
+ProcessedEvent = Tuple[AlertGroup, AlertInstance, str]
+
+
+@contextmanager
+def ingest_stage(stage: str):
+    """Time a pipeline stage and record it in the metrics."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        logger.debug(f"Ingest stage '{stage}' took {elapsed * 1000:.1f} ms")
+        if settings.METRICS_ENABLED:
+            metrics_manager.inc_counter('sentryhub_ingest_stage_seconds_total', labels={'stage': stage}, value=elapsed)
+            metrics_manager.inc_counter('sentryhub_ingest_stage_runs_total', labels={'stage': stage})
+
+
+def enrich_after_commit(events: List[ProcessedEvent]) -> None:
+    """Schedule the enrichment stage for the events once the current transaction commits."""
+    if events:
+        transaction.on_commit(partial(run_enrichment, list(events)))
+
+
+def run_enrichment(events: List[ProcessedEvent]) -> None:
+    """
+    Run the enrichment stages for a committed payload. Failures are logged
+    per group or event and never undo the committed state.
+    """
+    with ingest_stage('silence'):
+        _apply_silences(events)
+
+    with ingest_stage('dispatch'):
+        for alert_group, alert_instance, status in events:
+            logger.info(f"Dispatching 'alert_processed' signal. AlertGroup ID: {alert_group.id} (FP: {alert_group.fingerprint}), Status: {status}")
+            try:
+                alert_processed.send(
+                    sender=alert_group.__class__,
+                    alert_group=alert_group,
+                    instance=alert_instance,
+                    status=status
+                )
+            except Exception as e:
+                logger.error(f"Enrichment of AlertGroup {alert_group.id} (FP: {alert_group.fingerprint}) failed: {e}", exc_info=True)
+
+
+def _apply_silences(events: List[ProcessedEvent]) -> None:
+    """Re-evaluate the silence status of every changed group against the silence index."""
+    groups = {id(alert_group): alert_group for alert_group, _, _ in events}
+    for alert_group in groups.values():
+        try:
+            check_alert_silence(alert_group)
+        except Exception as e:
+            logger.error(f"Error checking silence for AlertGroup {alert_group.id} (FP: {alert_group.fingerprint}): {e}", exc_info=True)
@@ -0,0 +1,68 @@
+# alerts/services/label_index.py
+import json
+import logging
+from typing import Dict, Iterable
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+from ..models import AlertGroup, AlertLabel
+
+logger = logging.getLogger(__name__)
+
+
+def label_value(value) -> str:
+    """
+    The string form a label value is indexed under. Alertmanager labels are
+    always strings; anything else (e.g. hand-made groups) is stored as JSON.
+    Values are truncated to the column length.
+    """
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True)
+    return value[:AlertLabel.VALUE_MAX_LENGTH]
+
+
+def sync_alert_labels(alert_groups: Iterable[AlertGroup], replace: bool = True) -> int:
+    """
+    Replace the indexed labels of the given groups with their current
+    AlertGroup.labels, in one DELETE and one bulk INSERT. Pass replace=False
+    for freshly created groups to skip the DELETE.
+
+    Returns:
+        Number of AlertLabel rows written
+    """
+    groups = [group for group in alert_groups if group.pk]
+    if not groups:
+        return 0
+
+    rows = [
+        AlertLabel(alert_group_id=group.pk, key=str(key)[:AlertLabel.KEY_MAX_LENGTH], value=label_value(value))
+        for group in groups
+        if isinstance(group.labels, dict)
+        for key, value in group.labels.items()
+    ]
+    if not replace:
+        AlertLabel.objects.bulk_create(rows)
+        return len(rows)
+    with transaction.atomic():
+        AlertLabel.objects.filter(alert_group_id__in=[group.pk for group in groups]).delete()
+        AlertLabel.objects.bulk_create(rows)
+    return len(rows)
+
+
+def filter_by_labels(queryset: QuerySet, matchers: Dict[str, object], lookup: str = 'exact') -> QuerySet:
+    """
+    Narrow an AlertGroup queryset to groups whose labels satisfy every
+    matcher, using the (key, value) index instead of scanning the labels JSON.
+
+    Args:
+        queryset: AlertGroup queryset to filter
+        matchers: label key -> value; all must match
+        lookup: Django lookup applied to the value, e.g. 'exact' or 'icontains'
+    """
+    for key, value in matchers.items():
+        matching_groups = AlertLabel.objects.filter(
+            key=key, **{f'value__{lookup}': label_value(value)}
+        ).values('alert_group_id')
+        queryset = queryset.filter(pk__in=matching_groups)
+    return queryset
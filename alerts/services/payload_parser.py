@@ -1,6 +1,48 @@
+import re
+import datetime
+from functools import lru_cache
 from dateutil.parser import parse as parse_datetime
 from typing import List, Dict, Any
 
+ZERO_TIMESTAMP = '0001-01-01T00:00:00Z'
+
+# The RFC3339 forms Alertmanager emits, e.g. 2025-04-07T13:00:00.123456789Z or ...+03:30
+_RFC3339_RE = re.compile(
+    r'^(\d{4})-(\d{2})-(\d{2})[Tt ](\d{2}):(\d{2}):(\d{2})'
+    r'(?:\.(\d+))?'
+    r'(?:([Zz])|([+-])(\d{2}):(\d{2}))$'
+)
+
+
+@lru_cache(maxsize=4096)
+def parse_timestamp(value):
+    """
+    Parse an Alertmanager timestamp into an aware datetime.
+
+    RFC3339 strings are parsed directly (fractions beyond microseconds are
+    truncated, as dateutil does); anything else falls back to dateutil.
+    Results are cached since resends repeat the same startsAt strings.
+    """
+    match = _RFC3339_RE.match(value) if isinstance(value, str) else None
+    if match is None:
+        return parse_datetime(value)
+
+    year, month, day, hour, minute, second, fraction, zulu, sign, off_h, off_m = match.groups()
+    microsecond = int(fraction[:6].ljust(6, '0')) if fraction else 0
+    if zulu:
+        tz = datetime.timezone.utc
+    else:
+        offset = datetime.timedelta(hours=int(off_h), minutes=int(off_m))
+        tz = datetime.timezone(-offset if sign == '-' else offset) if offset else datetime.timezone.utc
+    try:
+        return datetime.datetime(
+            int(year), int(month), int(day), int(hour), int(minute), int(second), microsecond, tzinfo=tz
+        )
+    except ValueError:
+        # Out-of-range fields (e.g. second 60); let dateutil decide
+        return parse_datetime(value)
+
+
 def parse_alertmanager_payload(payload: dict) -> List[Dict[str, Any]]:
     """
     Parse Alertmanager webhook payload into standardized alert data.
@@ -33,8 +75,9 @@ def parse_alertmanager_payload(payload: dict) -> List[Dict[str, Any]]:
         annotations = alert_data.get('annotations', {})
         
         # Parse timestamps
-        starts_at = parse_datetime(alert_data.get('startsAt'))
-        ends_at = parse_datetime(alert_data.get('endsAt')) if alert_data.get('endsAt') != '0001-01-01T00:00:00Z' else None
+        starts_at = parse_timestamp(alert_data.get('startsAt'))
+        ends_at_raw = alert_data.get('endsAt')
+        ends_at = parse_timestamp(ends_at_raw) if ends_at_raw != ZERO_TIMESTAMP else None
         
         generator_url = alert_data.get('generatorURL')
         
@@ -0,0 +1,95 @@
+# alerts/services/shard_router.py
+import json
+import logging
+import zlib
+from collections import OrderedDict
+from typing import Dict, List
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AlertShardRouter:
+    """
+    Routes alert payloads to fingerprint-sharded Celery queues.
+
+    Each payload is split per fingerprint and every alert is sent to queue
+    'alerts.<crc32(fingerprint) % SHARDS>'. With exactly one single-concurrency
+    worker per shard queue, all events of an AlertGroup are processed in
+    arrival order by one worker, and workers never compete for the same rows:
+
+        celery -A sentryHub worker -Q alerts.0 --concurrency 1
+        ...
+        celery -A sentryHub worker -Q alerts.<SHARDS-1> --concurrency 1
+
+    Settings (ALERT_SHARDING):
+    - ENABLED: route to shard queues instead of the shared 'alerts' queue
+    - SHARDS: number of shard queues
+    - QUEUE_PREFIX: queue name prefix (default 'alerts.')
+    """
+
+    @property
+    def config(self) -> dict:
+        return getattr(settings, 'ALERT_SHARDING', {})
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.config.get('ENABLED', False))
+
+    @property
+    def shards(self) -> int:
+        return max(1, int(self.config.get('SHARDS', 4)))
+
+    def shard_for(self, fingerprint) -> int:
+        """Stable shard index of a fingerprint (crc32, unlike hash(), is identical across processes)."""
+        return zlib.crc32(str(fingerprint or '').encode('utf-8')) % self.shards
+
+    def queue_for(self, shard: int) -> str:
+        return f"{self.config.get('QUEUE_PREFIX', 'alerts.')}{shard}"
+
+    def split_payload(self, payload: dict) -> Dict[int, dict]:
+        """
+        Split a payload into per-shard payloads that keep the envelope fields
+        (receiver, externalURL, ...) and the original order of their alerts.
+        """
+        alert_list = payload['alerts'] if 'alerts' in payload else [payload]
+        envelope = {key: value for key, value in payload.items() if key != 'alerts'} if 'alerts' in payload else {}
+
+        by_shard = OrderedDict()
+        for alert in alert_list:
+            by_shard.setdefault(self.shard_for(alert.get('fingerprint')), []).append(alert)
+        return OrderedDict((shard, {**envelope, 'alerts': alerts}) for shard, alerts in by_shard.items())
+
+    def dispatch(self, payload_json: str) -> List[str]:
+        """Queue one raw JSON payload as one task per shard. Returns the queues used."""
+        from alerts.tasks import process_alert_payload_task
+
+        queues = []
+        for shard, shard_payload in self.split_payload(json.loads(payload_json)).items():
+            queue = self.queue_for(shard)
+            process_alert_payload_task.apply_async(args=[json.dumps(shard_payload)], queue=queue)
+            queues.append(queue)
+        logger.debug(f"AlertShardRouter: Dispatched payload to {len(queues)} shard queue(s): {queues}")
+        return queues
+
+    def dispatch_batch(self, payload_jsons: List[str]) -> List[str]:
+        """Queue a batch of raw JSON payloads as one batch task per shard, keeping message order."""
+        from alerts.tasks import process_alert_payload_batch_task
+
+        by_shard = OrderedDict()
+        for payload_json in payload_jsons:
+            for shard, shard_payload in self.split_payload(json.loads(payload_json)).items():
+                by_shard.setdefault(shard, []).append(json.dumps(shard_payload))
+
+        queues = []
+        for shard, shard_payloads in by_shard.items():
+            queue = self.queue_for(shard)
+            process_alert_payload_batch_task.apply_async(args=[shard_payloads], queue=queue)
+            queues.append(queue)
+        logger.debug(f"AlertShardRouter: Dispatched batch of {len(payload_jsons)} payload(s) to {len(queues)} shard queue(s).")
+        return queues
+
+
+# Global instance
+alert_shard_router = AlertShardRouter()
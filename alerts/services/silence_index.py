@@ -0,0 +1,200 @@
+# alerts/services/silence_index.py
+"""
+In-memory index of current and upcoming SilenceRules for check_alert_silence.
+
+Rules are compiled once per version into:
+- an inverted index on (label key, value): each rule is filed under one of
+  its matchers, so an alert only verifies the rules filed under its own
+  labels plus the few that cannot be anchored (a matcher expecting None
+  also matches a missing label);
+- two time-ordered heaps of boundaries: pending rules by starts_at and
+  active rules by ends_at. Advancing the clock pops the boundaries that
+  passed, so activation and expiry need no rescan of the rules.
+
+The version pairs a counter in the Django cache, bumped from the
+SilenceRule post_save/post_delete signals (immediate when the cache is
+shared Redis), with the SilenceRule table's version from the database
+(core.services.table_version), probed at most every
+SILENCE_INDEX['VERSION_PROBE_SECONDS'], so silences created or edited in
+the web process reach the ingest workers with any cache backend.
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from core.services.table_version import table_version
+from ..models import SilenceRule
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'sentryhub:silence_index:version'
+
+
+def matchers_match(matchers: dict, labels: dict) -> bool:
+    """Exact matching: every matcher must be present in the labels with the same value."""
+    return all(labels.get(key) == value for key, value in matchers.items())
+
+
+def _hashable(value) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class SilenceIndex:
+    """
+    Rules that are active at, or become active after, the time the index was
+    built. advance(now) must be called with non-decreasing times.
+    """
+
+    def __init__(self, rules, now):
+        self.now = now
+        self.buckets = defaultdict(dict)  # (key, value) -> {rule id: rule}
+        self.unanchored = {}
+        self._active = {}
+        self._pending = []  # (starts_at, seq, rule)
+        self._expiring = []  # (ends_at, seq, rule id)
+        self._seq = itertools.count()
+
+        for rule in rules:
+            if not isinstance(rule.matchers, dict) or not rule.matchers:
+                logger.debug(f"Skipping rule {rule.id}: Invalid or empty matchers ({rule.matchers})")
+                continue
+            heapq.heappush(self._pending, (rule.starts_at, next(self._seq), rule))
+        self.advance(now)
+
+    @staticmethod
+    def _anchor(matchers: dict):
+        for key, value in matchers.items():
+            if value is not None and _hashable(value):
+                return key, value
+        return None
+
+    def _activate(self, rule) -> None:
+        anchor = self._anchor(rule.matchers)
+        (self.buckets[anchor] if anchor else self.unanchored)[rule.id] = rule
+        self._active[rule.id] = anchor
+        heapq.heappush(self._expiring, (rule.ends_at, next(self._seq), rule.id))
+
+    def _expire(self, rule_id) -> None:
+        anchor = self._active.pop(rule_id)
+        bucket = self.buckets[anchor] if anchor else self.unanchored
+        bucket.pop(rule_id, None)
+        if anchor and not bucket:
+            del self.buckets[anchor]
+
+    def advance(self, now) -> None:
+        """Apply every activation and expiry that happened up to `now`."""
+        while self._pending and self._pending[0][0] <= now:
+            _, _, rule = heapq.heappop(self._pending)
+            if rule.ends_at > now:
+                self._activate(rule)
+        while self._expiring and self._expiring[0][0] <= now:
+            _, _, rule_id = heapq.heappop(self._expiring)
+            self._expire(rule_id)
+        self.now = now
+
+    def next_transition(self):
+        """The next instant a rule starts or ends, or None."""
+        instants = [heap[0][0] for heap in (self._pending, self._expiring) if heap]
+        return min(instants) if instants else None
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active)
+
+    def matching_rules(self, labels: dict) -> List[SilenceRule]:
+        """Active rules whose matchers all match the labels."""
+        candidates = list(self.unanchored.values())
+        for key, value in (labels or {}).items():
+            if _hashable(value):
+                candidates.extend(self.buckets.get((key, value), {}).values())
+        return [rule for rule in candidates if matchers_match(rule.matchers, labels or {})]
+
+
+class SilenceIndexRegistry:
+    """Per-process silence index, rebuilt when the shared version changes."""
+
+    def __init__(self):
+        self._index = None
+        self._version = None
+        self._probe = None
+        self._lock = threading.Lock()
+
+    @property
+    def probe_interval(self) -> float:
+        return float(getattr(settings, 'SILENCE_INDEX', {}).get('VERSION_PROBE_SECONDS', 2))
+
+    def version(self) -> tuple:
+        """(shared cache version, SilenceRule table version)."""
+        try:
+            shared = cache.get(VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Silence index version unavailable: {e}")
+            shared = None
+        probe = self._probe
+        if probe is None or time.monotonic() - probe[0] >= self.probe_interval:
+            probe = (time.monotonic(), table_version(SilenceRule.objects.all()))
+            self._probe = probe
+        return (shared, probe[1])
+
+    def _load_rules(self, now) -> List[SilenceRule]:
+        return list(SilenceRule.objects.filter(ends_at__gt=now))
+
+    def _current(self, now) -> SilenceIndex:
+        """The index advanced to `now`; caller holds the lock."""
+        version = self.version()
+        index = self._index
+        if index is None or version != self._version or now < index.now:
+            index = SilenceIndex(self._load_rules(now), now)
+            self._index, self._version = index, version
+            logger.debug(f"Compiled silence index with {index.active_count} active rule(s) (version {version}).")
+        else:
+            index.advance(now)
+        return index
+
+    def matching_rules(self, labels: dict, now=None) -> List[SilenceRule]:
+        now = now or timezone.now()
+        with self._lock:
+            return self._current(now).matching_rules(labels)
+
+    def next_transition(self, now=None):
+        now = now or timezone.now()
+        with self._lock:
+            return self._current(now).next_transition()
+
+    def invalidate(self) -> None:
+        """Drop this process' index and bump the shared version now and again on commit."""
+        self._bump()
+        connection = transaction.get_connection()
+        if connection.in_atomic_block:
+            connection.on_commit(self._bump)
+
+    def _bump(self) -> None:
+        self._index = None
+        self._probe = None
+        try:
+            try:
+                cache.incr(VERSION_KEY)
+            except ValueError:
+                cache.add(VERSION_KEY, time.time_ns() // 1000, timeout=None)
+        except Exception as e:
+            logger.warning(f"Failed to bump silence index version: {e}")
+
+    def clear(self) -> None:
+        self._index = None
+        self._probe = None
+
+
+silence_index_registry = SilenceIndexRegistry()
@@ -1,87 +1,146 @@
+from typing import Callable, Optional
 from django.utils import timezone
+from core.services import read_cache
 from ..models import SilenceRule, AlertGroup
+from .label_index import filter_by_labels
+from .silence_index import matchers_match, silence_index_registry
 import logging
 
 logger = logging.getLogger(__name__)
 
-def check_alert_silence(alert_group: AlertGroup):
+def get_active_silence_rules(now=None):
+    """All SilenceRules active at `now`, loaded once for checking many alerts."""
+    now = now or timezone.now()
+    return list(SilenceRule.objects.filter(starts_at__lte=now, ends_at__gt=now))
+
+
+def check_alert_silence(alert_group: AlertGroup, active_rules=None):
     """
     Checks if an AlertGroup matches any active SilenceRule based on exact label matching.
     Updates the alert_group's is_silenced status and silenced_until.
 
     Args:
         alert_group: The AlertGroup instance to check.
+        active_rules: Explicit rules to check against, e.g. a result of
+            get_active_silence_rules(); the silence index is used when omitted.
 
     Returns:
         bool: True if the alert is currently silenced, False otherwise.
     """
-    now = timezone.now()
-    alert_labels = alert_group.labels
-
-    # Find potentially matching active rules
-    # Optimization: Filter rules that could possibly match based on keys present in alert_labels
-    # This might be complex to implement efficiently with JSONField lookups across different DBs.
-    # For now, fetch all active rules and filter in Python.
-    active_rules = SilenceRule.objects.filter(starts_at__lte=now, ends_at__gt=now)
-
-    matching_rule = None
-    latest_end_time = None
-
-    for rule in active_rules:
-        rule_matchers = rule.matchers
-        is_match = True
-
-        # Ensure rule_matchers is a dictionary before proceeding
-        if not isinstance(rule_matchers, dict) or not rule_matchers:
-            logger.debug(f"Skipping rule {rule.id}: Invalid or empty matchers ({rule_matchers})")
-            continue
-
-        # Exact match logic: all rule matchers must exist and match in alert labels
-        for key, value in rule_matchers.items():
-            if alert_labels.get(key) != value:
-                is_match = False
-                break  # This rule doesn't match
-
-        if is_match:
-            # Found a matching active rule
-            logger.debug(f"AlertGroup {alert_group.id} matched rule {rule.id}")
-            matching_rule = rule # Keep track of the last matching rule (or first, depending on desired logic)
-            if latest_end_time is None or rule.ends_at > latest_end_time:
-                latest_end_time = rule.ends_at
-            # Continue checking other rules to find the one with the latest end time
-
-    # Update AlertGroup based on match results
-    was_silenced = alert_group.is_silenced
-    is_now_silenced = matching_rule is not None
+    matching_rule, latest_end_time = evaluate_silence(alert_group.labels or {}, active_rules)
+    updated_fields = apply_silence(alert_group, matching_rule, latest_end_time)
+    if updated_fields:
+        alert_group.save(update_fields=updated_fields)
+    return matching_rule is not None
+
+
+def evaluate_silence(alert_labels: dict, active_rules=None):
+    """
+    Find the active rules matching the labels.
+
+    Returns:
+        (rule, ends_at) of the matching rule that ends last, or (None, None)
+    """
+    if active_rules is None:
+        # Only the rules indexed under the alert's labels are verified
+        matching_rules = silence_index_registry.matching_rules(alert_labels)
+    else:
+        matching_rules = [
+            rule for rule in active_rules
+            if isinstance(rule.matchers, dict) and rule.matchers and matchers_match(rule.matchers, alert_labels)
+        ]
+
+    # The rule ending last determines silenced_until
+    matching_rule = max(matching_rules, key=lambda rule: rule.ends_at, default=None)
+    if matching_rule is None:
+        return None, None
+    logger.debug(f"Labels {alert_labels} matched rule(s) {[rule.id for rule in matching_rules]}")
+    return matching_rule, matching_rule.ends_at
 
-    updated_fields = []
-    needs_save = False
 
-    if is_now_silenced:
+def apply_silence(alert_group: AlertGroup, matching_rule, latest_end_time) -> list:
+    """
+    Set is_silenced/silenced_until from an evaluate_silence() result without saving.
+
+    Returns:
+        The changed field names; empty when the group is unchanged.
+    """
+    was_silenced = alert_group.is_silenced
+
+    if matching_rule is not None:
         if not was_silenced or alert_group.silenced_until != latest_end_time:
             alert_group.is_silenced = True
             alert_group.silenced_until = latest_end_time
-            updated_fields.extend(['is_silenced', 'silenced_until'])
-            needs_save = True
             logger.info(f"AlertGroup {alert_group.id} ({alert_group.name}) is now SILENCED until {latest_end_time} by rule {matching_rule.id}")
+            return ['is_silenced', 'silenced_until']
         # else: Alert was already silenced, and the end time hasn't changed, no update needed.
-        
-        # Return True as it is currently silenced
-        if needs_save:
-            alert_group.save(update_fields=updated_fields)
-        return True
+        return []
 
-    else:
-        # No active rule matched
-        if was_silenced:
-            alert_group.is_silenced = False
-            alert_group.silenced_until = None
-            updated_fields.extend(['is_silenced', 'silenced_until'])
-            needs_save = True
-            logger.info(f"AlertGroup {alert_group.id} ({alert_group.name}) is no longer silenced (no matching active rules).")
-        # else: Alert was not silenced, and still isn't, no update needed.
-
-        # Return False as it is not currently silenced
-        if needs_save:
-            alert_group.save(update_fields=updated_fields)
-        return False
+    # No active rule matched
+    if was_silenced:
+        alert_group.is_silenced = False
+        alert_group.silenced_until = None
+        logger.info(f"AlertGroup {alert_group.id} ({alert_group.name}) is no longer silenced (no matching active rules).")
+        return ['is_silenced', 'silenced_until']
+    # else: Alert was not silenced, and still isn't, no update needed.
+    return []
+
+
+def filter_by_matchers(queryset, matchers: dict):
+    """
+    Groups whose indexed labels contain the matchers. A matcher expecting None
+    also matches a missing label, so it is left out; this only widens the set.
+    """
+    return filter_by_labels(queryset, {key: value for key, value in matchers.items() if value is not None})
+
+
+def affected_alert_group_ids(matchers=None, previous_matchers=None) -> set:
+    """
+    Ids of the groups whose silence status may change when a rule's matchers
+    change from previous_matchers to matchers (either may be None on create
+    or delete): non-resolved groups the new matchers match, plus groups
+    currently silenced that the old matchers match.
+    """
+    ids = set()
+    if isinstance(matchers, dict) and matchers:
+        queryset = filter_by_matchers(AlertGroup.objects.exclude(current_status='resolved'), matchers)
+        ids.update(queryset.values_list('id', flat=True))
+    if isinstance(previous_matchers, dict) and previous_matchers:
+        queryset = filter_by_matchers(AlertGroup.objects.filter(is_silenced=True), previous_matchers)
+        ids.update(queryset.values_list('id', flat=True))
+    return ids
+
+
+def reevaluate_silences(alert_group_ids, chunk_size: int = 500, progress: Optional[Callable] = None) -> int:
+    """
+    Re-check the silence status of the given groups against the silence index
+    in chunks, writing each chunk's changes with one bulk_update.
+
+    Args:
+        alert_group_ids: ids of the groups to check
+        chunk_size: groups loaded and updated at a time
+        progress: called as progress(processed, total, changed) after each chunk
+
+    Returns:
+        Number of groups whose silence status changed
+    """
+    ids = sorted(alert_group_ids)
+    changed = 0
+    for start in range(0, len(ids), chunk_size):
+        groups = AlertGroup.objects.filter(pk__in=ids[start:start + chunk_size]).only(
+            'id', 'name', 'labels', 'is_silenced', 'silenced_until'
+        )
+        updated = [
+            group for group in groups
+            if apply_silence(group, *evaluate_silence(group.labels or {}))
+        ]
+        if updated:
+            AlertGroup.objects.bulk_update(updated, ['is_silenced', 'silenced_until'])
+            changed += len(updated)
+        if progress:
+            progress(min(start + chunk_size, len(ids)), len(ids), changed)
+
+    if changed:
+        # bulk_update bypasses the post_save read cache invalidation
+        read_cache.invalidate()
+    return changed
@@ -0,0 +1,121 @@
+# alerts/services/silence_sweeper.py
+"""
+Applies silence activations and expiries to quiet alert groups.
+
+is_silenced/silenced_until are otherwise only recomputed when an alert
+arrives for a group or a SilenceRule changes, so groups would stay silenced
+past ends_at and a rule with a future starts_at would never take effect.
+
+The sweeper keeps the next rule boundary (from the silence index heaps) and
+the silence index version in the Django cache. Each beat tick compares them
+with the clock and the current version and returns without sweeping until
+the boundary has passed or the rules changed. The version includes the
+SilenceRule table version from the database, so rules saved in the web
+process are seen by the beat worker even when the cache is per-process
+(the version in the cache alone would stay None there, and a sweep that
+found no boundary would never run again).
+When due, each transition is applied with one UPDATE:
+- expiry: groups whose silenced_until has passed are unsilenced;
+- activation: per rule started since the last sweep, the matching groups
+  are silenced until its ends_at unless a longer silence already applies.
+"""
+import logging
+from typing import Optional
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.services import read_cache
+from ..models import AlertGroup, AlertLabel, SilenceRule
+from .silence_index import silence_index_registry
+from .silence_matcher import filter_by_matchers, reevaluate_silences
+
+logger = logging.getLogger(__name__)
+
+STATE_KEY = 'sentryhub:silence_sweeper:state'
+
+
+def _load_state() -> dict:
+    try:
+        return cache.get(STATE_KEY) or {}
+    except Exception as e:
+        logger.warning(f"Silence sweeper state unavailable, sweeping now: {e}")
+        return {}
+
+
+def _save_state(state: dict) -> None:
+    try:
+        cache.set(STATE_KEY, state, timeout=None)
+    except Exception as e:
+        logger.warning(f"Failed to store the silence sweeper state: {e}")
+
+
+def is_sweep_due(now, state: dict, version) -> bool:
+    """True when a boundary has passed since the last sweep or the rules changed."""
+    if not state or state.get('version') != version:
+        return True
+    next_due = state.get('next_due')
+    return next_due is not None and next_due <= now
+
+
+def _is_exact_containment(matchers: dict) -> bool:
+    """The label index matches these matchers exactly (string values stored untruncated)."""
+    return all(
+        isinstance(value, str) and len(value) <= AlertLabel.VALUE_MAX_LENGTH
+        for value in matchers.values()
+    )
+
+
+def expire_silences(now) -> int:
+    """Unsilence every group whose last matching silence has ended."""
+    return AlertGroup.objects.filter(is_silenced=True, silenced_until__lte=now).update(
+        is_silenced=False, silenced_until=None
+    )
+
+
+def activate_silence(rule: SilenceRule) -> int:
+    """Silence the non-resolved groups matching a rule that has just started."""
+    if not isinstance(rule.matchers, dict) or not rule.matchers:
+        return 0
+    candidates = filter_by_matchers(AlertGroup.objects.exclude(current_status='resolved'), rule.matchers)
+    if not _is_exact_containment(rule.matchers):
+        # The label index can only narrow these down; verify each candidate
+        return reevaluate_silences(candidates.values_list('id', flat=True))
+    return candidates.filter(Q(is_silenced=False) | Q(silenced_until__lt=rule.ends_at)).update(
+        is_silenced=True, silenced_until=rule.ends_at
+    )
+
+
+def run_silence_sweep(now=None, force: bool = False) -> Optional[dict]:
+    """
+    Apply the silence transitions that happened since the last sweep.
+
+    Returns:
+        Counts of the applied transitions, or None when nothing was due
+    """
+    now = now or timezone.now()
+    state = _load_state()
+    version = silence_index_registry.version()
+    if not force and not is_sweep_due(now, state, version):
+        return None
+
+    last_run = state.get('last_run')
+    started = SilenceRule.objects.filter(starts_at__lte=now, ends_at__gt=now)
+    if last_run is not None:
+        started = started.filter(starts_at__gt=last_run)
+
+    with transaction.atomic():
+        expired = expire_silences(now)
+        activated = sum(activate_silence(rule) for rule in started)
+
+    if expired or activated:
+        logger.info(f"Silence sweep: {expired} alert group(s) unsilenced, {activated} silenced.")
+        # Queryset updates bypass the post_save read cache invalidation
+        read_cache.invalidate()
+
+    next_due = silence_index_registry.next_transition(now)
+    _save_state({'last_run': now, 'next_due': next_due, 'version': version})
+    logger.debug(f"Next silence transition at {next_due}.")
+    return {'expired': expired, 'activated': activated, 'next_due': next_due}
@@ -1,11 +1,13 @@
 import logging
 from django.dispatch import Signal, receiver
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.db import transaction
 
 from .models import SilenceRule, AlertGroup
-# Import the matcher function
-from .services.silence_matcher import check_alert_silence
+from .services.silence_index import silence_index_registry
+from .services.alert_deduplicator import alert_deduplicator
+from .services.label_index import sync_alert_labels
+from core.services import read_cache
 
 logger = logging.getLogger(__name__)
 
@@ -15,46 +17,88 @@ alert_processed = Signal()
 
 # --- Silence Rule Signal Handlers ---
 
-def _rescan_alerts_for_silence(rule_instance=None):
-    """
-    Iterates through potentially affected alerts and re-checks their silence status.
-    If rule_instance is provided (e.g., on delete), it might be used for optimization later,
-    but for now, we rescan all active/unacknowledged alerts for simplicity.
-    """
-    logger.info(f"Silence rule change detected (Rule ID: {getattr(rule_instance, 'id', 'N/A')}). Rescanning alerts...")
-    # Consider filtering alerts for efficiency, e.g., only 'firing' or recently active ones.
-    # For robustness, let's check all non-resolved alerts for now.
-    alerts_to_check = AlertGroup.objects.exclude(current_status='resolved')
-    count = 0
-    # Use transaction.atomic to ensure consistency if many alerts are updated
-    with transaction.atomic():
-        for alert_group in alerts_to_check.iterator(): # Use iterator for large querysets
-            try:
-                # check_alert_silence handles saving the alert_group if status changes
-                check_alert_silence(alert_group)
-                count += 1
-            except Exception as e:
-                logger.error(f"Error re-checking silence for AlertGroup {alert_group.id} ({alert_group.name}): {e}", exc_info=True)
-    logger.info(f"Finished rescanning {count} alerts for silence status.")
+def _schedule_silence_reevaluation(rule_id, matchers=None, previous_matchers=None):
+    """
+    Queue reevaluate_silences_task for the groups the change can affect once
+    the rule change commits, so the request never waits for the re-evaluation.
+    """
+    from .tasks import reevaluate_silences_task  # alerts.tasks imports this module indirectly
+
+    logger.info(f"Silence rule change detected (Rule ID: {rule_id}). Scheduling re-evaluation of affected alerts.")
+    transaction.get_connection().on_commit(
+        lambda: reevaluate_silences_task.delay(rule_id, matchers, previous_matchers)
+    )
+
+
+@receiver(pre_save, sender=SilenceRule)
+def remember_silence_rule_matchers(sender, instance, **kwargs):
+    """Keep the stored matchers of an updated rule: groups it silenced may need unsilencing."""
+    instance._previous_matchers = None
+    if instance.pk:
+        instance._previous_matchers = SilenceRule.objects.filter(pk=instance.pk).values_list('matchers', flat=True).first()
 
 
 @receiver(post_save, sender=SilenceRule)
 def handle_silence_rule_save(sender, instance, created, **kwargs):
     """
-    When a SilenceRule is created or updated, re-evaluate all relevant alerts.
+    When a SilenceRule is created or updated, re-evaluate the alerts its old
+    and new matchers can affect.
     """
     logger.debug(f"post_save signal received for SilenceRule {instance.id}")
-    _rescan_alerts_for_silence(instance)
+    silence_index_registry.invalidate()
+    _schedule_silence_reevaluation(instance.id, instance.matchers, getattr(instance, '_previous_matchers', None))
+    read_cache.invalidate()
 
 
 @receiver(post_delete, sender=SilenceRule)
 def handle_silence_rule_delete(sender, instance, **kwargs):
     """
-    When a SilenceRule is deleted, re-evaluate all relevant alerts.
+    When a SilenceRule is deleted, re-evaluate the alerts it silenced.
     The deleted rule won't be found by check_alert_silence, effectively unsilencing alerts
     that were only silenced by this rule.
     """
     logger.debug(f"post_delete signal received for SilenceRule {instance.id}")
-    _rescan_alerts_for_silence(instance)
+    silence_index_registry.invalidate()
+    _schedule_silence_reevaluation(instance.id, previous_matchers=instance.matchers)
+    read_cache.invalidate()
+
+# --- End Silence Rule Signal Handlers ---
+
+# --- Label Index ---
+
+@receiver(post_save, sender=AlertGroup)
+def handle_alert_group_labels(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Keep the AlertLabel index in sync when a group is created or its labels are saved.
+    Saves limited to other fields (the state manager's updates) skip this.
+    """
+    if created or update_fields is None or 'labels' in update_fields:
+        sync_alert_labels([instance], replace=not created)
+
+# --- Alert Dedup Cache Invalidation ---
+
+@receiver(post_delete, sender=AlertGroup)
+def handle_alert_group_delete(sender, instance, **kwargs):
+    """
+    When an AlertGroup is deleted, drop its remembered signature so the next
+    notification for that fingerprint recreates the group.
+    """
+    alert_deduplicator.forget([instance.fingerprint])
+
+
+# --- Read Cache Invalidation ---
+
+@receiver(post_save, sender=AlertGroup)
+@receiver(post_delete, sender=AlertGroup)
+def handle_alert_group_read_cache(sender, instance, **kwargs):
+    """
+    Acknowledgements, silencing and other single-group saves change what the
+    cached dashboard and list reads show.
+    """
+    read_cache.invalidate()
+
 
-# --- End Silence Rule Signal Handlers ---
\ No newline at end of file
+@receiver(alert_processed)
+def handle_alert_processed_read_cache(sender, alert_group=None, **kwargs):
+    """Bulk state updates from ingestion bypass post_save; invalidate per processed alert."""
+    read_cache.invalidate()
@@ -1,17 +1,76 @@
 # File: alerts/tasks.py
 import logging
 import json
+from functools import partial
 from celery import shared_task
 from django.db import transaction
 from django.conf import settings
 from core.services.metrics import metrics_manager
 from .services.payload_parser import parse_alertmanager_payload
-from .services.alert_state_manager import update_alert_state
-from .signals import alert_processed
+from .services.alert_state_manager import update_alert_states, touch_alert_groups
+from .services.alert_deduplicator import alert_deduplicator
+from .services.enrichment import enrich_after_commit, ingest_stage
+from .services.silence_matcher import affected_alert_group_ids, reevaluate_silences
+from .services.silence_index import silence_index_registry
+from .services.silence_sweeper import run_silence_sweep
 
 logger = logging.getLogger(__name__)
 
 
+def _apply_parsed_alerts(task, alerts: list) -> None:
+    """
+    Records metrics, skips repeat notifications and applies state changes in
+    one batch; 'alert_processed' is dispatched for every changed alert by the
+    enrichment stage once the caller's transaction commits.
+    Must be called inside the caller's transaction.
+    """
+    task_id = task.request.id if hasattr(task, 'request') else 'N/A_REQ'
+
+    for alert_data in alerts:
+        status_metric = alert_data.get('status', 'unknown')
+        source_metric = alert_data.get('source') or 'unknown' 
+
+        if settings.METRICS_ENABLED:
+            metrics_manager.inc_counter(
+                'sentryhub_alerts_received_total',
+                labels={'status': status_metric, 'source': source_metric}
+            )
+            logger.debug(f"Incremented sentryhub_alerts_received_total for status='{status_metric}', source='{source_metric}'")
+
+    # Repeat notifications identical to the last committed event only bump last_occurrence
+    fresh_alerts, resent_alerts = alert_deduplicator.partition(alerts)
+    if resent_alerts:
+        logger.info(f"Skipping state processing for {len(resent_alerts)} repeat notification(s).")
+        touch_alert_groups(resent_alerts)
+        if settings.METRICS_ENABLED:
+            metrics_manager.inc_counter('sentryhub_alerts_deduplicated_total', value=len(resent_alerts))
+
+    # Apply all state changes for the payload in a single batch
+    with ingest_stage('state'):
+        results = update_alert_states(fresh_alerts)
+    transaction.on_commit(partial(alert_deduplicator.remember, fresh_alerts))
+
+    events = []
+    for alert_data, (alert_group, alert_instance) in zip(fresh_alerts, results):
+        alert_name = alert_data.get('labels', {}).get('alertname', 'N/A')
+        fingerprint = alert_data.get('fingerprint', 'N/A')
+
+        if alert_group and alert_instance:
+            group_id = getattr(alert_group, 'id', 'N/A')
+            instance_id = getattr(alert_instance, 'id', 'N/A')
+            # The group object may be shared by several alerts of the payload,
+            # so the status of this particular event is taken from the alert itself.
+            events.append((alert_group, alert_instance, alert_data.get('status')))
+            logger.info(f"Successfully processed alert. AlertGroup ID: {group_id}, AlertInstance ID: {instance_id}")
+        else:
+            logger.info(f"update_alert_states returned no instance for alert: Name='{alert_name}', Fingerprint='{fingerprint}'. No DB changes made (e.g., duplicate event).")
+
+    # Silences, documentation and notifications run after commit, without the row locks
+    if events:
+        logger.info(f"Task {task_id}: Scheduling enrichment of {len(events)} processed alert(s) after commit.")
+        enrich_after_commit(events)
+
+
 @shared_task(bind=True)
 def process_alert_payload_task(self, payload_json: str):
     """
@@ -29,47 +88,102 @@ def process_alert_payload_task(self, payload_json: str):
 
     try:
         with transaction.atomic():
-            alerts = parse_alertmanager_payload(payload)
+            with ingest_stage('parse'):
+                alerts = parse_alertmanager_payload(payload)
             logger.info(f"Parsed {len(alerts)} alerts from payload.")
 
             if not alerts:
                 logger.warning("Payload parsed into zero alerts. No further processing.")
                 return "Parsed zero alerts"
 
-            for alert_data in alerts:
-                status_metric = alert_data.get('status', 'unknown')
-                source_metric = alert_data.get('source') or 'unknown' 
-
-                if settings.METRICS_ENABLED:
-                    metrics_manager.inc_counter(
-                        'sentryhub_alerts_received_total',
-                        labels={'status': status_metric, 'source': source_metric}
-                    )
-                    logger.debug(f"Incremented sentryhub_alerts_received_total for status='{status_metric}', source='{source_metric}'")
-
-                alert_name = alert_data.get('labels', {}).get('alertname', 'N/A')
-                fingerprint = alert_data.get('fingerprint', 'N/A')
-                logger.info(f"Task {self.request.id if hasattr(self, 'request') else 'N/A_REQ'} (FP: {fingerprint}): Processing alert payload. Alertname: {alert_name}")
-
-                alert_group, alert_instance = update_alert_state(alert_data)
-
-                if alert_group and alert_instance:
-                    group_id = getattr(alert_group, 'id', 'N/A')
-                    instance_id = getattr(alert_instance, 'id', 'N/A')
-                    logger.info(f"Successfully processed alert. AlertGroup ID: {group_id}, AlertInstance ID: {instance_id}")
-                    logger.info(f"Task {self.request.id if hasattr(self, 'request') else 'N/A_REQ'} (FP: {alert_group.fingerprint}): Dispatching 'alert_processed' signal. AlertGroup ID: {alert_group.id}, Status: {alert_group.current_status}")
-                    alert_processed.send(
-                        sender=alert_group.__class__,
-                        alert_group=alert_group,
-                        instance=alert_instance,
-                        status=alert_group.current_status
-                    )
-                else:
-                    logger.info(f"update_alert_state returned None for alert: Name='{alert_name}', Fingerprint='{fingerprint}'. No DB changes made (e.g., duplicate or error within update_alert_state).")
+            _apply_parsed_alerts(self, alerts)
 
             return "Processed alerts successfully"
 
     except Exception as e:
         logger.error(f"Task failed during direct call: {str(e)}", exc_info=True)
         # Re-raise the exception so the calling view can catch it and Celery can retry
-        raise e
\ No newline at end of file
+        raise e
+
+@shared_task(bind=True)
+def process_alert_payload_batch_task(self, payload_jsons: list):
+    """
+    Celery task to process a batch of Alertmanager payloads in one go.
+    Used by the batch mode of the RabbitMQ consumer: all alerts of all
+    payloads are applied in message order within a single transaction.
+    """
+    payloads = []
+    for index, payload_json in enumerate(payload_jsons):
+        try:
+            payloads.append(json.loads(payload_json))
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to deserialize payload JSON at batch index {index}: {e}", exc_info=True)
+
+    logger.info(f"ENTERING process_alert_payload_batch_task with {len(payloads)} payload(s).")
+
+    try:
+        with transaction.atomic():
+            alerts = []
+            with ingest_stage('parse'):
+                for payload in payloads:
+                    alerts.extend(parse_alertmanager_payload(payload))
+            logger.info(f"Parsed {len(alerts)} alerts from {len(payloads)} payload(s).")
+
+            if not alerts:
+                logger.warning("Batch parsed into zero alerts. No further processing.")
+                return "Parsed zero alerts"
+
+            _apply_parsed_alerts(self, alerts)
+
+            return f"Processed {len(payloads)} payloads successfully"
+
+    except Exception as e:
+        logger.error(f"Batch task failed: {str(e)}", exc_info=True)
+        raise e
+
+
+@shared_task(bind=True)
+def reevaluate_silences_task(self, rule_id, matchers=None, previous_matchers=None):
+    """
+    Re-evaluate the silence status of the groups a SilenceRule change can
+    affect: non-resolved groups matching the new matchers and groups
+    currently silenced that match the old ones. Progress is reported as the
+    PROGRESS state with processed/total/changed counts.
+    """
+    # The change may come from another process whose version bump this worker has not seen yet
+    silence_index_registry.clear()
+    affected_ids = affected_alert_group_ids(matchers, previous_matchers)
+    total = len(affected_ids)
+    logger.info(f"Task {self.request.id}: Re-evaluating silence status of {total} alert group(s) for silence rule {rule_id}.")
+
+    def report_progress(processed, total, changed):
+        logger.debug(f"Task {self.request.id}: Silence re-evaluation for rule {rule_id}: {processed}/{total} checked, {changed} changed.")
+        if self.request.id:
+            try:
+                self.update_state(state='PROGRESS', meta={
+                    'rule_id': rule_id, 'processed': processed, 'total': total, 'changed': changed,
+                })
+            except Exception as e:
+                logger.warning(f"Task {self.request.id}: Failed to report progress: {e}")
+
+    chunk_size = int(getattr(settings, 'SILENCE_REEVALUATION', {}).get('CHUNK_SIZE', 500))
+    changed = reevaluate_silences(affected_ids, chunk_size=chunk_size, progress=report_progress)
+
+    logger.info(f"Task {self.request.id}: Silence rule {rule_id}: {changed} of {total} alert group(s) changed silence status.")
+    return {'rule_id': rule_id, 'total': total, 'changed': changed}
+
+
+@shared_task(bind=True)
+def sweep_silences_task(self):
+    """
+    Beat-scheduled: apply silence activations and expiries to quiet groups.
+    Returns without database work until the next silence boundary has passed.
+    """
+    result = run_silence_sweep()
+    if result is None:
+        return "No silence transition due"
+    logger.info(
+        f"Task {self.request.id}: Silence sweep unsilenced {result['expired']} and silenced {result['activated']} "
+        f"alert group(s); next transition at {result['next_due']}."
+    )
+    return f"Expired {result['expired']}, activated {result['activated']}"
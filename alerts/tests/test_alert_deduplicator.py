@@ -0,0 +1,173 @@
+import datetime
+import json
+from unittest.mock import patch, MagicMock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from alerts.models import AlertGroup, AlertInstance
+from alerts.services.alert_deduplicator import AlertDeduplicator
+from alerts.tasks import process_alert_payload_task
+
+
+DEDUP_SETTINGS = {'ENABLED': True, 'LRU_SIZE': 3, 'TTL_SECONDS': 60, 'REDIS_URL': ''}
+
+
+def _alert(fingerprint, status='firing', starts_at=None, ends_at=None):
+    return {
+        'fingerprint': fingerprint,
+        'status': status,
+        'labels': {'alertname': fingerprint},
+        'annotations': {},
+        'starts_at': starts_at or datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+        'ends_at': ends_at,
+        'generator_url': '',
+        'source': None,
+    }
+
+
+@override_settings(ALERT_DEDUP=DEDUP_SETTINGS)
+class AlertDeduplicatorTests(TestCase):
+    def setUp(self):
+        self.dedup = AlertDeduplicator()
+        for fp in ('a', 'b', 'c', 'd'):
+            AlertGroup.objects.create(fingerprint=fp, name=fp, labels={'alertname': fp})
+
+    def test_unknown_alerts_are_fresh(self):
+        fresh, resends = self.dedup.partition([_alert('a'), _alert('b')])
+        self.assertEqual([a['fingerprint'] for a in fresh], ['a', 'b'])
+        self.assertEqual(resends, [])
+
+    def test_remembered_signature_is_a_resend(self):
+        self.dedup.remember([_alert('a')])
+        fresh, resends = self.dedup.partition([_alert('a'), _alert('b')])
+        self.assertEqual([a['fingerprint'] for a in fresh], ['b'])
+        self.assertEqual([a['fingerprint'] for a in resends], ['a'])
+
+    def test_changed_status_or_times_is_fresh(self):
+        start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        self.dedup.remember([_alert('a', starts_at=start)])
+        resolved = _alert('a', status='resolved', starts_at=start, ends_at=start + datetime.timedelta(minutes=5))
+        refired = _alert('a', starts_at=start + datetime.timedelta(hours=1))
+        self.assertEqual(self.dedup.partition([resolved]), ([resolved], []))
+        self.assertEqual(self.dedup.partition([refired]), ([refired], []))
+
+    def test_only_first_event_per_fingerprint_can_be_a_resend(self):
+        self.dedup.remember([_alert('a')])
+        later = _alert('a', status='resolved')
+        fresh, resends = self.dedup.partition([_alert('a'), later, _alert('a')])
+        self.assertEqual(len(resends), 1)
+        self.assertEqual(len(fresh), 2)
+
+    def test_forget_drops_signature(self):
+        self.dedup.remember([_alert('a')])
+        self.dedup.forget(['a'])
+        fresh, resends = self.dedup.partition([_alert('a')])
+        self.assertEqual(len(fresh), 1)
+        self.assertEqual(resends, [])
+
+    def test_groups_changed_by_another_process_are_fresh(self):
+        # forget() ran in the web process; this worker's LRU still has the signatures
+        self.dedup.remember([_alert('a'), _alert('b'), _alert('c')])
+        AlertGroup.objects.filter(fingerprint='a').update(current_status='resolved')
+        AlertGroup.objects.filter(fingerprint='b').delete()
+
+        with self.assertNumQueries(1):
+            fresh, resends = self.dedup.partition([_alert('a'), _alert('b'), _alert('c')])
+
+        self.assertEqual([a['fingerprint'] for a in fresh], ['a', 'b'])
+        self.assertEqual([a['fingerprint'] for a in resends], ['c'])
+        self.assertEqual(self.dedup._lookup(['a', 'b', 'c']), {'c': 'firing|2024-01-01T00:00:00+00:00|'})
+
+    def test_lru_is_bounded(self):
+        self.dedup.remember([_alert('a'), _alert('b'), _alert('c')])
+        self.dedup.partition([_alert('a')])  # touch 'a' so 'b' is the oldest
+        self.dedup.remember([_alert('d')])
+        fresh, resends = self.dedup.partition([_alert('a'), _alert('b'), _alert('c'), _alert('d')])
+        self.assertEqual([a['fingerprint'] for a in fresh], ['b'])
+
+    @patch('alerts.services.alert_deduplicator.time.monotonic')
+    def test_expired_entries_are_fresh(self, mock_monotonic):
+        mock_monotonic.return_value = 1000.0
+        self.dedup.remember([_alert('a')])
+        mock_monotonic.return_value = 1061.0
+        fresh, resends = self.dedup.partition([_alert('a')])
+        self.assertEqual(len(fresh), 1)
+
+    @override_settings(ALERT_DEDUP={**DEDUP_SETTINGS, 'ENABLED': False})
+    def test_disabled_passes_everything_through(self):
+        self.dedup.remember([_alert('a')])
+        fresh, resends = self.dedup.partition([_alert('a')])
+        self.assertEqual(len(fresh), 1)
+        self.assertEqual(resends, [])
+
+    @override_settings(ALERT_DEDUP={**DEDUP_SETTINGS, 'REDIS_URL': 'redis://localhost:6379/1'})
+    def test_redis_tier_shared_between_workers(self):
+        client = MagicMock()
+        self.dedup._redis = client
+        self.dedup._redis_url = 'redis://localhost:6379/1'
+        client.mget.return_value = [b'firing|2024-01-01T00:00:00+00:00|']
+
+        fresh, resends = self.dedup.partition([_alert('a')])
+
+        client.mget.assert_called_once_with(['sentryhub:alert_dedup:a'])
+        self.assertEqual(len(resends), 1)
+
+    @override_settings(ALERT_DEDUP={**DEDUP_SETTINGS, 'REDIS_URL': 'redis://localhost:6379/1'})
+    def test_redis_errors_do_not_block_ingestion(self):
+        client = MagicMock()
+        client.mget.side_effect = Exception("connection refused")
+        self.dedup._redis = client
+        self.dedup._redis_url = 'redis://localhost:6379/1'
+
+        fresh, resends = self.dedup.partition([_alert('a')])
+
+        self.assertEqual(len(fresh), 1)
+        self.assertEqual(resends, [])
+
+
+@override_settings(ALERT_DEDUP=DEDUP_SETTINGS)
+class ProcessAlertPayloadDedupTests(TestCase):
+    def setUp(self):
+        self.dedup = AlertDeduplicator()
+        patcher = patch('alerts.tasks.alert_deduplicator', self.dedup)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        start = (timezone.now() - datetime.timedelta(minutes=5)).isoformat()
+        self.payload = json.dumps({'alerts': [{
+            'status': 'firing',
+            'labels': {'alertname': 'Resent'},
+            'annotations': {},
+            'startsAt': start,
+            'endsAt': '0001-01-01T00:00:00Z',
+            'generatorURL': '',
+            'fingerprint': 'resent-fp',
+        }]})
+
+    def test_resend_only_touches_last_occurrence(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            process_alert_payload_task(self.payload)
+        group = AlertGroup.objects.get(fingerprint='resent-fp')
+        AlertGroup.objects.filter(pk=group.pk).update(
+            last_occurrence=timezone.now() - datetime.timedelta(hours=1)
+        )
+
+        with patch('alerts.tasks.update_alert_states', return_value=[]) as mock_update, \
+                patch('alerts.services.enrichment.alert_processed.send') as mock_send:
+            process_alert_payload_task(self.payload)
+
+        mock_update.assert_called_once_with([])
+        mock_send.assert_not_called()
+        group.refresh_from_db()
+        self.assertAlmostEqual(group.last_occurrence, timezone.now(), delta=datetime.timedelta(seconds=5))
+        self.assertEqual(AlertInstance.objects.filter(alert_group=group).count(), 1)
+
+    def test_deleting_group_forgets_signature(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            process_alert_payload_task(self.payload)
+        with patch('alerts.signals.alert_deduplicator', self.dedup):
+            AlertGroup.objects.get(fingerprint='resent-fp').delete()
+
+        process_alert_payload_task(self.payload)
+
+        self.assertTrue(AlertGroup.objects.filter(fingerprint='resent-fp').exists())
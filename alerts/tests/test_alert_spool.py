@@ -0,0 +1,193 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from alerts.management.commands.drain_alert_spool import Command as DrainCommand
+from alerts.services.alert_spool import AlertSpool
+
+
+class SpoolTestMixin:
+    def setUp(self):
+        super().setUp()
+        self.spool_dir = tempfile.mkdtemp(prefix='sentryhub-spool-')
+        self.addCleanup(shutil.rmtree, self.spool_dir, True)
+        self.settings_override = override_settings(ALERT_SPOOL={
+            'ENABLED': True,
+            'DIR': self.spool_dir,
+            'SEGMENT_MAX_BYTES': 1024 * 1024,
+            'SEGMENT_MAX_AGE_SECONDS': 60,
+            'FSYNC_INTERVAL_SECONDS': 0.01,
+            'MERGE_DELAY_SECONDS': 0,
+        })
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.spool = AlertSpool()
+        self.addCleanup(self.spool.close)
+
+
+class AlertSpoolTests(SpoolTestMixin, SimpleTestCase):
+    def test_append_and_read_records(self):
+        self.spool.append('{"a": 1}')
+        self.spool.append('{"a": 2}')
+
+        [segment] = self.spool.segments()
+        records, offset = self.spool.read_records(segment, 0, limit=10)
+
+        self.assertEqual(records, ['{"a": 1}', '{"a": 2}'])
+        self.assertEqual(offset, os.path.getsize(segment))
+
+    def test_partial_trailing_line_is_left_for_later(self):
+        self.spool.append('{"a": 1}')
+        [segment] = self.spool.segments()
+        complete = os.path.getsize(segment)
+        with open(segment, 'ab') as f:
+            f.write(b'{"a": ')
+
+        records, offset = self.spool.read_records(segment, 0, limit=10)
+
+        self.assertEqual(records, ['{"a": 1}'])
+        self.assertEqual(offset, complete)
+
+    def test_offset_survives_sealing(self):
+        self.spool.append('{"a": 1}')
+        [open_segment] = self.spool.segments()
+        size = os.path.getsize(open_segment)
+        self.spool.write_offset(open_segment, size)
+
+        self.spool.close()
+
+        [sealed_segment] = self.spool.segments()
+        self.assertTrue(sealed_segment.endswith('.seg'))
+        self.assertEqual(self.spool.read_offset(sealed_segment), size)
+        self.assertTrue(self.spool.is_finished(sealed_segment, size))
+
+    def test_rotates_on_size(self):
+        with override_settings(ALERT_SPOOL={**self.spool.config, 'SEGMENT_MAX_BYTES': 5}):
+            self.spool.append('{"a": 1}')
+            self.spool.append('{"a": 2}')
+        segments = self.spool.segments()
+        self.assertEqual(len(segments), 2)
+        self.assertTrue(segments[0].endswith('.seg'))
+
+    def test_reads_records_without_receive_stamp(self):
+        self.spool.append('{"a": 1}')
+        [segment] = self.spool.segments()
+        with open(segment, 'ab') as f:
+            f.write(b'{"a": 2}\n')
+
+        entries = self.spool.read_entries(segment, 0, limit=10)
+
+        self.assertEqual([payload for _, payload, _ in entries], ['{"a": 1}', '{"a": 2}'])
+        self.assertLessEqual(entries[1][0], entries[0][0])
+
+    def test_open_segment_read_follows_sealing(self):
+        self.spool.append('{"a": 1}')
+        [open_segment] = self.spool.segments()
+        self.spool.close()
+
+        records, _ = self.spool.read_records(open_segment, 0, limit=10)
+
+        self.assertEqual(records, ['{"a": 1}'])
+
+    def test_open_segment_is_not_finished_until_stale(self):
+        self.spool.append('{"a": 1}')
+        [segment] = self.spool.segments()
+        size = os.path.getsize(segment)
+        self.assertFalse(self.spool.is_finished(segment, size))
+        self.assertTrue(self.spool.is_finished(segment, size, stale_after=-1))
+
+
+class DrainAlertSpoolTests(SpoolTestMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = patch('alerts.management.commands.drain_alert_spool.alert_spool', self.spool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('alerts.management.commands.drain_alert_spool.process_alert_payload_batch_task')
+    def test_drain_ships_in_bulk_and_removes_sealed_segments(self, mock_task):
+        for i in range(5):
+            self.spool.append(json.dumps({'alerts': [], 'n': i}))
+        self.spool.close()
+
+        shipped = DrainCommand().drain_once(batch_size=2)
+
+        self.assertEqual(shipped, 5)
+        self.assertEqual([len(c.args[0]) for c in mock_task.delay.call_args_list], [2, 2, 1])
+        self.assertEqual(self.spool.segments(), [])
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+    @patch('alerts.management.commands.drain_alert_spool.process_alert_payload_batch_task')
+    def test_segments_of_several_processes_are_merged_in_receive_order(self, mock_task):
+        other = AlertSpool()
+        self.addCleanup(other.close)
+        for i in range(3):
+            self.spool.append(json.dumps({'n': f'a{i}'}))
+            other.append(json.dumps({'n': f'b{i}'}))
+
+        self.assertEqual(DrainCommand().drain_once(batch_size=2), 6)
+
+        shipped = [json.loads(r)['n'] for c in mock_task.delay.call_args_list for r in c.args[0]]
+        self.assertEqual(shipped, ['a0', 'b0', 'a1', 'b1', 'a2', 'b2'])
+
+    @patch('alerts.management.commands.drain_alert_spool.process_alert_payload_batch_task')
+    def test_recent_records_wait_for_the_merge_delay(self, mock_task):
+        self.spool.append('{"alerts": []}')
+
+        with override_settings(ALERT_SPOOL={**self.spool.config, 'MERGE_DELAY_SECONDS': 60}):
+            self.assertEqual(DrainCommand().drain_once(batch_size=10), 0)
+        self.assertEqual(DrainCommand().drain_once(batch_size=10), 1)
+
+    @patch('alerts.management.commands.drain_alert_spool.process_alert_payload_batch_task')
+    def test_failed_dispatch_does_not_advance_offset(self, mock_task):
+        self.spool.append('{"alerts": []}')
+        [segment] = self.spool.segments()
+        mock_task.delay.side_effect = Exception("broker down")
+
+        with self.assertRaises(Exception):
+            DrainCommand().drain_once(batch_size=10)
+        self.assertEqual(self.spool.read_offset(segment), 0)
+
+        mock_task.delay.side_effect = None
+        self.assertEqual(DrainCommand().drain_once(batch_size=10), 1)
+        self.assertEqual(DrainCommand().drain_once(batch_size=10), 0)
+
+    @patch('alerts.management.commands.drain_alert_spool.process_alert_payload_batch_task')
+    def test_once_option(self, mock_task):
+        self.spool.append('{"alerts": []}')
+        call_command('drain_alert_spool', '--once', stdout=open(os.devnull, 'w'))
+        mock_task.delay.assert_called_once_with(['{"alerts": []}'])
+
+
+class AlertWebhookSpoolTests(SpoolTestMixin, APITestCase):
+    @patch('alerts.api.views.process_alert_payload_task')
+    def test_webhook_appends_to_spool_instead_of_calling_celery(self, mock_task):
+        payload = {'receiver': 'webhook', 'status': 'firing', 'alerts': [{'status': 'firing', 'labels': {}}]}
+        with patch('alerts.api.views.alert_spool', self.spool):
+            response = self.client.post(reverse('alerts:alert-webhook'), payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {'status': 'success (spooled)'})
+        mock_task.delay.assert_not_called()
+        [segment] = self.spool.segments()
+        records, _ = self.spool.read_records(segment, 0, limit=10)
+        self.assertEqual([json.loads(r) for r in records], [payload])
+
+    @patch('alerts.api.views.process_alert_payload_task')
+    def test_webhook_falls_back_to_celery_when_spool_fails(self, mock_task):
+        payload = {'receiver': 'webhook', 'status': 'firing', 'alerts': [{'status': 'firing', 'labels': {}}]}
+        with patch('alerts.api.views.alert_spool') as mock_spool:
+            mock_spool.enabled = True
+            mock_spool.append.side_effect = OSError("disk full")
+            response = self.client.post(reverse('alerts:alert-webhook'), payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_task.delay.assert_called_once()
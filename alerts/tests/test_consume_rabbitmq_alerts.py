@@ -0,0 +1,77 @@
+import json
+from unittest.mock import patch, MagicMock
+
+from django.test import SimpleTestCase
+
+from alerts.management.commands.consume_rabbitmq_alerts import Command
+
+
+def _delivery(tag, payload):
+    method = MagicMock()
+    method.delivery_tag = tag
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+    return method, MagicMock(), body
+
+
+class ConsumeRabbitMQBatchTests(SimpleTestCase):
+    def setUp(self):
+        self.command = Command()
+        self.channel = MagicMock()
+
+    @patch('alerts.management.commands.consume_rabbitmq_alerts.process_alert_payload_batch_task')
+    def test_flush_dispatches_one_task_and_multi_acks(self, mock_task):
+        batch = [(1, b'{"alerts": []}'), (2, b'{"alerts": [{}]}'), (3, b'{"alerts": []}')]
+
+        self.command.flush_batch(self.channel, batch)
+
+        mock_task.delay.assert_called_once_with(['{"alerts": []}', '{"alerts": [{}]}', '{"alerts": []}'])
+        self.channel.basic_ack.assert_called_once_with(delivery_tag=3, multiple=True)
+        self.channel.basic_nack.assert_not_called()
+
+    @patch('alerts.management.commands.consume_rabbitmq_alerts.process_alert_payload_batch_task')
+    def test_flush_nacks_invalid_messages_individually(self, mock_task):
+        batch = [(1, b'{"alerts": []}'), (2, b'{"alerts": ['), (3, b'\xff\xfe')]
+
+        self.command.flush_batch(self.channel, batch)
+
+        mock_task.delay.assert_called_once_with(['{"alerts": []}'])
+        self.assertEqual(self.channel.basic_nack.call_count, 2)
+        self.channel.basic_nack.assert_any_call(delivery_tag=2, requeue=False)
+        self.channel.basic_nack.assert_any_call(delivery_tag=3, requeue=False)
+        self.channel.basic_ack.assert_called_once_with(delivery_tag=1, multiple=True)
+
+    @patch('alerts.management.commands.consume_rabbitmq_alerts.process_alert_payload_batch_task')
+    def test_flush_requeues_batch_when_dispatch_fails(self, mock_task):
+        mock_task.delay.side_effect = Exception("broker down")
+
+        with self.assertRaises(Exception):
+            self.command.flush_batch(self.channel, [(1, b'{}'), (2, b'{}')])
+
+        self.channel.basic_nack.assert_called_once_with(delivery_tag=2, multiple=True, requeue=True)
+        self.channel.basic_ack.assert_not_called()
+
+    @patch.object(Command, 'flush_batch')
+    def test_consume_flushes_full_batches_and_on_inactivity(self, mock_flush):
+        self.channel.consume.return_value = iter([
+            _delivery(1, {}), _delivery(2, {}),  # full batch
+            _delivery(3, {}),
+            (None, None, None),  # inactivity timeout flushes the partial batch
+            _delivery(4, {}),  # remainder is flushed when the consumer stops
+        ])
+
+        self.command.consume_batches(self.channel, 'queue', batch_size=2, linger=5)
+
+        flushed_tags = [[tag for tag, _ in c.args[1]] for c in mock_flush.call_args_list]
+        self.assertEqual(flushed_tags, [[1, 2], [3], [4]])
+        self.channel.consume.assert_called_once_with('queue', inactivity_timeout=5)
+
+    @patch('alerts.management.commands.consume_rabbitmq_alerts.time.monotonic')
+    @patch.object(Command, 'flush_batch')
+    def test_consume_flushes_when_linger_expires(self, mock_flush, mock_monotonic):
+        mock_monotonic.side_effect = [100.0, 100.1, 100.6]
+        self.channel.consume.return_value = iter([_delivery(1, {}), _delivery(2, {})])
+
+        self.command.consume_batches(self.channel, 'queue', batch_size=10, linger=0.5)
+
+        flushed_tags = [[tag for tag, _ in c.args[1]] for c in mock_flush.call_args_list]
+        self.assertEqual(flushed_tags, [[1, 2]])
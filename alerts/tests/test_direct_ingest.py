@@ -0,0 +1,172 @@
+import json
+import threading
+from unittest.mock import patch, MagicMock
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from alerts.management.commands.consume_rabbitmq_alerts import Command
+from alerts.services.direct_ingest import DirectIngestPool, IngestPoolFull
+
+
+INGEST_SETTINGS = {
+    'MODE': 'direct',
+    'WORKER_TYPE': 'thread',
+    'WORKERS': 2,
+    'MAX_PENDING': 2,
+    'SUBMIT_TIMEOUT_SECONDS': 0.05,
+    'RESULT_TIMEOUT_SECONDS': 5,
+}
+
+
+@override_settings(ALERT_INGEST=INGEST_SETTINGS)
+class DirectIngestPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.pool = DirectIngestPool()
+        self.addCleanup(self.pool.shutdown)
+
+    @patch('alerts.tasks.process_alert_payload_task')
+    def test_submit_runs_task_function_in_worker(self, mock_task):
+        mock_task.return_value = "Processed alerts successfully"
+
+        result = self.pool.submit('{"alerts": []}').result(timeout=5)
+
+        self.assertEqual(result, "Processed alerts successfully")
+        mock_task.assert_called_once_with('{"alerts": []}')
+        mock_task.delay.assert_not_called()
+
+    @patch('alerts.tasks.process_alert_payload_batch_task')
+    def test_submit_batch_runs_batch_task_function(self, mock_task):
+        self.pool.submit_batch(['{}', '{}']).result(timeout=5)
+        mock_task.assert_called_once_with(['{}', '{}'])
+
+    @patch('alerts.tasks.process_alert_payload_task')
+    def test_submit_raises_when_pool_is_full(self, mock_task):
+        release = threading.Event()
+        mock_task.side_effect = lambda payload: release.wait(5)
+        futures = [self.pool.submit('{}'), self.pool.submit('{}')]
+
+        with self.assertRaises(IngestPoolFull):
+            self.pool.submit('{}')
+
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+        # Slots are released once the work is done
+        self.pool.submit('{}').result(timeout=5)
+
+    @patch('alerts.tasks.process_alert_payload_task')
+    def test_non_blocking_submit_fails_fast(self, mock_task):
+        release = threading.Event()
+        mock_task.side_effect = lambda payload: release.wait(5)
+        futures = [self.pool.submit('{}'), self.pool.submit('{}')]
+
+        with override_settings(ALERT_INGEST={**INGEST_SETTINGS, 'SUBMIT_TIMEOUT_SECONDS': 30}):
+            with self.assertRaises(IngestPoolFull):
+                self.pool.submit('{}', block=False)
+
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+
+    @override_settings(ALERT_INGEST={**INGEST_SETTINGS, 'MODE': 'celery'})
+    def test_disabled_by_default_mode(self):
+        self.assertFalse(self.pool.enabled)
+
+
+@override_settings(ALERT_INGEST=INGEST_SETTINGS)
+class AlertWebhookDirectIngestTests(APITestCase):
+    def setUp(self):
+        self.url = reverse('alerts:alert-webhook')
+        self.payload = {
+            "receiver": "webhook",
+            "status": "firing",
+            "alerts": [{"status": "firing", "labels": {"alertname": "test"}, "startsAt": "2023-01-01T00:00:00Z"}],
+        }
+
+    @patch('alerts.api.views.process_alert_payload_task')
+    @patch('alerts.api.views.direct_ingest_pool')
+    def test_waits_for_commit_instead_of_queueing(self, mock_pool, mock_task):
+        mock_pool.enabled = True
+        mock_pool.result_timeout = 5
+
+        response = self.client.post(self.url, self.payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {'status': 'success (processed)'})
+        self.assertEqual(json.loads(mock_pool.submit.call_args.args[0]), self.payload)
+        mock_pool.submit.return_value.result.assert_called_once_with(timeout=5)
+        mock_task.delay.assert_not_called()
+
+    @patch('alerts.api.views.direct_ingest_pool')
+    def test_full_pool_returns_503(self, mock_pool):
+        mock_pool.enabled = True
+        mock_pool.submit.side_effect = IngestPoolFull("full")
+
+        response = self.client.post(self.url, self.payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    @patch('alerts.api.views.direct_ingest_pool')
+    def test_processing_error_returns_500(self, mock_pool):
+        mock_pool.enabled = True
+        mock_pool.result_timeout = 5
+        mock_pool.submit.return_value.result.side_effect = Exception("db down")
+
+        response = self.client.post(self.url, self.payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class ConsumeRabbitMQDirectIngestTests(SimpleTestCase):
+    def setUp(self):
+        self.command = Command()
+        self.command.direct_ingest = True
+        self.command.connection = MagicMock()
+        # Run thread-safe callbacks inline
+        self.command.connection.add_callback_threadsafe.side_effect = lambda callback: callback()
+        self.channel = MagicMock()
+
+    @patch('alerts.management.commands.consume_rabbitmq_alerts.process_alert_payload_batch_task')
+    @patch('alerts.management.commands.consume_rabbitmq_alerts.direct_ingest_pool')
+    def test_batch_is_acked_per_tag_after_commit(self, mock_pool, mock_task):
+        future = MagicMock()
+        future.exception.return_value = None
+        future.add_done_callback.side_effect = lambda callback: callback(future)
+        mock_pool.submit_batch.return_value = future
+
+        self.command.flush_batch(self.channel, [(5, b'{}'), (6, b'{'), (7, b'{}')])
+
+        mock_pool.submit_batch.assert_called_once_with(['{}', '{}'], block=False)
+        mock_task.delay.assert_not_called()
+        self.channel.basic_nack.assert_called_once_with(delivery_tag=6, requeue=False)
+        self.assertEqual(
+            [c.kwargs for c in self.channel.basic_ack.call_args_list],
+            [{'delivery_tag': 5}, {'delivery_tag': 7}],
+        )
+
+    @patch('alerts.management.commands.consume_rabbitmq_alerts.direct_ingest_pool')
+    def test_full_pool_requeues_the_batch(self, mock_pool):
+        mock_pool.submit_batch.side_effect = IngestPoolFull("full")
+
+        self.command.flush_batch(self.channel, [(1, b'{}'), (2, b'{}')])
+
+        self.channel.basic_ack.assert_not_called()
+        self.assertEqual(
+            [c.kwargs for c in self.channel.basic_nack.call_args_list],
+            [{'delivery_tag': 1, 'requeue': True}, {'delivery_tag': 2, 'requeue': True}],
+        )
+
+    @patch('alerts.management.commands.consume_rabbitmq_alerts.direct_ingest_pool')
+    def test_failed_batch_is_nacked(self, mock_pool):
+        future = MagicMock()
+        future.exception.return_value = Exception("db down")
+        future.add_done_callback.side_effect = lambda callback: callback(future)
+        mock_pool.submit_batch.return_value = future
+
+        self.command.flush_batch(self.channel, [(1, b'{}'), (2, b'{}')])
+
+        self.channel.basic_ack.assert_not_called()
+        self.assertEqual(self.channel.basic_nack.call_count, 2)
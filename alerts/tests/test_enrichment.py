@@ -0,0 +1,87 @@
+import datetime
+import json
+from unittest.mock import patch
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from alerts.models import AlertGroup, SilenceRule
+from alerts.services.alert_deduplicator import alert_deduplicator
+from alerts.services.enrichment import run_enrichment
+from alerts.services.silence_index import silence_index_registry
+from alerts.signals import alert_processed
+from alerts.tasks import process_alert_payload_task
+
+
+def _payload(*fingerprints, alertname='DiskFull'):
+    starts_at = (timezone.now() - datetime.timedelta(minutes=1)).isoformat()
+    return json.dumps({'alerts': [
+        {
+            'status': 'firing', 'fingerprint': fp, 'startsAt': starts_at, 'endsAt': '0001-01-01T00:00:00Z',
+            'labels': {'alertname': alertname, 'instance': fp, 'severity': 'warning'},
+            'annotations': {},
+        }
+        for fp in fingerprints
+    ]})
+
+
+class EnrichmentPipelineTests(TestCase):
+    def setUp(self):
+        self.dispatched = []
+        alert_processed.connect(self._record, dispatch_uid='test-enrichment-recorder')
+        self.addCleanup(alert_processed.disconnect, dispatch_uid='test-enrichment-recorder')
+        self.addCleanup(alert_deduplicator.forget, ['fp-1', 'fp-2'])
+
+    def _record(self, sender, alert_group, instance, status, **kwargs):
+        self.dispatched.append((alert_group.fingerprint, status, alert_group.is_silenced))
+
+    def test_signal_is_dispatched_only_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            process_alert_payload_task(_payload('fp-1', 'fp-2'))
+            self.assertEqual(self.dispatched, [])
+
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(self.dispatched, [('fp-1', 'firing', False), ('fp-2', 'firing', False)])
+
+    def test_silences_are_applied_before_dispatch_with_rules_loaded_once(self):
+        now = timezone.now()
+        SilenceRule.objects.create(
+            matchers={'alertname': 'DiskFull'}, starts_at=now - datetime.timedelta(hours=1),
+            ends_at=now + datetime.timedelta(hours=1),
+        )
+
+        with patch.object(silence_index_registry, '_load_rules', wraps=silence_index_registry._load_rules) as load_rules:
+            with self.captureOnCommitCallbacks(execute=True):
+                process_alert_payload_task(_payload('fp-1', 'fp-2'))
+
+        load_rules.assert_called_once()
+        self.assertEqual(self.dispatched, [('fp-1', 'firing', True), ('fp-2', 'firing', True)])
+        self.assertEqual(AlertGroup.objects.filter(is_silenced=True).count(), 2)
+
+    def test_failing_receiver_does_not_stop_other_events(self):
+        groups = [AlertGroup.objects.create(fingerprint=fp, name='A', labels={}) for fp in ('fp-1', 'fp-2')]
+
+        def explode(sender, alert_group, **kwargs):
+            if alert_group.fingerprint == 'fp-1':
+                raise RuntimeError('boom')
+        alert_processed.connect(explode, dispatch_uid='test-enrichment-explode')
+        self.addCleanup(alert_processed.disconnect, dispatch_uid='test-enrichment-explode')
+
+        # The error is logged; the event after it is still dispatched
+        run_enrichment([(group, None, 'firing') for group in groups])
+
+        self.assertEqual([fp for fp, _, _ in self.dispatched], ['fp-1', 'fp-2'])
+
+    @override_settings(METRICS_ENABLED=True)
+    @patch('alerts.services.enrichment.metrics_manager')
+    def test_stage_timings_are_recorded(self, metrics):
+        with self.captureOnCommitCallbacks(execute=True):
+            process_alert_payload_task(_payload('fp-1'))
+
+        stages = [
+            call.kwargs['labels']['stage'] for call in metrics.inc_counter.call_args_list
+            if call.args[0] == 'sentryhub_ingest_stage_seconds_total'
+        ]
+        self.assertEqual(stages, ['parse', 'state', 'silence', 'dispatch'])
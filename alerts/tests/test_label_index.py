@@ -0,0 +1,83 @@
+import datetime
+import io
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import AlertGroup, AlertLabel
+from ..services.alert_state_manager import update_alert_state, update_alert_states
+from ..services.label_index import filter_by_labels, label_value, sync_alert_labels
+
+
+class LabelIndexSyncTests(TestCase):
+    def _labels(self, group):
+        return dict(AlertLabel.objects.filter(alert_group=group).values_list('key', 'value'))
+
+    def test_create_indexes_labels(self):
+        group = AlertGroup.objects.create(
+            fingerprint='fp-1', name='A', labels={'alertname': 'A', 'job': 'node'}
+        )
+        self.assertEqual(self._labels(group), {'alertname': 'A', 'job': 'node'})
+
+    def test_saving_labels_replaces_index(self):
+        group = AlertGroup.objects.create(fingerprint='fp-1', name='A', labels={'job': 'node'})
+        group.labels = {'job': 'api', 'team': 'core'}
+        group.save(update_fields=['labels'])
+        self.assertEqual(self._labels(group), {'job': 'api', 'team': 'core'})
+
+    def test_saving_other_fields_skips_sync(self):
+        group = AlertGroup.objects.create(fingerprint='fp-1', name='A', labels={'job': 'node'})
+        with self.assertNumQueries(1):
+            group.current_status = 'resolved'
+            group.save(update_fields=['current_status'])
+
+    def test_state_manager_paths_index_new_groups(self):
+        now = timezone.now()
+        alert = {
+            'status': 'firing', 'starts_at': now, 'ends_at': None,
+            'annotations': {}, 'generator_url': '',
+        }
+        update_alert_state({**alert, 'fingerprint': 'single', 'labels': {'alertname': 'Single'}})
+        update_alert_states([{**alert, 'fingerprint': 'batch', 'labels': {'alertname': 'Batch'}}])
+
+        self.assertEqual(self._labels(AlertGroup.objects.get(fingerprint='single')), {'alertname': 'Single'})
+        self.assertEqual(self._labels(AlertGroup.objects.get(fingerprint='batch')), {'alertname': 'Batch'})
+
+    def test_non_string_values_are_stored_as_json(self):
+        group = AlertGroup.objects.create(fingerprint='fp-1', name='A', labels={'replicas': 3, 'canary': True})
+        self.assertEqual(self._labels(group), {'replicas': '3', 'canary': 'true'})
+        self.assertEqual(label_value('x' * 2000), 'x' * AlertLabel.VALUE_MAX_LENGTH)
+
+    def test_rebuild_command(self):
+        group = AlertGroup.objects.create(fingerprint='fp-1', name='A', labels={'job': 'node'})
+        AlertLabel.objects.all().delete()
+
+        call_command('rebuild_alert_labels', batch_size=1, stdout=io.StringIO())
+
+        self.assertEqual(self._labels(group), {'job': 'node'})
+
+
+class FilterByLabelsTests(TestCase):
+    def setUp(self):
+        self.web = AlertGroup.objects.create(
+            fingerprint='web', name='Web', labels={'service': 'web-frontend', 'cluster': 'prod'}
+        )
+        self.db = AlertGroup.objects.create(
+            fingerprint='db', name='DB', labels={'service': 'database', 'cluster': 'prod'}
+        )
+
+    def test_exact_match_requires_all_matchers(self):
+        matches = filter_by_labels(AlertGroup.objects.all(), {'service': 'database', 'cluster': 'prod'})
+        self.assertEqual(list(matches), [self.db])
+        self.assertFalse(filter_by_labels(AlertGroup.objects.all(), {'service': 'database', 'cluster': 'dev'}).exists())
+
+    def test_icontains_lookup(self):
+        matches = filter_by_labels(AlertGroup.objects.all(), {'service': 'FRONT'}, lookup='icontains')
+        self.assertEqual(list(matches), [self.web])
+
+    def test_missing_key_never_matches(self):
+        self.assertFalse(filter_by_labels(AlertGroup.objects.all(), {'team': 'core'}).exists())
+
+    def test_sync_returns_rows_written(self):
+        self.assertEqual(sync_alert_labels([self.web, self.db]), 4)
+        self.assertEqual(AlertLabel.objects.count(), 4)
@@ -0,0 +1,66 @@
+import datetime
+import glob
+import json
+import os
+from unittest.mock import patch
+
+from dateutil.parser import parse as dateutil_parse
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from alerts.services.payload_parser import parse_alertmanager_payload, parse_timestamp
+
+
+class ParseTimestampTests(SimpleTestCase):
+    def setUp(self):
+        parse_timestamp.cache_clear()
+
+    def test_matches_dateutil_for_alertmanager_forms(self):
+        values = [
+            '2025-04-07T13:00:00Z',
+            '2025-04-07T13:00:00.000Z',
+            '2025-04-07T13:00:00.123456789Z',
+            '2025-04-07T13:00:00.5+03:30',
+            '2025-04-07T13:00:00-05:00',
+            '2025-04-07T13:00:00+00:00',
+            '0001-01-01T00:00:00Z',
+        ]
+        for value in values:
+            with self.subTest(value=value):
+                parsed = parse_timestamp(value)
+                self.assertEqual(parsed, dateutil_parse(value))
+                self.assertEqual(parsed.utcoffset(), dateutil_parse(value).utcoffset())
+
+    @patch('alerts.services.payload_parser.parse_datetime', wraps=dateutil_parse)
+    def test_rfc3339_does_not_use_dateutil(self, mock_dateutil):
+        parse_timestamp('2025-04-07T13:00:00.123Z')
+        mock_dateutil.assert_not_called()
+
+    @patch('alerts.services.payload_parser.parse_datetime', wraps=dateutil_parse)
+    def test_unexpected_formats_fall_back_to_dateutil(self, mock_dateutil):
+        self.assertEqual(parse_timestamp('April 7 2025 13:00 UTC'), dateutil_parse('April 7 2025 13:00 UTC'))
+        self.assertEqual(parse_timestamp('2025-04-07T13:00:00'), datetime.datetime(2025, 4, 7, 13, 0))
+        self.assertEqual(mock_dateutil.call_count, 2)
+        with self.assertRaises(ValueError):
+            parse_timestamp('invalid-date-format')
+
+    def test_repeated_values_are_cached(self):
+        parse_timestamp('2025-04-07T13:00:00Z')
+        parse_timestamp('2025-04-07T13:00:00Z')
+        self.assertEqual(parse_timestamp.cache_info().hits, 1)
+
+
+class ParseAlertmanagerPayloadTests(SimpleTestCase):
+    def test_fixtures_parse_like_dateutil(self):
+        fixtures = glob.glob(os.path.join(settings.BASE_DIR, 'send_fake_data', '*.json'))
+        self.assertTrue(fixtures)
+        for path in fixtures:
+            with open(path) as f:
+                payload = json.load(f)
+            for raw, parsed in zip(payload['alerts'], parse_alertmanager_payload(payload)):
+                with self.subTest(fixture=os.path.basename(path)):
+                    self.assertEqual(parsed['starts_at'], dateutil_parse(raw['startsAt']))
+                    if raw.get('endsAt') == '0001-01-01T00:00:00Z':
+                        self.assertIsNone(parsed['ends_at'])
+                    else:
+                        self.assertEqual(parsed['ends_at'], dateutil_parse(raw['endsAt']))
@@ -2,7 +2,9 @@
 
 import unittest
 import datetime
+import io
 import json
+from django.core.management import call_command
 from django.test import TestCase, TransactionTestCase # Use TestCase for DB interactions
 from django.contrib.auth.models import User
 from django.utils import timezone
@@ -14,10 +16,11 @@ from ..models import AlertGroup, AlertInstance, AlertAcknowledgementHistory, Ale
 from ..services.alerts_processor import (
     acknowledge_alert,
     get_active_firing_instance,
+    get_latest_instance,
     manually_resolve_alert,
     ManualResolutionError,
 )
-from ..services.alert_state_manager import update_alert_state
+from ..services.alert_state_manager import update_alert_state, update_alert_states
 from ..services.payload_parser import parse_alertmanager_payload
 
 # --- Tests for alerts_processor.py ---
@@ -77,7 +80,22 @@ class GetActiveFiringInstanceTests(TestCase):
         instance = get_active_firing_instance(self.alert_group_resolved)
         self.assertIsNone(instance)
 
-    # Add more tests for get_active_firing_instance based on test_forms.py results
+    def test_get_active_instance_uses_pointer(self):
+        self.alert_group_active.active_instance = self.active_instance
+        self.alert_group_active.save(update_fields=['active_instance'])
+        group = AlertGroup.objects.select_related('active_instance').get(pk=self.alert_group_active.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_active_firing_instance(group), self.active_instance)
+
+    def test_get_active_instance_ignores_stale_pointer(self):
+        self.alert_group_active.active_instance = self.resolved_instance
+        self.alert_group_active.save(update_fields=['active_instance'])
+
+        self.assertEqual(get_active_firing_instance(self.alert_group_active), self.active_instance)
+
+    def test_get_latest_instance_falls_back_without_pointer(self):
+        self.assertEqual(get_latest_instance(self.alert_group_active), self.active_instance)
 
 
 class ManualResolveAlertTests(TestCase):
@@ -110,6 +128,20 @@ class ManualResolveAlertTests(TestCase):
         self.assertEqual(self.instance.resolution_type, 'manual')
         self.assertAlmostEqual(self.instance.ended_at, resolved_at, delta=datetime.timedelta(seconds=1))
 
+    def test_manual_resolve_clears_active_instance(self):
+        AlertGroup.objects.filter(pk=self.alert_group.pk).update(
+            active_instance=self.instance, latest_instance=self.instance
+        )
+        self.alert_group.refresh_from_db()
+
+        manually_resolve_alert(self.alert_group, self.user, timezone.now())
+
+        self.assertIsNone(self.alert_group.active_instance_id)
+        self.alert_group.refresh_from_db()
+        self.assertIsNone(self.alert_group.active_instance_id)
+        self.assertIsNone(self.alert_group.current_problem_start)
+        self.assertEqual(self.alert_group.latest_instance_id, self.instance.id)
+
     def test_manual_resolve_creates_comment_when_note_provided(self):
         resolved_at = timezone.now() - datetime.timedelta(minutes=2)
         manually_resolve_alert(self.alert_group, self.user, resolved_at, note='Investigated and mitigated')
@@ -526,6 +558,183 @@ class UpdateAlertStateTests(TestCase):
             self.assertIsNotNone(mock_error.call_args[1]['exc_info']) # Check exc_info is True
 
 
+class InstancePointerTests(TestCase):
+
+    def _alert(self, status, starts_at, ends_at=None):
+        return {
+            'fingerprint': 'pointer-fg', 'status': status, 'labels': {'alertname': 'Pointer'},
+            'starts_at': starts_at, 'ends_at': ends_at, 'annotations': {}, 'generator_url': '',
+        }
+
+    def _pointers(self):
+        group = AlertGroup.objects.get(fingerprint='pointer-fg')
+        return group.active_instance_id, group.latest_instance_id
+
+    def test_pointers_follow_fire_refire_and_resolve(self):
+        t0 = timezone.now() - datetime.timedelta(minutes=30)
+        t1 = t0 + datetime.timedelta(minutes=10)
+
+        group, first = update_alert_state(self._alert('firing', t0))
+        self.assertEqual(self._pointers(), (first.id, first.id))
+        self.assertEqual((group.active_instance_id, group.latest_instance_id), (first.id, first.id))
+
+        _, second = update_alert_state(self._alert('firing', t1))
+        self.assertEqual(self._pointers(), (second.id, second.id))
+
+        update_alert_state(self._alert('resolved', t1, timezone.now()))
+        self.assertEqual(self._pointers(), (None, second.id))
+
+    def test_start_columns_follow_instances(self):
+        t0 = timezone.now() - datetime.timedelta(minutes=30)
+        t1 = t0 + datetime.timedelta(minutes=10)
+
+        group, _ = update_alert_state(self._alert('firing', t0))
+        self.assertEqual((group.first_instance_start, group.current_problem_start, group.latest_instance_start), (t0, t0, t0))
+
+        update_alert_state(self._alert('firing', t1))
+        group.refresh_from_db()
+        self.assertEqual((group.first_instance_start, group.current_problem_start, group.latest_instance_start), (t0, t1, t1))
+
+        update_alert_state(self._alert('resolved', t1, timezone.now()))
+        group.refresh_from_db()
+        self.assertEqual((group.first_instance_start, group.current_problem_start, group.latest_instance_start), (t0, None, t1))
+
+    def test_out_of_order_start_keeps_latest(self):
+        t0 = timezone.now() - datetime.timedelta(minutes=30)
+        _, newer = update_alert_state(self._alert('resolved', t0, t0 + datetime.timedelta(minutes=1)))
+        update_alert_state(self._alert('resolved', t0 - datetime.timedelta(minutes=10), t0))
+
+        self.assertEqual(self._pointers(), (None, newer.id))
+
+    def test_backfill_command(self):
+        t0 = timezone.now() - datetime.timedelta(minutes=30)
+        group = AlertGroup.objects.create(fingerprint='pointer-fg', name='Pointer', labels={})
+        AlertInstance.objects.create(
+            alert_group=group, status='resolved', started_at=t0, ended_at=t0, annotations={}
+        )
+        firing = AlertInstance.objects.create(
+            alert_group=group, status='firing', started_at=t0 + datetime.timedelta(minutes=5), annotations={}
+        )
+        self.assertEqual(self._pointers(), (None, None))
+
+        call_command('backfill_instance_pointers', batch_size=1, stdout=io.StringIO())
+
+        self.assertEqual(self._pointers(), (firing.id, firing.id))
+        group.refresh_from_db()
+        self.assertEqual(group.first_instance_start, t0)
+        self.assertEqual(group.current_problem_start, firing.started_at)
+
+
+class UpdateAlertStatesBatchTests(TestCase):
+
+    def _alert(self, fingerprint, status, starts_at, ends_at=None, labels=None):
+        return {
+            'fingerprint': fingerprint, 'status': status,
+            'labels': labels if labels is not None else {'alertname': fingerprint, 'severity': 'critical'},
+            'starts_at': starts_at, 'ends_at': ends_at, 'annotations': {'summary': fingerprint},
+            'generator_url': '', 'source': 'am-1',
+        }
+
+    def _snapshot(self):
+        groups = {
+            g.fingerprint: (
+                g.current_status, g.total_firing_count, g.source,
+                getattr(g.active_instance, 'started_at', None), getattr(g.latest_instance, 'started_at', None),
+                g.first_instance_start, g.current_problem_start, g.latest_instance_start,
+            )
+            for g in AlertGroup.objects.select_related('active_instance', 'latest_instance')
+        }
+        instances = sorted(
+            (i.alert_group.fingerprint, i.status, i.started_at, i.ended_at, i.resolution_type)
+            for i in AlertInstance.objects.select_related('alert_group')
+        )
+        return groups, instances
+
+    def _scenario(self, t0):
+        """A mixed payload: new groups, re-fire, resolve, duplicate and flapping events."""
+        t1 = t0 + datetime.timedelta(minutes=10)
+        t2 = t0 + datetime.timedelta(minutes=20)
+        existing = AlertGroup.objects.create(
+            fingerprint='existing', name='Existing', labels={}, current_status='firing', total_firing_count=1
+        )
+        AlertInstance.objects.create(alert_group=existing, status='firing', started_at=t0, annotations={})
+        resolved = AlertGroup.objects.create(
+            fingerprint='was-resolved', name='Was Resolved', labels={}, current_status='resolved', total_firing_count=2
+        )
+        AlertInstance.objects.create(
+            alert_group=resolved, status='resolved', started_at=t0, ended_at=t1,
+            annotations={}, resolution_type='normal'
+        )
+        return [
+            self._alert('new-a', 'firing', t0),
+            self._alert('existing', 'firing', t0),  # duplicate firing
+            self._alert('existing', 'firing', t1),  # re-fire -> previous inferred
+            self._alert('was-resolved', 'resolved', t0, t1),  # duplicate resolved
+            self._alert('was-resolved', 'firing', t2),  # transition to firing
+            self._alert('new-b', 'resolved', t1, t2),  # resolved without firing
+            self._alert('new-a', 'resolved', t0, t2),  # resolve within the same payload
+            self._alert('new-a', 'firing', t2),  # flap back to firing
+            self._alert('existing', 'resolved', t0, t2),  # no exact match -> latest open inferred
+        ]
+
+    def test_batch_matches_sequential_semantics(self):
+        t0 = timezone.now() - datetime.timedelta(hours=1)
+        alerts = self._scenario(t0)
+        sequential_results = [update_alert_state(alert) for alert in alerts]
+        expected = self._snapshot()
+        expected_instance_flags = [instance is not None for _, instance in sequential_results]
+
+        AlertInstance.objects.all().delete()
+        AlertGroup.objects.all().delete()
+
+        alerts = self._scenario(t0)
+        batch_results = update_alert_states(alerts)
+
+        self.assertEqual(self._snapshot(), expected)
+        self.assertEqual([instance is not None for _, instance in batch_results], expected_instance_flags)
+        self.assertEqual([group.fingerprint for group, _ in batch_results], [a['fingerprint'] for a in alerts])
+
+    def test_batch_uses_constant_number_of_queries(self):
+        start = timezone.now() - datetime.timedelta(minutes=5)
+        for i in range(10):
+            group = AlertGroup.objects.create(fingerprint=f'fp-{i}', name=f'A{i}', labels={}, current_status='firing')
+            AlertInstance.objects.create(alert_group=group, status='firing', started_at=start, annotations={})
+        alerts = [self._alert(f'fp-{i}', 'resolved', start, timezone.now()) for i in range(10)]
+        alerts += [self._alert(f'new-{i}', 'firing', start) for i in range(40)]
+
+        # Outer savepoint, select groups, savepoint-wrapped bulk insert of groups,
+        # select instances, bulk update groups, bulk insert/update instances,
+        # index the new groups' labels, bump the dashboard rollups (per distinct
+        # key, not per group), refresh and read back the instance pointers.
+        with self.assertNumQueries(22):
+            results = update_alert_states(alerts)
+
+        self.assertEqual(len(results), 50)
+        self.assertEqual(AlertGroup.objects.count(), 50)
+        self.assertEqual(AlertInstance.objects.filter(status='firing').count(), 40)
+        self.assertEqual(
+            AlertInstance.objects.filter(status='resolved', resolution_type='normal', ended_at__isnull=False).count(), 10
+        )
+
+    def test_batch_increments_firing_count_on_transition(self):
+        group = AlertGroup.objects.create(
+            fingerprint='count-fg', name='Count', labels={}, current_status='resolved', total_firing_count=4
+        )
+        start = timezone.now() - datetime.timedelta(minutes=3)
+
+        results = update_alert_states([self._alert('count-fg', 'firing', start)])
+
+        group.refresh_from_db()
+        self.assertEqual(group.total_firing_count, 5)
+        self.assertEqual(group.current_status, 'firing')
+        self.assertEqual(group.source, 'am-1')
+        self.assertEqual(results[0][0].total_firing_count, 5)
+
+    def test_batch_empty_input(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(update_alert_states([]), [])
+
+
 # --- Tests for payload_parser.py ---
 
 class ParsePayloadTests(unittest.TestCase): # Inherit from unittest.TestCase
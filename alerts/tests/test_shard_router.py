@@ -0,0 +1,84 @@
+import json
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from alerts.services.shard_router import AlertShardRouter
+
+
+SHARDING_SETTINGS = {'ENABLED': True, 'SHARDS': 4, 'QUEUE_PREFIX': 'alerts.'}
+
+
+def _alert(fingerprint, status='firing'):
+    return {'fingerprint': fingerprint, 'status': status, 'labels': {'alertname': fingerprint}}
+
+
+@override_settings(ALERT_SHARDING=SHARDING_SETTINGS)
+class AlertShardRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = AlertShardRouter()
+
+    def test_shard_is_stable_and_in_range(self):
+        shards = {self.router.shard_for(f"fp-{i}") for i in range(200)}
+        self.assertEqual(shards, {0, 1, 2, 3})
+        self.assertEqual(self.router.shard_for('fp-1'), self.router.shard_for('fp-1'))
+        self.assertEqual(self.router.queue_for(2), 'alerts.2')
+
+    def test_split_keeps_envelope_and_per_fingerprint_order(self):
+        payload = {
+            'receiver': 'webhook',
+            'externalURL': 'http://am',
+            'alerts': [_alert('a'), _alert('b'), _alert('a', 'resolved'), _alert('c')],
+        }
+
+        parts = self.router.split_payload(payload)
+
+        self.assertEqual(sum(len(p['alerts']) for p in parts.values()), 4)
+        for shard, part in parts.items():
+            self.assertEqual(part['receiver'], 'webhook')
+            self.assertEqual(part['externalURL'], 'http://am')
+            for alert in part['alerts']:
+                self.assertEqual(self.router.shard_for(alert['fingerprint']), shard)
+        a_events = [alert['status'] for alert in parts[self.router.shard_for('a')]['alerts'] if alert['fingerprint'] == 'a']
+        self.assertEqual(a_events, ['firing', 'resolved'])
+
+    @patch('alerts.tasks.process_alert_payload_task')
+    def test_dispatch_sends_one_task_per_shard(self, mock_task):
+        payload = {'alerts': [_alert(f"fp-{i}") for i in range(20)]}
+
+        queues = self.router.dispatch(json.dumps(payload))
+
+        self.assertEqual(mock_task.apply_async.call_count, len(queues))
+        for call in mock_task.apply_async.call_args_list:
+            shard = int(call.kwargs['queue'].split('.')[-1])
+            shard_alerts = json.loads(call.kwargs['args'][0])['alerts']
+            self.assertTrue(all(self.router.shard_for(a['fingerprint']) == shard for a in shard_alerts))
+        mock_task.delay.assert_not_called()
+
+    @patch('alerts.tasks.process_alert_payload_batch_task')
+    def test_dispatch_batch_groups_payloads_per_shard(self, mock_task):
+        payloads = [json.dumps({'alerts': [_alert('a')]}), json.dumps({'alerts': [_alert('a', 'resolved')]})]
+
+        queues = self.router.dispatch_batch(payloads)
+
+        self.assertEqual(queues, [self.router.queue_for(self.router.shard_for('a'))])
+        sent = mock_task.apply_async.call_args.kwargs['args'][0]
+        self.assertEqual([json.loads(p)['alerts'][0]['status'] for p in sent], ['firing', 'resolved'])
+
+
+@override_settings(ALERT_SHARDING=SHARDING_SETTINGS)
+class AlertWebhookShardingTests(APITestCase):
+    @patch('alerts.api.views.process_alert_payload_task')
+    @patch('alerts.api.views.alert_shard_router')
+    def test_webhook_routes_through_shards_when_enabled(self, mock_router, mock_task):
+        mock_router.enabled = True
+        payload = {'receiver': 'webhook', 'status': 'firing', 'alerts': [_alert('a')]}
+
+        response = self.client.post(reverse('alerts:alert-webhook'), payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_router.dispatch.assert_called_once()
+        mock_task.delay.assert_not_called()
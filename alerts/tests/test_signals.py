@@ -32,24 +32,24 @@ class SilenceRuleSignalTests(TestCase):
             labels={'alertname': 'ResolvedAlert', 'env': 'prod'}
         )
 
-    @patch('alerts.signals._rescan_alerts_for_silence')
-    def test_handle_silence_rule_save_on_create(self, mock_rescan):
+    @patch('alerts.signals._schedule_silence_reevaluation')
+    def test_handle_silence_rule_save_on_create(self, mock_schedule):
         """
-        Test that _rescan_alerts_for_silence is called when a SilenceRule is created.
+        Test that a re-evaluation for the new matchers is scheduled when a SilenceRule is created.
         """
-        SilenceRule.objects.create(
+        rule = SilenceRule.objects.create(
             matchers={'alertname': 'TestAlert'},
             starts_at=timezone.now(),
             ends_at=timezone.now() + datetime.timedelta(hours=1),
             comment='Test rule',
             created_by=self.user
         )
-        mock_rescan.assert_called_once()
+        mock_schedule.assert_called_once_with(rule.id, {'alertname': 'TestAlert'}, None)
 
-    @patch('alerts.signals._rescan_alerts_for_silence')
-    def test_handle_silence_rule_save_on_update(self, mock_rescan):
+    @patch('alerts.signals._schedule_silence_reevaluation')
+    def test_handle_silence_rule_save_on_update(self, mock_schedule):
         """
-        Test that _rescan_alerts_for_silence is called when a SilenceRule is updated.
+        Test that a re-evaluation for the new and old matchers is scheduled when a SilenceRule is updated.
         """
         rule = SilenceRule.objects.create(
             matchers={'alertname': 'TestAlert'},
@@ -58,16 +58,16 @@ class SilenceRuleSignalTests(TestCase):
             comment='Test rule',
             created_by=self.user
         )
-        mock_rescan.reset_mock() # Reset mock after creation call
+        mock_schedule.reset_mock() # Reset mock after creation call
 
-        rule.comment = 'Updated comment'
+        rule.matchers = {'alertname': 'AnotherAlert'}
         rule.save()
-        mock_rescan.assert_called_once()
+        mock_schedule.assert_called_once_with(rule.id, {'alertname': 'AnotherAlert'}, {'alertname': 'TestAlert'})
 
-    @patch('alerts.signals._rescan_alerts_for_silence')
-    def test_handle_silence_rule_delete(self, mock_rescan):
+    @patch('alerts.signals._schedule_silence_reevaluation')
+    def test_handle_silence_rule_delete(self, mock_schedule):
         """
-        Test that _rescan_alerts_for_silence is called when a SilenceRule is deleted.
+        Test that a re-evaluation for the old matchers is scheduled when a SilenceRule is deleted.
         """
         rule = SilenceRule.objects.create(
             matchers={'alertname': 'TestAlert'},
@@ -76,27 +76,27 @@ class SilenceRuleSignalTests(TestCase):
             comment='Test rule',
             created_by=self.user
         )
-        mock_rescan.reset_mock() # Reset mock after creation call
+        rule_id = rule.id
+        mock_schedule.reset_mock() # Reset mock after creation call
 
         rule.delete()
-        mock_rescan.assert_called_once()
+        mock_schedule.assert_called_once_with(rule_id, previous_matchers={'alertname': 'TestAlert'})
 
-    @patch('alerts.signals.check_alert_silence')
-    def test_rescan_alerts_for_silence_logic(self, mock_check_alert_silence):
+    @patch('alerts.tasks.reevaluate_silences_task.delay')
+    def test_reevaluation_is_queued_after_commit(self, mock_delay):
         """
-        Test the internal logic of _rescan_alerts_for_silence, ensuring it queries
-        non-resolved alerts and calls check_alert_silence for each.
+        Test that the re-evaluation task is only queued once the rule change commits.
         """
-        from alerts.signals import _rescan_alerts_for_silence
-
-        # Call the function directly
-        _rescan_alerts_for_silence()
+        with self.captureOnCommitCallbacks() as callbacks:
+            rule = SilenceRule.objects.create(
+                matchers={'alertname': 'TestAlert'},
+                starts_at=timezone.now(),
+                ends_at=timezone.now() + datetime.timedelta(hours=1),
+                comment='Test rule',
+                created_by=self.user
+            )
+            mock_delay.assert_not_called()
 
-        # Assert that check_alert_silence was called for the two firing alerts
-        self.assertEqual(mock_check_alert_silence.call_count, 2)
-        
-        # Verify calls with specific alert groups
-        called_alert_groups = [call.args[0] for call in mock_check_alert_silence.call_args_list]
-        self.assertIn(self.alert_group_1, called_alert_groups)
-        self.assertIn(self.alert_group_2, called_alert_groups)
-        self.assertNotIn(self.alert_group_resolved, called_alert_groups)
\ No newline at end of file
+        for callback in callbacks:
+            callback()
+        mock_delay.assert_called_once_with(rule.id, {'alertname': 'TestAlert'}, None)
\ No newline at end of file
@@ -0,0 +1,139 @@
+import datetime
+from types import SimpleNamespace
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..models import AlertGroup, SilenceRule
+from ..services.silence_index import SilenceIndex, silence_index_registry
+from ..services.silence_matcher import check_alert_silence, get_active_silence_rules
+
+
+def _rule(rule_id, matchers, starts_at, ends_at):
+    return SimpleNamespace(id=rule_id, matchers=matchers, starts_at=starts_at, ends_at=ends_at)
+
+
+class SilenceIndexTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+
+    def _at(self, minutes):
+        return self.now + datetime.timedelta(minutes=minutes)
+
+    def test_only_rules_filed_under_the_labels_are_candidates(self):
+        index = SilenceIndex([
+            _rule(1, {'alertname': 'DiskFull'}, self._at(-10), self._at(10)),
+            _rule(2, {'alertname': 'DiskFull', 'instance': 'db-1'}, self._at(-10), self._at(10)),
+            _rule(3, {'alertname': 'CPU'}, self._at(-10), self._at(10)),
+            _rule(4, {'team': None}, self._at(-10), self._at(10)),  # matches a missing label
+            _rule(5, {}, self._at(-10), self._at(10)),  # never matches
+        ], self.now)
+
+        matched = index.matching_rules({'alertname': 'DiskFull', 'instance': 'db-2'})
+        self.assertEqual(sorted(rule.id for rule in matched), [1, 4])
+        self.assertEqual(sorted(index.buckets), [('alertname', 'CPU'), ('alertname', 'DiskFull')])
+
+    def test_boundaries_activate_and_expire_rules_without_rebuild(self):
+        index = SilenceIndex([
+            _rule(1, {'job': 'node'}, self._at(-10), self._at(5)),
+            _rule(2, {'job': 'node'}, self._at(2), self._at(20)),
+            _rule(3, {'job': 'node'}, self._at(30), self._at(31)),
+        ], self.now)
+        labels = {'job': 'node'}
+
+        self.assertEqual([rule.id for rule in index.matching_rules(labels)], [1])
+        self.assertEqual(index.next_transition(), self._at(2))
+
+        index.advance(self._at(3))
+        self.assertEqual(sorted(rule.id for rule in index.matching_rules(labels)), [1, 2])
+
+        index.advance(self._at(40))
+        self.assertEqual(index.matching_rules(labels), [])
+        self.assertEqual(index.active_count, 0)
+        self.assertIsNone(index.next_transition())
+
+
+class SilenceIndexRegistryTests(TestCase):
+    def setUp(self):
+        silence_index_registry.clear()
+        self.addCleanup(silence_index_registry.clear)
+        self.now = timezone.now()
+
+    def _silence(self, matchers, starts=-60, ends=60):
+        return SilenceRule.objects.create(
+            matchers=matchers, comment='test',
+            starts_at=self.now + datetime.timedelta(minutes=starts),
+            ends_at=self.now + datetime.timedelta(minutes=ends),
+        )
+
+    def test_results_are_the_same_as_a_full_scan(self):
+        self._silence({'alertname': 'DiskFull'}, ends=30)
+        self._silence({'alertname': 'DiskFull', 'instance': 'db-1'}, ends=90)
+        self._silence({'severity': 'warning'}, starts=10)  # not active yet
+        self._silence({'severity': 'warning'}, starts=-90, ends=-30)  # expired
+        self._silence({'team': None})
+        self._silence({'replicas': 3})
+        groups = [
+            AlertGroup.objects.create(fingerprint=f"fp-{i}", name='A', labels=labels)
+            for i, labels in enumerate([
+                {'alertname': 'DiskFull', 'instance': 'db-1', 'team': 'db'},
+                {'alertname': 'DiskFull', 'instance': 'db-2', 'team': 'db'},
+                {'alertname': 'CPU', 'severity': 'warning', 'team': 'web'},
+                {'alertname': 'CPU'},
+                {'alertname': 'Pods', 'replicas': 3, 'team': 'k8s'},
+            ])
+        ]
+
+        active_rules = get_active_silence_rules()
+        for group in groups:
+            expected = check_alert_silence(group, active_rules=active_rules), group.silenced_until
+            group.refresh_from_db()
+            self.assertEqual((check_alert_silence(group), group.silenced_until), expected, group.labels)
+
+        self.assertEqual(
+            list(AlertGroup.objects.order_by('fingerprint').values_list('is_silenced', flat=True)),
+            [True, True, False, True, True],
+        )
+        self.assertEqual(groups[0].silenced_until, self.now + datetime.timedelta(minutes=90))
+
+    def test_index_is_reused_until_a_rule_changes(self):
+        rule = self._silence({'alertname': 'DiskFull'})
+        group = AlertGroup.objects.create(fingerprint='fp-1', name='A', labels={'alertname': 'DiskFull'})
+        check_alert_silence(group)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(check_alert_silence(group))
+
+        rule.matchers = {'alertname': 'CPU'}
+        rule.save()
+        self.assertEqual(silence_index_registry.matching_rules(group.labels), [])
+
+        self._silence({'alertname': 'DiskFull'})
+        self.assertEqual(len(silence_index_registry.matching_rules(group.labels)), 1)
+
+        SilenceRule.objects.all().delete()
+        self.assertEqual(silence_index_registry.matching_rules(group.labels), [])
+
+    def test_rules_saved_by_other_processes_are_seen_through_the_table_version(self):
+        labels = {'alertname': 'DiskFull'}
+        self.assertEqual(silence_index_registry.matching_rules(labels), [])
+
+        # bulk_create bypasses the signals, like a save whose cache bump this process cannot see
+        SilenceRule.objects.bulk_create([SilenceRule(
+            matchers=labels, comment='test',
+            starts_at=self.now - datetime.timedelta(minutes=60), ends_at=self.now + datetime.timedelta(minutes=60),
+        )])
+
+        with override_settings(SILENCE_INDEX={'VERSION_PROBE_SECONDS': 60}):
+            self.assertEqual(silence_index_registry.matching_rules(labels), [])
+        with override_settings(SILENCE_INDEX={'VERSION_PROBE_SECONDS': 0}):
+            self.assertEqual(len(silence_index_registry.matching_rules(labels)), 1)
+
+    def test_rules_starting_later_take_effect_without_a_rebuild(self):
+        self._silence({'alertname': 'DiskFull'}, starts=10, ends=20)
+        labels = {'alertname': 'DiskFull'}
+        self.assertEqual(silence_index_registry.matching_rules(labels, now=self.now), [])
+
+        with self.assertNumQueries(0):
+            later = self.now + datetime.timedelta(minutes=15)
+            self.assertEqual(len(silence_index_registry.matching_rules(labels, now=later)), 1)
+            self.assertEqual(silence_index_registry.next_transition(now=later), self.now + datetime.timedelta(minutes=20))
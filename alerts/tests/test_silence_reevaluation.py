@@ -0,0 +1,90 @@
+import datetime
+from unittest.mock import patch
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from ..models import AlertGroup, SilenceRule
+from ..services.silence_index import silence_index_registry
+from ..services.silence_matcher import affected_alert_group_ids, reevaluate_silences
+from ..tasks import reevaluate_silences_task
+
+
+class SilenceReevaluationTests(TestCase):
+    def setUp(self):
+        silence_index_registry.clear()
+        self.addCleanup(silence_index_registry.clear)
+        self.now = timezone.now()
+        self.db_1 = self._group('db-1', {'alertname': 'DiskFull', 'instance': 'db-1'})
+        self.db_2 = self._group('db-2', {'alertname': 'DiskFull', 'instance': 'db-2'})
+        self.cpu = self._group('cpu', {'alertname': 'CPU', 'instance': 'db-1'})
+        self.resolved = self._group('old', {'alertname': 'DiskFull', 'instance': 'db-3'}, current_status='resolved')
+
+    def _group(self, fingerprint, labels, **kwargs):
+        return AlertGroup.objects.create(fingerprint=fingerprint, name=fingerprint, labels=labels, **kwargs)
+
+    def _silence(self, matchers, **kwargs):
+        return SilenceRule.objects.create(
+            matchers=matchers, comment='test',
+            starts_at=self.now - datetime.timedelta(minutes=5), ends_at=self.now + datetime.timedelta(hours=1),
+            **kwargs,
+        )
+
+    def test_affected_groups_are_new_matches_and_groups_silenced_under_old_matchers(self):
+        AlertGroup.objects.filter(pk__in=[self.cpu.pk, self.resolved.pk]).update(is_silenced=True)
+
+        self.assertEqual(affected_alert_group_ids({'alertname': 'DiskFull'}), {self.db_1.pk, self.db_2.pk})
+        self.assertEqual(
+            affected_alert_group_ids({'instance': 'db-2'}, previous_matchers={'instance': 'db-1'}),
+            {self.db_2.pk, self.cpu.pk},
+        )
+        self.assertEqual(affected_alert_group_ids(previous_matchers={'alertname': 'DiskFull'}), {self.resolved.pk})
+        self.assertEqual(affected_alert_group_ids({}, previous_matchers=None), set())
+
+    def test_matcher_expecting_a_missing_label_widens_the_candidates(self):
+        self.assertEqual(
+            affected_alert_group_ids({'alertname': 'DiskFull', 'team': None}), {self.db_1.pk, self.db_2.pk},
+        )
+
+    def test_reevaluate_updates_changed_groups_in_chunked_bulk_updates(self):
+        rule = self._silence({'alertname': 'DiskFull'})
+        progress = []
+        ids = [self.db_1.pk, self.db_2.pk, self.cpu.pk]
+
+        with patch.object(AlertGroup.objects, 'bulk_update', wraps=AlertGroup.objects.bulk_update) as bulk_update:
+            changed = reevaluate_silences(ids, chunk_size=2, progress=lambda *args: progress.append(args))
+
+        self.assertEqual(changed, 2)
+        self.assertEqual(progress, [(2, 3, 2), (3, 3, 2)])
+        bulk_update.assert_called_once()  # the second chunk has no changes
+        self.db_1.refresh_from_db()
+        self.assertTrue(self.db_1.is_silenced)
+        self.assertEqual(self.db_1.silenced_until, rule.ends_at)
+        self.cpu.refresh_from_db()
+        self.assertFalse(self.cpu.is_silenced)
+
+    @override_settings(SILENCE_REEVALUATION={'CHUNK_SIZE': 1})
+    def test_task_unsilences_groups_after_the_rule_is_deleted(self):
+        rule = self._silence({'instance': 'db-1'})
+        reevaluate_silences_task(rule.id, rule.matchers)
+        self.assertEqual(AlertGroup.objects.filter(is_silenced=True).count(), 2)
+
+        rule_id = rule.id
+        rule.delete()
+        result = reevaluate_silences_task(rule_id, previous_matchers={'instance': 'db-1'})
+
+        self.assertEqual(result, {'rule_id': rule_id, 'total': 2, 'changed': 2})
+        self.assertFalse(AlertGroup.objects.filter(is_silenced=True).exists())
+
+    def test_task_does_not_use_a_stale_worker_index(self):
+        with patch.object(silence_index_registry, 'version', return_value=(None, None)):
+            # Compiled before the rule exists; the rule's version bump never reaches this worker
+            silence_index_registry.matching_rules(self.db_1.labels)
+            [rule] = SilenceRule.objects.bulk_create([SilenceRule(
+                matchers={'instance': 'db-1'}, comment='test',
+                starts_at=self.now - datetime.timedelta(minutes=5), ends_at=self.now + datetime.timedelta(hours=1),
+            )])
+
+            result = reevaluate_silences_task(rule.id, rule.matchers)
+
+        self.assertEqual(result['changed'], 2)
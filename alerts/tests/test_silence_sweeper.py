@@ -0,0 +1,93 @@
+import datetime
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..models import AlertGroup, SilenceRule
+from ..services.silence_index import silence_index_registry
+from ..services.silence_sweeper import STATE_KEY, run_silence_sweep
+from ..tasks import sweep_silences_task
+
+
+class SilenceSweeperTests(TestCase):
+    def setUp(self):
+        cache.delete(STATE_KEY)
+        silence_index_registry.clear()
+        self.addCleanup(silence_index_registry.clear)
+        self.addCleanup(cache.delete, STATE_KEY)
+        self.now = timezone.now()
+        self.db_1 = AlertGroup.objects.create(fingerprint='db-1', name='A', labels={'alertname': 'DiskFull', 'instance': 'db-1'})
+        self.db_2 = AlertGroup.objects.create(fingerprint='db-2', name='A', labels={'alertname': 'DiskFull', 'instance': 'db-2'})
+        self.cpu = AlertGroup.objects.create(fingerprint='cpu', name='B', labels={'alertname': 'CPU'})
+
+    def _at(self, minutes):
+        return self.now + datetime.timedelta(minutes=minutes)
+
+    def _silence(self, matchers, starts, ends):
+        return SilenceRule.objects.create(matchers=matchers, comment='test', starts_at=self._at(starts), ends_at=self._at(ends))
+
+    def _silenced(self):
+        return set(AlertGroup.objects.filter(is_silenced=True).values_list('fingerprint', flat=True))
+
+    def test_future_rule_activates_and_expires_on_its_own(self):
+        self._silence({'alertname': 'DiskFull'}, starts=10, ends=20)
+
+        self.assertEqual(run_silence_sweep(now=self.now)['next_due'], self._at(10))
+        self.assertEqual(self._silenced(), set())
+
+        result = run_silence_sweep(now=self._at(11))
+        self.assertEqual((result['activated'], result['next_due']), (2, self._at(20)))
+        self.assertEqual(self._silenced(), {'db-1', 'db-2'})
+        self.db_1.refresh_from_db()
+        self.assertEqual(self.db_1.silenced_until, self._at(20))
+
+        result = run_silence_sweep(now=self._at(21))
+        self.assertEqual((result['expired'], result['next_due']), (2, None))
+        self.assertEqual(self._silenced(), set())
+
+    def test_idle_ticks_do_not_touch_the_database(self):
+        self._silence({'alertname': 'DiskFull'}, starts=10, ends=20)
+        run_silence_sweep(now=self.now)
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(run_silence_sweep(now=self._at(5)))
+            self.assertEqual(sweep_silences_task(), "No silence transition due")
+
+    def test_one_update_per_transition_and_longer_silences_are_kept(self):
+        self._silence({'alertname': 'DiskFull'}, starts=-10, ends=5)
+        self._silence({'instance': 'db-2'}, starts=-10, ends=60)
+        self._silence({'alertname': 'CPU'}, starts=2, ends=30)
+        run_silence_sweep(now=self.now)
+        # Without a previous sweep, every active rule is applied
+        self.assertEqual(self._silenced(), {'db-1', 'db-2'})
+
+        with self.assertNumQueries(5):
+            # expiry, started rules, CPU activation, savepoint and release
+            result = run_silence_sweep(now=self._at(6))
+
+        self.assertEqual((result['expired'], result['activated']), (1, 1))
+        self.assertEqual(self._silenced(), {'db-2', 'cpu'})
+        self.db_2.refresh_from_db()
+        self.assertEqual(self.db_2.silenced_until, self._at(60))
+
+    def test_rule_changes_make_the_next_tick_due(self):
+        run_silence_sweep(now=self.now)
+        self.assertIsNone(run_silence_sweep(now=self._at(1)))
+
+        self._silence({'alertname': 'CPU'}, starts=5, ends=10)
+
+        self.assertEqual(run_silence_sweep(now=self._at(2))['next_due'], self._at(5))
+
+    @override_settings(SILENCE_INDEX={'VERSION_PROBE_SECONDS': 0})
+    def test_rules_saved_by_other_processes_make_the_next_tick_due(self):
+        self.assertIsNone(run_silence_sweep(now=self.now)['next_due'])
+        self.assertIsNone(run_silence_sweep(now=self._at(1)))
+
+        # bulk_create bypasses the signals, like a rule saved where this worker's cache cannot see it
+        SilenceRule.objects.bulk_create([
+            SilenceRule(matchers={'alertname': 'CPU'}, comment='test', starts_at=self._at(5), ends_at=self._at(10)),
+        ])
+
+        self.assertEqual(run_silence_sweep(now=self._at(2))['next_due'], self._at(5))
+        self.assertEqual(run_silence_sweep(now=self._at(6))['activated'], 1)
+        self.assertEqual(self._silenced(), {'cpu'})
@@ -2,8 +2,9 @@ import json
 import logging
 from django.test import TestCase
 from unittest.mock import patch, MagicMock
-from alerts.tasks import process_alert_payload_task
+from alerts.tasks import process_alert_payload_task, process_alert_payload_batch_task
 from alerts.models import AlertGroup, AlertInstance
+from alerts.services.alert_deduplicator import alert_deduplicator
 
 class ProcessAlertPayloadTaskTests(TestCase):
     def setUp(self):
@@ -25,6 +26,9 @@ class ProcessAlertPayloadTaskTests(TestCase):
         self.mock_alert_instance = MagicMock(spec=AlertInstance)
         self.mock_alert_instance.id = 101
 
+        # Running the commit callbacks remembers the alert as already processed
+        self.addCleanup(alert_deduplicator.forget, ["test_fingerprint_1"])
+
         # Capture logs for assertion
         self.logger = logging.getLogger('alerts.tasks')
         self.log_stream = MagicMock()
@@ -32,19 +36,24 @@ class ProcessAlertPayloadTaskTests(TestCase):
         self.logger.setLevel(logging.INFO)
 
     @patch('alerts.tasks.parse_alertmanager_payload')
-    @patch('alerts.tasks.update_alert_state')
-    @patch('alerts.tasks.alert_processed.send')
+    @patch('alerts.tasks.update_alert_states')
+    @patch('alerts.services.enrichment.alert_processed.send')
     def test_process_alert_payload_task_success(self, mock_signal_send, mock_update_alert_state, mock_parse_payload):
         """
         Test successful processing of an alert payload.
         """
         mock_parse_payload.return_value = [self.mock_payload['alerts'][0]]
-        mock_update_alert_state.return_value = (self.mock_alert_group, self.mock_alert_instance)
+        mock_update_alert_state.return_value = [(self.mock_alert_group, self.mock_alert_instance)]
 
-        result = process_alert_payload_task(json.dumps(self.mock_payload))
+        with self.captureOnCommitCallbacks() as callbacks:
+            result = process_alert_payload_task(json.dumps(self.mock_payload))
 
         mock_parse_payload.assert_called_once_with(self.mock_payload)
-        mock_update_alert_state.assert_called_once_with(self.mock_payload['alerts'][0])
+        mock_update_alert_state.assert_called_once_with([self.mock_payload['alerts'][0]])
+        # The signal is only dispatched by the enrichment stage after commit
+        mock_signal_send.assert_not_called()
+        for callback in callbacks:
+            callback()
         mock_signal_send.assert_called_once_with(
             sender=self.mock_alert_group.__class__,
             alert_group=self.mock_alert_group,
@@ -70,8 +79,8 @@ class ProcessAlertPayloadTaskTests(TestCase):
         self.assertTrue(any("Failed to deserialize payload JSON:" in msg for msg in log_messages))
 
     @patch('alerts.tasks.parse_alertmanager_payload')
-    @patch('alerts.tasks.update_alert_state')
-    @patch('alerts.tasks.alert_processed.send')
+    @patch('alerts.tasks.update_alert_states')
+    @patch('alerts.services.enrichment.alert_processed.send')
     def test_process_alert_payload_task_empty_alerts(self, mock_signal_send, mock_update_alert_state, mock_parse_payload):
         """
         Test handling when payload parses into zero alerts.
@@ -98,7 +107,7 @@ class ProcessAlertPayloadTaskTests(TestCase):
         self.assertIn("Task failed during direct call: Parsing Error", self.log_stream.write.call_args[0][0])
 
     @patch('alerts.tasks.parse_alertmanager_payload')
-    @patch('alerts.tasks.update_alert_state', side_effect=Exception("Update Error"))
+    @patch('alerts.tasks.update_alert_states', side_effect=Exception("Update Error"))
     def test_process_alert_payload_task_update_exception(self, mock_update_alert_state, mock_parse_payload):
         """
         Test handling of exceptions during alert state update.
@@ -109,23 +118,59 @@ class ProcessAlertPayloadTaskTests(TestCase):
             process_alert_payload_task(json.dumps(self.mock_payload))
 
         mock_parse_payload.assert_called_once_with(self.mock_payload)
-        mock_update_alert_state.assert_called_once_with(self.mock_payload['alerts'][0])
+        mock_update_alert_state.assert_called_once_with([self.mock_payload['alerts'][0]])
         self.assertIn("Task failed during direct call: Update Error", self.log_stream.write.call_args[0][0])
 
     @patch('alerts.tasks.parse_alertmanager_payload')
-    @patch('alerts.tasks.update_alert_state')
-    @patch('alerts.tasks.alert_processed.send')
+    @patch('alerts.tasks.update_alert_states')
+    @patch('alerts.services.enrichment.alert_processed.send')
     def test_process_alert_payload_task_update_returns_none(self, mock_signal_send, mock_update_alert_state, mock_parse_payload):
         """
         Test handling when update_alert_state returns None (e.g., no changes made).
         """
         mock_parse_payload.return_value = [self.mock_payload['alerts'][0]]
-        mock_update_alert_state.return_value = (None, None) # Simulate no group/instance returned
+        mock_update_alert_state.return_value = [(None, None)] # Simulate no group/instance returned
 
-        result = process_alert_payload_task(json.dumps(self.mock_payload))
+        with self.captureOnCommitCallbacks(execute=True):
+            result = process_alert_payload_task(json.dumps(self.mock_payload))
 
         mock_parse_payload.assert_called_once_with(self.mock_payload)
-        mock_update_alert_state.assert_called_once_with(self.mock_payload['alerts'][0])
+        mock_update_alert_state.assert_called_once_with([self.mock_payload['alerts'][0]])
         mock_signal_send.assert_not_called()
         self.assertEqual(result, "Processed alerts successfully")
-        self.assertIn("update_alert_state returned None for alert:", self.log_stream.write.call_args[0][0])
\ No newline at end of file
+        self.assertIn("update_alert_states returned no instance for alert:", self.log_stream.write.call_args[0][0])
+
+
+class ProcessAlertPayloadBatchTaskTests(TestCase):
+    def _payload(self, fingerprint, status='firing'):
+        return {"alerts": [{"labels": {"alertname": fingerprint}, "fingerprint": fingerprint, "status": status}]}
+
+    @patch('alerts.tasks.parse_alertmanager_payload')
+    @patch('alerts.tasks.update_alert_states')
+    def test_batch_applies_all_payloads_in_one_call(self, mock_update, mock_parse):
+        payloads = [self._payload('fp1'), self._payload('fp2', 'resolved')]
+        mock_parse.side_effect = lambda payload: payload['alerts']
+        mock_update.return_value = [(None, None), (None, None)]
+
+        result = process_alert_payload_batch_task([json.dumps(p) for p in payloads])
+
+        self.assertEqual(result, "Processed 2 payloads successfully")
+        mock_update.assert_called_once_with(payloads[0]['alerts'] + payloads[1]['alerts'])
+
+    @patch('alerts.tasks.parse_alertmanager_payload')
+    @patch('alerts.tasks.update_alert_states')
+    def test_batch_skips_undecodable_payloads(self, mock_update, mock_parse):
+        mock_parse.side_effect = lambda payload: payload['alerts']
+        mock_update.return_value = [(None, None)]
+
+        result = process_alert_payload_batch_task(['{"alerts": [', json.dumps(self._payload('fp1'))])
+
+        self.assertEqual(result, "Processed 1 payloads successfully")
+        mock_parse.assert_called_once_with(self._payload('fp1'))
+
+    @patch('alerts.tasks.update_alert_states')
+    def test_batch_of_empty_payloads(self, mock_update):
+        result = process_alert_payload_batch_task([json.dumps({"alerts": []})])
+
+        self.assertEqual(result, "Parsed zero alerts")
+        mock_update.assert_not_called()
@@ -6,7 +6,7 @@ from django.conf import settings # Import settings
 from datetime import timedelta, datetime
 import pytz
 import json
-from unittest.mock import patch, call
+from unittest.mock import patch
 from django.contrib import messages
 from django.contrib.auth.forms import AuthenticationForm
 
@@ -40,6 +40,19 @@ class AlertListViewTest(TestCase):
         self.assertIn('alerts', response.context)
         self.assertEqual(len(response.context['alerts']), 3) # Check if all alerts are initially listed
 
+    def test_alert_list_orders_by_latest_instance_start_and_counts_totals(self):
+        now = timezone.now()
+        AlertGroup.objects.filter(pk=self.alert1.pk).update(latest_instance_start=now - timedelta(hours=2))
+        AlertGroup.objects.filter(pk=self.alert2.pk).update(latest_instance_start=now)
+        AlertGroup.objects.filter(pk=self.alert3.pk).update(latest_instance_start=now - timedelta(hours=1))
+
+        response = self.client.get(reverse('alerts:alert-list'))
+
+        self.assertEqual([a.pk for a in response.context['alerts']], [self.alert2.pk, self.alert3.pk, self.alert1.pk])
+        self.assertEqual(response.context['total_firing_count'], 2)
+        self.assertEqual(response.context['total_critical_count'], 1)
+        self.assertEqual(response.context['total_acknowledged_count'], 1)
+
     def test_alert_list_view_unauthenticated(self):
         self.client.logout()
         response = self.client.get(reverse('alerts:alert-list'))
@@ -658,8 +671,8 @@ class SilenceRuleCreateViewTest(TestCase):
         # Check that messages.warning was called
         mock_messages.warning.assert_called_once_with(response.wsgi_request, "Could not pre-fill matchers: Invalid label format.")
 
-    @patch('alerts.signals.check_alert_silence') # Patch the function AS IT IS IMPORTED/USED in alerts.signals
-    def test_post_valid_data(self, mock_check_alert_silence_in_signals):
+    @patch('alerts.tasks.reevaluate_silences_task.delay')
+    def test_post_valid_data(self, mock_reevaluate_delay):
         # Make test times aware using the project's default timezone
         tz = timezone.get_current_timezone()
         now = timezone.now().astimezone(tz)
@@ -675,7 +688,8 @@ class SilenceRuleCreateViewTest(TestCase):
             'comment': 'Test silence rule creation'
         }
 
-        response = self.client.post(self.create_url, post_data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.create_url, post_data)
 
         # Check redirect
         self.assertRedirects(response, self.list_url)
@@ -690,19 +704,16 @@ class SilenceRuleCreateViewTest(TestCase):
         self.assertEqual(rule.comment, 'Test silence rule creation')
         self.assertEqual(rule.created_by, self.user)
 
-        # Manually trigger the rescan logic for testing purposes
-        # Assert the mock calls triggered by the post_save signal
-        expected_calls = [call(self.matching_alert), call(self.non_matching_alert)]
-        mock_check_alert_silence_in_signals.assert_has_calls(expected_calls, any_order=True)
-        self.assertEqual(mock_check_alert_silence_in_signals.call_count, 2) # Expect 2 calls from the signal handler
+        # The post_save signal queues the background re-evaluation once the rule commits
+        mock_reevaluate_delay.assert_called_once_with(rule.id, matchers_dict, None)
 
         # Check for success message
         messages = list(response.wsgi_request._messages)
         self.assertEqual(len(messages), 1)
         self.assertEqual(str(messages[0]), "Silence rule created successfully.")
 
-    @patch('alerts.signals.check_alert_silence') # Patch the function AS IT IS IMPORTED/USED in alerts.signals
-    def test_post_valid_data_no_matching_alerts(self, mock_check_alert_silence_in_signals):
+    @patch('alerts.tasks.reevaluate_silences_task.delay')
+    def test_post_valid_data_no_matching_alerts(self, mock_reevaluate_delay):
         now = timezone.now()
         start_time = now + timedelta(minutes=5)
         end_time = now + timedelta(hours=1)
@@ -716,15 +727,14 @@ class SilenceRuleCreateViewTest(TestCase):
             'comment': 'Test silence rule creation - no match'
         }
 
-        response = self.client.post(self.create_url, post_data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.create_url, post_data)
         self.assertRedirects(response, self.list_url)
         self.assertEqual(SilenceRule.objects.count(), 1)
+        rule = SilenceRule.objects.first()
 
-        # Manually trigger the rescan logic for testing purposes
-        # Assert the mock calls triggered by the post_save signal
-        expected_calls = [call(self.matching_alert), call(self.non_matching_alert)]
-        mock_check_alert_silence_in_signals.assert_has_calls(expected_calls, any_order=True)
-        self.assertEqual(mock_check_alert_silence_in_signals.call_count, 2) # Expect 2 calls from the signal handler
+        # The post_save signal queues the background re-evaluation once the rule commits
+        mock_reevaluate_delay.assert_called_once_with(rule.id, matchers_dict, None)
 
         # Check for success message
         messages = list(response.wsgi_request._messages)
@@ -12,6 +12,7 @@ from django.contrib import messages # Import messages
 # Import the model and form (will be mocked)
 from alerts.models import SilenceRule, AlertGroup
 from alerts.forms import SilenceRuleForm
+from alerts.tasks import reevaluate_silences_task
 
 class SilenceRuleUpdateViewTests(TestCase):
 
@@ -52,8 +53,9 @@ class SilenceRuleUpdateViewTests(TestCase):
         self.assertEqual(response.status_code, 302)
         self.assertEqual(response.url, f'/accounts/login/?next={self.update_url}')
 
+    @patch('alerts.tasks.reevaluate_silences_task.delay')
     @patch('alerts.views.messages')
-    def test_update_view_post_valid_data(self, mock_messages):
+    def test_update_view_post_valid_data(self, mock_messages, mock_delay):
         """Test POST request to update view with valid data."""
         updated_comment = "Updated comment"
         updated_matchers = {"severity": "critical", "env": "dev"}
@@ -67,14 +69,15 @@ class SilenceRuleUpdateViewTests(TestCase):
         updated_starts_at_local = timezone.make_aware(updated_starts_at_naive, timezone.get_current_timezone())
         updated_ends_at_local = timezone.make_aware(updated_ends_at_naive, timezone.get_current_timezone())
 
-        response = self.client.post(self.update_url, {
-            'comment': updated_comment,
-            'matchers': json.dumps(updated_matchers), # Form expects JSON string
-            'starts_at_0': updated_starts_at_local.strftime('%Y-%m-%d'), # Date part
-            'starts_at_1': updated_starts_at_local.strftime('%H:%M:%S'), # Time part
-            'ends_at_0': updated_ends_at_local.strftime('%Y-%m-%d'),
-            'ends_at_1': updated_ends_at_local.strftime('%H:%M:%S'),
-        })
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.update_url, {
+                'comment': updated_comment,
+                'matchers': json.dumps(updated_matchers), # Form expects JSON string
+                'starts_at_0': updated_starts_at_local.strftime('%Y-%m-%d'), # Date part
+                'starts_at_1': updated_starts_at_local.strftime('%H:%M:%S'), # Time part
+                'ends_at_0': updated_ends_at_local.strftime('%Y-%m-%d'),
+                'ends_at_1': updated_ends_at_local.strftime('%H:%M:%S'),
+            })
 
         # Refresh the instance from the database to check updates
         self.silence_rule.refresh_from_db()
@@ -90,7 +93,11 @@ class SilenceRuleUpdateViewTests(TestCase):
 
         self.assertAlmostEqual(self.silence_rule.starts_at, expected_starts_at_utc, delta=timezone.timedelta(seconds=1))
         self.assertAlmostEqual(self.silence_rule.ends_at, expected_ends_at_utc, delta=timezone.timedelta(seconds=1))
-        mock_messages.success.assert_called_once_with(ANY, "Silence rule updated successfully and 0 matching alerts re-evaluated.")
+        mock_messages.success.assert_called_once_with(
+            ANY, "Silence rule updated successfully. Matching alerts are being re-evaluated in the background."
+        )
+        # Re-evaluation is queued with the old matchers, whose silenced alerts may need unsilencing
+        mock_delay.assert_called_once_with(self.silence_rule.pk, updated_matchers, {"severity": "warning"})
 
     @patch('alerts.views.messages')
     def test_update_view_post_invalid_data(self, mock_messages):
@@ -190,22 +197,23 @@ class SilenceRuleDeleteViewTests(TestCase):
         self.assertEqual(response.status_code, 302)
         self.assertEqual(response.url, f'/accounts/login/?next={self.delete_url}')
 
+    @patch('alerts.tasks.reevaluate_silences_task.delay')
     @patch('alerts.views.messages')
-    @patch('alerts.views.check_alert_silence')
-    def test_delete_view_post_valid_data(self, mock_check_alert_silence, mock_messages):
+    def test_delete_view_post_valid_data(self, mock_messages, mock_delay):
         """Test POST request to delete view with valid data."""
-        response = self.client.post(self.delete_url)
+        rule_pk = self.silence_rule.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.delete_url)
 
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, reverse('alerts:silence-rule-list'))
-        self.assertFalse(SilenceRule.objects.filter(pk=self.silence_rule.pk).exists())
+        self.assertFalse(SilenceRule.objects.filter(pk=rule_pk).exists())
         mock_messages.success.assert_called_once()
         self.assertEqual(mock_messages.success.call_args[0][1], "Silence rule deleted successfully.")
-        mock_check_alert_silence.assert_not_called() # No affected alerts initially
+        mock_delay.assert_called_once_with(rule_pk, None, {"severity": "info"})
 
     @patch('alerts.views.messages')
-    @patch('alerts.views.check_alert_silence')
-    def test_delete_view_post_valid_data_with_affected_alerts(self, mock_check_alert_silence, mock_messages):
+    def test_delete_view_post_valid_data_with_affected_alerts(self, mock_messages):
         """Test POST request to delete view with valid data and affected alerts."""
         # Create an alert that would be silenced by this rule
         affected_alert = AlertGroup.objects.create(
@@ -213,19 +221,24 @@ class SilenceRuleDeleteViewTests(TestCase):
             fingerprint="affected_alert_fingerprint",
             current_status="firing",
             severity="info",
-            labels={"alertname": "TestAlert", "env": "production"}, # Added labels field
+            labels={"alertname": "TestAlert", "env": "production", "severity": "info"}, # Added labels field
             is_silenced=True,
             silenced_until=self.fixed_ends_at_for_test # Use the fixed ends_at for the affected alert
         )
 
-        response = self.client.post(self.delete_url)
+        # The queued task runs eagerly once the deletion commits
+        with patch('alerts.tasks.reevaluate_silences_task.delay', side_effect=lambda *args: reevaluate_silences_task(*args)):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(self.delete_url)
 
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, reverse('alerts:silence-rule-list'))
         self.assertFalse(SilenceRule.objects.filter(pk=self.silence_rule.pk).exists())
         mock_messages.success.assert_called_once()
-        self.assertEqual(mock_messages.success.call_args[0][1], f"Silence rule deleted successfully and 1 affected alerts re-evaluated.")
-        mock_check_alert_silence.assert_called_once_with(affected_alert)
+        self.assertEqual(mock_messages.success.call_args[0][1], "Silence rule deleted successfully.")
+        affected_alert.refresh_from_db()
+        self.assertFalse(affected_alert.is_silenced)
+        self.assertIsNone(affected_alert.silenced_until)
 
     def test_delete_view_post_unauthenticated(self):
         """Test POST request to delete view for unauthenticated user."""
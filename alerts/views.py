@@ -1,6 +1,5 @@
 from django.views.generic import TemplateView, ListView, DetailView, FormView
-from django.db.models import Count, Q, Min, OuterRef, Subquery, F, Value, Case, When, IntegerField, Max
-from django.db.models.functions import Coalesce
+from django.db.models import Count, Q, Min, F, Value, Case, When, IntegerField, Max
 from django.utils import timezone
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.shortcuts import get_object_or_404, redirect, render
@@ -28,8 +27,8 @@ from .forms import (
     AlertDeleteForm, SilenceRuleForm, ManualResolveForm
 )
 from .services.alerts_processor import acknowledge_alert, manually_resolve_alert, ManualResolutionError
-from .services.silence_matcher import check_alert_silence # Import the function
 from docs.services.documentation_matcher import match_documentation_to_alert
+from core.services import read_cache
 from users.models import UserProfile
 
 logger = logging.getLogger(__name__)
@@ -42,29 +41,9 @@ class AlertListView(LoginRequiredMixin, ListView):
     paginate_by = 10 # Changed from 20 to 10
     
     def get_queryset(self):
-        # Subquery to get the first instance start time for each group (for sorting)
-        first_instance_subquery = AlertInstance.objects.filter(
-            alert_group=OuterRef('pk')
-        ).order_by('started_at').values('started_at')[:1]
-
-        # Subquery to get the minimum start time of active instances (for duration calculation)
-        active_instances_subquery = AlertInstance.objects.filter(
-            alert_group=OuterRef('pk'),
-            status='firing'
-        ).order_by('started_at').values('started_at')[:1]
-
-        latest_instance_subquery = AlertInstance.objects.filter(
-            alert_group=OuterRef('pk')
-        ).order_by('-started_at').values('started_at')[:1]
-
-        queryset = AlertGroup.objects.annotate(
-            first_instance_start_time=Subquery(first_instance_subquery),
-            current_problem_start_time=Coalesce(
-                Subquery(active_instances_subquery),
-                None
-            ),
-            latest_instance_start=Subquery(latest_instance_subquery)
-        )
+        # first_instance_start, current_problem_start and latest_instance_start
+        # are maintained on AlertGroup by the alert state manager.
+        queryset = AlertGroup.objects.all()
 
         # --- Apply Filters ---
         status = self.request.GET.get('status')
@@ -128,15 +107,23 @@ class AlertListView(LoginRequiredMixin, ListView):
         context['source_filter_value'] = self.request.GET.get('source', '')
 
         # Query for available sources for the filter dropdown
-        context['available_sources'] = AlertGroup.objects.filter(source__isnull=False).values_list('source', flat=True).distinct().order_by('source')
+        context['available_sources'] = read_cache.cached(
+            read_cache.ALERT_READS, 'alert_list:available_sources',
+            lambda: list(AlertGroup.objects.filter(source__isnull=False).values_list('source', flat=True).distinct().order_by('source'))
+        )
 
         # Calculate statistics counts for the filtered results (before pagination)
         # Note: These counts reflect the total matching alerts, not just the current page.
         # If counts per page are needed, they should be calculated based on context['alerts'] or context['object_list']
-        queryset = self.get_queryset() # Re-fetch the filtered queryset
-        context['total_firing_count'] = queryset.filter(current_status='firing').count()
-        context['total_critical_count'] = queryset.filter(severity='critical').count()
-        context['total_acknowledged_count'] = queryset.filter(acknowledged=True).count()
+        totals = read_cache.cached(
+            read_cache.ALERT_READS, self._read_cache_key('totals'),
+            lambda: self.object_list.order_by().aggregate(
+                total_firing_count=Count('pk', filter=Q(current_status='firing')),
+                total_critical_count=Count('pk', filter=Q(severity='critical')),
+                total_acknowledged_count=Count('pk', filter=Q(acknowledged=True)),
+            )
+        )
+        context.update(totals)
 
         # Counts for the current page (if pagination is active)
         alerts_on_page = context.get('alerts') # Use the context object name
@@ -152,6 +139,19 @@ class AlertListView(LoginRequiredMixin, ListView):
 
         return context
 
+    def _read_cache_key(self, name):
+        """Cache key for a read of this view under the current filters (page excluded)."""
+        params = sorted((key, value) for key, value in self.request.GET.items() if key != self.page_kwarg)
+        return f"{self.__class__.__name__}:{name}:{params}"
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        paginator = super().get_paginator(queryset, per_page, **kwargs)
+        # The COUNT(*) behind the page links only changes when alerts change
+        paginator.count = read_cache.cached(
+            read_cache.ALERT_READS, self._read_cache_key('count'), queryset.count
+        )
+        return paginator
+
     def paginate_queryset(self, queryset, page_size):
          paginator = self.get_paginator(
              queryset,
@@ -674,40 +674,12 @@ class SilenceRuleUpdateView(LoginRequiredMixin, UpdateView):
         # Call parent form_valid without showing default success message
         response = super().form_valid(form)
         
-        # Get the updated rule
-        updated_rule = self.object
-        matchers = updated_rule.matchers
-        
-        if matchers:
-            try:
-                logger.info(f"Finding alerts matching updated silence rule ID {updated_rule.id}")
-                
-                # Build query to find matching alerts
-                filter_q = Q()
-                for key, value in matchers.items():
-                    filter_q &= Q(**{f'labels__{key}': value})
-                
-                matching_alerts = AlertGroup.objects.filter(filter_q)
-                alert_count = matching_alerts.count()
-                logger.info(f"Found {alert_count} alerts matching updated silence rule ID {updated_rule.id}")
-                
-                # Re-evaluate each matching alert
-                for alert in matching_alerts:
-                    check_alert_silence(alert)
-                
-                messages.success(
-                    self.request,
-                    f"Silence rule updated successfully and {alert_count} matching alerts re-evaluated."
-                )
-            except Exception as e:
-                logger.error(
-                    f"Error re-evaluating alerts after updating silence rule ID {updated_rule.id}: {str(e)}",
-                    exc_info=True
-                )
-                messages.warning(
-                    self.request,
-                    "Silence rule was updated, but an error occurred while re-evaluating matching alerts."
-                )
+        # Affected alerts are re-evaluated by reevaluate_silences_task once the change commits
+        if self.object.matchers:
+            messages.success(
+                self.request,
+                "Silence rule updated successfully. Matching alerts are being re-evaluated in the background."
+            )
         else:
             messages.success(
                 self.request,
@@ -743,49 +715,14 @@ class SilenceRuleDeleteView(LoginRequiredMixin, DeleteView):
 
     def post(self, request, *args, **kwargs):
         self.object = self.get_object()
-        rule = self.object
-        rule_id = rule.id
-        ends_at = rule.ends_at
+        rule_id = self.object.id
 
         logger.info(f"User {request.user.username} deleting silence rule ID {rule_id}")
 
-        # Find potentially affected alerts (silenced by this rule)
-        # Use a range-based check for ends_at to account for potential microsecond differences
-        affected_alerts_ids = AlertGroup.objects.filter(
-            is_silenced=True,
-            silenced_until=ends_at
-        ).values_list('id', flat=True)
-        
-        # Store the list of IDs before deletion, as the queryset might become empty after deletion
-        affected_alerts_list = list(affected_alerts_ids)
-        initial_affected_count = len(affected_alerts_list)
-
-        # Perform the actual deletion
-        rule.delete()
+        # Alerts silenced by this rule are re-evaluated by reevaluate_silences_task once the deletion commits
+        self.object.delete()
+        messages.success(request, "Silence rule deleted successfully.")
 
-        # Re-check affected alerts if any were found (use the stored list of IDs)
-        if initial_affected_count > 0:
-            try:
-                alerts_to_recheck = AlertGroup.objects.filter(id__in=affected_alerts_list)
-                for alert in alerts_to_recheck:
-                    check_alert_silence(alert)
-                
-                messages.success(
-                    request,
-                    f"Silence rule deleted successfully and {initial_affected_count} affected alerts re-evaluated."
-                )
-            except Exception as e:
-                logger.error(
-                    f"Error re-evaluating alerts after deleting silence rule ID {rule_id}: {str(e)}",
-                    exc_info=True
-                )
-                messages.error(
-                    request,
-                    "Silence rule was deleted, but an error occurred while re-evaluating affected alerts."
-                )
-        else:
-            messages.success(request, "Silence rule deleted successfully.")
-            
         return HttpResponseRedirect(self.get_success_url())
 
     # Optional: Add permission check if needed
@@ -0,0 +1,121 @@
+# core/benchmarks/__init__.py
+"""
+Micro-benchmarks for the alert ingestion and matching hot paths.
+
+Cases are registered with @benchmark and run by `python manage.py run_benchmarks`,
+which compares results with a JSON baseline per database vendor and flags
+regressions beyond a threshold.
+"""
+import json
+import logging
+import os
+import statistics
+import time
+from typing import Callable, Dict, List, Optional
+
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+# name -> factory(scale, repeat) returning (operation, number_of_calls)
+_REGISTRY: Dict[str, Callable] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark case. The factory does the setup and returns (operation, calls)."""
+    def decorator(factory):
+        _REGISTRY[name] = factory
+        return factory
+    return decorator
+
+
+def registered_cases() -> Dict[str, Callable]:
+    from . import cases  # noqa: F401  (registers the cases)
+    return dict(_REGISTRY)
+
+
+class _Rollback(Exception):
+    pass
+
+
+def run_case(name: str, factory: Callable, scale: float = 1.0, repeat: int = 5) -> dict:
+    """
+    Run one case inside a transaction that is rolled back afterwards, so cases
+    never see each other's rows. Each repeat calls the operation `calls` times;
+    us_per_op is the best repeat, median_us_per_op the median one.
+    """
+    result = None
+    try:
+        with transaction.atomic():
+            operation, calls = factory(scale, repeat)
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                for _ in range(calls):
+                    operation()
+                timings.append((time.perf_counter() - started) / calls * 1e6)
+            result = {
+                'name': name,
+                'calls': calls,
+                'us_per_op': min(timings),
+                'median_us_per_op': statistics.median(timings),
+            }
+            raise _Rollback()
+    except _Rollback:
+        pass
+    return result
+
+
+def run_cases(pattern: Optional[str] = None, scale: float = 1.0, repeat: int = 5) -> List[dict]:
+    results = []
+    for name, factory in registered_cases().items():
+        if pattern and pattern not in name:
+            continue
+        results.append(run_case(name, factory, scale=scale, repeat=repeat))
+        logger.debug(f"Benchmark {name}: {results[-1]['us_per_op']:.2f} us/op")
+    return results
+
+
+def default_baseline_path() -> str:
+    return os.path.join(BASELINE_DIR, f"{connection.vendor}.json")
+
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    try:
+        with open(path) as f:
+            return json.load(f).get('results', {})
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: str, results: List[dict]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = {
+        'vendor': connection.vendor,
+        'results': {r['name']: r for r in results},
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(results: List[dict], baseline: Dict[str, dict], threshold: float) -> List[dict]:
+    """
+    Compare results with a baseline. A case regresses when its best time is
+    more than `threshold` (e.g. 0.25 = 25%) slower than the baseline.
+    """
+    rows = []
+    for result in results:
+        base = baseline.get(result['name'])
+        base_us = base['us_per_op'] if base else None
+        change = (result['us_per_op'] / base_us - 1.0) if base_us else None
+        rows.append({
+            'name': result['name'],
+            'us_per_op': result['us_per_op'],
+            'baseline_us_per_op': base_us,
+            'change': change,
+            'regression': change is not None and change > threshold,
+        })
+    return rows
@@ -0,0 +1,260 @@
+# core/benchmarks/cases.py
+"""
+Benchmark cases. Each factory receives a scale factor (1.0 = full size,
+smaller for quick runs) and the number of timed repeats, performs its setup
+inside the case transaction and returns (operation, calls). The operation is
+called repeat * calls times.
+"""
+import datetime
+import glob
+import itertools
+import json
+import os
+
+from django.conf import settings
+from django.utils import timezone
+
+from alerts.models import AlertGroup, SilenceRule
+from alerts.services.alert_state_manager import update_alert_state
+from alerts.services.payload_parser import parse_alertmanager_payload, parse_timestamp
+from alerts.services.silence_index import silence_index_registry
+from alerts.services.silence_matcher import check_alert_silence
+from integrations.models import JiraIntegrationRule, SlackIntegrationRule, SmsIntegrationRule
+from integrations.services.jira_matcher import JiraRuleMatcherService
+from integrations.services.rule_index import rule_index_registry
+from integrations.services.slack_matcher import SlackRuleMatcherService
+from integrations.services.sms_matcher import SmsRuleMatcherService
+from integrations.tasks import render_template_safe, sanitize_ip_addresses
+
+from . import benchmark
+
+RULE_COUNTS = (10, 100, 1000, 10000)
+MATCHER_RULE_COUNT = 1000
+
+ALERT_LABELS = {
+    'alertname': 'HighCPU',
+    'instance': 'db-01:9100',
+    'job': 'node',
+    'severity': 'critical',
+    'namespace': 'payments',
+    'cluster': 'prod-1',
+}
+
+
+def _scaled(value, scale, minimum=1):
+    return max(minimum, int(value * scale))
+
+
+def _alert(fingerprint, status='firing', starts_at=None, ends_at=None, labels=None):
+    return {
+        'fingerprint': fingerprint,
+        'status': status,
+        'labels': labels or {**ALERT_LABELS, 'fp': fingerprint},
+        'annotations': {'summary': 'Benchmark alert'},
+        'starts_at': starts_at or timezone.now(),
+        'ends_at': ends_at,
+        'generator_url': 'http://prometheus/graph',
+        'source': None,
+    }
+
+
+def _alert_group(fingerprint='bench-group', labels=None):
+    return AlertGroup.objects.create(
+        fingerprint=fingerprint,
+        name='HighCPU',
+        labels=labels or dict(ALERT_LABELS),
+        severity='critical',
+        instance=ALERT_LABELS['instance'],
+    )
+
+
+# --- Payload parsing ---
+
+def _fixture_payloads():
+    payloads = []
+    for path in sorted(glob.glob(os.path.join(settings.BASE_DIR, 'send_fake_data', '*.json'))):
+        with open(path) as f:
+            payloads.append(json.load(f))
+    return payloads
+
+
+@benchmark('parse_alertmanager_payload.fixtures_cold')
+def parse_payload_cold(scale, repeat):
+    payloads = _fixture_payloads()
+
+    def operation():
+        parse_timestamp.cache_clear()
+        for payload in payloads:
+            parse_alertmanager_payload(payload)
+    return operation, _scaled(500, scale)
+
+
+@benchmark('parse_alertmanager_payload.fixtures_warm')
+def parse_payload_warm(scale, repeat):
+    payloads = _fixture_payloads()
+
+    def operation():
+        for payload in payloads:
+            parse_alertmanager_payload(payload)
+    return operation, _scaled(2000, scale)
+
+
+# --- update_alert_state ---
+
+@benchmark('update_alert_state.new_group')
+def update_state_new_group(scale, repeat):
+    counter = itertools.count()
+    return (lambda: update_alert_state(_alert(f"bench-new-{next(counter)}"))), _scaled(200, scale)
+
+
+@benchmark('update_alert_state.resend')
+def update_state_resend(scale, repeat):
+    alert = _alert('bench-resend')
+    update_alert_state(alert)
+    return (lambda: update_alert_state(alert)), _scaled(200, scale)
+
+
+@benchmark('update_alert_state.resolve')
+def update_state_resolve(scale, repeat):
+    calls = _scaled(200, scale)
+    starts_at = timezone.now() - datetime.timedelta(minutes=5)
+    # Enough firing groups for every call of every repeat to resolve a fresh one
+    alerts = [_alert(f"bench-resolve-{i}", starts_at=starts_at) for i in range(calls * repeat)]
+    for alert in alerts:
+        update_alert_state(alert)
+    pending = iter(alerts)
+
+    def operation():
+        alert = next(pending)
+        update_alert_state({**alert, 'status': 'resolved', 'ends_at': timezone.now()})
+    return operation, calls
+
+
+@benchmark('update_alert_state.flapping')
+def update_state_flapping(scale, repeat):
+    base = timezone.now() - datetime.timedelta(days=1)
+    counter = itertools.count()
+
+    def operation():
+        # Alternates firing with a new startsAt and resolving that firing
+        n = next(counter)
+        starts_at = base + datetime.timedelta(seconds=n // 2)
+        if n % 2 == 0:
+            update_alert_state(_alert('bench-flap', starts_at=starts_at))
+        else:
+            update_alert_state(_alert('bench-flap', 'resolved', starts_at=starts_at, ends_at=timezone.now()))
+    return operation, _scaled(200, scale)
+
+
+# --- check_alert_silence ---
+
+def _silence_case(rule_count):
+    def factory(scale, repeat):
+        now = timezone.now()
+        count = _scaled(rule_count, scale)
+        SilenceRule.objects.bulk_create([
+            SilenceRule(
+                matchers={'alertname': f"Other{i}", 'namespace': 'payments'},
+                starts_at=now - datetime.timedelta(hours=1),
+                ends_at=now + datetime.timedelta(hours=1),
+                comment='benchmark',
+            )
+            for i in range(count)
+        ], batch_size=1000)
+        silence_index_registry.clear()  # bulk_create bypasses the SilenceRule signals
+        group = _alert_group('bench-silence')
+        return (lambda: check_alert_silence(group)), _scaled(20, scale)
+    return factory
+
+
+for _count in RULE_COUNTS:
+    benchmark(f"check_alert_silence.rules_{_count}")(_silence_case(_count))
+
+
+# --- Rule matchers ---
+
+@benchmark(f"jira.find_matching_rule.rules_{MATCHER_RULE_COUNT}")
+def jira_find_matching_rule(scale, repeat):
+    count = _scaled(MATCHER_RULE_COUNT, scale)
+    JiraIntegrationRule.objects.bulk_create([
+        JiraIntegrationRule(
+            name=f"bench-jira-{i}",
+            match_criteria={'namespace': 'payments', 'alertname': f"Other{i}"} if i else {'namespace': 'payments'},
+            jira_project_key='OPS',
+            jira_issue_type='Task',
+            priority=i % 10,
+        )
+        for i in range(count)
+    ], batch_size=1000)
+    rule_index_registry.clear()  # bulk_create bypasses the rule signals
+    service = JiraRuleMatcherService()
+    return (lambda: service.find_matching_rule(dict(ALERT_LABELS))), _scaled(20, scale)
+
+
+@benchmark(f"slack.find_matching_rule.rules_{MATCHER_RULE_COUNT}")
+def slack_find_matching_rule(scale, repeat):
+    count = _scaled(MATCHER_RULE_COUNT, scale)
+    SlackIntegrationRule.objects.bulk_create([
+        SlackIntegrationRule(
+            name=f"bench-slack-{i}",
+            match_criteria={'labels__namespace': 'payments', 'labels__alertname': f"Other{i}"} if i else {'labels__namespace': 'payments'},
+            slack_channel='#alerts',
+            message_template='{{ alertname }}',
+            priority=i % 10,
+        )
+        for i in range(count)
+    ], batch_size=1000)
+    rule_index_registry.clear()  # bulk_create bypasses the rule signals
+    service = SlackRuleMatcherService()
+    group = _alert_group('bench-slack')
+    return (lambda: service.find_matching_rule(group)), _scaled(20, scale)
+
+
+@benchmark(f"sms.find_matching_rule.rules_{MATCHER_RULE_COUNT}")
+def sms_find_matching_rule(scale, repeat):
+    count = _scaled(MATCHER_RULE_COUNT, scale)
+    SmsIntegrationRule.objects.bulk_create([
+        SmsIntegrationRule(
+            name=f"bench-sms-{i}",
+            match_criteria={'labels__namespace': 'payments', 'labels__alertname': f"Other{i}"} if i else {'labels__namespace': 'payments'},
+            recipients='oncall',
+            firing_template='{{ alertname }}',
+            priority=i % 10,
+        )
+        for i in range(count)
+    ], batch_size=1000)
+    rule_index_registry.clear()  # bulk_create bypasses the rule signals
+    service = SmsRuleMatcherService()
+    group = _alert_group('bench-sms')
+    return (lambda: service.find_matching_rule(group)), _scaled(20, scale)
+
+
+# --- Notification helpers ---
+
+SLACK_TEMPLATE = (
+    "{% if status == 'firing' %}:red_circle:{% else %}:large_green_circle:{% endif %} "
+    "*{{ alertname }}* on {{ instance }}\n"
+    "{% for key, value in labels.items %}{{ key }}={{ value }} {% endfor %}\n"
+    "{{ annotations.summary|default:'' }}"
+)
+
+
+@benchmark('render_template_safe.slack_message')
+def render_template(scale, repeat):
+    context = {
+        'status': 'firing',
+        'alertname': ALERT_LABELS['alertname'],
+        'instance': ALERT_LABELS['instance'],
+        'labels': ALERT_LABELS,
+        'annotations': {'summary': 'CPU above 90% for 10 minutes'},
+    }
+    return (lambda: render_template_safe(SLACK_TEMPLATE, context)), _scaled(2000, scale)
+
+
+@benchmark('sanitize_ip_addresses.mixed_message')
+def sanitize_ips(scale, repeat):
+    message = (
+        "Connection from 10.0.12.7:5432 to [2001:db8::1]:443 failed; fallback 192.168.1.20 "
+        "and fe80::1ff:fe23:4567:890a unreachable, version 1.2.3 at 12:30:45"
+    )
+    return (lambda: sanitize_ip_addresses(message)), _scaled(5000, scale)
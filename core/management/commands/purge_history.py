@@ -0,0 +1,66 @@
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from core.services.retention import RETENTION_TABLES, purge_table, retention_days
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes alert history older than the ALERT_RETENTION policies in small batches, oldest first. "
+        "Purged AlertInstances are summarized in AlertDailyRollup. With --archive, expired rows are "
+        "written to gzipped NDJSON files before deletion. Interrupted runs resume where they stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--table', action='append', choices=sorted(RETENTION_TABLES),
+                            help='Table(s) to purge (repeatable). Default: all tables with a policy.')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the expired rows.')
+        parser.add_argument('--archive', action='store_true', help='Archive expired rows before deleting them.')
+        parser.add_argument('--archive-dir', default=None, help="Archive directory (default: ALERT_RETENTION['ARCHIVE_DIR']).")
+        parser.add_argument('--batch-size', type=int, default=None, help='Rows per delete transaction.')
+        parser.add_argument('--pause', type=float, default=None, help='Seconds to sleep between batches.')
+        parser.add_argument('--max-batches', type=int, default=None, help='Stop each table after this many batches.')
+        parser.add_argument('--vacuum', action='store_true', help='Run VACUUM (ANALYZE) on purged tables afterwards (PostgreSQL only).')
+
+    def handle(self, *args, **options):
+        tables = options['table'] or [table for table in RETENTION_TABLES if retention_days(table) > 0]
+        archive_dir = None
+        if options['archive']:
+            archive_dir = options['archive_dir'] or getattr(settings, 'ALERT_RETENTION', {}).get('ARCHIVE_DIR')
+            if not archive_dir:
+                raise CommandError("--archive needs --archive-dir or ALERT_RETENTION['ARCHIVE_DIR'].")
+
+        purged_models = []
+        for table in tables:
+            result = purge_table(
+                table,
+                batch_size=options['batch_size'],
+                archive_dir=archive_dir,
+                pause=options['pause'],
+                max_batches=options['max_batches'],
+                dry_run=options['dry_run'],
+            )
+            days = retention_days(table)
+            if options['dry_run']:
+                self.stdout.write(f"{table}: {result['expired']} row(s) older than {days} day(s)")
+                continue
+            line = f"{table}: deleted {result['deleted']} row(s) in {result['batches']} batch(es)"
+            if result['archive'] and result['deleted']:
+                line += f", archived to {result['archive']}"
+            self.stdout.write(line)
+            if result['deleted']:
+                purged_models.append(RETENTION_TABLES[table]['model'])
+
+        if options['vacuum'] and purged_models:
+            self._vacuum(purged_models)
+
+    def _vacuum(self, model_labels):
+        if connection.vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING("--vacuum is only supported on PostgreSQL; skipped."))
+            return
+        with connection.cursor() as cursor:
+            for label in model_labels:
+                table_name = apps.get_model(label)._meta.db_table
+                cursor.execute(f'VACUUM (ANALYZE) "{table_name}"')
+                self.stdout.write(f"Vacuumed {table_name}")
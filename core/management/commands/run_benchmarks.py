@@ -0,0 +1,67 @@
+import json
+import logging
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, teardown_databases
+from core.benchmarks import compare, default_baseline_path, load_baseline, run_cases, save_baseline
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the ingestion and matching micro-benchmarks (core.benchmarks) against a throwaway test database "
+        "and compares them with the JSON baseline for the database vendor. Exits with an error when a case "
+        "is slower than the baseline by more than --threshold."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filter', default=None, help='Only run cases whose name contains this string.')
+        parser.add_argument('--scale', type=float, default=1.0, help='Scale factor for data sizes and call counts (e.g. 0.1 for a quick run).')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed repeats per case; the best one is reported.')
+        parser.add_argument('--baseline', default=None, help='Baseline JSON path (default: core/benchmarks/baselines/<vendor>.json).')
+        parser.add_argument('--save-baseline', action='store_true', help='Write the results as the new baseline instead of comparing.')
+        parser.add_argument('--threshold', type=float, default=0.25, help='Allowed slowdown before a case counts as a regression (default: 0.25 = 25%%).')
+        parser.add_argument('--output', default=None, help='Also write the results and comparison as JSON to this path.')
+
+    def handle(self, *args, **options):
+        if options['verbosity'] < 2:
+            # Per-alert logging would dominate the timings
+            logging.disable(logging.WARNING)
+        old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+        try:
+            # Resolved after setup so the vendor is the test database's
+            baseline_path = options['baseline'] or default_baseline_path()
+            results = run_cases(options['filter'], scale=options['scale'], repeat=options['repeat'])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            logging.disable(logging.NOTSET)
+
+        if not results:
+            raise CommandError(f"No benchmark matches filter '{options['filter']}'.")
+
+        if options['save_baseline']:
+            save_baseline(baseline_path, results)
+            self._report(compare(results, {}, options['threshold']))
+            self.stdout.write(self.style.SUCCESS(f"Saved baseline with {len(results)} case(s) to {baseline_path}"))
+            return
+
+        rows = compare(results, load_baseline(baseline_path), options['threshold'])
+        self._report(rows)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump({'results': results, 'comparison': rows}, f, indent=2)
+
+        regressions = [row['name'] for row in rows if row['regression']]
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} benchmark(s) regressed more than {options['threshold']:.0%} "
+                f"against {baseline_path}: {', '.join(regressions)}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"{len(rows)} benchmark(s) within {options['threshold']:.0%} of baseline."))
+
+    def _report(self, rows):
+        width = max(len(row['name']) for row in rows)
+        self.stdout.write(f"{'case':<{width}}  {'us/op':>12}  {'baseline':>12}  {'change':>8}")
+        for row in rows:
+            baseline = f"{row['baseline_us_per_op']:12.2f}" if row['baseline_us_per_op'] is not None else f"{'-':>12}"
+            change = f"{row['change']:+8.1%}" if row['change'] is not None else f"{'new':>8}"
+            line = f"{row['name']:<{width}}  {row['us_per_op']:12.2f}  {baseline}  {change}"
+            self.stdout.write(self.style.ERROR(line) if row['regression'] else line)
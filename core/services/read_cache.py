@@ -0,0 +1,108 @@
+# core/services/read_cache.py
+"""
+Shared cache for read models that only change when alerts change: dashboard
+stats, list filter dropdowns and counts, API list responses.
+
+Entries are grouped in namespaces. Every key embeds the namespace's current
+version, so invalidation is a single INCR of the version key; stale entries
+are never read again and simply expire. Writers call invalidate(), which
+bumps the version immediately and again once their transaction commits.
+
+Uses the Django cache alias in settings.READ_CACHE['ALIAS'] (Redis in
+production, local memory otherwise). Cache errors are logged and the value
+is computed from the database as if caching were disabled.
+"""
+import hashlib
+import logging
+import time
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+ALERT_READS = 'alerts'
+
+
+def _config() -> dict:
+    return getattr(settings, 'READ_CACHE', {})
+
+
+def _cache():
+    return caches[_config().get('ALIAS', 'default')]
+
+
+def _version_key(namespace: str) -> str:
+    return f"{_config().get('KEY_PREFIX', 'sentryhub:reads:')}{namespace}:version"
+
+
+def current_version(namespace: str) -> int:
+    cache = _cache()
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock so a lost version key never revives older entries
+        cache.add(key, time.time_ns() // 1000, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def cache_key(namespace: str, key: str) -> str:
+    # Keys may contain arbitrary query strings; hash them to stay within backend limits
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return f"{_config().get('KEY_PREFIX', 'sentryhub:reads:')}{namespace}:v{current_version(namespace)}:{digest}"
+
+
+def cached(namespace: str, key: str, builder: Callable, timeout: int = None):
+    """
+    Return the cached value for `key` in the namespace's current version,
+    computing and storing it with builder() on a miss.
+    """
+    config = _config()
+    if not config.get('ENABLED', False):
+        return builder()
+    try:
+        full_key = cache_key(namespace, key)
+        value = _cache().get(full_key)
+    except Exception as e:
+        logger.warning(f"Read cache unavailable, computing '{key}' from the database: {e}")
+        return builder()
+    if value is not None:
+        return value
+
+    value = builder()
+    try:
+        _cache().set(full_key, value, timeout if timeout is not None else int(config.get('TIMEOUT_SECONDS', 30)))
+    except Exception as e:
+        logger.warning(f"Failed to store '{key}' in the read cache: {e}")
+    return value
+
+
+def bump(namespace: str) -> None:
+    """Invalidate every entry of the namespace immediately."""
+    if not _config().get('ENABLED', False):
+        return
+    cache = _cache()
+    key = _version_key(namespace)
+    try:
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Version key missing or evicted: re-seed it from the clock
+            current_version(namespace)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate read cache namespace '{namespace}': {e}")
+
+
+def invalidate(namespace: str = ALERT_READS) -> None:
+    """
+    Invalidate the namespace now and again once the current transaction
+    commits: anything a reader cached from the old state in between is
+    discarded by the second bump.
+    """
+    bump(namespace)
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        connection.on_commit(lambda: bump(namespace))
@@ -0,0 +1,166 @@
+# core/services/retention.py
+"""
+Retention of alert history: batched, resumable purges of expired rows with
+optional gzipped NDJSON archives and per-group/per-day rollups of purged
+AlertInstances. Driven by `manage.py purge_history` and settings.ALERT_RETENTION.
+"""
+import datetime
+import gzip
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from typing import Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# table name -> model and the timestamp the retention period counts from
+RETENTION_TABLES = {
+    'alert_instance': {'model': 'alerts.AlertInstance', 'date_field': 'started_at'},
+    'alert_comment': {'model': 'alerts.AlertComment', 'date_field': 'created_at'},
+    'acknowledgement_history': {'model': 'alerts.AlertAcknowledgementHistory', 'date_field': 'acknowledged_at'},
+    'sms_message_log': {'model': 'integrations.SmsMessageLog', 'date_field': 'created_at'},
+}
+
+
+def _config() -> dict:
+    return getattr(settings, 'ALERT_RETENTION', {})
+
+
+def retention_days(table: str) -> int:
+    """Days to keep rows of `table`; 0 keeps them forever."""
+    return int(_config().get('POLICIES', {}).get(table, 0) or 0)
+
+
+def expired_queryset(table: str, now: Optional[datetime.datetime] = None):
+    """
+    Rows of `table` older than its retention period, or None when the table
+    is kept forever. Open firing instances and the instances AlertGroups
+    point at (active/latest) are never expired.
+    """
+    days = retention_days(table)
+    if days <= 0:
+        return None
+    spec = RETENTION_TABLES[table]
+    model = apps.get_model(spec['model'])
+    cutoff = (now or timezone.now()) - datetime.timedelta(days=days)
+    queryset = model.objects.filter(**{f"{spec['date_field']}__lt": cutoff})
+    if table == 'alert_instance':
+        alert_group_model = apps.get_model('alerts.AlertGroup')
+        queryset = queryset.exclude(Q(status='firing', ended_at__isnull=True)).exclude(
+            pk__in=alert_group_model.objects.filter(latest_instance__isnull=False).values('latest_instance_id')
+        )
+    return queryset
+
+
+def archive_path(table: str, archive_dir: str, started_at: datetime.datetime) -> str:
+    return os.path.join(archive_dir, table, f"{table}-{started_at:%Y%m%dT%H%M%SZ}.ndjson.gz")
+
+
+def purge_table(table: str, batch_size: Optional[int] = None, archive_dir: Optional[str] = None,
+                pause: Optional[float] = None, max_batches: Optional[int] = None,
+                dry_run: bool = False, now: Optional[datetime.datetime] = None) -> dict:
+    """
+    Delete expired rows of `table` oldest first, one short transaction per
+    batch so no lock is held for long. Each batch is archived (when
+    archive_dir is given), rolled up (instances) and deleted atomically, so
+    an interrupted run simply continues with the next batch when re-run.
+    The archive is written before the delete commits: a batch that fails to
+    commit can be archived twice, never lost.
+
+    Returns:
+        dict with table, expired (dry run) or deleted counts, batches and archive path
+    """
+    config = _config()
+    batch_size = batch_size or int(config.get('BATCH_SIZE', 2000))
+    pause = float(config.get('BATCH_PAUSE_SECONDS', 0.2)) if pause is None else pause
+    now = now or timezone.now()
+    result = {'table': table, 'expired': 0, 'deleted': 0, 'batches': 0, 'archive': None}
+
+    queryset = expired_queryset(table, now)
+    if queryset is None:
+        logger.info(f"Retention: {table} is kept forever, skipping.")
+        return result
+    if dry_run:
+        result['expired'] = queryset.count()
+        return result
+
+    model = queryset.model
+    date_field = RETENTION_TABLES[table]['date_field']
+    if archive_dir:
+        result['archive'] = archive_path(table, archive_dir, now.astimezone(datetime.timezone.utc))
+
+    while max_batches is None or result['batches'] < max_batches:
+        ids = list(queryset.order_by(date_field, 'pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            break
+        with transaction.atomic():
+            batch = model.objects.filter(pk__in=ids)
+            if archive_dir:
+                _archive_rows(result['archive'], batch)
+            if table == 'alert_instance':
+                _rollup_instances(batch)
+            # Fast single DELETE unless the model has cascades/SET_NULL relations
+            batch.delete()
+        result['deleted'] += len(ids)
+        result['batches'] += 1
+        logger.info(f"Retention: deleted {len(ids)} {table} row(s) (batch {result['batches']}, {result['deleted']} total).")
+        if pause:
+            time.sleep(pause)
+    return result
+
+
+def _archive_rows(path: str, queryset) -> None:
+    """Append the rows as NDJSON to a gzip file (one gzip member per batch) and fsync it."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'ab') as raw:
+        with gzip.GzipFile(fileobj=raw, mode='wb') as gz:
+            for row in queryset.order_by('pk').values().iterator():
+                gz.write(json.dumps(row, cls=DjangoJSONEncoder).encode('utf-8') + b'\n')
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def _rollup_instances(queryset) -> None:
+    """Add the instances' counts and durations to AlertDailyRollup, per group and UTC start day."""
+    rollup_model = apps.get_model('alerts.AlertDailyRollup')
+    totals = defaultdict(lambda: [0, 0.0, 0.0])
+    for group_id, started_at, ended_at in queryset.values_list('alert_group_id', 'started_at', 'ended_at'):
+        entry = totals[(group_id, started_at.astimezone(datetime.timezone.utc).date())]
+        entry[0] += 1
+        if ended_at is not None and ended_at >= started_at:
+            seconds = (ended_at - started_at).total_seconds()
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+    if not totals:
+        return
+
+    existing = {
+        (rollup.alert_group_id, rollup.day): rollup
+        for rollup in rollup_model.objects.select_for_update().filter(
+            alert_group_id__in={key[0] for key in totals}, day__in={key[1] for key in totals}
+        )
+    }
+    to_create = []
+    for (group_id, day), (count, seconds, max_seconds) in totals.items():
+        rollup = existing.get((group_id, day))
+        if rollup is None:
+            to_create.append(rollup_model(
+                alert_group_id=group_id, day=day, instance_count=count,
+                firing_seconds=seconds, max_firing_seconds=max_seconds,
+            ))
+            continue
+        rollup_model.objects.filter(pk=rollup.pk).update(
+            instance_count=F('instance_count') + count,
+            firing_seconds=F('firing_seconds') + seconds,
+            max_firing_seconds=max(rollup.max_firing_seconds, max_seconds),
+        )
+    rollup_model.objects.bulk_create(to_create)
@@ -0,0 +1,18 @@
+# core/services/table_version.py
+"""
+Database-derived version of a small configuration table (rules, silences).
+
+Per-process indexes compare it to decide whether to rebuild. Unlike a
+version in the Django cache it is seen by every process, even when the
+cache backend is per-process memory. Any saved, created or deleted row
+changes the version: a save moves the latest updated_at, a create raises
+the highest id, a delete lowers the row count. Queryset .update() calls
+that do not set updated_at are not seen.
+"""
+from django.db.models import Count, Max
+
+
+def table_version(queryset) -> tuple:
+    """(row count, highest id, latest updated_at) of the queryset, in one aggregate query."""
+    stats = queryset.aggregate(rows=Count('pk'), last_id=Max('pk'), last_update=Max('updated_at'))
+    return (stats['rows'], stats['last_id'], stats['last_update'])
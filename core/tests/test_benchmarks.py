@@ -0,0 +1,46 @@
+import os
+import tempfile
+from django.test import SimpleTestCase, TestCase
+from alerts.models import SilenceRule
+from core.benchmarks import compare, load_baseline, registered_cases, run_case, save_baseline
+
+
+class CompareTests(SimpleTestCase):
+    def test_flags_slowdown_beyond_threshold(self):
+        results = [
+            {'name': 'fast', 'us_per_op': 10.0},
+            {'name': 'slow', 'us_per_op': 13.0},
+            {'name': 'new', 'us_per_op': 5.0},
+        ]
+        baseline = {'fast': {'us_per_op': 10.0}, 'slow': {'us_per_op': 10.0}}
+        rows = {row['name']: row for row in compare(results, baseline, threshold=0.25)}
+
+        self.assertFalse(rows['fast']['regression'])
+        self.assertTrue(rows['slow']['regression'])
+        self.assertAlmostEqual(rows['slow']['change'], 0.3)
+        self.assertIsNone(rows['new']['baseline_us_per_op'])
+        self.assertFalse(rows['new']['regression'])
+
+    def test_baseline_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'baselines', 'sqlite.json')
+            save_baseline(path, [{'name': 'case', 'us_per_op': 1.5, 'calls': 3}])
+            self.assertEqual(load_baseline(path)['case']['us_per_op'], 1.5)
+
+    def test_missing_baseline_is_empty(self):
+        self.assertEqual(load_baseline('/nonexistent/baseline.json'), {})
+
+
+class RunCaseTests(TestCase):
+    def test_all_cases_run_at_tiny_scale_and_roll_back(self):
+        for name, factory in registered_cases().items():
+            with self.subTest(name=name):
+                result = run_case(name, factory, scale=0.001, repeat=1)
+                self.assertEqual(result['name'], name)
+                self.assertGreater(result['us_per_op'], 0)
+        self.assertFalse(SilenceRule.objects.exists())
+
+    def test_resolve_case_has_a_firing_group_for_every_repeat(self):
+        factory = registered_cases()['update_alert_state.resolve']
+        result = run_case('update_alert_state.resolve', factory, scale=0.005, repeat=7)
+        self.assertEqual(result['calls'], 1)
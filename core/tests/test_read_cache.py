@@ -0,0 +1,128 @@
+import datetime
+from unittest.mock import MagicMock, patch
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from alerts.models import AlertGroup, AlertInstance, SilenceRule
+from alerts.services.alerts_processor import acknowledge_alert, manually_resolve_alert
+from alerts.signals import alert_processed
+from core.services import read_cache
+
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'read-cache-tests'},
+}
+READ_CACHE = {'ENABLED': True, 'ALIAS': 'default', 'TIMEOUT_SECONDS': 60}
+
+
+@override_settings(CACHES=CACHES, READ_CACHE=READ_CACHE)
+class ReadCacheTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.builder = MagicMock(side_effect=lambda: {'n': self.builder.call_count})
+
+    def test_cached_until_namespace_is_bumped(self):
+        self.assertEqual(read_cache.cached('alerts', 'k', self.builder), {'n': 1})
+        self.assertEqual(read_cache.cached('alerts', 'k', self.builder), {'n': 1})
+        self.assertEqual(read_cache.cached('other', 'k', self.builder), {'n': 2})
+
+        read_cache.bump('alerts')
+
+        self.assertEqual(read_cache.cached('alerts', 'k', self.builder), {'n': 3})
+        self.assertEqual(read_cache.cached('other', 'k', self.builder), {'n': 2})
+
+    def test_lost_version_key_does_not_revive_old_entries(self):
+        read_cache.cached('alerts', 'k', self.builder)
+        caches['default'].delete(read_cache._version_key('alerts'))
+
+        read_cache.bump('alerts')
+
+        self.assertEqual(read_cache.cached('alerts', 'k', self.builder), {'n': 2})
+
+    @override_settings(READ_CACHE={**READ_CACHE, 'ENABLED': False})
+    def test_disabled_always_builds(self):
+        read_cache.cached('alerts', 'k', self.builder)
+        read_cache.cached('alerts', 'k', self.builder)
+        self.assertEqual(self.builder.call_count, 2)
+
+    def test_backend_errors_fall_back_to_builder(self):
+        broken = MagicMock()
+        broken.get.side_effect = ConnectionError('redis down')
+        broken.incr.side_effect = ConnectionError('redis down')
+        with patch('core.services.read_cache._cache', return_value=broken):
+            self.assertEqual(read_cache.cached('alerts', 'k', self.builder), {'n': 1})
+            read_cache.bump('alerts')  # logged, not raised
+
+    def test_invalidate_bumps_now_and_on_commit(self):
+        version = read_cache.current_version('alerts')
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            read_cache.invalidate('alerts')
+            self.assertEqual(read_cache.current_version('alerts'), version + 1)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(read_cache.current_version('alerts'), version + 2)
+
+
+@override_settings(CACHES=CACHES, READ_CACHE=READ_CACHE)
+class ReadCacheInvalidationTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.user = User.objects.create_user(username='operator', password='password', is_staff=True)
+        self.client.login(username='operator', password='password')
+        self.group = AlertGroup.objects.create(
+            fingerprint='fp-1', name='A', labels={'alertname': 'A'}, severity='critical',
+            current_status='firing', source='am-1',
+        )
+        self.instance = AlertInstance.objects.create(
+            alert_group=self.group, status='firing',
+            started_at=timezone.now() - datetime.timedelta(minutes=5), annotations={},
+        )
+
+    def _version(self):
+        return read_cache.current_version(read_cache.ALERT_READS)
+
+    def test_dashboard_stats_are_served_from_cache(self):
+        self.client.get(reverse('dashboard:dashboard'))
+        # Only session, user and profile lookups and the recent alerts table hit the database
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('dashboard:dashboard'))
+        self.assertIn('total_firing_alerts', response.context)
+
+    def test_alert_list_sources_and_counts_are_cached(self):
+        self.client.get(reverse('alerts:alert-list'))
+        AlertGroup.objects.filter(pk=self.group.pk).update(source='am-2')  # no signal: stays cached
+
+        response = self.client.get(reverse('alerts:alert-list'))
+        self.assertEqual(response.context['available_sources'], ['am-1'])
+
+        read_cache.bump(read_cache.ALERT_READS)
+        response = self.client.get(reverse('alerts:alert-list'))
+        self.assertEqual(response.context['available_sources'], ['am-2'])
+
+    def test_api_list_is_cached_and_invalidated_by_saves(self):
+        url = reverse('alerts:alertgroup-list')
+        self.assertEqual(self.client.get(url).data['count'], 1)
+        AlertGroup.objects.filter(pk=self.group.pk).update(current_status='resolved')
+        self.assertEqual(self.client.get(url).data['count'], 1)
+
+        self.group.refresh_from_db()
+        self.group.save()
+
+        self.assertEqual(self.client.get(url).data['count'], 0)
+
+    def test_events_bump_the_version(self):
+        events = [
+            lambda: acknowledge_alert(self.group, self.user, 'ack'),
+            lambda: alert_processed.send(sender=AlertGroup, alert_group=self.group, instance=self.instance, status='firing'),
+            lambda: SilenceRule.objects.create(
+                matchers={'alertname': 'B'}, starts_at=timezone.now(),
+                ends_at=timezone.now() + datetime.timedelta(hours=1), created_by=self.user,
+            ),
+            lambda: manually_resolve_alert(self.group, self.user, timezone.now()),
+        ]
+        for i, event in enumerate(events):
+            version = self._version()
+            event()
+            self.assertGreater(self._version(), version, f"event {i}")
@@ -0,0 +1,117 @@
+import datetime
+import gzip
+import io
+import json
+import os
+import tempfile
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from alerts.models import AlertComment, AlertDailyRollup, AlertGroup, AlertInstance
+from core.services.retention import expired_queryset, purge_table
+from integrations.models import SmsMessageLog
+
+RETENTION = {
+    'POLICIES': {'alert_instance': 30, 'alert_comment': 30, 'acknowledgement_history': 0, 'sms_message_log': 30},
+    'BATCH_SIZE': 2,
+    'BATCH_PAUSE_SECONDS': 0,
+    'ARCHIVE_DIR': '',
+}
+
+
+@override_settings(ALERT_RETENTION=RETENTION)
+class PurgeTableTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.old = self.now - datetime.timedelta(days=40)
+        self.group = AlertGroup.objects.create(fingerprint='fp-1', name='A', labels={})
+
+    def _instance(self, started_at, status='resolved', duration=None):
+        return AlertInstance.objects.create(
+            alert_group=self.group, status=status, started_at=started_at,
+            ended_at=started_at + duration if duration else None, annotations={},
+        )
+
+    def test_purges_expired_instances_and_rolls_them_up(self):
+        for minutes in (0, 10, 20):
+            self._instance(self.old + datetime.timedelta(minutes=minutes), duration=datetime.timedelta(minutes=5))
+        recent = self._instance(self.now - datetime.timedelta(days=1))
+
+        result = purge_table('alert_instance', now=self.now)
+
+        self.assertEqual(result['deleted'], 3)
+        self.assertEqual(result['batches'], 2)
+        self.assertEqual(list(AlertInstance.objects.all()), [recent])
+        rollup = AlertDailyRollup.objects.get(alert_group=self.group)
+        self.assertEqual(rollup.day, self.old.astimezone(datetime.timezone.utc).date())
+        self.assertEqual(rollup.instance_count, 3)
+        self.assertAlmostEqual(rollup.firing_seconds, 900)
+        self.assertAlmostEqual(rollup.max_firing_seconds, 300)
+
+    def test_rollup_accumulates_across_runs(self):
+        self._instance(self.old, duration=datetime.timedelta(minutes=1))
+        purge_table('alert_instance', now=self.now)
+        self._instance(self.old + datetime.timedelta(minutes=1), duration=datetime.timedelta(minutes=2))
+        purge_table('alert_instance', now=self.now)
+
+        rollup = AlertDailyRollup.objects.get(alert_group=self.group)
+        self.assertEqual(rollup.instance_count, 2)
+        self.assertAlmostEqual(rollup.firing_seconds, 180)
+        self.assertAlmostEqual(rollup.max_firing_seconds, 120)
+
+    def test_keeps_open_firing_and_latest_instances(self):
+        open_firing = self._instance(self.old, status='firing')
+        latest = self._instance(self.old + datetime.timedelta(minutes=30))
+        AlertGroup.objects.filter(pk=self.group.pk).update(latest_instance=latest)
+
+        self.assertEqual(expired_queryset('alert_instance', self.now).count(), 0)
+        purge_table('alert_instance', now=self.now)
+        self.assertEqual(set(AlertInstance.objects.all()), {open_firing, latest})
+
+    def test_max_batches_stops_early_and_rerun_resumes(self):
+        for minutes in range(5):
+            self._instance(self.old + datetime.timedelta(minutes=minutes))
+
+        first = purge_table('alert_instance', max_batches=1, now=self.now)
+        self.assertEqual(first['deleted'], 2)
+        second = purge_table('alert_instance', now=self.now)
+        self.assertEqual(second['deleted'], 3)
+        self.assertFalse(AlertInstance.objects.exists())
+
+    def test_dry_run_counts_without_deleting(self):
+        self._instance(self.old)
+        result = purge_table('alert_instance', dry_run=True, now=self.now)
+        self.assertEqual(result['expired'], 1)
+        self.assertEqual(AlertInstance.objects.count(), 1)
+
+    def test_zero_days_keeps_table(self):
+        result = purge_table('acknowledgement_history', now=self.now)
+        self.assertEqual(result['deleted'], 0)
+        self.assertIsNone(expired_queryset('acknowledgement_history', self.now))
+
+    def test_archive_writes_ndjson_before_delete(self):
+        user = User.objects.create_user(username='u', password='p')
+        comment = AlertComment.objects.create(alert_group=self.group, user=user, content='old note')
+        AlertComment.objects.filter(pk=comment.pk).update(created_at=self.old)
+        log = SmsMessageLog.objects.create(message='hi', delivery_method='sms', status='success')
+        SmsMessageLog.objects.filter(pk=log.pk).update(created_at=self.old)
+
+        with tempfile.TemporaryDirectory() as archive_dir:
+            result = purge_table('alert_comment', archive_dir=archive_dir, now=self.now)
+            purge_table('sms_message_log', now=self.now)
+
+            self.assertTrue(result['archive'].startswith(os.path.join(archive_dir, 'alert_comment')))
+            with gzip.open(result['archive'], 'rt') as f:
+                rows = [json.loads(line) for line in f]
+        self.assertEqual([row['content'] for row in rows], ['old note'])
+        self.assertFalse(AlertComment.objects.exists())
+        self.assertFalse(SmsMessageLog.objects.exists())
+
+    def test_command_reports_per_table(self):
+        self._instance(self.old)
+        out = io.StringIO()
+        call_command('purge_history', table=['alert_instance'], stdout=out)
+        self.assertIn('alert_instance: deleted 1 row(s) in 1 batch(es)', out.getvalue())
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from dashboard.services.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the dashboard rollup tables (ActiveAlertRollup, DailyAlertRollup) from AlertGroup. "
+        "Run after deploying them and whenever counters may have drifted, e.g. after bulk SQL changes."
+    )
+
+    def handle(self, *args, **options):
+        active_rows, daily_rows = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt dashboard rollups: {active_rows} active row(s), {daily_rows} daily row(s)."
+        ))
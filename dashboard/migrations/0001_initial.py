@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActiveAlertRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('severity', models.CharField(max_length=20)),
+                ('instance', models.CharField(blank=True, default='', max_length=255)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyAlertRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('severity', models.CharField(max_length=20)),
+                ('source', models.CharField(blank=True, default='', max_length=100)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['day'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyalertrollup',
+            constraint=models.UniqueConstraint(fields=('day', 'severity', 'source'), name='dashboard_daily_day_sev_src_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='activealertrollup',
+            constraint=models.UniqueConstraint(fields=('severity', 'instance'), name='dashboard_active_sev_inst_uniq'),
+        ),
+    ]
@@ -1,3 +1,41 @@
 from django.db import models
 
-# Create your models here.
+
+class ActiveAlertRollup(models.Model):
+    """
+    Number of currently firing AlertGroups per (severity, instance).
+    Maintained incrementally by dashboard.services.rollups; rebuilt by
+    `manage.py reconcile_dashboard_rollups`.
+    """
+    severity = models.CharField(max_length=20)
+    instance = models.CharField(max_length=255, blank=True, default='')
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.severity}/{self.instance or '-'}: {self.count}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['severity', 'instance'], name='dashboard_active_sev_inst_uniq'),
+        ]
+
+
+class DailyAlertRollup(models.Model):
+    """
+    Number of AlertGroups first seen per (local day, severity, source).
+    Maintained incrementally by dashboard.services.rollups; rebuilt by
+    `manage.py reconcile_dashboard_rollups`.
+    """
+    day = models.DateField()
+    severity = models.CharField(max_length=20)
+    source = models.CharField(max_length=100, blank=True, default='')
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.day} {self.severity}/{self.source or '-'}: {self.count}"
+
+    class Meta:
+        ordering = ['day']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'severity', 'source'], name='dashboard_daily_day_sev_src_uniq'),
+        ]
@@ -0,0 +1,117 @@
+# dashboard/services/rollups.py
+"""
+Incrementally maintained counters behind DashboardView.
+
+- ActiveAlertRollup: firing groups per (severity, instance); moved by status
+  transitions from the alert state manager and manual resolve.
+- DailyAlertRollup: new groups per (local day, severity, source); bumped when
+  a group is created.
+
+Group creation and deletion are picked up by the receivers in
+dashboard.signals (bulk_create callers call record_new_groups themselves).
+Callers run inside the transaction that changes the groups, so counters
+commit or roll back with the state. `manage.py reconcile_dashboard_rollups`
+rebuilds both tables from AlertGroup.
+"""
+import logging
+from collections import defaultdict
+from typing import Iterable, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from alerts.models import AlertGroup
+from ..models import ActiveAlertRollup, DailyAlertRollup
+
+logger = logging.getLogger(__name__)
+
+
+def _active_key(alert_group) -> Tuple[str, str]:
+    return (alert_group.severity, alert_group.instance or '')
+
+
+def _daily_key(alert_group) -> Tuple:
+    first_seen = alert_group.first_occurrence or timezone.now()
+    return (timezone.localdate(first_seen), alert_group.severity, alert_group.source or '')
+
+
+def _apply(model, key_fields, deltas) -> None:
+    """
+    Add each delta to its counter row, creating the row on first use.
+
+    Rows are touched in key order, so concurrent batches lock them in the
+    same order and cannot deadlock on each other.
+    """
+    for key, delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        lookup = dict(zip(key_fields, key))
+        if model.objects.filter(**lookup).update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                model.objects.create(count=delta, **lookup)
+        except IntegrityError:
+            # Created concurrently by another worker
+            model.objects.filter(**lookup).update(count=F('count') + delta)
+
+
+def record_new_groups(alert_groups: Iterable[AlertGroup], sign: int = 1) -> None:
+    """Count newly created groups (sign=-1 takes deleted groups out again)."""
+    daily = defaultdict(int)
+    active = defaultdict(int)
+    for alert_group in alert_groups:
+        daily[_daily_key(alert_group)] += sign
+        if alert_group.current_status == 'firing':
+            active[_active_key(alert_group)] += sign
+    _apply(DailyAlertRollup, ('day', 'severity', 'source'), daily)
+    _apply(ActiveAlertRollup, ('severity', 'instance'), active)
+
+
+def record_status_changes(changes: Iterable[Tuple[AlertGroup, str, str]]) -> None:
+    """Move active counters for (alert_group, old_status, new_status) transitions of existing groups."""
+    active = defaultdict(int)
+    for alert_group, old_status, new_status in changes:
+        if old_status == new_status:
+            continue
+        if new_status == 'firing':
+            active[_active_key(alert_group)] += 1
+        elif old_status == 'firing':
+            active[_active_key(alert_group)] -= 1
+    _apply(ActiveAlertRollup, ('severity', 'instance'), active)
+
+
+def rebuild_rollups() -> Tuple[int, int]:
+    """
+    Recompute both rollup tables from AlertGroup in one transaction.
+
+    Returns:
+        (active rows, daily rows) written
+    """
+    with transaction.atomic():
+        ActiveAlertRollup.objects.all().delete()
+        DailyAlertRollup.objects.all().delete()
+
+        active = defaultdict(int)
+        for row in AlertGroup.objects.filter(current_status='firing').order_by().values(
+                'severity', 'instance').annotate(n=Count('id')):
+            active[(row['severity'], row['instance'] or '')] += row['n']
+        ActiveAlertRollup.objects.bulk_create([
+            ActiveAlertRollup(severity=severity, instance=instance, count=n)
+            for (severity, instance), n in active.items()
+        ])
+
+        daily = defaultdict(int)
+        for row in AlertGroup.objects.order_by().annotate(
+                day=TruncDate('first_occurrence', tzinfo=timezone.get_current_timezone())
+        ).values('day', 'severity', 'source').annotate(n=Count('id')):
+            daily[(row['day'], row['severity'], row['source'] or '')] += row['n']
+        DailyAlertRollup.objects.bulk_create([
+            DailyAlertRollup(day=day, severity=severity, source=source, count=n)
+            for (day, severity, source), n in daily.items()
+        ])
+
+    logger.info(f"Rebuilt dashboard rollups: {len(active)} active row(s), {len(daily)} daily row(s).")
+    return len(active), len(daily)
@@ -0,0 +1,21 @@
+import logging
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from alerts.models import AlertGroup
+from .services.rollups import record_new_groups
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=AlertGroup)
+def handle_alert_group_created(sender, instance, created, **kwargs):
+    """Count new groups in the dashboard rollups. Status changes are recorded by the state manager."""
+    if created:
+        record_new_groups([instance])
+
+
+@receiver(post_delete, sender=AlertGroup)
+def handle_alert_group_deleted(sender, instance, **kwargs):
+    """Take deleted groups out of the dashboard rollups."""
+    record_new_groups([instance], sign=-1)
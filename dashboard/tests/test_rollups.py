@@ -0,0 +1,125 @@
+import datetime
+import io
+import json
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from alerts.models import AlertGroup, AlertInstance
+from alerts.services.alert_state_manager import update_alert_state, update_alert_states
+from alerts.services.alerts_processor import manually_resolve_alert
+from dashboard.models import ActiveAlertRollup, DailyAlertRollup
+from dashboard.services.rollups import _apply, rebuild_rollups
+
+
+def _alert(fingerprint, status, starts_at, severity='critical', instance='host-1'):
+    return {
+        'fingerprint': fingerprint, 'status': status,
+        'labels': {'alertname': fingerprint, 'severity': severity, 'instance': instance},
+        'starts_at': starts_at, 'ends_at': timezone.now() if status == 'resolved' else None,
+        'annotations': {}, 'generator_url': '', 'source': 'am-1',
+    }
+
+
+class RollupMaintenanceTests(TestCase):
+    def _active(self):
+        return {(r.severity, r.instance): r.count for r in ActiveAlertRollup.objects.exclude(count=0)}
+
+    def _daily(self):
+        return {(r.day, r.severity, r.source): r.count for r in DailyAlertRollup.objects.exclude(count=0)}
+
+    def _assert_matches_rebuild(self):
+        active, daily = self._active(), self._daily()
+        rebuild_rollups()
+        self.assertEqual(active, self._active())
+        self.assertEqual(daily, self._daily())
+
+    def test_state_transitions_move_active_counts(self):
+        start = timezone.now() - datetime.timedelta(minutes=10)
+        update_alert_state(_alert('a', 'firing', start))
+        update_alert_state(_alert('b', 'firing', start, severity='warning'))
+        self.assertEqual(self._active(), {('critical', 'host-1'): 1, ('warning', 'host-1'): 1})
+
+        update_alert_state(_alert('a', 'resolved', start))
+        update_alert_state(_alert('b', 'firing', start, severity='warning'))  # duplicate: no change
+        self.assertEqual(self._active(), {('warning', 'host-1'): 1})
+
+        update_alert_state(_alert('a', 'firing', start + datetime.timedelta(minutes=5)))
+        self.assertEqual(self._active(), {('critical', 'host-1'): 1, ('warning', 'host-1'): 1})
+        self.assertEqual(sum(self._daily().values()), 2)
+        self._assert_matches_rebuild()
+
+    def test_batch_path_matches_rebuild(self):
+        start = timezone.now() - datetime.timedelta(minutes=10)
+        update_alert_state(_alert('existing', 'firing', start))
+        update_alert_states([
+            _alert('new-a', 'firing', start),
+            _alert('new-b', 'resolved', start, instance='host-2'),
+            _alert('existing', 'resolved', start),
+            _alert('new-a', 'resolved', start),
+            _alert('new-a', 'firing', start + datetime.timedelta(minutes=1)),
+        ])
+        self.assertEqual(self._active(), {('critical', 'host-1'): 1})
+        self._assert_matches_rebuild()
+
+    def test_counters_are_updated_in_key_order(self):
+        ActiveAlertRollup.objects.create(severity='warning', instance='host-1', count=0)
+        ActiveAlertRollup.objects.create(severity='critical', instance='host-2', count=0)
+
+        with CaptureQueriesContext(connection) as queries:
+            _apply(ActiveAlertRollup, ('severity', 'instance'), {
+                ('warning', 'host-1'): 1, ('critical', 'host-2'): 1, ('critical', 'host-1'): 0,
+            })
+
+        updated = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updated), 2)
+        self.assertIn("'critical'", updated[0])
+        self.assertIn("'warning'", updated[1])
+
+    def test_manual_resolve_and_delete(self):
+        user = User.objects.create_user(username='resolver', password='password')
+        start = timezone.now() - datetime.timedelta(minutes=10)
+        group, _ = update_alert_state(_alert('a', 'firing', start))
+        update_alert_state(_alert('b', 'firing', start))
+
+        manually_resolve_alert(group, user, timezone.now())
+        self.assertEqual(self._active(), {('critical', 'host-1'): 1})
+
+        AlertGroup.objects.filter(fingerprint='b').delete()
+        self.assertEqual(self._active(), {})
+        self.assertEqual(sum(self._daily().values()), 1)
+        self._assert_matches_rebuild()
+
+    def test_reconcile_command_repairs_drift(self):
+        update_alert_state(_alert('a', 'firing', timezone.now()))
+        ActiveAlertRollup.objects.update(count=42)
+        DailyAlertRollup.objects.all().delete()
+
+        call_command('reconcile_dashboard_rollups', stdout=io.StringIO())
+
+        self.assertEqual(self._active(), {('critical', 'host-1'): 1})
+        self.assertEqual(list(self._daily().values()), [1])
+
+
+class DashboardRollupViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='viewer', password='password')
+        self.client.login(username='viewer', password='password')
+        start = timezone.now() - datetime.timedelta(minutes=10)
+        for i, severity in enumerate(['critical', 'critical', 'warning']):
+            update_alert_state(_alert(f'fp-{i}', 'firing', start, severity=severity, instance=f'host-{i % 2}'))
+
+    def test_dashboard_reads_rollups(self):
+        response = self.client.get(reverse('dashboard:dashboard'))
+
+        self.assertEqual(response.context['total_firing_alerts'], 3)
+        self.assertEqual(json.loads(response.context['severity_distribution_json'])['data'], [2, 1, 0])
+        instances = json.loads(response.context['instance_distribution_json'])
+        self.assertEqual(instances, {'labels': ['host-0', 'host-1'], 'data': [2, 1]})
+        trend = json.loads(response.context['daily_trend_json'])
+        self.assertEqual(trend['datasets'][0]['data'][-1], 2)
+        self.assertEqual(trend['datasets'][1]['data'][-1], 1)
@@ -1,17 +1,20 @@
 from django.shortcuts import render
 from django.views.generic import TemplateView, ListView
-from django.db.models import Count, Q
+from django.db.models import Count, Q, Sum
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.urls import reverse, reverse_lazy
 from django.http import JsonResponse
 from django.template.loader import render_to_string
 from django.utils import timezone
 from datetime import timedelta
+from collections import defaultdict
 import logging
 import json
 from alerts.models import AlertGroup, AlertComment, AlertAcknowledgementHistory
 from alerts.views import AlertListView
 from alerts.forms import AlertAcknowledgementForm
+from .models import ActiveAlertRollup, DailyAlertRollup
+from core.services import read_cache
 from django.contrib.auth.models import User, Group
 
 logger = logging.getLogger(__name__)
@@ -23,11 +26,27 @@ class DashboardView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
+        # Cards and charts only change with alert state; shared by every polling operator
+        context.update(read_cache.cached(
+            read_cache.ALERT_READS, f"dashboard:stats:{timezone.localdate().isoformat()}", self._build_stats
+        ))
+
+        # --- 5. Data for Recent Alerts Table (Top 5 Firing) ---
+        context['recent_alerts'] = AlertGroup.objects.filter(current_status='firing').order_by('-last_occurrence')[:5]
+
+        return context
+
+    def _build_stats(self):
+        context = {}
+
         # --- 1. Calculate Stats for Cards ---
+        # Firing counts per (severity, instance) come from the incrementally
+        # maintained rollup (dashboard.services.rollups): one small indexed read.
         active_alerts_qs = AlertGroup.objects.filter(current_status='firing')
         silenced_alerts_qs = AlertGroup.objects.filter(is_silenced=True) # Count all defined silenced alerts
+        active_rollup = list(ActiveAlertRollup.objects.filter(count__gt=0).values_list('severity', 'instance', 'count'))
 
-        context['total_firing_alerts'] = active_alerts_qs.count()
+        context['total_firing_alerts'] = sum(count for _, _, count in active_rollup)
         # Unacknowledged = Firing AND NOT Acknowledged AND NOT Silenced
         context['unacknowledged_alerts'] = active_alerts_qs.filter(
             acknowledged=False,
@@ -36,12 +55,9 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         context['silenced_alerts'] = silenced_alerts_qs.count()
 
         # --- 2. Data for Severity Donut Chart ---
-        severity_distribution = active_alerts_qs.values('severity').annotate(count=Count('severity')).order_by('severity')
-        sev_labels = []
-        sev_data = []
         sev_map = {'critical': 0, 'warning': 0, 'info': 0}
-        for item in severity_distribution:
-            sev_map[item['severity']] = item['count']
+        for severity, _, count in active_rollup:
+            sev_map[severity] = sev_map.get(severity, 0) + count
         # Ensure order for the chart
         sev_labels = ['Critical', 'Warning', 'Info']
         sev_data = [sev_map['critical'], sev_map['warning'], sev_map['info']]
@@ -51,10 +67,14 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             'data': sev_data
         })
 
-        # --- 3. Data for Instance Donut Chart (Top 5) ---
-        instance_distribution = active_alerts_qs.exclude(instance__isnull=True).exclude(instance__exact='').values('instance').annotate(count=Count('id')).order_by('-count')[:10] # Get top 10
-        inst_labels = [item['instance'] for item in instance_distribution]
-        inst_data = [item['count'] for item in instance_distribution]
+        # --- 3. Data for Instance Donut Chart (Top 10) ---
+        instance_counts = defaultdict(int)
+        for _, instance, count in active_rollup:
+            if instance:
+                instance_counts[instance] += count
+        instance_distribution = sorted(instance_counts.items(), key=lambda item: (-item[1], item[0]))[:10]
+        inst_labels = [instance for instance, _ in instance_distribution]
+        inst_data = [count for _, count in instance_distribution]
 
         context['instance_distribution_json'] = json.dumps({
             'labels': inst_labels,
@@ -62,11 +82,11 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         })
 
         # --- 4. Data for Daily Trend Bar Chart (Last 7 Days) ---
-        # Note: This counts alerts occurred (first_occurrence) in the last 7 days, NOT currently active ones. Adjust if needed.
-        seven_days_ago = timezone.now().date() - timedelta(days=6)
-        daily_alerts = AlertGroup.objects.filter(
-            first_occurrence__date__gte=seven_days_ago
-        ).values('first_occurrence__date', 'severity').annotate(count=Count('id')).order_by('first_occurrence__date')
+        # Note: This counts alerts occurred (first_occurrence) in the last 7 days, NOT currently active ones.
+        seven_days_ago = timezone.localdate() - timedelta(days=6)
+        daily_alerts = DailyAlertRollup.objects.filter(
+            day__gte=seven_days_ago
+        ).values('day', 'severity').annotate(count=Sum('count')).order_by('day')
 
         # Process data for stacked bar chart format
         trend_data = {} # {date_str: {'Critical': count, 'Warning': count, 'Info': count}}
@@ -77,7 +97,7 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             trend_data[d.isoformat()] = {'Critical': 0, 'Warning': 0, 'Info': 0}
 
         for alert in daily_alerts:
-            date_str = alert['first_occurrence__date'].isoformat()
+            date_str = alert['day'].isoformat()
             severity = alert['severity'].capitalize() # Match chart labels
             if date_str in trend_data and severity in trend_data[date_str]:
                 trend_data[date_str][severity] = alert['count']
@@ -93,9 +113,6 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             'datasets': daily_datasets
         })
 
-        # --- 5. Data for Recent Alerts Table (Top 5 Firing) ---
-        context['recent_alerts'] = active_alerts_qs.order_by('-last_occurrence')[:5]
-
         return context
 
 
@@ -8,3 +8,4 @@ class IntegrationsConfig(AppConfig):
     def ready(self):
         # Import signal handlers
         import integrations.handlers
+        import integrations.signals  # noqa
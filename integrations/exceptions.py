@@ -3,6 +3,11 @@ class SlackNotificationError(Exception):
     pass
 
 
+class SlackThrottledError(SlackNotificationError):
+    """The Slack endpoint concurrency limit was reached; the send should be deferred, not counted as a failure."""
+    pass
+
+
 class SmsNotificationError(Exception):
     """Custom exception for SMS notification failures that should trigger a retry."""
     pass
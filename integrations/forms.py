@@ -99,6 +99,7 @@ class SlackIntegrationRuleForm(forms.ModelForm):
         fields = [
             'name', 'is_active', 'priority',
             'match_criteria', 'slack_channel', 'message_template', 'resolved_message_template',
+            'digest_window_seconds', 'digest_template',
         ]
         help_texts = {
             'slack_channel': "Leave empty to route via labels.channel or fallback default channel.",
@@ -126,6 +127,13 @@ class SlackIntegrationRuleForm(forms.ModelForm):
                     'placeholder': ':white_check_mark: [{{ alert_group.severity }}] {{ summary }}\nStarted: {{ latest_instance.started_at|format_datetime:user }}\nEnded: {{ latest_instance.ended_at|format_datetime:user }}'
                 }
             ),
+            'digest_template': forms.Textarea(
+                attrs={
+                    'rows': 3,
+                    'class': 'form-control font-monospace',
+                    'placeholder': ':rotating_light: {{ count }} alerts ({{ firing_count }} firing, {{ resolved_count }} resolved)\n{% for entry in entries %}{{ entry.message }}\n{% endfor %}'
+                }
+            ),
         }
 
     def __init__(self, *args, **kwargs):
@@ -139,9 +147,15 @@ class SlackIntegrationRuleForm(forms.ModelForm):
         # Set priority default
         if 'priority' in self.fields:
             self.fields['priority'].initial = 0
+        # Digests are opt-in; an empty window sends immediately
+        if 'digest_window_seconds' in self.fields:
+            self.fields['digest_window_seconds'].required = False
 
 # Removed duplicate __init__; initialization handled above
 
+    def clean_digest_window_seconds(self):
+        return self.cleaned_data.get('digest_window_seconds') or 0
+
     def clean_match_criteria(self):
         match_criteria = self.cleaned_data.get('match_criteria', '{}')
 
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0016_alertgroup_status_ack_index'),
+        ('integrations', '0006_phonebook_contact_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='slackintegrationrule',
+            name='digest_template',
+            field=models.TextField(blank=True, help_text='Template for digest messages. Uses Django template syntax with entries, count, firing_count, resolved_count, channel and rule. Leave empty for the default digest.'),
+        ),
+        migrations.AddField(
+            model_name='slackintegrationrule',
+            name='digest_window_seconds',
+            field=models.PositiveIntegerField(default=0, help_text='Coalesce notifications for the same channel arriving within this many seconds into one digest message. 0 sends every notification immediately.'),
+        ),
+        migrations.CreateModel(
+            name='SlackDigestEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(max_length=100)),
+                ('status', models.CharField(blank=True, max_length=20)),
+                ('message', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('claim_token', models.CharField(blank=True, db_index=True, max_length=32)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('alert_group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='slack_digest_entries', to='alerts.alertgroup')),
+                ('rule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='digest_entries', to='integrations.slackintegrationrule')),
+            ],
+            options={
+                'ordering': ['created_at', 'id'],
+                'indexes': [models.Index(fields=['rule', 'channel', 'claim_token'], name='slack_digest_pending_idx')],
+            },
+        ),
+    ]
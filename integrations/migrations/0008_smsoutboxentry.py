@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0016_alertgroup_status_ack_index'),
+        ('integrations', '0007_slack_digest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SmsOutboxEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('recipients', models.JSONField(default=list)),
+                ('message', models.TextField()),
+                ('claim_token', models.CharField(blank=True, db_index=True, max_length=32)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('alert_group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sms_outbox_entries', to='alerts.alertgroup')),
+                ('rule', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='outbox_entries', to='integrations.smsintegrationrule')),
+            ],
+            options={
+                'ordering': ['created_at', 'id'],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-17 06:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0008_smsoutboxentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='slackintegrationrule',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='smsintegrationrule',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -105,6 +105,15 @@ class SlackIntegrationRule(models.Model):
         blank=True,
         help_text="Template used when an alert is resolved. Uses Django template syntax."
     )
+    digest_window_seconds = models.PositiveIntegerField(
+        default=0,
+        help_text="Coalesce notifications for the same channel arriving within this many seconds into one digest message. 0 sends every notification immediately."
+    )
+    digest_template = models.TextField(
+        blank=True,
+        help_text="Template for digest messages. Uses Django template syntax with entries, count, firing_count, resolved_count, channel and rule. Leave empty for the default digest."
+    )
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-priority', 'name']
@@ -122,6 +131,39 @@ class SlackIntegrationRule(models.Model):
         return f"{self.name} ({status}, Prio: {self.priority})"
 
 
+class SlackDigestEntry(models.Model):
+    """A rendered Slack notification waiting to be sent as part of a rule's digest."""
+
+    rule = models.ForeignKey(
+        SlackIntegrationRule,
+        on_delete=models.CASCADE,
+        related_name="digest_entries",
+    )
+    alert_group = models.ForeignKey(
+        AlertGroup,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="slack_digest_entries",
+    )
+    channel = models.CharField(max_length=100)
+    status = models.CharField(max_length=20, blank=True)
+    message = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Set while a flush is sending the entry; stale claims are taken over
+    claim_token = models.CharField(max_length=32, blank=True, db_index=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at', 'id']
+        indexes = [
+            models.Index(fields=['rule', 'channel', 'claim_token'], name='slack_digest_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f"Slack digest entry {self.pk} ({self.channel})"
+
+
 class PhoneBook(models.Model):
     """Simple directory mapping names to phone numbers."""
 
@@ -181,6 +223,7 @@ class SmsIntegrationRule(models.Model):
         blank=True,
         help_text="Optional template for SMS message when alert is resolved. If blank, no message is sent on resolve."
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-priority', 'name']
@@ -197,6 +240,37 @@ class SmsIntegrationRule(models.Model):
         return f"{self.name} ({status}, Prio: {self.priority})"
 
 
+class SmsOutboxEntry(models.Model):
+    """A rendered SMS waiting to be packed into the next batched provider request."""
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    rule = models.ForeignKey(
+        SmsIntegrationRule,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="outbox_entries",
+    )
+    alert_group = models.ForeignKey(
+        AlertGroup,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="sms_outbox_entries",
+    )
+    recipients = models.JSONField(default=list)
+    message = models.TextField()
+    # Set while a flush is sending the entry; stale claims are taken over
+    claim_token = models.CharField(max_length=32, blank=True, db_index=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at", "id"]
+
+    def __str__(self):
+        return f"SMS outbox entry {self.pk} ({len(self.recipients)} recipient(s))"
+
+
 class SmsMessageLog(models.Model):
     """Stores a record for each SMS message attempt made by the system."""
 
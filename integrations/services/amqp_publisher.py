@@ -0,0 +1,158 @@
+# integrations/services/amqp_publisher.py
+"""
+Long-lived AMQP publishers for the Slack and SMS RabbitMQ forwarders.
+
+Opening a pika.BlockingConnection per message costs a TCP and AMQP
+handshake plus a queue_declare each time. Instead, every worker process
+keeps one publisher per broker (host, port, user):
+- the connection and channel are opened on first use and reused;
+- the channel is in publisher-confirm mode, so a publish only returns once
+  the broker has taken responsibility for the message;
+- queues are declared once per connection;
+- a failed publish reconnects and is retried AMQP_PUBLISHER['RETRIES'] times;
+- publish_batch() sends several bodies over the same channel in one call and,
+  after a failure, retries only the bodies the broker has not confirmed;
+- worker processes close their publishers on shutdown (integrations.signals).
+
+pika connections are neither thread- nor fork-safe: publishers are guarded
+by a lock and dropped when the process id changes (e.g. after a prefork).
+"""
+import logging
+import os
+import threading
+from typing import Dict, Iterable
+
+import pika
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _publisher_config() -> dict:
+    return getattr(settings, 'AMQP_PUBLISHER', {})
+
+
+class AmqpPublisher:
+    """Publishes persistent messages to durable queues over one reused channel."""
+
+    def __init__(self, host: str, port: int, user: str, password: str):
+        self.host = host
+        self.port = port
+        self.user = user
+        self._password = password
+        self._connection = None
+        self._channel = None
+        self._declared_queues = set()
+        self._lock = threading.Lock()
+
+    def _parameters(self) -> pika.ConnectionParameters:
+        config = _publisher_config()
+        return pika.ConnectionParameters(
+            host=self.host,
+            port=self.port,
+            credentials=pika.PlainCredentials(self.user, self._password),
+            heartbeat=int(config.get('HEARTBEAT_SECONDS', 60)),
+            blocked_connection_timeout=float(config.get('BLOCKED_CONNECTION_TIMEOUT_SECONDS', 30)),
+        )
+
+    def _ensure_channel(self):
+        if self._channel is not None and self._channel.is_open and self._connection.is_open:
+            # Serve heartbeats and broker events that arrived while idle
+            self._connection.process_data_events(time_limit=0)
+            return self._channel
+
+        self._close()
+        self._connection = pika.BlockingConnection(self._parameters())
+        self._channel = self._connection.channel()
+        if _publisher_config().get('CONFIRM_DELIVERY', True):
+            self._channel.confirm_delivery()
+        logger.info(f"AMQP publisher connected to {self.host}:{self.port}.")
+        return self._channel
+
+    def _close(self) -> None:
+        connection = self._connection
+        self._connection = self._channel = None
+        self._declared_queues = set()
+        if connection is not None:
+            try:
+                if connection.is_open:
+                    connection.close()
+            except Exception as e:
+                logger.debug(f"Ignoring error while closing AMQP connection to {self.host}:{self.port}: {e}")
+
+    def _publish_all(self, queue: str, bodies: list):
+        """Publish the bodies in order, yielding after each one the broker has taken."""
+        channel = self._ensure_channel()
+        if queue not in self._declared_queues:
+            channel.queue_declare(queue=queue, durable=True)
+            self._declared_queues.add(queue)
+        properties = pika.BasicProperties(delivery_mode=2)  # Make message persistent
+        for body in bodies:
+            channel.basic_publish(exchange='', routing_key=queue, body=body, properties=properties)
+            yield
+
+    def publish_batch(self, queue: str, bodies: Iterable) -> None:
+        """
+        Publish the bodies in order. On a connection or channel failure the
+        publisher reconnects and retries from the first body that was not
+        confirmed, so confirmed messages are not sent twice.
+
+        Raises:
+            The last pika error when every attempt failed.
+        """
+        bodies = list(bodies)
+        if not bodies:
+            return
+        retries = int(_publisher_config().get('RETRIES', 1))
+        sent = 0
+        with self._lock:
+            for attempt in range(retries + 1):
+                try:
+                    for _ in self._publish_all(queue, bodies[sent:]):
+                        sent += 1
+                    return
+                except (pika.exceptions.AMQPError, OSError) as e:
+                    self._close()
+                    if attempt >= retries:
+                        raise
+                    logger.warning(
+                        f"AMQP publish to '{queue}' on {self.host}:{self.port} failed after {sent} of {len(bodies)} "
+                        f"message(s) ({e!r}); reconnecting to send the rest."
+                    )
+
+    def publish(self, queue: str, body) -> None:
+        """Publish one message; see publish_batch()."""
+        self.publish_batch(queue, [body])
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+
+_publishers: Dict[tuple, AmqpPublisher] = {}
+_publishers_pid = None
+_publishers_lock = threading.Lock()
+
+
+def publisher_for(config: dict) -> AmqpPublisher:
+    """The shared publisher of this process for a forwarder config (HOST, PORT, USER, PASSWORD)."""
+    global _publishers_pid
+    key = (config['HOST'], int(config['PORT']), config['USER'], config['PASSWORD'])
+    with _publishers_lock:
+        if _publishers_pid != os.getpid():
+            # Connections inherited from the parent process must not be reused
+            _publishers.clear()
+            _publishers_pid = os.getpid()
+        publisher = _publishers.get(key)
+        if publisher is None:
+            publisher = _publishers[key] = AmqpPublisher(*key)
+        return publisher
+
+
+def close_publishers() -> None:
+    """Close and forget every publisher of this process."""
+    with _publishers_lock:
+        publishers = list(_publishers.values())
+        _publishers.clear()
+    for publisher in publishers:
+        publisher.close()
@@ -0,0 +1,102 @@
+# integrations/services/http_pool.py
+"""
+Shared HTTP sessions and per-endpoint concurrency limits for integration calls.
+
+A plain requests.post() opens a new TCP (and TLS) connection per message.
+Every worker process instead keeps one requests.Session per pool name whose
+adapter keeps up to POOL_SIZE connections per host alive between tasks.
+
+endpoint_slot() caps the number of requests in flight to one endpoint across
+all workers: each request leases one of `limit` slot keys in the Django cache
+with cache.add(), and gives it back afterwards. Leases expire on their own,
+so a worker killed mid-request cannot hold a slot forever. With the
+per-process memory cache the limit only applies within one process.
+"""
+import logging
+import os
+import random
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict
+
+import requests
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+SLOT_KEY_PREFIX = 'sentryhub:http_slot'
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_pid = None
+_sessions_lock = threading.Lock()
+
+
+def get_session(name: str, pool_size: int = 10) -> requests.Session:
+    """The shared keep-alive session of this process for the pool name."""
+    global _sessions_pid
+    with _sessions_lock:
+        if _sessions_pid != os.getpid():
+            # Sockets inherited from the parent process must not be reused
+            _sessions.clear()
+            _sessions_pid = os.getpid()
+        session = _sessions.get(name)
+        if session is None:
+            session = requests.Session()
+            # Retries are scheduled by the Celery tasks, not inside the request
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session = _sessions[name] = session
+        return session
+
+
+def close_sessions() -> None:
+    """Close and forget every session of this process."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+@contextmanager
+def endpoint_slot(endpoint: str, limit: int, lease_seconds: float):
+    """
+    Lease one of `limit` request slots for the endpoint without waiting.
+
+    Yields True when a slot was taken (or limit is 0, i.e. unlimited) and
+    False when all slots are in use. A cache failure does not block sending.
+    """
+    if limit <= 0:
+        yield True
+        return
+
+    token = uuid.uuid4().hex
+    slot_key = None
+    slots = list(range(limit))
+    random.shuffle(slots)
+    try:
+        for slot in slots:
+            key = f"{SLOT_KEY_PREFIX}:{endpoint}:{slot}"
+            if cache.add(key, token, timeout=max(1, int(lease_seconds))):
+                slot_key = key
+                break
+    except Exception as e:
+        logger.warning(f"Concurrency limit for {endpoint} unavailable, sending anyway: {e}")
+        yield True
+        return
+
+    if slot_key is None:
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        try:
+            # Do not free a slot that expired and was leased again by someone else
+            if cache.get(slot_key) == token:
+                cache.delete(slot_key)
+        except Exception as e:
+            logger.debug(f"Failed to release HTTP slot {slot_key}: {e}")
@@ -1,9 +1,10 @@
 # integrations/services/jira_matcher.py
 
 import logging
-from typing import Dict, Optional, List # Added List import
+from typing import Dict, Optional
 
 from integrations.models import JiraIntegrationRule
+from .rule_index import find_best_rule
 
 logger = logging.getLogger(__name__)
 
@@ -28,34 +29,19 @@ class JiraRuleMatcherService:
         Returns:
             The most specific matching JiraIntegrationRule instance, or None if no rule matches.
         """
-        # Get all active rules (no initial ordering needed here)
-        active_rules = JiraIntegrationRule.objects.filter(is_active=True)
-
-        matching_rules: List[JiraIntegrationRule] = []
-        for rule in active_rules:
-            if self._does_rule_match(rule, alert_labels):
-                # Collect all rules that match
-                matching_rules.append(rule)
+        # Candidates come from the compiled index (no query per alert), best first
+        best_match = find_best_rule(
+            JiraIntegrationRule, alert_labels,
+            lambda rule: self._does_rule_match(rule, alert_labels),
+            label_prefix=None,
+        )
 
-        if not matching_rules:
+        if best_match is None:
             logger.debug("No active Jira integration rule matched the alert labels.")
             return None
 
-        # Sort the matching rules to find the best one
-        # 1. Most specific first (more criteria keys)
-        # 2. Highest priority first (tie-breaker 1)
-        # 3. Alphabetical name first (tie-breaker 2)
-        matching_rules.sort(key=lambda r: (
-            -len(r.match_criteria or {}), # Descending order of criteria count
-            -r.priority,                 # Descending order of priority
-            r.name                       # Ascending order of name
-        ))
-
-        # The best match is the first rule after sorting
-        best_match = matching_rules[0]
         logger.debug(
-            f"Alert labels matched {len(matching_rules)} Jira rule(s). "
-            f"Selected best match by specificity/priority/name: {best_match.name} (ID: {best_match.id})"
+            f"Alert labels matched Jira rule by specificity/priority/name: {best_match.name} (ID: {best_match.id})"
         )
         return best_match
 
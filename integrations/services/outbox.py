@@ -0,0 +1,42 @@
+# integrations/services/outbox.py
+"""
+Claiming helpers for the notification outbox models (SlackDigestEntry, SmsOutboxEntry).
+
+A flush claims entries by writing a fresh claim_token/claimed_at on them, so
+concurrent flushes take disjoint entries without holding row locks while they
+talk to the provider. Claims older than the claim timeout belong to a flush
+that died and can be taken over.
+"""
+import uuid
+from datetime import timedelta
+
+from django.db.models import Q
+
+
+def claimable(now, claim_timeout_seconds: int) -> Q:
+    """Entries that are unclaimed or whose claim is stale."""
+    stale_before = now - timedelta(seconds=claim_timeout_seconds)
+    return Q(claim_token='') | Q(claimed_at__lt=stale_before)
+
+
+def claim_entries(queryset, now, batch_size: int, claim_timeout_seconds: int) -> str:
+    """
+    Claim up to batch_size claimable entries of the queryset, oldest first.
+
+    Returns:
+        The claim token; filter the model on claim_token to get the entries
+    """
+    condition = claimable(now, claim_timeout_seconds)
+    ids = list(
+        queryset.filter(condition).order_by('created_at', 'id').values_list('id', flat=True)[:batch_size]
+    )
+    token = uuid.uuid4().hex
+    if ids:
+        # Re-checking the claim condition makes concurrent flushes take disjoint entries
+        queryset.model.objects.filter(condition, id__in=ids).update(claim_token=token, claimed_at=now)
+    return token
+
+
+def release_entries(queryset) -> int:
+    """Give claimed entries back to the outbox for a later flush."""
+    return queryset.update(claim_token='', claimed_at=None)
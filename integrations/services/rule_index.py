@@ -0,0 +1,189 @@
+# integrations/services/rule_index.py
+"""
+Compiled, per-process index of active integration rules (Jira, Slack, SMS).
+
+Instead of loading and testing every active rule for every alert, the
+active rules of a model are compiled once into an inverted index:
+each rule is filed under one "anchor" criterion that any matching alert
+must satisfy exactly, either a (label key, value) or an (AlertGroup field,
+value) pair. Rules without such a criterion (empty criteria, __isnull
+lookups, ...) are always candidates. Matching looks up the buckets of the
+alert's labels and fields and runs the matcher's own _does_rule_match on
+the candidates in precomputed specificity/priority/name order, so the
+first match is the best one and match semantics stay exactly the same.
+
+Indexes are rebuilt when the model's version changes. The version pairs a
+counter in the Django cache, bumped from the rules' post_save/post_delete
+signals (immediate when the cache is shared Redis), with the rule table's
+version from the database (core.services.table_version), probed at most
+every RULE_INDEX['VERSION_PROBE_SECONDS'] so that rule edits reach every
+process even when the cache is per-process.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from core.services.table_version import table_version
+
+logger = logging.getLogger(__name__)
+
+LABEL_PREFIX = 'labels__'
+
+
+def _rule_sort_key(rule):
+    """Same order the matchers have always used: most criteria, then highest priority, then name."""
+    return (-len(rule.match_criteria or {}), -rule.priority, rule.name)
+
+
+class CompiledRuleIndex:
+    """
+    Inverted index over one model's active rules.
+
+    Args:
+        rules: active rules
+        label_prefix: prefix that marks label criteria ('labels__'), or None
+            when every criteria key is a label key (Jira)
+    """
+
+    def __init__(self, rules, label_prefix: Optional[str] = LABEL_PREFIX):
+        self.label_prefix = label_prefix
+        self.label_buckets: Dict[tuple, List] = defaultdict(list)
+        self.field_buckets: Dict[tuple, List] = defaultdict(list)
+        self.unanchored: List = []
+        self.size = 0
+
+        for position, rule in enumerate(sorted(rules, key=_rule_sort_key)):
+            entry = (position, rule)
+            self.size += 1
+            anchor = self._anchor(rule.match_criteria)
+            if anchor is None:
+                self.unanchored.append(entry)
+            elif anchor[0] == 'label':
+                self.label_buckets[anchor[1:]].append(entry)
+            else:
+                self.field_buckets[anchor[1:]].append(entry)
+        self.anchor_fields = sorted({field for field, _ in self.field_buckets})
+
+    def _anchor(self, criteria):
+        """An exact criterion every alert matching these criteria satisfies, if any."""
+        if not isinstance(criteria, dict) or not criteria:
+            return None
+        field_anchor = None
+        for key, expected in criteria.items():
+            value = str(expected)
+            if self.label_prefix is None:
+                return ('label', key, value)
+            if key.startswith(self.label_prefix):
+                # A missing label compares as 'None', so that value cannot be anchored
+                if value != 'None':
+                    return ('label', key.split('__', 1)[1], value)
+                continue
+            field_name, _, lookup = key.partition('__')
+            # Only the isnull lookup is evaluated; any other key compares the field exactly
+            if lookup != 'isnull' and field_anchor is None:
+                field_anchor = ('field', field_name, value)
+        return field_anchor
+
+    def candidates(self, labels: dict, alert_group=None) -> List:
+        """Rules that may match, best first."""
+        entries = list(self.unanchored)
+        for key, value in (labels or {}).items():
+            entries.extend(self.label_buckets.get((key, str(value)), ()))
+        if alert_group is not None:
+            for field_name in self.anchor_fields:
+                if hasattr(alert_group, field_name):
+                    entries.extend(self.field_buckets.get((field_name, str(getattr(alert_group, field_name))), ()))
+        entries.sort(key=lambda entry: entry[0])
+        return [rule for _, rule in entries]
+
+
+class RuleIndexRegistry:
+    """Per-process cache of compiled indexes, keyed by model label."""
+
+    def __init__(self):
+        self._indexes = {}
+        self._probes = {}
+        self._lock = threading.Lock()
+
+    @property
+    def probe_interval(self) -> float:
+        return float(getattr(settings, 'RULE_INDEX', {}).get('VERSION_PROBE_SECONDS', 2))
+
+    def _version_key(self, model) -> str:
+        return f"sentryhub:rule_index:{model._meta.label_lower}:version"
+
+    def version(self, model) -> tuple:
+        """(shared cache version, rule table version) of the model's rules."""
+        try:
+            shared = cache.get(self._version_key(model))
+        except Exception as e:
+            logger.warning(f"Rule index version unavailable for {model._meta.label}: {e}")
+            shared = None
+        return (shared, self._table_version(model))
+
+    def _table_version(self, model) -> tuple:
+        label = model._meta.label_lower
+        probe = self._probes.get(label)
+        if probe is None or time.monotonic() - probe[0] >= self.probe_interval:
+            probe = (time.monotonic(), table_version(model.objects.all()))
+            self._probes[label] = probe
+        return probe[1]
+
+    def get(self, model, label_prefix: Optional[str] = LABEL_PREFIX) -> CompiledRuleIndex:
+        label = model._meta.label_lower
+        version = self.version(model)
+        cached = self._indexes.get(label)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        with self._lock:
+            index = CompiledRuleIndex(model.objects.filter(is_active=True), label_prefix=label_prefix)
+            self._indexes[label] = (version, index)
+        logger.debug(f"Compiled {model._meta.label} index with {index.size} active rule(s) (version {version}).")
+        return index
+
+    def invalidate(self, model) -> None:
+        """Drop this process' index and bump the shared version now and again on commit."""
+        self._indexes.pop(model._meta.label_lower, None)
+        self._bump(model)
+        connection = transaction.get_connection()
+        if connection.in_atomic_block:
+            connection.on_commit(lambda: self._bump(model))
+
+    def _bump(self, model) -> None:
+        self._indexes.pop(model._meta.label_lower, None)
+        self._probes.pop(model._meta.label_lower, None)
+        key = self._version_key(model)
+        try:
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, time.time_ns() // 1000, timeout=None)
+        except Exception as e:
+            logger.warning(f"Failed to bump rule index version for {model._meta.label}: {e}")
+
+    def clear(self) -> None:
+        self._indexes.clear()
+        self._probes.clear()
+
+
+rule_index_registry = RuleIndexRegistry()
+
+
+def find_best_rule(model, labels: dict, matches: Callable, alert_group=None,
+                   label_prefix: Optional[str] = LABEL_PREFIX):
+    """
+    Return the best active rule of `model` for which matches(rule) is true,
+    testing only the candidates from the compiled index, or None.
+    """
+    index = rule_index_registry.get(model, label_prefix=label_prefix)
+    for rule in index.candidates(labels, alert_group):
+        if matches(rule):
+            return rule
+    return None
@@ -0,0 +1,160 @@
+# integrations/services/slack_digest.py
+"""
+Coalesces Slack notifications of a rule into digest messages during alert storms.
+
+Rules with digest_window_seconds > 0 do not post each rendered notification.
+The Slack task stores it as a SlackDigestEntry (a DB outbox) instead, and the
+first entry of a window for a (rule, channel) schedules one flush task for
+the end of the window (deduplicated through the Django cache). The flush
+claims the pending entries with a token, renders them with the rule's
+digest_template and posts them as one message of up to
+SLACK_DIGEST['MAX_ENTRIES_PER_MESSAGE'] entries, then deletes them.
+
+Entries of a failed or lost flush stay in the outbox: claims older than
+CLAIM_TIMEOUT_SECONDS are taken over, and the beat sweep flushes any window
+that is overdue by more than FLUSH_GRACE_SECONDS.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Min
+from django.template import Context
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+
+from integrations.models import SlackDigestEntry, SlackIntegrationRule
+from integrations.services.outbox import claim_entries, claimable, release_entries
+from integrations.services.slack_service import SlackService
+from integrations.services.template_cache import template_cache
+
+logger = logging.getLogger(__name__)
+
+WINDOW_KEY_PREFIX = 'sentryhub:slack_digest:window'
+
+DEFAULT_DIGEST_TEMPLATE = (
+    "*{{ count }} alert notification{{ count|pluralize }} for {{ channel }}* "
+    "({{ firing_count }} firing, {{ resolved_count }} resolved)\n"
+    "{% for entry in entries %}{{ entry.message }}\n{% endfor %}"
+)
+
+
+def _digest_config() -> dict:
+    return getattr(settings, 'SLACK_DIGEST', {})
+
+
+def _window_key(rule_id: int, channel: str) -> str:
+    return f"{WINDOW_KEY_PREFIX}:{rule_id}:{channel}"
+
+
+def buffer_notification(rule: SlackIntegrationRule, alert_group, channel: str, status: str, message: str) -> bool:
+    """
+    Store a rendered notification for the rule's next digest to the channel.
+
+    Returns:
+        True when the entry opened a new window and the caller must schedule
+        the flush in rule.digest_window_seconds
+    """
+    SlackDigestEntry.objects.create(
+        rule=rule, alert_group=alert_group, channel=channel, status=status or '', message=message
+    )
+    try:
+        return cache.add(_window_key(rule.id, channel), 1, timeout=rule.digest_window_seconds)
+    except Exception as e:
+        logger.warning(f"Slack digest window state unavailable, scheduling a flush: {e}")
+        return True
+
+
+def render_digest(rule: SlackIntegrationRule, channel: str, entries) -> str:
+    """Render the digest message for the entries with the rule's digest template."""
+    entries = list(entries)
+    context = {
+        'rule': rule,
+        'channel': channel,
+        # Messages are already rendered (and escaped) by the rule templates
+        'entries': [
+            {
+                'message': mark_safe(entry.message),
+                'status': entry.status,
+                'alert_group': entry.alert_group,
+                'created_at': entry.created_at,
+            }
+            for entry in entries
+        ],
+        'count': len(entries),
+        'firing_count': sum(1 for entry in entries if entry.status != 'resolved'),
+        'resolved_count': sum(1 for entry in entries if entry.status == 'resolved'),
+        'window_seconds': rule.digest_window_seconds,
+    }
+    try:
+        return template_cache.get(rule.digest_template or DEFAULT_DIGEST_TEMPLATE).render(Context(context)).strip()
+    except Exception as e:
+        logger.warning(f"Slack digest template of rule '{rule.name}' failed ({e}); using the default digest.")
+        return template_cache.get(DEFAULT_DIGEST_TEMPLATE).render(Context(context)).strip()
+
+
+def flush_digest(rule_id: int, channel: str, now=None) -> int:
+    """
+    Send the pending entries of a (rule, channel) as digest messages.
+
+    Returns:
+        The number of entries sent
+
+    Raises:
+        SlackNotificationError: on a network error; the unsent entries are
+        released for the retry
+    """
+    now = now or timezone.now()
+    try:
+        rule = SlackIntegrationRule.objects.get(pk=rule_id)
+    except SlackIntegrationRule.DoesNotExist:
+        logger.warning(f"Slack digest: rule {rule_id} no longer exists; nothing to flush.")
+        return 0
+
+    config = _digest_config()
+    batch_size = max(1, int(config.get('MAX_ENTRIES_PER_MESSAGE', 50)))
+    claim_timeout = int(config.get('CLAIM_TIMEOUT_SECONDS', 300))
+    pending = SlackDigestEntry.objects.filter(rule_id=rule_id, channel=channel)
+    service = SlackService()
+    sent = 0
+    while True:
+        token = claim_entries(pending, now, batch_size, claim_timeout)
+        claimed = SlackDigestEntry.objects.filter(claim_token=token)
+        entries = list(claimed.select_related('alert_group'))
+        if not entries:
+            return sent
+
+        message = render_digest(rule, channel, entries)
+        try:
+            delivered = service.send_notification(channel, message, fingerprint=f"digest:{rule.name}")
+        except Exception:
+            release_entries(claimed)
+            raise
+        claimed.delete()
+        if delivered:
+            sent += len(entries)
+            logger.info(f"Slack digest for rule '{rule.name}' sent {len(entries)} notification(s) to {channel}.")
+        else:
+            # Not retryable (bad response or missing endpoint), same as a single notification
+            logger.error(f"Slack digest for rule '{rule.name}' to {channel} was rejected; dropped {len(entries)} notification(s).")
+
+
+def flush_overdue_digests(now=None) -> int:
+    """Flush every (rule, channel) whose oldest pending entry is past its window."""
+    now = now or timezone.now()
+    config = _digest_config()
+    grace = timedelta(seconds=int(config.get('FLUSH_GRACE_SECONDS', 30)))
+    pending = (
+        SlackDigestEntry.objects.filter(claimable(now, int(config.get('CLAIM_TIMEOUT_SECONDS', 300))))
+        .values('rule_id', 'channel', 'rule__digest_window_seconds')
+        .annotate(oldest=Min('created_at'))
+        .order_by()
+    )
+    sent = 0
+    for group in pending:
+        window = timedelta(seconds=group['rule__digest_window_seconds'])
+        if group['oldest'] + window + grace <= now:
+            logger.warning(f"Slack digest for rule {group['rule_id']} to {group['channel']} is overdue; flushing.")
+            sent += flush_digest(group['rule_id'], group['channel'], now=now)
+    return sent
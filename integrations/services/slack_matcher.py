@@ -2,12 +2,13 @@
 
 """Service for matching Slack integration rules and resolving target channel."""
 import logging
-from typing import Optional, List, Tuple
+from typing import Optional, Tuple
 
 from django.conf import settings
 
 from integrations.models import SlackIntegrationRule
 from alerts.models import AlertGroup
+from .rule_index import find_best_rule
 
 logger = logging.getLogger(__name__)
 
@@ -18,29 +19,21 @@ class SlackRuleMatcherService:
         Return the best matching SlackIntegrationRule for a given alert group.
         Specificity is determined by the number of criteria keys.
         """
-        active_rules = SlackIntegrationRule.objects.filter(is_active=True)
-        matching_rules: List[SlackIntegrationRule] = []
         fp_for_log = alert_group.fingerprint  # Fingerprint for logging
 
         logger.debug(f"(FP: {fp_for_log}) Starting Slack rule matching for alert group.")
 
-        for rule in active_rules:
-            if self._does_rule_match(rule, alert_group):
-                matching_rules.append(rule)
-                logger.info(f"(FP: {fp_for_log}) Rule '{rule.name}' (ID: {rule.id}) is a potential match.")
+        # Candidates come from the compiled index, best first (specificity, priority, name)
+        best_match = find_best_rule(
+            SlackIntegrationRule, alert_group.labels,
+            lambda rule: self._does_rule_match(rule, alert_group),
+            alert_group=alert_group,
+        )
 
-        if not matching_rules:
+        if best_match is None:
             logger.info(f"(FP: {fp_for_log}) No active Slack integration rules matched the alert group.")
             return None
 
-        # Sort by specificity (more criteria is better), then priority, then name
-        matching_rules.sort(key=lambda r: (
-            -len(r.match_criteria or {}),
-            -r.priority,
-            r.name
-        ))
-
-        best_match = matching_rules[0]
         logger.info(f"(FP: {fp_for_log}) Selected best match: Rule '{best_match.name}' (ID: {best_match.id}).")
         return best_match
 
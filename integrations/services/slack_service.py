@@ -3,10 +3,11 @@ from django.conf import settings
 import requests
 import time
 import json
-import pika
 
 from core.services.metrics import metrics_manager
-from integrations.exceptions import SlackNotificationError
+from integrations.exceptions import SlackNotificationError, SlackThrottledError
+from integrations.services.amqp_publisher import publisher_for
+from integrations.services.http_pool import endpoint_slot, get_session
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +15,8 @@ logger = logging.getLogger(__name__)
 class SlackService:
     """
     Service for sending messages to Slack via an internal proxy endpoint or RabbitMQ.
-    Includes retry logic for network errors and adds contextual fingerprint to logs.
+    HTTP delivery reuses a pooled session; network errors raise SlackNotificationError
+    so the task can retry later. Adds contextual fingerprint to logs.
     """
 
     def __init__(self):
@@ -33,31 +35,14 @@ class SlackService:
 
     def _send_to_rabbitmq(self, channel: str, message: str, fingerprint: str) -> bool:
         """
-        Queues the notification message in RabbitMQ.
+        Queues the notification message in RabbitMQ through this process' shared publisher.
         """
         config = settings.RABBITMQ_FORWARDER_CONFIG
         normalized_channel = self._normalize_channel(channel)
         payload = json.dumps({"channel": normalized_channel, "text": message, "fingerprint": fingerprint})
 
         try:
-            connection = pika.BlockingConnection(
-                pika.ConnectionParameters(
-                    host=config['HOST'],
-                    port=config['PORT'],
-                    credentials=pika.PlainCredentials(config['USER'], config['PASSWORD'])
-                )
-            )
-            channel_mq = connection.channel()
-            channel_mq.queue_declare(queue=config['QUEUE_NAME'], durable=True)
-
-            channel_mq.basic_publish(
-                exchange='',
-                routing_key=config['QUEUE_NAME'],
-                body=payload,
-                properties=pika.BasicProperties(delivery_mode=2)  # Make message persistent
-            )
-
-            connection.close()
+            publisher_for(config).publish(config['QUEUE_NAME'], payload)
             logger.info(f"SlackService (FP: {fingerprint}): Message for channel '{normalized_channel}' queued successfully in RabbitMQ.")
             # You can add success metrics for RabbitMQ here if needed
             return True
@@ -69,7 +54,11 @@ class SlackService:
 
     def _send_via_http(self, channel: str, message: str, fingerprint: str) -> bool:
         """
-        Original method to send notification via HTTP with retry logic.
+        Send the notification to the internal proxy endpoint in a single attempt.
+
+        Network errors and a saturated endpoint raise SlackNotificationError;
+        the calling task schedules the retry with a countdown instead of
+        sleeping in the worker.
         """
         if not self.endpoint:
             logger.error(f"SlackService (FP: {fingerprint}): SLACK_INTERNAL_ENDPOINT is not configured for HTTP delivery.")
@@ -82,74 +71,34 @@ class SlackService:
         channel_fixed = self._normalize_channel(channel)
         payload = {"channel": channel_fixed, "text": message}
 
-        max_retries = 3
-        timeout_exceptions = (requests.exceptions.ReadTimeout, requests.exceptions.ConnectTimeout)
-
-        for attempt in range(1, max_retries + 1):
-            try:
-                resp = requests.post(self.endpoint, json=payload, timeout=10)
-                resp.raise_for_status()
+        config = getattr(settings, "SLACK_HTTP", {})
+        timeout = float(config.get("TIMEOUT_SECONDS", 10))
+        session = get_session("slack", pool_size=int(config.get("POOL_SIZE", 10)))
+        limit = int(config.get("MAX_CONCURRENT_REQUESTS", 0))
 
-                body = resp.text.strip().lower()
-                if body != "ok":
-                    error_msg = (
-                        f"Slack returned unexpected response "
-                        f"(status={resp.status_code}, body={resp.text!r})"
-                    )
-                    logger.error(
-                        f"SlackService (FP: {fingerprint}): send failed (channel={channel_fixed!r}): {error_msg}"
-                    )
-                    metrics_manager.inc_counter(
-                        "sentryhub_slack_notifications_total",
-                        labels={"status": "failure", "reason": "bad_response"},
-                    )
-                    return False
-
-                logger.info(
-                    "Message posted to Slack channel %r: %r",
-                    channel_fixed,
-                    message[:200] + ("…" if len(message) > 200 else ""),
+        with endpoint_slot(self.endpoint, limit, lease_seconds=timeout * 2) as acquired:
+            if not acquired:
+                logger.warning(
+                    f"SlackService (FP: {fingerprint}): {limit} requests already in flight to the Slack endpoint; deferring channel {channel_fixed!r}."
                 )
                 metrics_manager.inc_counter(
-                    "sentryhub_slack_notifications_total", labels={"status": "success"}
-                )
-                metrics_manager.set_gauge(
-                    "sentryhub_component_last_successful_api_call_timestamp",
-                    value=time.time(),
-                    labels={"component": "slack"},
-                )
-                return True
-
-            except timeout_exceptions as exc:
-                retry_delay = 2 ** (attempt - 1)
-                logger.warning(
-                    f"SlackService (FP: {fingerprint}): Timeout on attempt {attempt}/{max_retries} for channel {channel_fixed!r}. Retrying in {retry_delay}s... Error: {exc}"
+                    "sentryhub_slack_notifications_total",
+                    labels={"status": "failure", "reason": "throttled"},
                 )
-                if attempt == max_retries:
-                    metrics_manager.inc_counter(
-                        "sentryhub_slack_notifications_total",
-                        labels={"status": "failure", "reason": "network_error"},
-                    )
-                    raise SlackNotificationError(
-                        "Network error during Slack notification after multiple retries"
-                    ) from exc
-                time.sleep(retry_delay)
+                raise SlackThrottledError("Slack endpoint concurrency limit reached")
 
+            try:
+                resp = session.post(self.endpoint, json=payload, timeout=timeout)
+                resp.raise_for_status()
             except requests.exceptions.RequestException as exc:
-                retry_delay = 2 ** (attempt - 1)
                 logger.warning(
-                    f"SlackService (FP: {fingerprint}): HTTP request attempt {attempt}/{max_retries} failed (channel={channel_fixed!r}): {exc}. Retrying in {retry_delay}s..."
+                    f"SlackService (FP: {fingerprint}): HTTP request failed (channel={channel_fixed!r}): {exc}"
                 )
-                if attempt == max_retries:
-                    metrics_manager.inc_counter(
-                        "sentryhub_slack_notifications_total",
-                        labels={"status": "failure", "reason": "network_error"},
-                    )
-                    raise SlackNotificationError(
-                        "Network error during Slack notification"
-                    ) from exc
-                time.sleep(retry_delay)
-
+                metrics_manager.inc_counter(
+                    "sentryhub_slack_notifications_total",
+                    labels={"status": "failure", "reason": "network_error"},
+                )
+                raise SlackNotificationError("Network error during Slack notification") from exc
             except Exception as exc:
                 logger.error(
                     f"SlackService (FP: {fingerprint}): unexpected error when sending to Slack (channel={channel_fixed!r}): {exc}",
@@ -160,7 +109,36 @@ class SlackService:
                     labels={"status": "failure", "reason": "unexpected"},
                 )
                 return False
-        return False
+
+        body = resp.text.strip().lower()
+        if body != "ok":
+            error_msg = (
+                f"Slack returned unexpected response "
+                f"(status={resp.status_code}, body={resp.text!r})"
+            )
+            logger.error(
+                f"SlackService (FP: {fingerprint}): send failed (channel={channel_fixed!r}): {error_msg}"
+            )
+            metrics_manager.inc_counter(
+                "sentryhub_slack_notifications_total",
+                labels={"status": "failure", "reason": "bad_response"},
+            )
+            return False
+
+        logger.info(
+            "Message posted to Slack channel %r: %r",
+            channel_fixed,
+            message[:200] + ("…" if len(message) > 200 else ""),
+        )
+        metrics_manager.inc_counter(
+            "sentryhub_slack_notifications_total", labels={"status": "success"}
+        )
+        metrics_manager.set_gauge(
+            "sentryhub_component_last_successful_api_call_timestamp",
+            value=time.time(),
+            labels={"component": "slack"},
+        )
+        return True
 
     def _normalize_channel(self, channel: str) -> str:
         if not channel:
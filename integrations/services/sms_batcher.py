@@ -0,0 +1,199 @@
+# integrations/services/sms_batcher.py
+"""
+Packs SMS notifications of many alert groups into few provider requests.
+
+With SMS_BATCH['ENABLED'], the SMS task stores each rendered message as an
+SmsOutboxEntry instead of calling the provider. The first entry of a window
+schedules one flush WINDOW_SECONDS later (deduplicated through the Django
+cache). The flush claims the pending entries and packs them, oldest first,
+into provider requests of at most MAX_RECIPIENTS_PER_REQUEST array items:
+the Magfa API takes parallel senders/messages/recipients arrays, so entries
+with different messages share one request. The per-recipient statuses of
+the response are split back per entry and stored as one SmsMessageLog row
+each with bulk_create.
+
+Entries of a failed or lost flush stay in the outbox: claims older than
+CLAIM_TIMEOUT_SECONDS are taken over, and the beat sweep flushes once the
+oldest entry is overdue by more than FLUSH_GRACE_SECONDS.
+"""
+import logging
+from datetime import timedelta
+from typing import Any, List, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Min
+from django.utils import timezone
+
+from integrations.exceptions import SmsNotificationError
+from integrations.models import SmsMessageLog, SmsOutboxEntry
+from integrations.services.outbox import claim_entries, claimable, release_entries
+from integrations.services.sms_service import SmsService
+
+logger = logging.getLogger(__name__)
+
+WINDOW_KEY = 'sentryhub:sms_batch:window'
+
+
+def _batch_config() -> dict:
+    return getattr(settings, 'SMS_BATCH', {})
+
+
+def is_batching_enabled() -> bool:
+    return bool(_batch_config().get('ENABLED', False))
+
+
+def window_seconds() -> int:
+    return max(1, int(_batch_config().get('WINDOW_SECONDS', 5)))
+
+
+def enqueue_sms(rule, alert_group, recipients: List[str], message: str) -> bool:
+    """
+    Store a rendered SMS for the next batched provider request.
+
+    Returns:
+        True when the entry opened a new window and the caller must schedule
+        the flush in window_seconds()
+    """
+    SmsOutboxEntry.objects.create(rule=rule, alert_group=alert_group, recipients=recipients, message=message)
+    try:
+        return cache.add(WINDOW_KEY, 1, timeout=window_seconds())
+    except Exception as e:
+        logger.warning(f"SMS batch window state unavailable, scheduling a flush: {e}")
+        return True
+
+
+def pack_requests(entries: List[SmsOutboxEntry], max_recipients: int) -> List[List[SmsOutboxEntry]]:
+    """Group entries in order into requests of at most max_recipients array items (an oversized entry goes alone)."""
+    packed, current, size = [], [], 0
+    for entry in entries:
+        count = len(entry.recipients)
+        if current and size + count > max_recipients:
+            packed.append(current)
+            current, size = [], 0
+        current.append(entry)
+        size += count
+    if current:
+        packed.append(current)
+    return packed
+
+
+def split_provider_response(response: Any, sizes: List[int]) -> List[Any]:
+    """Split a batched provider response into one response per entry of the given sizes."""
+    messages = response.get('messages') if isinstance(response, dict) else None
+    if not isinstance(messages, list) or len(messages) != sum(sizes):
+        # Request-level answer (e.g. an auth or credit error): it applies to every entry
+        return [response] * len(sizes)
+    parts, offset = [], 0
+    for size in sizes:
+        part = {key: value for key, value in response.items() if key != 'messages'}
+        part['messages'] = messages[offset:offset + size]
+        parts.append(part)
+        offset += size
+    return parts
+
+
+def entry_status(response: Any) -> Tuple[str, str]:
+    """(SmsMessageLog status, error message) for one entry's share of a provider response."""
+    if not response:
+        return SmsMessageLog.STATUS_FAILED, "No response from SMS provider."
+    if not isinstance(response, dict):
+        return SmsMessageLog.STATUS_SUCCESS, ""
+    codes = [
+        message.get('status') for message in response.get('messages') or []
+        if isinstance(message, dict)
+    ]
+    if not codes and response.get('status') is not None:
+        codes = [response.get('status')]
+    failures = sorted({code for code in codes if code not in (0, None)}, key=str)
+    if failures:
+        return SmsMessageLog.STATUS_FAILED, "; ".join(
+            SmsService.STATUS_MESSAGES.get(code, f"Provider status {code}") for code in failures
+        )
+    return SmsMessageLog.STATUS_SUCCESS, ""
+
+
+def _log(entry: SmsOutboxEntry, delivery_method: str, status: str, response: Any, error: str) -> SmsMessageLog:
+    return SmsMessageLog(
+        rule_id=entry.rule_id,
+        alert_group_id=entry.alert_group_id,
+        recipients=entry.recipients,
+        message=entry.message,
+        delivery_method=delivery_method,
+        status=status,
+        provider_response=response,
+        error_message=error,
+    )
+
+
+def _send_request(service: SmsService, batch: List[SmsOutboxEntry], delivery_method: str) -> List[SmsMessageLog]:
+    """Send one packed request and build the log rows of its entries."""
+    fingerprint = f"batch of {len(batch)}"
+    if delivery_method == "RABBITMQ":
+        queued = service.queue_batch([(entry.recipients, entry.message) for entry in batch], fingerprint=fingerprint)
+        status = SmsMessageLog.STATUS_QUEUED if queued else SmsMessageLog.STATUS_FAILED
+        error = "" if queued else "No response from SMS provider."
+        return [_log(entry, delivery_method, status, queued, error) for entry in batch]
+
+    recipients, messages = [], []
+    for entry in batch:
+        recipients.extend(entry.recipients)
+        messages.extend([entry.message] * len(entry.recipients))
+    response = service.send_messages(recipients, messages, fingerprint=fingerprint)
+    parts = split_provider_response(response, [len(entry.recipients) for entry in batch])
+    logs = []
+    for entry, part in zip(batch, parts):
+        status, error = entry_status(part)
+        logs.append(_log(entry, delivery_method, status, part, error))
+    return logs
+
+
+def flush_sms_outbox(now=None, overdue_only: bool = False) -> int:
+    """
+    Send the pending outbox entries in packed provider requests.
+
+    Returns:
+        The number of entries sent (or queued)
+
+    Raises:
+        SmsNotificationError: on a network error; the failed request is
+        logged and the unsent entries are released for the retry
+    """
+    now = now or timezone.now()
+    config = _batch_config()
+    max_recipients = max(1, int(config.get('MAX_RECIPIENTS_PER_REQUEST', 100)))
+    claim_timeout = int(config.get('CLAIM_TIMEOUT_SECONDS', 300))
+
+    if overdue_only:
+        oldest = SmsOutboxEntry.objects.filter(claimable(now, claim_timeout)).aggregate(oldest=Min('created_at'))['oldest']
+        grace = timedelta(seconds=window_seconds() + int(config.get('FLUSH_GRACE_SECONDS', 30)))
+        if oldest is None or oldest + grace > now:
+            return 0
+        logger.warning("SMS outbox has overdue entries; flushing.")
+
+    delivery_method = getattr(settings, "SMS_DELIVERY_METHOD", "HTTP").upper()
+    service = SmsService()
+    sent = 0
+    while True:
+        token = claim_entries(SmsOutboxEntry.objects.all(), now, max_recipients, claim_timeout)
+        entries = list(SmsOutboxEntry.objects.filter(claim_token=token))
+        if not entries:
+            return sent
+
+        for batch in pack_requests(entries, max_recipients):
+            batch_ids = [entry.id for entry in batch]
+            try:
+                logs = _send_request(service, batch, delivery_method)
+            except SmsNotificationError as exc:
+                SmsMessageLog.objects.bulk_create(
+                    [_log(entry, delivery_method, SmsMessageLog.STATUS_FAILED, None, str(exc)) for entry in batch]
+                )
+                release_entries(SmsOutboxEntry.objects.filter(claim_token=token))
+                logger.warning(f"SMS batch of {len(batch)} message(s) failed and will be retried: {exc}")
+                raise
+            SmsMessageLog.objects.bulk_create(logs)
+            SmsOutboxEntry.objects.filter(id__in=batch_ids).delete()
+            sent += len(batch)
+            logger.info(
+                f"SMS batch: {len(batch)} message(s) to {sum(len(entry.recipients) for entry in batch)} recipient(s) sent in one request."
+            )
@@ -3,6 +3,8 @@ from typing import Optional, List, Tuple
 
 from integrations.models import SmsIntegrationRule, PhoneBook
 from alerts.models import AlertGroup
+from alerts.services.alerts_processor import get_latest_instance
+from .rule_index import find_best_rule
 
 logger = logging.getLogger(__name__)
 
@@ -11,22 +13,20 @@ class SmsRuleMatcherService:
     """Service to match SmsIntegrationRule and resolve recipients."""
 
     def find_matching_rule(self, alert_group: AlertGroup) -> Optional[SmsIntegrationRule]:
-        active_rules = SmsIntegrationRule.objects.filter(is_active=True)
-        matching: List[SmsIntegrationRule] = []
-        for rule in active_rules:
-            if self._does_rule_match(rule, alert_group):
-                matching.append(rule)
-                logger.info("Rule '%s' is a potential match.", rule.name)
-        if not matching:
-            return None
-        matching.sort(key=lambda r: (-len(r.match_criteria or {}), -r.priority, r.name))
-        return matching[0]
+        rule = find_best_rule(
+            SmsIntegrationRule, alert_group.labels,
+            lambda rule: self._does_rule_match(rule, alert_group),
+            alert_group=alert_group,
+        )
+        if rule is not None:
+            logger.info("Rule '%s' is the best match.", rule.name)
+        return rule
 
     def resolve_recipients(self, alert_group: AlertGroup, rule: SmsIntegrationRule) -> Tuple[List[str], bool]:
         names: List[str] = []
         should_send_resolve = False
         if rule.use_sms_annotation:
-            latest = alert_group.instances.order_by('-started_at').first()
+            latest = get_latest_instance(alert_group)
             annotations = getattr(latest, 'annotations', {}) or {}
             raw = annotations.get('sms', '')
             if isinstance(raw, str):
@@ -1,12 +1,12 @@
 import logging
 import json
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 from django.conf import settings
 import requests
-import pika
 
 from integrations.exceptions import SmsNotificationError
+from integrations.services.amqp_publisher import publisher_for
 
 logger = logging.getLogger(__name__)
 
@@ -79,29 +79,12 @@ class SmsService:
     def _send_to_rabbitmq(
         self, phone_numbers: List[str], message: str, fingerprint: str
     ) -> bool:
-        """Queues the SMS message in RabbitMQ."""
+        """Queues the SMS message in RabbitMQ through this process' shared publisher."""
         config = settings.RABBITMQ_SMS_FORWARDER_CONFIG
         payload = json.dumps({"recipients": phone_numbers, "text": message})
 
         try:
-            connection = pika.BlockingConnection(
-                pika.ConnectionParameters(
-                    host=config["HOST"],
-                    port=config["PORT"],
-                    credentials=pika.PlainCredentials(config["USER"], config["PASSWORD"]),
-                )
-            )
-            channel = connection.channel()
-            channel.queue_declare(queue=config["QUEUE_NAME"], durable=True)
-
-            channel.basic_publish(
-                exchange="",
-                routing_key=config["QUEUE_NAME"],
-                body=payload,
-                properties=pika.BasicProperties(delivery_mode=2),
-            )
-
-            connection.close()
+            publisher_for(config).publish(config["QUEUE_NAME"], payload)
             logger.info(
                 "SmsService (FP: %s): Message queued successfully in RabbitMQ for recipients %s.",
                 fingerprint,
@@ -117,9 +100,42 @@ class SmsService:
             )
             return False
 
+    def queue_batch(self, jobs: List[Tuple[List[str], str]], fingerprint: str = "N/A") -> bool:
+        """
+        Queue several (recipients, message) jobs in RabbitMQ over one publisher
+        call. The forwarder receives the same per-job payloads as send_bulk().
+        """
+        config = settings.RABBITMQ_SMS_FORWARDER_CONFIG
+        payloads = [json.dumps({"recipients": recipients, "text": message}) for recipients, message in jobs]
+        try:
+            publisher_for(config).publish_batch(config["QUEUE_NAME"], payloads)
+            logger.info(
+                "SmsService (FP: %s): %s message(s) queued successfully in RabbitMQ.",
+                fingerprint,
+                len(payloads),
+            )
+            return True
+        except Exception as e:
+            logger.error(
+                "SmsService (FP: %s): Failed to queue message batch in RabbitMQ. Error: %s",
+                fingerprint,
+                e,
+                exc_info=True,
+            )
+            return False
+
     def _send_via_http(
         self, phone_numbers: List[str], message: str, fingerprint: str
     ) -> Optional[Dict[str, Any]]:
+        return self.send_messages(phone_numbers, [message] * len(phone_numbers), fingerprint)
+
+    def send_messages(
+        self, recipients: List[str], messages: List[str], fingerprint: str = "N/A"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Send messages[i] to recipients[i] in one provider request (parallel arrays).
+        The provider reports one status per entry, in order, under "messages".
+        """
         if not all([self.send_url, self.username, self.password, self.domain, self.sender]):
             logger.error(
                 "SmsService (FP: %s): SMS provider send URL or credentials not configured.",
@@ -129,9 +145,9 @@ class SmsService:
 
         headers = {"accept": "application/json", "cache-control": "no-cache"}
         payload_json = {
-            "senders": [self.sender] * len(phone_numbers),
-            "messages": [message] * len(phone_numbers),
-            "recipients": phone_numbers,
+            "senders": [self.sender] * len(recipients),
+            "messages": messages,
+            "recipients": recipients,
         }
         try:
             resp = requests.post(
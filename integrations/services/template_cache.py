@@ -0,0 +1,102 @@
+# integrations/services/template_cache.py
+"""
+Process-wide cache of compiled Django templates for integration messages.
+
+Jira, Slack and SMS rules render the same few template strings for every
+alert; compiling them is most of the rendering cost. Templates are keyed by
+a hash of their source, so an edited rule template simply gets a new entry
+and the old one ages out of the LRU (TEMPLATE_CACHE['MAX_SIZE'] entries).
+Templates that fail to compile are not cached.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.template import Template
+
+logger = logging.getLogger(__name__)
+
+# Rule fields holding message templates, per integration model
+RULE_TEMPLATE_FIELDS = {
+    'JiraIntegrationRule': ('jira_title_template', 'jira_description_template', 'jira_update_comment_template'),
+    'SlackIntegrationRule': ('message_template', 'resolved_message_template', 'digest_template'),
+    'SmsIntegrationRule': ('firing_template', 'resolved_template'),
+}
+
+
+class CompiledTemplateCache:
+    """Thread-safe LRU of compiled templates keyed by source hash."""
+
+    def __init__(self, max_size: int = None):
+        self._max_size = max_size
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is not None:
+            return self._max_size
+        return int(getattr(settings, 'TEMPLATE_CACHE', {}).get('MAX_SIZE', 512))
+
+    @staticmethod
+    def _key(template_string: str) -> str:
+        return hashlib.sha1(template_string.encode('utf-8')).hexdigest()
+
+    def get(self, template_string: str) -> Template:
+        """
+        Return the compiled template for the source, compiling it on a miss.
+
+        Raises:
+            TemplateSyntaxError: if the template does not compile
+        """
+        key = self._key(template_string)
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return template
+            self.misses += 1
+
+        # Compile outside the lock; a concurrent miss for the same source just compiles twice
+        template = Template(template_string)
+        with self._lock:
+            self._templates[key] = template
+            self._templates.move_to_end(key)
+            while len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+        return template
+
+    def warm(self) -> int:
+        """Compile the templates of all active integration rules. Returns the number cached."""
+        from integrations.models import JiraIntegrationRule, SlackIntegrationRule, SmsIntegrationRule
+
+        compiled = 0
+        for model in (JiraIntegrationRule, SlackIntegrationRule, SmsIntegrationRule):
+            fields = RULE_TEMPLATE_FIELDS[model.__name__]
+            for values in model.objects.filter(is_active=True).values_list(*fields):
+                for template_string in values:
+                    if not template_string:
+                        continue
+                    try:
+                        self.get(template_string)
+                        compiled += 1
+                    except Exception as e:
+                        logger.warning(f"Could not precompile a {model.__name__} template: {e}")
+        logger.info(f"Template cache warmed with {compiled} rule template(s).")
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+
+template_cache = CompiledTemplateCache()
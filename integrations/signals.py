@@ -0,0 +1,56 @@
+# integrations/signals.py
+import logging
+from celery.signals import worker_process_init, worker_process_shutdown
+from django.db.models.signals import post_save, post_delete
+from django.conf import settings
+from django.dispatch import receiver
+
+from .models import JiraIntegrationRule, SlackIntegrationRule, SmsIntegrationRule
+from .services.amqp_publisher import close_publishers
+from .services.http_pool import close_sessions
+from .services.rule_index import rule_index_registry
+from .services.template_cache import template_cache
+
+logger = logging.getLogger(__name__)
+
+
+# --- Rule Index Invalidation ---
+
+@receiver(post_save, sender=JiraIntegrationRule)
+@receiver(post_delete, sender=JiraIntegrationRule)
+@receiver(post_save, sender=SlackIntegrationRule)
+@receiver(post_delete, sender=SlackIntegrationRule)
+@receiver(post_save, sender=SmsIntegrationRule)
+@receiver(post_delete, sender=SmsIntegrationRule)
+def handle_integration_rule_change(sender, instance, **kwargs):
+    """Recompile the sender's rule index after any rule is created, edited or deleted."""
+    logger.debug(f"{sender.__name__} {instance.pk} changed, invalidating its rule index.")
+    rule_index_registry.invalidate(sender)
+
+
+# --- Template Cache Warm-up ---
+
+@worker_process_init.connect
+def warm_template_cache(**kwargs):
+    """Precompile the active rules' templates in every new worker process."""
+    if not getattr(settings, 'TEMPLATE_CACHE', {}).get('WARM_ON_WORKER_START', True):
+        return
+    try:
+        template_cache.warm()
+    except Exception as e:
+        logger.warning(f"Template cache warm-up failed: {e}")
+
+
+# --- Connection Cleanup ---
+
+@worker_process_shutdown.connect
+def close_worker_connections(**kwargs):
+    """Close the pooled broker and HTTP connections of a worker process that is exiting."""
+    try:
+        close_publishers()
+    except Exception as e:
+        logger.warning(f"Closing AMQP publishers on worker shutdown failed: {e}")
+    try:
+        close_sessions()
+    except Exception as e:
+        logger.warning(f"Closing HTTP sessions on worker shutdown failed: {e}")
@@ -4,6 +4,7 @@ import logging
 import json
 import re
 import ipaddress
+import random
 import pytz
 from typing import Optional, Dict, Any
 from celery import shared_task, Task
@@ -11,11 +12,11 @@ from celery.exceptions import Retry # <--- این ایمپورت را اضافه
 from django.conf import settings
 
 from core.services.metrics import metrics_manager
-from integrations.exceptions import SlackNotificationError, SmsNotificationError
+from integrations.exceptions import SlackNotificationError, SlackThrottledError, SmsNotificationError
 from django.utils import timezone
 from django.urls import reverse
 from django.core.exceptions import ObjectDoesNotExist
-from django.template import Context, Template, TemplateSyntaxError
+from django.template import Context, TemplateSyntaxError
 
 from integrations.models import (
     JiraIntegrationRule,
@@ -24,9 +25,12 @@ from integrations.models import (
     SmsMessageLog,
 )
 from alerts.models import AlertGroup, AlertInstance
+from alerts.services.alerts_processor import get_latest_instance
+from integrations.services import slack_digest, sms_batcher
 from integrations.services.jira_service import JiraService
 from integrations.services.slack_service import SlackService
 from integrations.services.sms_service import SmsService
+from integrations.services.template_cache import template_cache
 
 logger = logging.getLogger(__name__)
 
@@ -39,14 +43,15 @@ class JiraTaskBase(Task):
 # --- Helper Function for Template Rendering --- (unchanged)
 def render_template_safe(template_string: str, context_dict: Dict[str, Any], default_value: str = "") -> str:
     """
-    Safely renders a Django template string with the given context.
+    Safely renders a Django template string with the given context, compiling
+    it through the shared template cache.
     Returns the default_value if the template_string is empty or rendering fails.
     """
     if not template_string:
         return default_value
 
     try:
-        template = Template(template_string)
+        template = template_cache.get(template_string)
         rendered = template.render(Context(context_dict))
         return rendered.strip()
     except TemplateSyntaxError as e:
@@ -104,7 +109,7 @@ def process_jira_for_alert_group(self, alert_group_id: int, rule_id: int, alert_
     Uses the specific triggering_instance if provided.
     """
     try:
-        alert_group = AlertGroup.objects.get(pk=alert_group_id)
+        alert_group = AlertGroup.objects.select_related('latest_instance').get(pk=alert_group_id)
         rule = JiraIntegrationRule.objects.get(pk=rule_id)
         fingerprint_for_log = alert_group.fingerprint
         logger.info(f"Jira Task {self.request.id} (FP: {fingerprint_for_log}): Starting for AlertGroup ID: {alert_group_id}, Rule ID: {rule_id}, Status: {alert_status}, TriggeringInstanceID: {triggering_instance_id}")
@@ -132,7 +137,7 @@ def process_jira_for_alert_group(self, alert_group_id: int, rule_id: int, alert_
         logger.info(f"Jira Task {self.request.id} (FP: {fingerprint_for_log}): TriggeringInstanceID was None.")
 
 
-    latest_overall_instance = alert_group.instances.order_by('-started_at').first()
+    latest_overall_instance = get_latest_instance(alert_group)
     if latest_overall_instance:
         logger.info(f"Jira Task {self.request.id} (FP: {fingerprint_for_log}): Latest overall instance for group: ID={latest_overall_instance.id}, Started_at={latest_overall_instance.started_at}")
     else:
@@ -325,14 +330,49 @@ def process_jira_for_alert_group(self, alert_group_id: int, rule_id: int, alert_
 
 
 
-@shared_task(bind=True, retry_kwargs={'max_retries': 12}, countdown=300, retry_backoff=True, retry_backoff_max=3600)
-def process_slack_for_alert_group(self, alert_group_id: int, rule_id: int, alert_status: Optional[str] = None):
+def slack_retry_countdown(retries: int) -> int:
+    """Seconds until the next Slack delivery attempt: jittered exponential backoff."""
+    config = getattr(settings, 'SLACK_HTTP', {})
+    base = int(config.get('RETRY_BASE_SECONDS', 10))
+    ceiling = int(config.get('RETRY_MAX_SECONDS', 3600))
+    delay = min(ceiling, base * 2 ** retries)
+    # Spread retries so a recovering endpoint is not hit by every worker at once
+    return max(1, int(random.uniform(delay / 2, delay)))
+
+
+def defer_throttled_slack_task(task, kwargs: dict, deferrals: int) -> bool:
+    """
+    Re-queue a Slack task that hit the endpoint concurrency limit after a
+    short jittered countdown. The copy keeps the task's retry count, so
+    waiting for a slot does not use up the network-error retry budget.
+
+    Returns:
+        False once SLACK_HTTP['MAX_THROTTLE_DEFERRALS'] is reached; the
+        caller then retries as for a network error
+    """
+    config = getattr(settings, 'SLACK_HTTP', {})
+    if deferrals >= int(config.get('MAX_THROTTLE_DEFERRALS', 50)):
+        return False
+    delay = float(config.get('THROTTLE_DELAY_SECONDS', 5))
+    task.apply_async(
+        kwargs={**kwargs, 'deferrals': deferrals + 1},
+        countdown=max(1, int(random.uniform(delay / 2, delay * 3 / 2))),
+        retries=task.request.retries,
+    )
+    return True
+
+
+@shared_task(bind=True, max_retries=12)
+def process_slack_for_alert_group(self, alert_group_id: int, rule_id: int, alert_status: Optional[str] = None,
+                                  deferrals: int = 0):
     """
     Celery task to send Slack notifications for an alert group.
     Handles network errors gracefully and retries without logging full tracebacks.
+    Sends throttled by the endpoint concurrency limit are deferred (see
+    defer_throttled_slack_task); `deferrals` counts them.
     """
     try:
-        alert_group = AlertGroup.objects.get(pk=alert_group_id)
+        alert_group = AlertGroup.objects.select_related('latest_instance').get(pk=alert_group_id)
         rule = SlackIntegrationRule.objects.get(pk=rule_id)
         fingerprint_for_log = alert_group.fingerprint
         logger.info(
@@ -345,7 +385,7 @@ def process_slack_for_alert_group(self, alert_group_id: int, rule_id: int, alert
         logger.error(f"Slack Task {self.request.id}: SlackIntegrationRule with ID {rule_id} not found. Aborting.")
         return
 
-    latest_instance = alert_group.instances.order_by('-started_at').first()
+    latest_instance = get_latest_instance(alert_group)
     annotations = latest_instance.annotations if latest_instance else {}
     summary = annotations.get('summary', alert_group.name)
     description = annotations.get('description', 'No description provided.')
@@ -385,6 +425,17 @@ def process_slack_for_alert_group(self, alert_group_id: int, rule_id: int, alert
         f"Slack Task {self.request.id} (FP: {fingerprint_for_log}): Using channel {channel!r} resolved from {source} for AlertGroup {alert_group_id}."
     )
 
+    if rule.digest_window_seconds:
+        opened_window = slack_digest.buffer_notification(rule, alert_group, channel, status, message)
+        logger.info(
+            f"Slack Task {self.request.id} (FP: {fingerprint_for_log}): Buffered notification for the {channel} digest of rule '{rule.name}'."
+        )
+        if opened_window:
+            flush_slack_digests_task.apply_async(
+                kwargs={'rule_id': rule.id, 'channel': channel}, countdown=rule.digest_window_seconds
+            )
+        return
+
     slack_service = SlackService()
     try:
         slack_service.send_notification(channel, message, fingerprint=fingerprint_for_log)
@@ -392,18 +443,56 @@ def process_slack_for_alert_group(self, alert_group_id: int, rule_id: int, alert
             f"Slack Task {self.request.id} (FP: {fingerprint_for_log}): Notification sent to {channel} for AlertGroup {alert_group_id}."
         )
     except SlackNotificationError as e:
+        if isinstance(e, SlackThrottledError) and defer_throttled_slack_task(
+            self, {'alert_group_id': alert_group_id, 'rule_id': rule_id, 'alert_status': alert_status}, deferrals
+        ):
+            logger.info(
+                f"Slack Task {self.request.id} (FP: {fingerprint_for_log}): Slack endpoint busy; deferred notification for AlertGroup {alert_group_id}."
+            )
+            return
         metrics_manager.inc_counter("sentryhub_slack_notifications_total", {"status": "retry"})
         logger.warning(
             f"Slack Task {self.request.id} (FP: {fingerprint_for_log}): Network error sending notification for AlertGroup {alert_group_id}. Celery will retry. Error: {e}"
         )
-        raise self.retry(exc=e)
+        raise self.retry(
+            exc=e,
+            countdown=slack_retry_countdown(self.request.retries),
+            max_retries=int(getattr(settings, 'SLACK_HTTP', {}).get('MAX_RETRIES', self.max_retries)),
+        )
+
+
+@shared_task(bind=True, max_retries=12)
+def flush_slack_digests_task(self, rule_id: Optional[int] = None, channel: Optional[str] = None, deferrals: int = 0):
+    """
+    Send the buffered Slack digest of a (rule, channel) at the end of its window.
+    Without arguments (beat), flushes every digest that is overdue.
+    """
+    try:
+        if rule_id is None:
+            sent = slack_digest.flush_overdue_digests()
+        else:
+            sent = slack_digest.flush_digest(rule_id, channel)
+    except SlackNotificationError as e:
+        if isinstance(e, SlackThrottledError) and defer_throttled_slack_task(
+            self, {'rule_id': rule_id, 'channel': channel}, deferrals
+        ):
+            logger.info(f"Slack Digest Task {self.request.id}: Slack endpoint busy; deferred digest (rule {rule_id}, channel {channel}).")
+            return "Deferred: Slack endpoint busy"
+        metrics_manager.inc_counter("sentryhub_slack_notifications_total", {"status": "retry"})
+        logger.warning(f"Slack Digest Task {self.request.id}: Network error sending digest (rule {rule_id}, channel {channel}). Celery will retry. Error: {e}")
+        raise self.retry(
+            exc=e,
+            countdown=slack_retry_countdown(self.request.retries),
+            max_retries=int(getattr(settings, 'SLACK_HTTP', {}).get('MAX_RETRIES', self.max_retries)),
+        )
+    return f"Sent {sent} buffered Slack notification(s)"
 
 
 @shared_task(bind=True, autoretry_for=(SmsNotificationError,), retry_backoff=True, retry_backoff_max=3600, max_retries=20)
 def process_sms_for_alert_group(self, alert_group_id: int, rule_id: int, alert_status: Optional[str] = None):
     """Celery task to send SMS notifications for an alert group."""
     try:
-        alert_group = AlertGroup.objects.get(pk=alert_group_id)
+        alert_group = AlertGroup.objects.select_related('latest_instance').get(pk=alert_group_id)
         rule = SmsIntegrationRule.objects.get(pk=rule_id)
         fingerprint_for_log = alert_group.fingerprint
         logger.info(
@@ -416,7 +505,7 @@ def process_sms_for_alert_group(self, alert_group_id: int, rule_id: int, alert_s
         logger.error(f"SMS Task {self.request.id}: SmsIntegrationRule with ID {rule_id} not found. Aborting.")
         return
 
-    latest_instance = alert_group.instances.order_by('-started_at').first()
+    latest_instance = get_latest_instance(alert_group)
     annotations = latest_instance.annotations if latest_instance else {}
     summary = annotations.get('summary', alert_group.name)
     description = annotations.get('description', 'No description provided.')
@@ -456,6 +545,15 @@ def process_sms_for_alert_group(self, alert_group_id: int, rule_id: int, alert_s
         )
         return
 
+    if sms_batcher.is_batching_enabled():
+        opened_window = sms_batcher.enqueue_sms(rule, alert_group, recipients, message)
+        logger.info(
+            f"SMS Task {self.request.id} (FP: {fingerprint_for_log}): Queued message to {recipients} for the next SMS batch."
+        )
+        if opened_window:
+            flush_sms_outbox_task.apply_async(countdown=sms_batcher.window_seconds())
+        return
+
     sms_service = SmsService()
     delivery_method = getattr(settings, "SMS_DELIVERY_METHOD", "HTTP").upper()
     logger.info(
@@ -511,3 +609,15 @@ def process_sms_for_alert_group(self, alert_group_id: int, rule_id: int, alert_s
         f"SMS Task {self.request.id} (FP: {fingerprint_for_log}): "
         f"Notification sent to {recipients} for AlertGroup {alert_group_id}."
     )
+
+
+@shared_task(bind=True, autoretry_for=(SmsNotificationError,), retry_backoff=True, retry_backoff_max=3600, max_retries=20)
+def flush_sms_outbox_task(self, overdue_only: bool = False):
+    """
+    Send the batched SMS outbox in packed provider requests.
+    With overdue_only (beat), only flushes when a scheduled flush was missed.
+    """
+    sent = sms_batcher.flush_sms_outbox(overdue_only=overdue_only)
+    if sent:
+        logger.info(f"SMS Outbox Task {self.request.id}: Sent {sent} batched message(s).")
+    return f"Sent {sent} batched SMS message(s)"
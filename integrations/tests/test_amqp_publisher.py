@@ -0,0 +1,87 @@
+from unittest.mock import Mock, patch
+from django.test import SimpleTestCase, override_settings
+import pika
+from celery.signals import worker_process_shutdown
+
+from integrations.services.amqp_publisher import AmqpPublisher, close_publishers, publisher_for
+
+CONFIG = {"HOST": "mq", "PORT": 5672, "USER": "guest", "PASSWORD": "guest", "QUEUE_NAME": "q"}
+
+
+@patch("integrations.services.amqp_publisher.pika.BlockingConnection")
+class AmqpPublisherTests(SimpleTestCase):
+    def setUp(self):
+        close_publishers()
+        self.addCleanup(close_publishers)
+
+    def _connection(self, channel):
+        connection = Mock()
+        connection.channel.return_value = channel
+        return connection
+
+    def test_publishers_are_shared_per_broker(self, connection_mock):
+        self.assertIs(publisher_for(CONFIG), publisher_for(dict(CONFIG, QUEUE_NAME="other")))
+        self.assertIsNot(publisher_for(CONFIG), publisher_for(dict(CONFIG, HOST="mq-2")))
+        connection_mock.assert_not_called()  # opened lazily
+
+    def test_batch_is_published_over_one_channel(self, connection_mock):
+        channel = Mock()
+        connection_mock.return_value = self._connection(channel)
+        publisher = AmqpPublisher("mq", 5672, "guest", "guest")
+
+        publisher.publish_batch("q", ["a", "b", "c"])
+        publisher.publish("q", "d")
+
+        connection_mock.assert_called_once()
+        channel.queue_declare.assert_called_once_with(queue="q", durable=True)
+        self.assertEqual([call.kwargs["body"] for call in channel.basic_publish.call_args_list], ["a", "b", "c", "d"])
+
+    def test_reconnects_and_retries_after_a_lost_connection(self, connection_mock):
+        broken, healthy = Mock(), Mock()
+        broken.basic_publish.side_effect = pika.exceptions.StreamLostError("gone")
+        connection_mock.side_effect = [self._connection(broken), self._connection(healthy)]
+        publisher = AmqpPublisher("mq", 5672, "guest", "guest")
+
+        publisher.publish("q", "a")
+
+        self.assertEqual(connection_mock.call_count, 2)
+        # The queue is declared again on the new connection
+        healthy.queue_declare.assert_called_once_with(queue="q", durable=True)
+        healthy.basic_publish.assert_called_once()
+
+    def test_retry_resumes_after_the_last_confirmed_message(self, connection_mock):
+        broken, healthy = Mock(), Mock()
+        broken.basic_publish.side_effect = [None, pika.exceptions.StreamLostError("gone")]
+        connection_mock.side_effect = [self._connection(broken), self._connection(healthy)]
+        publisher = AmqpPublisher("mq", 5672, "guest", "guest")
+
+        publisher.publish_batch("q", ["a", "b", "c"])
+
+        self.assertEqual([call.kwargs["body"] for call in broken.basic_publish.call_args_list], ["a", "b"])
+        self.assertEqual([call.kwargs["body"] for call in healthy.basic_publish.call_args_list], ["b", "c"])
+
+    def test_worker_shutdown_closes_the_publishers(self, connection_mock):
+        connection_mock.return_value = self._connection(Mock())
+        publisher = publisher_for(CONFIG)
+        publisher.publish("q", "a")
+
+        worker_process_shutdown.send(sender=None, pid=1, exitcode=0)
+
+        connection_mock.return_value.close.assert_called_once()
+        self.assertIsNot(publisher_for(CONFIG), publisher)
+
+    @override_settings(AMQP_PUBLISHER={"RETRIES": 0, "CONFIRM_DELIVERY": False})
+    def test_raises_when_retries_are_exhausted(self, connection_mock):
+        channel = Mock()
+        channel.basic_publish.side_effect = pika.exceptions.NackError([])
+        connection_mock.return_value = self._connection(channel)
+        publisher = AmqpPublisher("mq", 5672, "guest", "guest")
+
+        with self.assertRaises(pika.exceptions.NackError):
+            publisher.publish("q", "a")
+        channel.confirm_delivery.assert_not_called()
+
+    def test_publisher_is_not_reused_after_fork(self, connection_mock):
+        publisher = publisher_for(CONFIG)
+        with patch("integrations.services.amqp_publisher.os.getpid", return_value=-1):
+            self.assertIsNot(publisher_for(CONFIG), publisher)
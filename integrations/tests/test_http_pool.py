@@ -0,0 +1,51 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from integrations.services import http_pool
+from integrations.services.http_pool import close_sessions, endpoint_slot, get_session
+
+
+class GetSessionTests(SimpleTestCase):
+    def setUp(self):
+        close_sessions()
+        self.addCleanup(close_sessions)
+
+    def test_session_is_shared_per_name_and_pools_connections(self):
+        session = get_session("slack", pool_size=4)
+
+        self.assertIs(get_session("slack", pool_size=4), session)
+        self.assertIsNot(get_session("sms"), session)
+        adapter = session.get_adapter("https://slack.internal/post")
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertEqual(adapter.max_retries.total, 0)
+
+    def test_sessions_are_not_reused_after_a_fork(self):
+        session = get_session("slack")
+        with patch.object(http_pool.os, "getpid", return_value=-1):
+            self.assertIsNot(get_session("slack"), session)
+
+
+class EndpointSlotTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_at_most_limit_requests_hold_a_slot(self):
+        with endpoint_slot("http://slack", 2, lease_seconds=10) as first:
+            with endpoint_slot("http://slack", 2, lease_seconds=10) as second:
+                with endpoint_slot("http://slack", 2, lease_seconds=10) as third:
+                    self.assertEqual((first, second, third), (True, True, False))
+                with endpoint_slot("http://other", 2, lease_seconds=10) as other:
+                    self.assertTrue(other)
+            # Released slots are available again
+            with endpoint_slot("http://slack", 2, lease_seconds=10) as again:
+                self.assertTrue(again)
+
+    def test_zero_limit_and_cache_errors_do_not_block(self):
+        with endpoint_slot("http://slack", 0, lease_seconds=10) as unlimited:
+            self.assertTrue(unlimited)
+        with patch.object(http_pool.cache, "add", side_effect=ConnectionError("down")):
+            with endpoint_slot("http://slack", 1, lease_seconds=10) as acquired:
+                self.assertTrue(acquired)
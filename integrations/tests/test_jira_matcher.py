@@ -89,164 +89,71 @@ class JiraRuleMatcherServiceTests(TestCase):
         self.assertFalse(self.matcher_service._does_rule_match(mock_rule, alert_labels))
         mock_does_criteria_match.assert_called_once_with(mock_rule.match_criteria, alert_labels)
 
-    @patch('integrations.services.jira_matcher.JiraIntegrationRule.objects')
-    @patch('integrations.services.jira_matcher.JiraRuleMatcherService._does_rule_match')
-    def test_find_matching_rule_no_active_rules(self, mock_does_rule_match, mock_objects):
-        """Test find_matching_rule when there are no active rules."""
-        # Mock the filter method to return an iterable MagicMock
-        mock_queryset = MagicMock()
-        mock_queryset.__iter__.return_value = iter([]) # Make it iterable
-        mock_objects.filter.return_value = mock_queryset
+    def _rule(self, name, match_criteria, priority=0, is_active=True):
+        return JiraIntegrationRule.objects.create(
+            name=name, match_criteria=match_criteria, priority=priority, is_active=is_active,
+            jira_project_key='OPS', jira_issue_type='Task',
+        )
 
-        alert_labels = {"severity": "critical", "env": "prod"}
-        best_match = self.matcher_service.find_matching_rule(alert_labels)
+    def test_find_matching_rule_no_active_rules(self):
+        """Test find_matching_rule when there are no active rules."""
+        self._rule("Inactive", {"severity": "critical"}, is_active=False)
 
-        mock_objects.filter.assert_called_once_with(is_active=True)
-        mock_does_rule_match.assert_not_called()
-        self.assertIsNone(best_match)
+        self.assertIsNone(self.matcher_service.find_matching_rule({"severity": "critical", "env": "prod"}))
 
-    @patch('integrations.services.jira_matcher.JiraIntegrationRule.objects')
-    @patch('integrations.services.jira_matcher.JiraRuleMatcherService._does_rule_match')
-    def test_find_matching_rule_no_rules_match(self, mock_does_rule_match, mock_objects):
+    def test_find_matching_rule_no_rules_match(self):
         """Test find_matching_rule when active rules exist but none match."""
-        mock_rule1 = ComparableRuleMock(name="Rule1", id=1, match_criteria={"severity": "warning"}, priority=1)
-        mock_rule2 = ComparableRuleMock(name="Rule2", id=2, match_criteria={"env": "dev"}, priority=1)
-        # Mock the filter method to return an iterable MagicMock
-        mock_queryset = MagicMock()
-        mock_queryset.__iter__.return_value = iter([mock_rule1, mock_rule2]) # Make it iterable
-        mock_objects.filter.return_value = mock_queryset
+        self._rule("Rule1", {"severity": "warning"}, priority=1)
+        self._rule("Rule2", {"env": "dev"}, priority=1)
+        self._rule("Empty", {}, priority=1)  # Empty criteria never match Jira rules
 
-        mock_does_rule_match.return_value = False # Simulate no match
+        self.assertIsNone(self.matcher_service.find_matching_rule({"severity": "critical", "env": "prod"}))
 
-        alert_labels = {"severity": "critical", "env": "prod"}
-        best_match = self.matcher_service.find_matching_rule(alert_labels)
-
-        mock_objects.filter.assert_called_once_with(is_active=True)
-        self.assertEqual(mock_does_rule_match.call_count, 2) # Called for each rule
-        self.assertIsNone(best_match)
-
-    @patch('integrations.services.jira_matcher.JiraIntegrationRule.objects')
-    @patch('integrations.services.jira_matcher.JiraRuleMatcherService._does_rule_match')
-    def test_find_matching_rule_one_rule_matches(self, mock_does_rule_match, mock_objects):
+    def test_find_matching_rule_one_rule_matches(self):
         """Test find_matching_rule when only one rule matches."""
-        mock_rule1 = ComparableRuleMock(name="Rule1", id=1, match_criteria={"severity": "critical"}, priority=1)
-        mock_rule2 = ComparableRuleMock(name="Rule2", id=2, match_criteria={"env": "dev"}, priority=1)
-        # Mock the filter method to return an iterable MagicMock
-        mock_queryset = MagicMock()
-        mock_queryset.__iter__.return_value = iter([mock_rule1, mock_rule2]) # Make it iterable
-        mock_objects.filter.return_value = mock_queryset
-
-        # Simulate only rule1 matching
-        def side_effect_does_rule_match(rule, labels):
-            return rule == mock_rule1
-        mock_does_rule_match.side_effect = side_effect_does_rule_match
+        rule1 = self._rule("Rule1", {"severity": "critical"}, priority=1)
+        self._rule("Rule2", {"env": "dev"}, priority=1)
 
-        alert_labels = {"severity": "critical", "env": "prod"}
-        best_match = self.matcher_service.find_matching_rule(alert_labels)
-
-        mock_objects.filter.assert_called_once_with(is_active=True)
-        self.assertEqual(mock_does_rule_match.call_count, 2) # Called for each rule
-        self.assertEqual(best_match, mock_rule1)
-
-    @patch('integrations.services.jira_matcher.JiraIntegrationRule.objects')
-    @patch('integrations.services.jira_matcher.JiraRuleMatcherService._does_rule_match')
-    def test_find_matching_rule_multiple_rules_match_sorting(self, mock_does_rule_match, mock_objects):
-        """Test find_matching_rule with multiple matching rules, verifying sorting."""
-        # Rules with different specificity, priority, and name for sorting test
-        # Specificity (criteria count), Priority (desc), Name (asc)
-# Define a simple class to act as a comparable mock for JiraIntegrationRule
-class ComparableRuleMock:
-    def __init__(self, name, id, match_criteria, priority):
-        self.name = name
-        self.id = id
-        self.match_criteria = match_criteria
-        self.priority = priority
-
-    # Implement __lt__ for comparison based on the sorting key logic in find_matching_rule
-    def __lt__(self, other):
-        return (
-            -len(self.match_criteria or {}), -self.priority, self.name
-        ) < (
-            -len(other.match_criteria or {}), -other.priority, other.name
-        )
+        self.assertEqual(self.matcher_service.find_matching_rule({"severity": "critical", "env": "prod"}), rule1)
 
-# ... rest of the tests ...
-
-        # Rules with different specificity, priority, and name for sorting test
-        # Specificity (criteria count), Priority (desc), Name (asc)
-        # Rules with different specificity, priority, and name for sorting test
-        # Specificity (criteria count), Priority (desc), Name (asc)
-        mock_rule_low_spec_high_prio_a = ComparableRuleMock(name="Rule A", id=1, match_criteria={"severity": "critical"}, priority=10) # Spec 1, Prio 10, Name A
-        mock_rule_high_spec_low_prio_b = ComparableRuleMock(name="Rule B", id=2, match_criteria={"severity": "critical", "env": "prod"}, priority=5) # Spec 2, Prio 5, Name B
-        mock_rule_low_spec_high_prio_c = ComparableRuleMock(name="Rule C", id=3, match_criteria={"severity": "critical"}, priority=10) # Spec 1, Prio 10, Name C
-        mock_rule_high_spec_high_prio_d = ComparableRuleMock(name="Rule D", id=4, match_criteria={"severity": "critical", "env": "prod", "region": "us-east-1"}, priority=10) # Spec 3, Prio 10, Name D
-
-        # Order in the queryset shouldn't matter for the final result due to sorting
-        all_rules = [
-            mock_rule_low_spec_high_prio_a,
-            mock_rule_high_spec_low_prio_b,
-            mock_rule_low_spec_high_prio_c,
-            mock_rule_high_spec_high_prio_d,
-        ]
-        # Mock the filter method to return an iterable MagicMock
-        mock_queryset = MagicMock()
-        mock_queryset.__iter__.return_value = iter(all_rules) # Make it iterable
-        mock_objects.filter.return_value = mock_queryset
-
-        # Simulate all rules matching
-        mock_does_rule_match.return_value = True
+    def test_find_matching_rule_multiple_rules_match_sorting(self):
+        """Test find_matching_rule with multiple matching rules: the most specific one wins."""
+        self._rule("Rule A", {"severity": "critical"}, priority=10)
+        self._rule("Rule B", {"severity": "critical", "env": "prod"}, priority=5)
+        self._rule("Rule C", {"severity": "critical"}, priority=10)
+        rule_d = self._rule("Rule D", {"severity": "critical", "env": "prod", "region": "us-east-1"}, priority=10)
+        self._rule("Rule E", {"severity": "critical", "env": "prod", "region": "eu-west-1"}, priority=99)
 
         alert_labels = {"severity": "critical", "env": "prod", "region": "us-east-1", "alertname": "TestAlert"}
-        best_match = self.matcher_service.find_matching_rule(alert_labels)
-
-        mock_objects.filter.assert_called_once_with(is_active=True)
-        self.assertEqual(mock_does_rule_match.call_count, len(all_rules)) # Called for each rule
-
-        # Expected sorting order:
-        # 1. mock_rule_high_spec_high_prio_d (Spec 3)
-        # 2. mock_rule_high_spec_low_prio_b (Spec 2)
-        # 3. mock_rule_low_spec_high_prio_a (Spec 1, Prio 10, Name A)
-        # 4. mock_rule_low_spec_high_prio_c (Spec 1, Prio 10, Name C) - Name A comes before C
-
-        # The best match should be the one with the highest specificity
-        self.assertEqual(best_match, mock_rule_high_spec_high_prio_d)
+        self.assertEqual(self.matcher_service.find_matching_rule(alert_labels), rule_d)
 
-    @patch('integrations.services.jira_matcher.JiraIntegrationRule.objects')
-    @patch('integrations.services.jira_matcher.JiraRuleMatcherService._does_rule_match')
-    def test_find_matching_rule_sorting_tie_breaker_priority(self, mock_does_rule_match, mock_objects):
+    def test_find_matching_rule_sorting_tie_breaker_priority(self):
         """Test find_matching_rule sorting tie-breaker by priority."""
-        # Rules with same specificity, different priority
-        mock_rule_prio_low = ComparableRuleMock(name="Rule Low Prio", id=1, match_criteria={"severity": "critical"}, priority=5)
-        mock_rule_prio_high = ComparableRuleMock(name="Rule High Prio", id=2, match_criteria={"severity": "critical"}, priority=10)
+        self._rule("Rule Low Prio", {"severity": "critical"}, priority=5)
+        rule_high = self._rule("Rule High Prio", {"severity": "critical"}, priority=10)
 
-        all_rules = [mock_rule_prio_low, mock_rule_prio_high]
-        # Mock the filter method to return an iterable MagicMock
-        mock_queryset = MagicMock()
-        mock_queryset.__iter__.return_value = iter(all_rules) # Make it iterable
-        mock_objects.filter.return_value = mock_queryset
-        mock_does_rule_match.return_value = True
+        self.assertEqual(self.matcher_service.find_matching_rule({"severity": "critical"}), rule_high)
 
-        alert_labels = {"severity": "critical"}
-        best_match = self.matcher_service.find_matching_rule(alert_labels)
+    def test_find_matching_rule_sorting_tie_breaker_name(self):
+        """Test find_matching_rule sorting tie-breaker by name."""
+        self._rule("Rule B", {"severity": "critical"}, priority=10)
+        rule_a = self._rule("Rule A", {"severity": "critical"}, priority=10)
 
-        self.assertEqual(best_match, mock_rule_prio_high) # High priority should win
+        self.assertEqual(self.matcher_service.find_matching_rule({"severity": "critical"}), rule_a)
 
-    @patch('integrations.services.jira_matcher.JiraIntegrationRule.objects')
-    @patch('integrations.services.jira_matcher.JiraRuleMatcherService._does_rule_match')
-    def test_find_matching_rule_sorting_tie_breaker_name(self, mock_does_rule_match, mock_objects):
-        """Test find_matching_rule sorting tie-breaker by name."""
-        # Rules with same specificity and priority, different name
-        mock_rule_name_a = ComparableRuleMock(name="Rule A", id=1, match_criteria={"severity": "critical"}, priority=10)
-        mock_rule_name_b = ComparableRuleMock(name="Rule B", id=2, match_criteria={"severity": "critical"}, priority=10)
+    def test_find_matching_rule_compares_values_as_strings(self):
+        rule = self._rule("Numeric", {"count": 5})
+
+        self.assertEqual(self.matcher_service.find_matching_rule({"count": "5"}), rule)
 
-        all_rules = [mock_rule_name_b, mock_rule_name_a] # Order in list shouldn't matter
-        # Mock the filter method to return an iterable MagicMock
-        mock_queryset = MagicMock()
-        mock_queryset.__iter__.return_value = iter(all_rules) # Make it iterable
-        mock_objects.filter.return_value = mock_queryset
-        mock_does_rule_match.return_value = True
+    def test_find_matching_rule_uses_compiled_index(self):
+        """Rules are loaded once per index version, not once per alert."""
+        rule = self._rule("Rule1", {"severity": "critical"})
+        self.matcher_service.find_matching_rule({"severity": "critical"})
 
-        alert_labels = {"severity": "critical"}
-        best_match = self.matcher_service.find_matching_rule(alert_labels)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.matcher_service.find_matching_rule({"severity": "critical"}), rule)
 
-        self.assertEqual(best_match, mock_rule_name_a) # Alphabetical name should win
\ No newline at end of file
+        rule.match_criteria = {"severity": "warning"}
+        rule.save()
+        self.assertIsNone(self.matcher_service.find_matching_rule({"severity": "critical"}))
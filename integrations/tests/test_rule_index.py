@@ -0,0 +1,115 @@
+from django.test import TestCase, override_settings
+
+from alerts.models import AlertGroup
+from integrations.models import JiraIntegrationRule, SlackIntegrationRule, SmsIntegrationRule
+from integrations.services.jira_matcher import JiraRuleMatcherService
+from integrations.services.rule_index import CompiledRuleIndex, rule_index_registry
+from integrations.services.slack_matcher import SlackRuleMatcherService
+from integrations.services.sms_matcher import SmsRuleMatcherService
+
+
+class CompiledRuleIndexTests(TestCase):
+    def setUp(self):
+        rule_index_registry.clear()
+        self.addCleanup(rule_index_registry.clear)
+
+    def _slack(self, name, match_criteria, priority=0, **kwargs):
+        return SlackIntegrationRule.objects.create(
+            name=name, match_criteria=match_criteria, priority=priority, **kwargs,
+        )
+
+    def _group(self, labels, **kwargs):
+        return AlertGroup.objects.create(
+            fingerprint=f"fp-{len(AlertGroup.objects.all())}", name='A', labels=labels, **kwargs,
+        )
+
+    def test_candidates_are_limited_to_matching_anchors_in_best_first_order(self):
+        generic = self._slack('generic', {})
+        by_team = self._slack('team', {'labels__team': 'db'}, priority=5)
+        self._slack('other-team', {'labels__team': 'web'})
+        specific = self._slack('team-critical', {'labels__team': 'db', 'labels__severity': 'critical'})
+
+        index = CompiledRuleIndex(SlackIntegrationRule.objects.all())
+
+        self.assertEqual(index.candidates({'team': 'db', 'severity': 'critical'}), [specific, by_team, generic])
+        self.assertEqual(index.candidates({'team': 'ops'}), [generic])
+
+    def test_label_expected_as_none_and_isnull_lookups_are_not_anchored(self):
+        missing = self._slack('missing-label', {'labels__team': None})
+        isnull = self._slack('isnull', {'jira_issue_key__isnull': True})
+
+        index = CompiledRuleIndex(SlackIntegrationRule.objects.all())
+
+        self.assertEqual(index.unanchored, [(0, isnull), (1, missing)])
+
+    def test_field_criteria_anchor_on_the_alert_group(self):
+        rule = self._slack('critical', {'severity': 'critical'})
+        index = CompiledRuleIndex(SlackIntegrationRule.objects.all())
+
+        self.assertEqual(index.candidates({}, self._group({}, severity='critical')), [rule])
+        self.assertEqual(index.candidates({}, self._group({}, severity='warning')), [])
+
+    def test_matching_is_equivalent_to_evaluating_every_rule(self):
+        self._slack('generic', {})
+        self._slack('team', {'labels__team': 'db'}, priority=5)
+        self._slack('no-team', {'labels__team': None}, priority=7)
+        self._slack('critical', {'severity': 'critical', 'labels__team': 'db'})
+        self._slack('unlinked', {'jira_issue_key__isnull': True, 'labels__env': 'prod'}, priority=1)
+        self._slack('inactive', {'labels__team': 'db'}, priority=99, is_active=False)
+        matcher = SlackRuleMatcherService()
+        groups = [
+            self._group({'team': 'db'}, severity='critical'),
+            self._group({'team': 'db', 'env': 'prod'}, severity='warning'),
+            self._group({'env': 'prod'}, severity='warning'),
+            self._group({'team': 'web'}, severity='critical'),
+        ]
+
+        for group in groups:
+            expected = sorted(
+                (rule for rule in SlackIntegrationRule.objects.filter(is_active=True)
+                 if matcher._does_rule_match(rule, group)),
+                key=lambda rule: (-len(rule.match_criteria), -rule.priority, rule.name),
+            )
+            self.assertEqual(matcher.find_matching_rule(group), expected[0] if expected else None, group.labels)
+
+    def test_empty_criteria_match_for_slack_and_sms_only(self):
+        self._slack('catch-all', {})
+        SmsIntegrationRule.objects.create(name='catch-all', match_criteria={}, firing_template='x')
+        JiraIntegrationRule.objects.create(
+            name='catch-all', match_criteria={}, jira_project_key='OPS', jira_issue_type='Task',
+        )
+        group = self._group({'team': 'db'})
+
+        self.assertEqual(SlackRuleMatcherService().find_matching_rule(group).name, 'catch-all')
+        self.assertEqual(SmsRuleMatcherService().find_matching_rule(group).name, 'catch-all')
+        self.assertIsNone(JiraRuleMatcherService().find_matching_rule(group.labels))
+
+    def test_index_is_reused_until_a_rule_changes(self):
+        rule = self._slack('team', {'labels__team': 'db'})
+        group = self._group({'team': 'db'})
+        matcher = SlackRuleMatcherService()
+        matcher.find_matching_rule(group)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(matcher.find_matching_rule(group), rule)
+
+        rule.match_criteria = {'labels__team': 'web'}
+        rule.save()
+        self.assertIsNone(matcher.find_matching_rule(group))
+
+        rule.delete()
+        self._slack('team-db', {'labels__team': 'db'})
+        self.assertEqual(matcher.find_matching_rule(group).name, 'team-db')
+
+    def test_changes_made_by_other_processes_are_seen_through_the_table_version(self):
+        group = self._group({'team': 'db'})
+        matcher = SlackRuleMatcherService()
+        self.assertIsNone(matcher.find_matching_rule(group))
+
+        # bulk_create bypasses the signals, like a change whose cache bump this process cannot see
+        SlackIntegrationRule.objects.bulk_create([SlackIntegrationRule(name='team', match_criteria={'labels__team': 'db'})])
+
+        with override_settings(RULE_INDEX={'VERSION_PROBE_SECONDS': 60}):
+            self.assertIsNone(matcher.find_matching_rule(group))
+        with override_settings(RULE_INDEX={'VERSION_PROBE_SECONDS': 0}):
+            self.assertEqual(matcher.find_matching_rule(group).name, 'team')
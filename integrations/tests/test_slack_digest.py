@@ -0,0 +1,103 @@
+import datetime
+from unittest.mock import patch
+
+from celery.exceptions import Retry
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from alerts.models import AlertGroup
+from integrations.exceptions import SlackNotificationError
+from integrations.models import SlackDigestEntry, SlackIntegrationRule
+from integrations.services.slack_digest import flush_digest, flush_overdue_digests, render_digest
+from integrations.tasks import flush_slack_digests_task, process_slack_for_alert_group
+
+
+class SlackDigestTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.rule = SlackIntegrationRule.objects.create(
+            name='storm',
+            slack_channel='#ops',
+            match_criteria={},
+            message_template='{{ alert_group.name }} firing',
+            resolved_message_template='{{ alert_group.name }} resolved',
+            digest_window_seconds=60,
+        )
+        self.groups = [
+            AlertGroup.objects.create(fingerprint=f'fp-{i}', name=f'Disk<{i}>', labels={'i': str(i)})
+            for i in range(3)
+        ]
+
+    @patch('integrations.tasks.flush_slack_digests_task.apply_async')
+    @patch('integrations.tasks.SlackService')
+    def test_notifications_within_a_window_are_buffered_and_flushed_once(self, service_cls, apply_async_mock):
+        for group in self.groups:
+            process_slack_for_alert_group(group.id, self.rule.id, alert_status='firing')
+
+        service_cls.return_value.send_notification.assert_not_called()
+        self.assertEqual(SlackDigestEntry.objects.count(), 3)
+        apply_async_mock.assert_called_once_with(kwargs={'rule_id': self.rule.id, 'channel': '#ops'}, countdown=60)
+
+        with patch('integrations.services.slack_digest.SlackService') as digest_service_cls:
+            digest_service_cls.return_value.send_notification.return_value = True
+            self.assertEqual(flush_digest(self.rule.id, '#ops'), 3)
+
+        digest_service_cls.return_value.send_notification.assert_called_once()
+        channel, message = digest_service_cls.return_value.send_notification.call_args[0]
+        self.assertEqual(channel, '#ops')
+        self.assertIn('*3 alert notifications for #ops* (3 firing, 0 resolved)', message)
+        # Rendered messages are not escaped a second time
+        self.assertIn('Disk&lt;0&gt; firing', message)
+        self.assertFalse(SlackDigestEntry.objects.exists())
+
+    @patch('integrations.tasks.SlackService')
+    def test_rules_without_a_window_send_immediately(self, service_cls):
+        self.rule.digest_window_seconds = 0
+        self.rule.save()
+
+        process_slack_for_alert_group(self.groups[0].id, self.rule.id, alert_status='firing')
+
+        service_cls.return_value.send_notification.assert_called_once_with('#ops', 'Disk&lt;0&gt; firing', fingerprint='fp-0')
+        self.assertFalse(SlackDigestEntry.objects.exists())
+
+    @override_settings(SLACK_DIGEST={'MAX_ENTRIES_PER_MESSAGE': 2})
+    @patch('integrations.services.slack_digest.SlackService')
+    def test_large_digests_are_split_and_use_the_rule_template(self, service_cls):
+        self.rule.digest_template = '{{ count }}:{% for entry in entries %}{{ entry.status }}{% endfor %}'
+        self.rule.save()
+        for group, status in zip(self.groups, ['firing', 'resolved', 'firing']):
+            SlackDigestEntry.objects.create(rule=self.rule, alert_group=group, channel='#ops', status=status, message='m')
+
+        self.assertEqual(flush_digest(self.rule.id, '#ops'), 3)
+
+        messages = [call[0][1] for call in service_cls.return_value.send_notification.call_args_list]
+        self.assertEqual(messages, ['2:firingresolved', '1:firing'])
+
+    @patch('integrations.services.slack_digest.SlackService')
+    def test_failed_flush_keeps_the_entries_for_the_retry(self, service_cls):
+        service_cls.return_value.send_notification.side_effect = SlackNotificationError('down')
+        SlackDigestEntry.objects.create(rule=self.rule, channel='#ops', status='firing', message='m')
+
+        with patch('integrations.tasks.flush_slack_digests_task.retry', side_effect=Retry('later')) as retry_mock:
+            with self.assertRaises(Retry):
+                flush_slack_digests_task(rule_id=self.rule.id, channel='#ops')
+
+        retry_mock.assert_called_once()
+        self.assertEqual(list(SlackDigestEntry.objects.values_list('claim_token', flat=True)), [''])
+
+    @patch('integrations.services.slack_digest.SlackService')
+    def test_beat_flushes_only_overdue_windows(self, service_cls):
+        entry = SlackDigestEntry.objects.create(rule=self.rule, channel='#ops', status='firing', message='m')
+        now = entry.created_at
+
+        self.assertEqual(flush_overdue_digests(now=now + datetime.timedelta(seconds=61)), 0)
+        self.assertEqual(flush_overdue_digests(now=now + datetime.timedelta(seconds=120)), 1)
+        service_cls.return_value.send_notification.assert_called_once()
+
+    def test_render_digest_falls_back_to_the_default_template(self):
+        self.rule.digest_template = '{% for %}'
+        entry = SlackDigestEntry(rule=self.rule, channel='#ops', status='resolved', message='ok', created_at=timezone.now())
+
+        self.assertEqual(render_digest(self.rule, '#ops', [entry]), '*1 alert notification for #ops* (0 firing, 1 resolved)\nok')
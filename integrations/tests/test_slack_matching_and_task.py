@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from unittest.mock import patch
 import datetime
 
@@ -7,7 +7,8 @@ from django.utils import timezone
 from integrations.models import SlackIntegrationRule
 from integrations.services.slack_matcher import SlackRuleMatcherService
 from integrations.services.slack_service import SlackNotificationError
-from integrations.tasks import process_slack_for_alert_group, sanitize_ip_addresses
+from integrations.exceptions import SlackThrottledError
+from integrations.tasks import process_slack_for_alert_group, sanitize_ip_addresses, slack_retry_countdown
 from celery.exceptions import Retry
 
 
@@ -289,6 +290,40 @@ class SlackTaskTests(TestCase):
             process_slack_for_alert_group(alert_group.id, rule.id)
 
         metrics_mock.inc_counter.assert_called_once_with("sentryhub_slack_notifications_total", {"status": "retry"})
+        # Retried later by the broker with a jittered exponential countdown
+        _, kwargs = retry_mock.call_args
+        self.assertTrue(5 <= kwargs['countdown'] <= 10, kwargs)
+        self.assertEqual(kwargs['max_retries'], 12)
+
+    @override_settings(SLACK_HTTP={'THROTTLE_DELAY_SECONDS': 4, 'MAX_THROTTLE_DEFERRALS': 2, 'MAX_RETRIES': 12})
+    @patch('integrations.tasks.SlackService')
+    @patch('integrations.tasks.process_slack_for_alert_group.apply_async')
+    @patch('integrations.tasks.process_slack_for_alert_group.retry', side_effect=Retry('boom'))
+    def test_throttled_sends_are_deferred_outside_the_retry_budget(self, retry_mock, apply_async_mock, mock_service_cls):
+        mock_service_cls.return_value.send_notification.side_effect = SlackThrottledError("busy")
+        alert_group = AlertGroup.objects.create(fingerprint='fp8', name='AG8', labels={}, source='prometheus')
+        rule = SlackIntegrationRule.objects.create(name='rule', slack_channel='#chan', match_criteria={}, message_template='hi')
+
+        process_slack_for_alert_group(alert_group.id, rule.id, alert_status='firing', deferrals=1)
+
+        retry_mock.assert_not_called()
+        _, kwargs = apply_async_mock.call_args
+        self.assertEqual(kwargs['kwargs'], {
+            'alert_group_id': alert_group.id, 'rule_id': rule.id, 'alert_status': 'firing', 'deferrals': 2,
+        })
+        self.assertTrue(2 <= kwargs['countdown'] <= 6, kwargs)
+        self.assertEqual(kwargs['retries'], 0)
+
+        # Once the deferral budget is spent the send is retried like a network error
+        with self.assertRaises(Retry):
+            process_slack_for_alert_group(alert_group.id, rule.id, alert_status='firing', deferrals=2)
+        apply_async_mock.assert_called_once()
+
+    @override_settings(SLACK_HTTP={'RETRY_BASE_SECONDS': 10, 'RETRY_MAX_SECONDS': 300})
+    def test_slack_retry_countdown_backs_off_up_to_the_maximum(self):
+        self.assertTrue(5 <= slack_retry_countdown(0) <= 10)
+        self.assertTrue(20 <= slack_retry_countdown(2) <= 40)
+        self.assertTrue(150 <= slack_retry_countdown(10) <= 300)
 
 
 class SanitizeIpAddressesTests(TestCase):
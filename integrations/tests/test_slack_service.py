@@ -3,7 +3,9 @@ from unittest.mock import Mock, patch
 import requests
 import json
 
-from integrations.services.slack_service import SlackService, SlackNotificationError
+from integrations.services.amqp_publisher import close_publishers
+from integrations.services.http_pool import endpoint_slot
+from integrations.services.slack_service import SlackService, SlackNotificationError, SlackThrottledError
 
 
 class SlackServiceNormalizeChannelTests(SimpleTestCase):
@@ -37,12 +39,13 @@ class SlackServiceSendNotificationTests(SimpleTestCase):
         response_mock = Mock(status_code=200, text="ok")
         response_mock.raise_for_status = Mock()
         with patch(
-            "integrations.services.slack_service.requests.post",
-            return_value=response_mock,
-        ) as post_mock:
+            "integrations.services.slack_service.get_session",
+        ) as session_mock:
+            post_mock = session_mock.return_value.post
+            post_mock.return_value = response_mock
             result = service.send_notification("#general", "hi")
         self.assertTrue(result)
-        post_mock.assert_called_once()
+        post_mock.assert_called_once_with("http://slack", json={"channel": "#general", "text": "hi"}, timeout=10.0)
         metrics_mock.inc_counter.assert_called()
         metrics_mock.set_gauge.assert_called()
 
@@ -53,17 +56,19 @@ class SlackServiceSendNotificationTests(SimpleTestCase):
         response_mock = Mock(status_code=200, text="error")
         response_mock.raise_for_status = Mock()
         with patch(
-            "integrations.services.slack_service.requests.post",
-            return_value=response_mock,
-        ):
+            "integrations.services.slack_service.get_session",
+        ) as session_mock:
+            session_mock.return_value.post.return_value = response_mock
             result = service.send_notification("#general", "hi")
         self.assertFalse(result)
         metrics_mock.inc_counter.assert_called()
 
     @override_settings(SLACK_DELIVERY_METHOD="RABBITMQ")
-    @patch("integrations.services.slack_service.pika.BasicProperties")
-    @patch("integrations.services.slack_service.pika.BlockingConnection")
+    @patch("integrations.services.amqp_publisher.pika.BasicProperties")
+    @patch("integrations.services.amqp_publisher.pika.BlockingConnection")
     def test_send_notification_rabbitmq_success(self, connection_mock, basic_props_mock):
+        close_publishers()
+        self.addCleanup(close_publishers)
         service = SlackService()
         channel_mock = Mock()
         connection_instance = Mock()
@@ -72,53 +77,55 @@ class SlackServiceSendNotificationTests(SimpleTestCase):
         basic_props_mock.return_value = Mock()
 
         result = service.send_notification("general", "hi", "test_fingerprint")
+        self.assertTrue(service.send_notification("general", "again", "test_fingerprint"))
 
         self.assertTrue(result)
+        # One long-lived connection with confirms; the queue is declared once
         connection_mock.assert_called_once()
+        channel_mock.confirm_delivery.assert_called_once()
         channel_mock.queue_declare.assert_called_once_with(queue='slack_notifications_queue', durable=True)
-        channel_mock.basic_publish.assert_called_once()
-        args, kwargs = channel_mock.basic_publish.call_args
+        self.assertEqual(channel_mock.basic_publish.call_count, 2)
+        args, kwargs = channel_mock.basic_publish.call_args_list[0]
         self.assertEqual(kwargs["routing_key"], 'slack_notifications_queue')
         self.assertEqual(json.loads(kwargs["body"]), {"channel": "#general", "text": "hi", "fingerprint": "test_fingerprint"})
         self.assertIs(kwargs["properties"], basic_props_mock.return_value)
-        connection_instance.close.assert_called_once()
+        connection_instance.close.assert_not_called()
 
     @override_settings(SLACK_INTERNAL_ENDPOINT="http://slack")
     @patch("integrations.services.slack_service.metrics_manager")
-    def test_send_notification_network_error_raises(self, metrics_mock):
+    def test_send_notification_network_error_raises_without_sleeping(self, metrics_mock):
         service = SlackService()
-        with patch(
-            "integrations.services.slack_service.requests.post",
-            side_effect=requests.exceptions.RequestException,
-        ) as post_mock:
+        with patch("integrations.services.slack_service.get_session") as session_mock:
+            post_mock = session_mock.return_value.post
+            post_mock.side_effect = requests.exceptions.ReadTimeout
             with patch("integrations.services.slack_service.time.sleep") as sleep_mock:
                 with self.assertRaises(SlackNotificationError):
                     service.send_notification("#general", "hi")
-        self.assertEqual(post_mock.call_count, 3)
-        self.assertEqual(sleep_mock.call_count, 2)
-        metrics_mock.inc_counter.assert_called()
+        # The task reschedules the delivery; the worker is never parked
+        post_mock.assert_called_once()
+        sleep_mock.assert_not_called()
+        metrics_mock.inc_counter.assert_called_once_with(
+            "sentryhub_slack_notifications_total",
+            labels={"status": "failure", "reason": "network_error"},
+        )
 
-    @override_settings(SLACK_INTERNAL_ENDPOINT="http://slack")
+    @override_settings(
+        SLACK_INTERNAL_ENDPOINT="http://slack",
+        SLACK_HTTP={"MAX_CONCURRENT_REQUESTS": 1, "TIMEOUT_SECONDS": 10},
+    )
     @patch("integrations.services.slack_service.metrics_manager")
-    def test_send_notification_retries_and_succeeds(self, metrics_mock):
+    def test_send_notification_defers_when_endpoint_is_saturated(self, metrics_mock):
         service = SlackService()
-        response_mock = Mock(status_code=200, text="ok")
-        response_mock.raise_for_status = Mock()
-        side_effects = [
-            requests.exceptions.RequestException,
-            requests.exceptions.RequestException,
-            response_mock,
-        ]
-        with patch(
-            "integrations.services.slack_service.requests.post",
-            side_effect=side_effects,
-        ) as post_mock:
-            with patch("integrations.services.slack_service.time.sleep") as sleep_mock:
-                result = service.send_notification("#general", "hi")
-        self.assertTrue(result)
-        self.assertEqual(post_mock.call_count, 3)
-        self.assertEqual(sleep_mock.call_count, 2)
-        metrics_mock.inc_counter.assert_called()
+        with endpoint_slot("http://slack", 1, lease_seconds=10) as acquired:
+            self.assertTrue(acquired)
+            with patch("integrations.services.slack_service.get_session") as session_mock:
+                with self.assertRaises(SlackThrottledError):
+                    service.send_notification("#general", "hi")
+        session_mock.return_value.post.assert_not_called()
+        metrics_mock.inc_counter.assert_called_once_with(
+            "sentryhub_slack_notifications_total",
+            labels={"status": "failure", "reason": "throttled"},
+        )
 
     @override_settings(SLACK_INTERNAL_ENDPOINT="")
     @patch("integrations.services.slack_service.metrics_manager")
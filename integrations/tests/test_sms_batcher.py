@@ -0,0 +1,134 @@
+import datetime
+from unittest.mock import Mock, patch
+
+import requests
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from alerts.models import AlertGroup
+from integrations.exceptions import SmsNotificationError
+from integrations.models import PhoneBook, SmsIntegrationRule, SmsMessageLog, SmsOutboxEntry
+from integrations.services.amqp_publisher import close_publishers
+from integrations.services.sms_batcher import flush_sms_outbox, split_provider_response
+from integrations.services.sms_service import SmsService
+from integrations.tasks import process_sms_for_alert_group
+
+PROVIDER_SETTINGS = dict(
+    SMS_PROVIDER_SEND_URL="http://sms",
+    SMS_PROVIDER_USERNAME="u",
+    SMS_PROVIDER_PASSWORD="p",
+    SMS_PROVIDER_DOMAIN="d",
+    SMS_PROVIDER_SENDER="3000",
+    SMS_DELIVERY_METHOD="HTTP",
+)
+
+
+def _provider_response(statuses):
+    response = Mock(status_code=200)
+    response.raise_for_status = Mock()
+    response.json = Mock(return_value={"status": 0, "messages": [{"status": status} for status in statuses]})
+    return response
+
+
+@override_settings(SMS_BATCH={'ENABLED': True, 'WINDOW_SECONDS': 5, 'MAX_RECIPIENTS_PER_REQUEST': 4}, **PROVIDER_SETTINGS)
+class SmsBatcherTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        PhoneBook.objects.create(name='alice', phone_number='09100000000')
+        PhoneBook.objects.create(name='bob', phone_number='09100000001')
+        self.rule = SmsIntegrationRule.objects.create(
+            name='r', match_criteria={}, recipients='alice,bob', firing_template='{{ alert_group.name }} down'
+        )
+        self.groups = [
+            AlertGroup.objects.create(fingerprint=f'fp-{i}', name=f'svc-{i}', labels={'i': str(i)})
+            for i in range(3)
+        ]
+
+    def _outbox(self, *messages):
+        for group, message in zip(self.groups, messages):
+            SmsOutboxEntry.objects.create(
+                rule=self.rule, alert_group=group, recipients=['09100000000', '09100000001'], message=message
+            )
+
+    @patch('integrations.tasks.flush_sms_outbox_task.apply_async')
+    @patch('integrations.tasks.SmsService')
+    def test_task_queues_messages_and_schedules_one_flush(self, service_cls, apply_async_mock):
+        for group in self.groups:
+            process_sms_for_alert_group(group.id, self.rule.id, alert_status='firing')
+
+        service_cls.return_value.send_bulk.assert_not_called()
+        self.assertEqual(
+            list(SmsOutboxEntry.objects.values_list('message', flat=True)),
+            ['svc-0 down', 'svc-1 down', 'svc-2 down'],
+        )
+        apply_async_mock.assert_called_once_with(countdown=5)
+
+    def test_flush_packs_entries_and_logs_per_entry_statuses(self):
+        self._outbox('a', 'b', 'c')
+        responses = [_provider_response([0, 0, 0, 14]), _provider_response([0, 27])]
+
+        with patch("integrations.services.sms_service.requests.post", side_effect=responses) as post_mock:
+            self.assertEqual(flush_sms_outbox(), 3)
+
+        # Two entries (4 recipients) fill the first request; the third goes in a second one
+        self.assertEqual(post_mock.call_count, 2)
+        self.assertEqual(post_mock.call_args_list[0][1]['json'], {
+            'senders': ['3000'] * 4,
+            'messages': ['a', 'a', 'b', 'b'],
+            'recipients': ['09100000000', '09100000001'] * 2,
+        })
+        logs = {log.message: log for log in SmsMessageLog.objects.all()}
+        self.assertEqual(logs['a'].status, SmsMessageLog.STATUS_SUCCESS)
+        self.assertEqual(logs['a'].provider_response, {'status': 0, 'messages': [{'status': 0}, {'status': 0}]})
+        self.assertEqual(logs['a'].alert_group, self.groups[0])
+        self.assertEqual((logs['b'].status, logs['b'].error_message), (SmsMessageLog.STATUS_FAILED, SmsService.STATUS_MESSAGES[14]))
+        self.assertEqual((logs['c'].status, logs['c'].error_message), (SmsMessageLog.STATUS_FAILED, SmsService.STATUS_MESSAGES[27]))
+        self.assertFalse(SmsOutboxEntry.objects.exists())
+
+    def test_network_error_logs_the_failed_request_and_keeps_the_rest(self):
+        self._outbox('a', 'b', 'c')
+
+        with patch(
+            "integrations.services.sms_service.requests.post",
+            side_effect=[_provider_response([0, 0, 0, 0]), requests.exceptions.ConnectionError],
+        ):
+            with self.assertRaises(SmsNotificationError):
+                flush_sms_outbox()
+
+        self.assertEqual(
+            sorted(SmsMessageLog.objects.values_list('message', 'status')),
+            [('a', 'success'), ('b', 'success'), ('c', 'failed')],
+        )
+        entry = SmsOutboxEntry.objects.get()
+        self.assertEqual((entry.message, entry.claim_token), ('c', ''))
+
+    @override_settings(SMS_DELIVERY_METHOD="RABBITMQ")
+    @patch("integrations.services.amqp_publisher.pika.BlockingConnection")
+    def test_rabbitmq_batches_are_published_together(self, connection_mock):
+        close_publishers()
+        self.addCleanup(close_publishers)
+        channel_mock = connection_mock.return_value.channel.return_value
+        self._outbox('a', 'b')
+
+        self.assertEqual(flush_sms_outbox(), 2)
+
+        self.assertEqual(channel_mock.basic_publish.call_count, 2)
+        self.assertEqual(
+            set(SmsMessageLog.objects.values_list('status', flat=True)), {SmsMessageLog.STATUS_QUEUED}
+        )
+
+    def test_beat_only_flushes_overdue_entries(self):
+        self._outbox('a')
+        created_at = SmsOutboxEntry.objects.get().created_at
+
+        with patch("integrations.services.sms_service.requests.post", return_value=_provider_response([0, 0])) as post_mock:
+            self.assertEqual(flush_sms_outbox(now=created_at + datetime.timedelta(seconds=10), overdue_only=True), 0)
+            self.assertEqual(flush_sms_outbox(now=created_at + datetime.timedelta(seconds=60), overdue_only=True), 1)
+        post_mock.assert_called_once()
+
+
+class SplitProviderResponseTests(SimpleTestCase):
+    def test_request_level_errors_apply_to_every_entry(self):
+        self.assertEqual(split_provider_response({'status': 18}, [2, 1]), [{'status': 18}, {'status': 18}])
+        self.assertEqual(split_provider_response(None, [1]), [None])
@@ -2,6 +2,7 @@ from django.test import SimpleTestCase, override_settings
 from unittest.mock import Mock, patch
 import json
 
+from integrations.services.amqp_publisher import close_publishers
 from integrations.services.sms_service import SmsService
 
 
@@ -36,9 +37,11 @@ class SmsServiceSendBulkTests(SimpleTestCase):
             "QUEUE_NAME": "sms_notifications_queue",
         },
     )
-    @patch("integrations.services.sms_service.pika.BasicProperties")
-    @patch("integrations.services.sms_service.pika.BlockingConnection")
+    @patch("integrations.services.amqp_publisher.pika.BasicProperties")
+    @patch("integrations.services.amqp_publisher.pika.BlockingConnection")
     def test_send_bulk_rabbitmq_success(self, connection_mock, basic_props_mock):
+        close_publishers()
+        self.addCleanup(close_publishers)
         service = SmsService()
         channel_mock = Mock()
         connection_instance = Mock()
@@ -56,4 +59,4 @@ class SmsServiceSendBulkTests(SimpleTestCase):
         self.assertEqual(kwargs["routing_key"], "sms_notifications_queue")
         self.assertEqual(json.loads(kwargs["body"]), {"recipients": ["0912"], "text": "hi"})
         self.assertIs(kwargs["properties"], basic_props_mock.return_value)
-        connection_instance.close.assert_called_once()
+        connection_instance.close.assert_not_called()  # kept open for the next message
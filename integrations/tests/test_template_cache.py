@@ -0,0 +1,91 @@
+import json
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.template import Template, TemplateSyntaxError
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from integrations.models import JiraIntegrationRule, SlackIntegrationRule, SmsIntegrationRule
+from integrations.services.template_cache import CompiledTemplateCache, template_cache
+from integrations.signals import warm_template_cache
+from integrations.tasks import render_template_safe
+
+
+class CompiledTemplateCacheTests(SimpleTestCase):
+    def test_same_source_is_compiled_once(self):
+        cache = CompiledTemplateCache(max_size=4)
+        with patch('integrations.services.template_cache.Template', wraps=Template) as compile_template:
+            first = cache.get('Hello {{ name }}')
+            second = cache.get('Hello {{ name }}')
+
+        self.assertIs(first, second)
+        compile_template.assert_called_once()
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = CompiledTemplateCache(max_size=2)
+        a = cache.get('a')
+        cache.get('b')
+        cache.get('a')  # 'b' is now the least recently used
+        cache.get('c')
+
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.get('a'), a)
+        self.assertEqual(cache.misses, 3)
+        cache.get('b')
+        self.assertEqual(cache.misses, 4)
+
+    def test_syntax_errors_are_raised_and_not_cached(self):
+        cache = CompiledTemplateCache(max_size=2)
+        with self.assertRaises(TemplateSyntaxError):
+            cache.get('{% if %}')
+        self.assertEqual(len(cache), 0)
+
+    def test_render_template_safe_uses_the_shared_cache(self):
+        template_cache.clear()
+        self.addCleanup(template_cache.clear)
+
+        self.assertEqual(render_template_safe('Hi {{ n }}', {'n': 1}), 'Hi 1')
+        self.assertEqual(render_template_safe('Hi {{ n }}', {'n': 2}), 'Hi 2')
+
+        self.assertEqual((template_cache.hits, template_cache.misses), (1, 1))
+
+
+class TemplateCacheWarmupTests(TestCase):
+    def setUp(self):
+        template_cache.clear()
+        self.addCleanup(template_cache.clear)
+
+    def test_worker_start_compiles_active_rule_templates(self):
+        SlackIntegrationRule.objects.create(name='s', message_template='{{ alert_group.name }}', resolved_message_template='')
+        SmsIntegrationRule.objects.create(name='sms', firing_template='fire', resolved_template='{% if %}')
+        SmsIntegrationRule.objects.create(name='off', firing_template='inactive', is_active=False)
+        JiraIntegrationRule.objects.create(
+            name='j', jira_project_key='OPS', jira_issue_type='Task',
+            jira_title_template='{{ summary }}', jira_description_template='', jira_update_comment_template='',
+        )
+
+        warm_template_cache()
+
+        # Empty, broken and inactive templates are skipped
+        self.assertEqual(len(template_cache), 3)
+        template_cache.get('fire')
+        self.assertEqual(template_cache.hits, 1)
+
+    @override_settings(TEMPLATE_CACHE={'WARM_ON_WORKER_START': False})
+    def test_warmup_can_be_disabled(self):
+        SmsIntegrationRule.objects.create(name='sms', firing_template='fire')
+        warm_template_cache()
+        self.assertEqual(len(template_cache), 0)
+
+    def test_preview_endpoints_use_the_cache(self):
+        user = get_user_model().objects.create_user(username='tester', password='pass')
+        self.client.force_login(user)
+        body = json.dumps({'template_string': 'Hello {{ alert_group.name }}'})
+
+        for name in ('integrations:slack-rule-check-template', 'integrations:sms-rule-check-template'):
+            response = self.client.post(reverse(name), data=body, content_type='application/json')
+            self.assertEqual(response.json()['status'], 'success')
+
+        self.assertEqual((template_cache.hits, template_cache.misses), (1, 1))
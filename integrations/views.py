@@ -13,6 +13,7 @@ from django.utils import timezone
 from .services.jira_service import JiraService  # Import the service
 from .services.slack_service import SlackService
 from .services.sms_service import SmsService
+from .services.template_cache import template_cache
 from .exceptions import SmsNotificationError
 import markdown
 import re
@@ -544,9 +545,9 @@ def slack_admin_view(request):
                 template_text = template_form.cleaned_data["message_template"]
                 extra = template_form.cleaned_data.get("extra_context") or {}
                 ag = _apply_extra_context(_build_mock_alert_group(), extra)
-                from django.template import Template, Context
+                from django.template import Context
                 try:
-                    tmpl = Template(template_text)
+                    tmpl = template_cache.get(template_text)
                     rendered_preview = tmpl.render(Context({"alert_group": ag}))
                 except Exception as exc:
                     messages.error(request, f"Template rendering failed: {exc}")
@@ -729,8 +730,8 @@ def check_slack_template(request):
 
         # Attempt to render the template
         try:
-            from django.template import Template, Context, TemplateSyntaxError  # Local import
-            template = Template(template_string)
+            from django.template import Context, TemplateSyntaxError  # Local import
+            template = template_cache.get(template_string)
             rendered_text = template.render(Context(context))
             return JsonResponse({'status': 'success', 'rendered': rendered_text.strip()})
         except TemplateSyntaxError as e:
@@ -778,8 +779,8 @@ def check_sms_template(request):
         }
 
         try:
-            from django.template import Template, Context, TemplateSyntaxError  # Local import
-            template = Template(template_string)
+            from django.template import Context, TemplateSyntaxError  # Local import
+            template = template_cache.get(template_string)
             rendered_text = template.render(Context(context))
             return JsonResponse({'status': 'success', 'rendered': rendered_text.strip()})
         except TemplateSyntaxError as e:
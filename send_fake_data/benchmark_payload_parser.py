@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of alerts.services.payload_parser over the JSON fixtures in this directory.
+
+Compares the per-alert parse cost of the previous dateutil-only implementation
+with the current fast RFC3339 path, both with a cold and a warm timestamp cache.
+
+    python send_fake_data/benchmark_payload_parser.py --iterations 20000
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import timeit
+
+from dateutil.parser import parse as dateutil_parse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from alerts.services.payload_parser import parse_alertmanager_payload, parse_timestamp  # noqa: E402
+
+
+def parse_with_dateutil(payload):
+    """The parser as it was before the fast path: dateutil for every timestamp."""
+    alerts = []
+    for alert_data in payload.get('alerts', [payload]):
+        starts_at = dateutil_parse(alert_data.get('startsAt'))
+        ends_at = dateutil_parse(alert_data.get('endsAt')) if alert_data.get('endsAt') != '0001-01-01T00:00:00Z' else None
+        alerts.append({
+            'fingerprint': alert_data.get('fingerprint'),
+            'status': alert_data.get('status'),
+            'labels': alert_data.get('labels', {}),
+            'annotations': alert_data.get('annotations', {}),
+            'starts_at': starts_at,
+            'ends_at': ends_at,
+            'generator_url': alert_data.get('generatorURL'),
+            'source': alert_data.get('labels', {}).get('source'),
+        })
+    return alerts
+
+
+def parse_cold(payload):
+    parse_timestamp.cache_clear()
+    return parse_alertmanager_payload(payload)
+
+
+def load_fixtures(directory):
+    payloads = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+        with open(path) as f:
+            payloads.append(json.load(f))
+    return payloads
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Alertmanager payload parsing')
+    parser.add_argument('--iterations', type=int, default=5000,
+                        help='Passes over all fixtures per variant (default: 5000)')
+    parser.add_argument('--dir', default=os.path.dirname(os.path.abspath(__file__)),
+                        help='Directory with *.json fixtures (default: this directory)')
+    args = parser.parse_args()
+
+    payloads = load_fixtures(args.dir)
+    alert_count = sum(len(p.get('alerts', [p])) for p in payloads)
+    if not alert_count:
+        print(f"No alerts found in {args.dir}/*.json")
+        return
+
+    variants = [
+        ('dateutil (before)', parse_with_dateutil),
+        ('fast path, cold cache', parse_cold),
+        ('fast path, warm cache', parse_alertmanager_payload),
+    ]
+    print(f"{len(payloads)} fixture(s), {alert_count} alert(s), {args.iterations} iteration(s)")
+    baseline = None
+    for name, func in variants:
+        seconds = timeit.timeit(lambda: [func(p) for p in payloads], number=args.iterations)
+        per_alert_us = seconds / (args.iterations * alert_count) * 1e6
+        baseline = baseline or per_alert_us
+        print(f"  {name:<24} {per_alert_us:8.2f} us/alert  ({baseline / per_alert_us:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
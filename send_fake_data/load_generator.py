@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+High-rate load generator for SentryHub alert ingestion.
+
+Sends synthetic Alertmanager payloads to the webhook or the external RabbitMQ
+queue at a configurable rate and concurrency, and reports ingest throughput and
+the receive-to-commit latency distribution (p50/p95/p99).
+
+Commits are detected by polling the SentryHub database through the Django ORM
+(--measure db, default), so run it from a checkout whose settings point at the
+same database as the deployment under test. Use --measure none to only
+generate load.
+
+Examples:
+    # 200 payloads/s for 60s to the webhook, 5000 fingerprints, 10% flapping
+    python send_fake_data/load_generator.py --rate 200 --duration 60 --fingerprints 5000 --flap-ratio 0.1
+
+    # Unthrottled, 8 publishers, 20 alerts per payload, to RabbitMQ
+    python send_fake_data/load_generator.py --target rabbitmq --rate 0 --concurrency 8 --group-size 20 --count 10000
+"""
+import argparse
+import json
+import os
+import queue
+import random
+import statistics
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+import requests
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# --- Alert model ---
+
+class FingerprintState:
+    """Lifecycle of one synthetic alert (fingerprint)."""
+
+    def __init__(self, fingerprint, index, flapping):
+        self.fingerprint = fingerprint
+        self.index = index
+        self.flapping = flapping
+        self.status = 'resolved'
+        self.starts_at = None
+
+
+class AlertScenario:
+    """
+    Produces alert events over a fixed set of fingerprints.
+
+    - a resolved fingerprint always fires again with a new startsAt
+    - a flapping fingerprint toggles firing/resolved on every event
+    - any other firing fingerprint resolves with probability resolved_ratio,
+      otherwise it is re-sent unchanged (an Alertmanager repeat notification)
+    """
+
+    def __init__(self, run_id, fingerprints, resolved_ratio, flap_ratio, seed=None):
+        self.random = random.Random(seed)
+        self.resolved_ratio = resolved_ratio
+        self.lock = threading.Lock()
+        self.states = [
+            FingerprintState(f"loadgen-{run_id}-{i}", i, self.random.random() < flap_ratio)
+            for i in range(fingerprints)
+        ]
+
+    def next_event(self):
+        """Returns (alert_dict, kind) where kind is 'firing', 'resolved' or 'resend'."""
+        with self.lock:
+            state = self.random.choice(self.states)
+            now = datetime.now(timezone.utc)
+            if state.status == 'resolved':
+                state.status = 'firing'
+                state.starts_at = now
+                kind = 'firing'
+            elif state.flapping or self.random.random() < self.resolved_ratio:
+                state.status = 'resolved'
+                kind = 'resolved'
+            else:
+                kind = 'resend'
+            starts_at = state.starts_at
+
+        alert = {
+            'status': 'resolved' if kind == 'resolved' else 'firing',
+            'labels': {
+                'alertname': f"LoadGen{state.index % 50}",
+                'instance': f"loadgen-host-{state.index}:9100",
+                'job': 'loadgen',
+                'severity': 'warning',
+                'sentryhub_loadgen': 'true',
+            },
+            'annotations': {'summary': f"Synthetic alert {state.fingerprint}"},
+            'startsAt': _rfc3339(starts_at),
+            'endsAt': _rfc3339(now) if kind == 'resolved' else '0001-01-01T00:00:00Z',
+            'generatorURL': 'http://loadgen/graph',
+            'fingerprint': state.fingerprint,
+        }
+        return alert, kind
+
+    def build_payload(self, group_size):
+        events = [self.next_event() for _ in range(group_size)]
+        alerts = [alert for alert, _ in events]
+        payload = {
+            'version': '4',
+            'receiver': 'loadgen',
+            'status': 'firing' if any(a['status'] == 'firing' for a in alerts) else 'resolved',
+            'groupLabels': {'job': 'loadgen'},
+            'commonLabels': {'job': 'loadgen'},
+            'commonAnnotations': {},
+            'externalURL': 'http://loadgen',
+            'alerts': alerts,
+        }
+        return payload, events
+
+
+def _rfc3339(value):
+    return value.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+# --- Senders ---
+
+class WebhookSender:
+    def __init__(self, url, timeout):
+        self.url = url
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def send(self, body):
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.local.session = requests.Session()
+        response = session.post(self.url, data=body, headers={'Content-Type': 'application/json'}, timeout=self.timeout)
+        response.raise_for_status()
+
+    def close(self):
+        pass
+
+
+class RabbitMQSender:
+    def __init__(self, args):
+        import pika  # Only needed for --target rabbitmq
+        self.pika = pika
+        self.args = args
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+
+    def _channel(self):
+        channel = getattr(self.local, 'channel', None)
+        if channel is None:
+            # pika connections are not thread-safe: one per sender thread
+            parameters = self.pika.ConnectionParameters(
+                host=self.args.rabbitmq_host,
+                port=self.args.rabbitmq_port,
+                virtual_host=self.args.rabbitmq_vhost,
+                credentials=self.pika.PlainCredentials(self.args.rabbitmq_user, self.args.rabbitmq_password),
+            )
+            connection = self.pika.BlockingConnection(parameters)
+            channel = connection.channel()
+            channel.queue_declare(queue=self.args.rabbitmq_queue, durable=True)
+            self.local.channel = channel
+            with self.lock:
+                self.connections.append(connection)
+        return channel
+
+    def send(self, body):
+        self._channel().basic_publish(
+            exchange='',
+            routing_key=self.args.rabbitmq_queue,
+            body=body,
+            properties=self.pika.BasicProperties(delivery_mode=2, content_type='application/json'),
+        )
+
+    def close(self):
+        for connection in self.connections:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+
+# --- Commit tracking ---
+
+class CommitTracker:
+    """
+    Polls AlertInstance rows to find when each sent firing/resolved event was committed.
+    A firing event is committed once an instance with its startsAt exists;
+    a resolved event once that instance is resolved. Resends are not tracked.
+    """
+
+    def __init__(self, poll_interval):
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sentryHub.settings')
+        sys.path.insert(0, PROJECT_ROOT)
+        import django
+        django.setup()
+        from alerts.models import AlertInstance
+        self.AlertInstance = AlertInstance
+        self.poll_interval = poll_interval
+        self.pending = {}  # (fingerprint, starts_at, kind) -> sent_at
+        self.latencies = []
+        self.lock = threading.Lock()
+
+    def track(self, events, sent_at):
+        with self.lock:
+            for alert, kind in events:
+                if kind == 'resend':
+                    continue
+                starts_at = datetime.strptime(alert['startsAt'], '%Y-%m-%dT%H:%M:%S.%fZ').replace(tzinfo=timezone.utc)
+                self.pending.setdefault((alert['fingerprint'], starts_at, kind), sent_at)
+
+    def poll_once(self):
+        with self.lock:
+            keys = list(self.pending)
+        if not keys:
+            return 0
+        committed = set()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self.AlertInstance.objects.filter(
+                alert_group__fingerprint__in={k[0] for k in chunk},
+                started_at__in={k[1] for k in chunk},
+            ).values_list('alert_group__fingerprint', 'started_at', 'status')
+            for fingerprint, started_at, status in rows:
+                committed.add((fingerprint, started_at, 'firing'))
+                if status == 'resolved':
+                    committed.add((fingerprint, started_at, 'resolved'))
+        now = time.perf_counter()
+        with self.lock:
+            for key in committed:
+                sent_at = self.pending.pop(key, None)
+                if sent_at is not None:
+                    self.latencies.append(now - sent_at)
+        return len(committed)
+
+    def run(self, stop_event):
+        while not stop_event.is_set():
+            self.poll_once()
+            time.sleep(self.poll_interval)
+
+    def drain(self, timeout):
+        deadline = time.perf_counter() + timeout
+        while self.pending and time.perf_counter() < deadline:
+            self.poll_once()
+            time.sleep(self.poll_interval)
+        return len(self.pending)
+
+
+# --- Runner ---
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))]
+
+
+def run(args):
+    run_id = uuid.uuid4().hex[:8]
+    scenario = AlertScenario(run_id, args.fingerprints, args.resolved_ratio, args.flap_ratio, seed=args.seed)
+    sender = RabbitMQSender(args) if args.target == 'rabbitmq' else WebhookSender(args.url, args.timeout)
+    tracker = CommitTracker(args.poll_interval) if args.measure == 'db' else None
+
+    work = queue.Queue(maxsize=args.concurrency * 4)
+    stats = {'payloads': 0, 'alerts': 0, 'errors': 0, 'send_latencies': []}
+    stats_lock = threading.Lock()
+
+    def worker():
+        while True:
+            item = work.get()
+            if item is None:
+                return
+            body, events = item
+            sent_at = time.perf_counter()
+            try:
+                sender.send(body)
+            except Exception as e:
+                with stats_lock:
+                    stats['errors'] += 1
+                if args.verbose:
+                    print(f"Send failed: {e}")
+                continue
+            send_latency = time.perf_counter() - sent_at
+            if tracker:
+                tracker.track(events, sent_at)
+            with stats_lock:
+                stats['payloads'] += 1
+                stats['alerts'] += len(events)
+                stats['send_latencies'].append(send_latency)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    stop_polling = threading.Event()
+    poller = None
+    if tracker:
+        poller = threading.Thread(target=tracker.run, args=(stop_polling,), daemon=True)
+        poller.start()
+
+    print(f"Run {run_id}: target={args.target} rate={args.rate or 'unlimited'}/s concurrency={args.concurrency} "
+          f"fingerprints={args.fingerprints} group_size={args.group_size} resolved_ratio={args.resolved_ratio} "
+          f"flap_ratio={args.flap_ratio}")
+    started = time.perf_counter()
+    produced = 0
+    try:
+        while True:
+            elapsed = time.perf_counter() - started
+            if args.count and produced >= args.count:
+                break
+            if not args.count and elapsed >= args.duration:
+                break
+            if args.rate:
+                # Open-loop pacing: payload n is due at n / rate seconds
+                delay = produced / args.rate - elapsed
+                if delay > 0:
+                    time.sleep(delay)
+            payload, events = scenario.build_payload(args.group_size)
+            work.put((json.dumps(payload), events))
+            produced += 1
+    except KeyboardInterrupt:
+        print("Interrupted, finishing in-flight payloads...")
+    for _ in threads:
+        work.put(None)
+    for thread in threads:
+        thread.join()
+    send_elapsed = time.perf_counter() - started
+    sender.close()
+
+    unconfirmed = 0
+    if tracker:
+        stop_polling.set()
+        poller.join()
+        unconfirmed = tracker.drain(args.drain_timeout)
+    total_elapsed = time.perf_counter() - started
+
+    send_latencies = sorted(stats['send_latencies'])
+    print(f"\nSent {stats['payloads']} payloads / {stats['alerts']} alerts in {send_elapsed:.2f}s "
+          f"({stats['payloads'] / send_elapsed:.1f} payloads/s, {stats['alerts'] / send_elapsed:.1f} alerts/s), "
+          f"{stats['errors']} error(s)")
+    if send_latencies:
+        print(f"Send latency ms: p50={_percentile(send_latencies, 50) * 1000:.1f} "
+              f"p95={_percentile(send_latencies, 95) * 1000:.1f} p99={_percentile(send_latencies, 99) * 1000:.1f}")
+    if tracker:
+        latencies = sorted(tracker.latencies)
+        print(f"Committed {len(latencies)} tracked event(s) in {total_elapsed:.2f}s "
+              f"({len(latencies) / total_elapsed:.1f} events/s), {unconfirmed} not committed within {args.drain_timeout}s")
+        if latencies:
+            print(f"Receive-to-commit ms: p50={_percentile(latencies, 50) * 1000:.1f} "
+                  f"p95={_percentile(latencies, 95) * 1000:.1f} p99={_percentile(latencies, 99) * 1000:.1f} "
+                  f"max={latencies[-1] * 1000:.1f} mean={statistics.mean(latencies) * 1000:.1f} "
+                  f"(includes up to {args.poll_interval * 1000:.0f}ms poll interval)")
+    return 0 if not stats['errors'] and not unconfirmed else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SentryHub alert ingestion load generator')
+    parser.add_argument('--target', choices=['webhook', 'rabbitmq'], default='webhook',
+                        help='Where to send payloads (default: webhook)')
+    parser.add_argument('--url', default='http://localhost:8000/alerts/api/v1/webhook/',
+                        help='Webhook URL (default: http://localhost:8000/alerts/api/v1/webhook/)')
+    parser.add_argument('--timeout', type=float, default=10.0, help='HTTP timeout in seconds (default: 10)')
+    parser.add_argument('--rabbitmq-host', default=os.environ.get('RABBITMQ_HOST', 'localhost'))
+    parser.add_argument('--rabbitmq-port', type=int, default=int(os.environ.get('RABBITMQ_PORT', 5672)))
+    parser.add_argument('--rabbitmq-vhost', default=os.environ.get('RABBITMQ_VHOST', '/'))
+    parser.add_argument('--rabbitmq-user', default=os.environ.get('RABBITMQ_USER', 'guest'))
+    parser.add_argument('--rabbitmq-password', default=os.environ.get('RABBITMQ_PASSWORD', 'guest'))
+    parser.add_argument('--rabbitmq-queue', default=os.environ.get('RABBITMQ_EXTERNAL_QUEUE', 'sentryhub_alerts_external'))
+
+    parser.add_argument('--rate', type=float, default=50.0, help='Payloads per second, 0 for unlimited (default: 50)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Parallel senders (default: 4)')
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds to run when --count is not set (default: 30)')
+    parser.add_argument('--count', type=int, default=0, help='Number of payloads to send (overrides --duration)')
+    parser.add_argument('--fingerprints', type=int, default=1000, help='Fingerprint cardinality (default: 1000)')
+    parser.add_argument('--group-size', type=int, default=1, help='Alerts per payload (default: 1)')
+    parser.add_argument('--resolved-ratio', type=float, default=0.3,
+                        help='Probability that a firing, non-flapping alert resolves on its next event (default: 0.3)')
+    parser.add_argument('--flap-ratio', type=float, default=0.05,
+                        help='Fraction of fingerprints that toggle firing/resolved on every event (default: 0.05)')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for a repeatable event sequence')
+
+    parser.add_argument('--measure', choices=['db', 'none'], default='db',
+                        help='Track receive-to-commit latency by polling the database (default: db)')
+    parser.add_argument('--poll-interval', type=float, default=0.05, help='DB poll interval in seconds (default: 0.05)')
+    parser.add_argument('--drain-timeout', type=float, default=60.0,
+                        help='Seconds to wait for outstanding commits after sending (default: 60)')
+    parser.add_argument('--verbose', action='store_true', help='Print individual send errors')
+    args = parser.parse_args()
+
+    if args.group_size < 1 or args.concurrency < 1 or args.fingerprints < 1:
+        parser.error('--group-size, --concurrency and --fingerprints must be >= 1')
+    sys.exit(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -265,6 +265,17 @@ CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_DEFAULT_QUEUE = 'alerts'
 CELERY_TASK_ROUTES = {
     'alerts.tasks.process_alert_payload_task': {'queue': 'alerts'},
+    'alerts.tasks.process_alert_payload_batch_task': {'queue': 'alerts'},
+    'alerts.tasks.reevaluate_silences_task': {'queue': 'alerts'},
+    'alerts.tasks.sweep_silences_task': {'queue': 'alerts'},
+}
+# Fingerprint-sharded ingestion (see alerts/services/shard_router.py): when enabled, payloads are
+# split per fingerprint and routed to queues alerts.0 .. alerts.<SHARDS-1>, each served by one
+# single-concurrency worker, e.g. `celery -A sentryHub worker -Q alerts.0 --concurrency 1`.
+ALERT_SHARDING = {
+    'ENABLED': os.environ.get('SENTRYHUB_ALERT_SHARDING_ENABLED', 'False').lower() == 'true',
+    'SHARDS': int(os.environ.get('SENTRYHUB_ALERT_SHARDS', 4)),
+    'QUEUE_PREFIX': 'alerts.',
 }
 # Removed redundant serializer settings
 CELERY_TIMEZONE = TIME_ZONE
@@ -276,11 +287,121 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'core.tasks.flush_metrics_to_file',
         'schedule': timedelta(seconds=15),
     },
+    # Cheap when idle: only touches the database once the next silence start/end has passed
+    'sweep-silences': {
+        'task': 'alerts.tasks.sweep_silences_task',
+        'schedule': timedelta(seconds=int(os.environ.get('SENTRYHUB_SILENCE_SWEEP_INTERVAL', 15))),
+    },
+    # Safety nets for Slack digests / SMS batches whose scheduled flush was lost; no-ops when nothing is buffered
+    'flush-overdue-slack-digests': {
+        'task': 'integrations.tasks.flush_slack_digests_task',
+        'schedule': timedelta(seconds=int(os.environ.get('SENTRYHUB_SLACK_DIGEST_SWEEP_INTERVAL', 60))),
+    },
+    'flush-overdue-sms-outbox': {
+        'task': 'integrations.tasks.flush_sms_outbox_task',
+        'schedule': timedelta(seconds=int(os.environ.get('SENTRYHUB_SMS_BATCH_SWEEP_INTERVAL', 60))),
+        'kwargs': {'overdue_only': True},
+    },
 }
 # Internal Metrics Framework Settings
 METRICS_ENABLED = os.environ.get('SENTRYHUB_METRICS_ENABLED', 'True').lower() == 'true'
 METRICS_FILE_PATH = os.environ.get('SENTRYHUB_METRICS_FILE_PATH', "/var/lib/node_exporter/textfile_collector/sentryhub.prom")
 
+# Pre-DB dedup of Alertmanager repeat notifications (see alerts/services/alert_deduplicator.py)
+ALERT_DEDUP = {
+    'ENABLED': os.environ.get('SENTRYHUB_ALERT_DEDUP_ENABLED', 'True').lower() == 'true',
+    'LRU_SIZE': int(os.environ.get('SENTRYHUB_ALERT_DEDUP_LRU_SIZE', 50000)),
+    'TTL_SECONDS': int(os.environ.get('SENTRYHUB_ALERT_DEDUP_TTL_SECONDS', 3600)),
+    # Optional shared tier, e.g. 'redis://172.20.82.3:6379/1'. Leave empty for in-process only.
+    'REDIS_URL': os.environ.get('SENTRYHUB_ALERT_DEDUP_REDIS_URL', ''),
+}
+
+# Ingest path for the webhook and the RabbitMQ consumer (see alerts/services/direct_ingest.py).
+# 'celery' queues every payload to process_alert_payload_task; 'direct' applies it in a local pool.
+ALERT_INGEST = {
+    'MODE': os.environ.get('SENTRYHUB_ALERT_INGEST_MODE', 'celery'),
+    'WORKER_TYPE': os.environ.get('SENTRYHUB_ALERT_INGEST_WORKER_TYPE', 'thread'),  # 'thread' or 'process'
+    'WORKERS': int(os.environ.get('SENTRYHUB_ALERT_INGEST_WORKERS', 4)),
+    'MAX_PENDING': int(os.environ.get('SENTRYHUB_ALERT_INGEST_MAX_PENDING', 64)),
+    'SUBMIT_TIMEOUT_SECONDS': float(os.environ.get('SENTRYHUB_ALERT_INGEST_SUBMIT_TIMEOUT', 10)),
+    'RESULT_TIMEOUT_SECONDS': float(os.environ.get('SENTRYHUB_ALERT_INGEST_RESULT_TIMEOUT', 30)),
+}
+
+# Local write-ahead spool for webhook payloads (see alerts/services/alert_spool.py).
+# When enabled, run `python manage.py drain_alert_spool` next to the web server.
+ALERT_SPOOL = {
+    'ENABLED': os.environ.get('SENTRYHUB_ALERT_SPOOL_ENABLED', 'False').lower() == 'true',
+    'DIR': os.environ.get('SENTRYHUB_ALERT_SPOOL_DIR', os.path.join(BASE_DIR, 'spool', 'alerts')),
+    'SEGMENT_MAX_BYTES': int(os.environ.get('SENTRYHUB_ALERT_SPOOL_SEGMENT_MAX_BYTES', 16 * 1024 * 1024)),
+    'SEGMENT_MAX_AGE_SECONDS': float(os.environ.get('SENTRYHUB_ALERT_SPOOL_SEGMENT_MAX_AGE', 60)),
+    'FSYNC_INTERVAL_SECONDS': float(os.environ.get('SENTRYHUB_ALERT_SPOOL_FSYNC_INTERVAL', 0.05)),
+    'MERGE_DELAY_SECONDS': float(os.environ.get('SENTRYHUB_ALERT_SPOOL_MERGE_DELAY', 0.1)),
+}
+
+# Retention of alert history (see core/services/retention.py and `manage.py purge_history`).
+# Days to keep per table; 0 keeps rows forever.
+ALERT_RETENTION = {
+    'POLICIES': {
+        'alert_instance': int(os.environ.get('SENTRYHUB_RETENTION_INSTANCE_DAYS', 180)),
+        'alert_comment': int(os.environ.get('SENTRYHUB_RETENTION_COMMENT_DAYS', 365)),
+        'acknowledgement_history': int(os.environ.get('SENTRYHUB_RETENTION_ACK_HISTORY_DAYS', 365)),
+        'sms_message_log': int(os.environ.get('SENTRYHUB_RETENTION_SMS_LOG_DAYS', 90)),
+    },
+    'BATCH_SIZE': int(os.environ.get('SENTRYHUB_RETENTION_BATCH_SIZE', 2000)),
+    'BATCH_PAUSE_SECONDS': float(os.environ.get('SENTRYHUB_RETENTION_BATCH_PAUSE', 0.2)),
+    # Expired rows are written here as gzipped NDJSON before deletion when archiving is requested
+    'ARCHIVE_DIR': os.environ.get('SENTRYHUB_RETENTION_ARCHIVE_DIR', os.path.join(BASE_DIR, 'archive')),
+}
+
+# Django cache: shared Redis when configured (e.g. 'redis://172.20.82.3:6379/2'), per-process memory otherwise
+CACHE_REDIS_URL = os.environ.get('SENTRYHUB_CACHE_REDIS_URL', '')
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+            'OPTIONS': {'socket_timeout': 0.5, 'socket_connect_timeout': 0.5},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'sentryhub-default',
+        }
+    }
+
+# Versioned cache for dashboard stats, list dropdowns/counts and API lists (see core/services/read_cache.py).
+# Entries are invalidated on alert changes; TIMEOUT_SECONDS bounds staleness of anything not covered
+# (e.g. last_occurrence bumps from repeat notifications, or other processes with the memory backend).
+READ_CACHE = {
+    'ENABLED': os.environ.get('SENTRYHUB_READ_CACHE_ENABLED', 'True').lower() == 'true',
+    'ALIAS': 'default',
+    'TIMEOUT_SECONDS': int(os.environ.get('SENTRYHUB_READ_CACHE_TIMEOUT', 30)),
+}
+
+# Compiled integration rule indexes (integrations.services.rule_index); rebuilt when
+# a rule changes. Other processes see the change through the shared cache at once, and
+# through the rule table's version in the database (probed this often) with any cache.
+RULE_INDEX = {
+    'VERSION_PROBE_SECONDS': float(os.environ.get('SENTRYHUB_RULE_INDEX_VERSION_PROBE', 2)),
+}
+
+# In-memory silence index (alerts.services.silence_index), same invalidation scheme
+SILENCE_INDEX = {
+    'VERSION_PROBE_SECONDS': float(os.environ.get('SENTRYHUB_SILENCE_INDEX_VERSION_PROBE', 2)),
+}
+
+# Compiled integration message templates (integrations.services.template_cache), warmed per worker process
+TEMPLATE_CACHE = {
+    'MAX_SIZE': int(os.environ.get('SENTRYHUB_TEMPLATE_CACHE_SIZE', 512)),
+    'WARM_ON_WORKER_START': os.environ.get('SENTRYHUB_TEMPLATE_CACHE_WARM', 'True').lower() == 'true',
+}
+
+# Background re-evaluation of affected alerts after a SilenceRule change (alerts.tasks.reevaluate_silences_task)
+SILENCE_REEVALUATION = {
+    'CHUNK_SIZE': int(os.environ.get('SENTRYHUB_SILENCE_REEVALUATION_CHUNK_SIZE', 500)),
+}
 
 # RabbitMQ Configuration for External Alerts
 RABBITMQ_CONFIG = {
@@ -293,6 +414,10 @@ RABBITMQ_CONFIG = {
     'HEARTBEAT': int(os.environ.get('RABBITMQ_HEARTBEAT', 600)),
     'BLOCKED_CONNECTION_TIMEOUT': int(os.environ.get('RABBITMQ_BLOCKED_CONNECTION_TIMEOUT', 300)),
     'RETRY_DELAY': int(os.environ.get('RABBITMQ_RETRY_DELAY', 30)), # Seconds
+    # Batch consuming: BATCH_SIZE > 1 enables it; PREFETCH_COUNT is raised to at least BATCH_SIZE
+    'PREFETCH_COUNT': int(os.environ.get('RABBITMQ_PREFETCH_COUNT', 1)),
+    'BATCH_SIZE': int(os.environ.get('RABBITMQ_BATCH_SIZE', 1)),
+    'BATCH_LINGER_SECONDS': float(os.environ.get('RABBITMQ_BATCH_LINGER_SECONDS', 0.2)),
 }
 
 SITE_URL = "https://sentryhub.tsetmc.com"
@@ -318,6 +443,25 @@ SMS_PROVIDER_SENDER = os.environ.get("SMS_PROVIDER_SENDER", "")
 # Defines the delivery method for SMS notifications ('HTTP' or 'RABBITMQ')
 SMS_DELIVERY_METHOD = os.environ.get('SMS_DELIVERY_METHOD', 'HTTP')
 
+# Batched SMS dispatch (see integrations/services/sms_batcher.py): when enabled, messages rendered
+# within WINDOW_SECONDS are packed into provider requests of up to MAX_RECIPIENTS_PER_REQUEST entries.
+SMS_BATCH = {
+    'ENABLED': os.environ.get('SENTRYHUB_SMS_BATCH_ENABLED', 'False').lower() == 'true',
+    'WINDOW_SECONDS': int(os.environ.get('SENTRYHUB_SMS_BATCH_WINDOW', 5)),
+    'MAX_RECIPIENTS_PER_REQUEST': int(os.environ.get('SENTRYHUB_SMS_BATCH_MAX_RECIPIENTS', 100)),
+    'CLAIM_TIMEOUT_SECONDS': int(os.environ.get('SENTRYHUB_SMS_BATCH_CLAIM_TIMEOUT', 300)),
+    'FLUSH_GRACE_SECONDS': int(os.environ.get('SENTRYHUB_SMS_BATCH_FLUSH_GRACE', 30)),
+}
+
+# Shared per-process AMQP publisher used by the Slack and SMS RabbitMQ forwarders
+# (integrations/services/amqp_publisher.py)
+AMQP_PUBLISHER = {
+    'CONFIRM_DELIVERY': os.environ.get('SENTRYHUB_AMQP_CONFIRM_DELIVERY', 'True').lower() == 'true',
+    'HEARTBEAT_SECONDS': int(os.environ.get('SENTRYHUB_AMQP_HEARTBEAT', 60)),
+    'BLOCKED_CONNECTION_TIMEOUT_SECONDS': float(os.environ.get('SENTRYHUB_AMQP_BLOCKED_TIMEOUT', 30)),
+    'RETRIES': int(os.environ.get('SENTRYHUB_AMQP_PUBLISH_RETRIES', 1)),
+}
+
 # Configuration for the external RabbitMQ instance used as a forwarder for SMS
 RABBITMQ_SMS_FORWARDER_CONFIG = {
     'HOST': os.environ.get('RABBITMQ_FORWARDER_HOST', 'localhost'),
@@ -348,6 +492,31 @@ JIRA_CONFIG = {
 # Defines the delivery method for Slack notifications ('HTTP' or 'RABBITMQ')
 SLACK_DELIVERY_METHOD = os.environ.get('SLACK_DELIVERY_METHOD', 'HTTP')
 
+# HTTP delivery to SLACK_INTERNAL_ENDPOINT (see integrations/services/http_pool.py).
+# Each request is sent once; failures are retried by the Celery task after an
+# exponential countdown (RETRY_BASE_SECONDS * 2**n, jittered, capped at RETRY_MAX_SECONDS).
+# MAX_CONCURRENT_REQUESTS caps in-flight requests to the endpoint across workers (0 disables the limit).
+SLACK_HTTP = {
+    'TIMEOUT_SECONDS': float(os.environ.get('SENTRYHUB_SLACK_HTTP_TIMEOUT', 10)),
+    'POOL_SIZE': int(os.environ.get('SENTRYHUB_SLACK_HTTP_POOL_SIZE', 10)),
+    'MAX_CONCURRENT_REQUESTS': int(os.environ.get('SENTRYHUB_SLACK_MAX_CONCURRENT_REQUESTS', 8)),
+    'RETRY_BASE_SECONDS': int(os.environ.get('SENTRYHUB_SLACK_RETRY_BASE', 10)),
+    'RETRY_MAX_SECONDS': int(os.environ.get('SENTRYHUB_SLACK_RETRY_MAX', 3600)),
+    'MAX_RETRIES': int(os.environ.get('SENTRYHUB_SLACK_MAX_RETRIES', 12)),
+    # Sends over MAX_CONCURRENT_REQUESTS are re-queued after ~this delay, outside the MAX_RETRIES budget
+    'THROTTLE_DELAY_SECONDS': float(os.environ.get('SENTRYHUB_SLACK_THROTTLE_DELAY', 5)),
+    'MAX_THROTTLE_DEFERRALS': int(os.environ.get('SENTRYHUB_SLACK_MAX_THROTTLE_DEFERRALS', 50)),
+}
+
+# Per-rule Slack digests (SlackIntegrationRule.digest_window_seconds, see integrations/services/slack_digest.py)
+SLACK_DIGEST = {
+    'MAX_ENTRIES_PER_MESSAGE': int(os.environ.get('SENTRYHUB_SLACK_DIGEST_MAX_ENTRIES', 50)),
+    # A flush holding entries longer than this is presumed dead and its entries are sent again
+    'CLAIM_TIMEOUT_SECONDS': int(os.environ.get('SENTRYHUB_SLACK_DIGEST_CLAIM_TIMEOUT', 300)),
+    # Beat flushes windows overdue by more than this (their scheduled flush was lost)
+    'FLUSH_GRACE_SECONDS': int(os.environ.get('SENTRYHUB_SLACK_DIGEST_FLUSH_GRACE', 30)),
+}
+
 # Configuration for the external RabbitMQ instance used as a forwarder for Slack
 RABBITMQ_FORWARDER_CONFIG = {
     'HOST': os.environ.get('RABBITMQ_FORWARDER_HOST', 'localhost'),